@@ -11,11 +11,42 @@ Sürüm: 1.0
 """
 import sys
 import os
+import calendar
+import csv
+import difflib
+import argparse
+import asyncio
+import base64
+import bisect
+import gzip
+import hmac
+import io
+import tempfile
+import threading
+import queue
+import multiprocessing
+import itertools
+import mmap
+import contextvars
+import random
+import shutil
+import statistics
+import struct
+import subprocess
+import time
+import urllib.request
+import urllib.error
+from array import array
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial, wraps
+from xml.sax.saxutils import escape
+import re
+import atexit
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
-from datetime import datetime, date
+from datetime import datetime, date, timedelta
 import sqlite3
-import os
+import json
 
 # PDF için reportlab
 from reportlab.lib import colors
@@ -42,33 +73,110 @@ DB_FILE = resource_path("esnaf_defter.db")
 # ============================================================================
 
 def tarih_dogrula(tarih_str):
-    """Tarihi YYYY-MM-DD formatında doğrular"""
+    """Tarihi YYYY-MM-DD formatında doğrular ve sıfır dolgulu biçimde döndürür"""
     if not tarih_str or not tarih_str.strip():
         return False, "Tarih boş olamaz!"
     
     try:
-        datetime.strptime(tarih_str.strip(), "%Y-%m-%d")
-        return True, tarih_str.strip()
+        # "2025-1-5" gibi girişler de kabul edilir; metin sıralaması bozulmasın diye dolgulanır
+        return True, datetime.strptime(tarih_str.strip(), "%Y-%m-%d").date().isoformat()
     except ValueError:
         return False, "Geçersiz tarih formatı! (YYYY-AA-GG olmalı, örn: 2025-12-14)"
 
 
+def tutar_dogrula(tutar):
+    """Tutarın sıfırdan büyük bir sayı olduğunu doğrular"""
+    try:
+        tutar = float(tutar)
+        if tutar <= 0:
+            return False, "Tutar sıfırdan büyük olmalı!"
+    except (TypeError, ValueError):
+        return False, "Geçerli bir tutar girin!"
+    return True, tutar
+
+
 # ============================================================================
 # VERİTABANI FONKSİYONLARI
 # ============================================================================
 
+# Arka uç çağrısı süresince kullanılacak veritabanı (None ise DB_FILE)
+_etkin_veritabani = contextvars.ContextVar("etkin_veritabani", default=None)
+
+# Başka bir süreç (ikinci program, yedekleme aracı) dosyayı kilitlediğinde beklenecek süre
+MESGUL_ZAMAN_ASIMI_MS = 5000
+# Kilit hatasında yazma işleminin toplam deneme sayısı ve üstel bekleme sınırları
+YAZMA_DENEME_SAYISI = 5
+YAZMA_ILK_BEKLEME_SN = 0.05
+YAZMA_EN_UZUN_BEKLEME_SN = 1.0
+
+# Süreç içindeki yazmalar tek tek yapılır (iş parçacıkları birbirini kilitlemesin)
+_yazma_kilidi = threading.RLock()
+# Bu süreçteki yeniden deneme ve vazgeçilen kilit hatası sayıları
+yazma_sayaclari = {"yeniden_deneme": 0, "kilit_hatasi": 0}
+
+
+def etkin_veritabani():
+    """Geçerli çağrının kullandığı veritabanı yolunu döndürür"""
+    return _etkin_veritabani.get() or DB_FILE
+
+
 def veritabani_baglantisi():
-    """Veritabanı bağlantısı oluşturur"""
-    conn = sqlite3.connect(DB_FILE)
+    """Veritabanı bağlantısı oluşturur
+    
+    Yazan bağlantılar ilk değişiklikte BEGIN IMMEDIATE ile yazma kilidini
+    baştan alır; kilit meşgulse MESGUL_ZAMAN_ASIMI_MS kadar beklenir.
+    """
+    yol = etkin_veritabani()
+    conn = sqlite3.connect(yol, uri=yol.startswith("file:"), timeout=MESGUL_ZAMAN_ASIMI_MS / 1000,
+                           isolation_level="IMMEDIATE")
     conn.row_factory = sqlite3.Row
+    # Müşterisi olmayan işlem, kaydı olmayan etiket bağlantısı vb. oluşmasın
+    conn.execute("PRAGMA foreign_keys = ON")
+    if _olcum_acik:
+        conn.set_trace_callback(_sql_izle)
     return conn
 
 
+def kilit_hatasi_mi(hata):
+    """Hata, veritabanının başka bir bağlantı tarafından kilitli olmasından mı kaynaklanıyor"""
+    return isinstance(hata, sqlite3.OperationalError) and (
+        "locked" in str(hata) or "busy" in str(hata)
+    )
+
+
+def yazma_islemi(fonksiyon, *args, **kwargs):
+    """Yazma fonksiyonunu süreç içi tek yazıcı kilidiyle, kilit hatasında yeniden deneyerek çalıştırır
+    
+    Yazma fonksiyonları tek işlemde (tek commit) yazar ve işlem BEGIN
+    IMMEDIATE ile başlar; kilit hatası commit'ten önce oluştuğundan
+    yarım işlem geri alınır ve fonksiyonu baştan çalıştırmak güvenlidir.
+    Denemeler arasında üstel artan, rastgele saptırılmış süre beklenir.
+    """
+    bekleme = YAZMA_ILK_BEKLEME_SN
+    for deneme in range(1, YAZMA_DENEME_SAYISI + 1):
+        try:
+            with _yazma_kilidi:
+                return fonksiyon(*args, **kwargs)
+        except sqlite3.OperationalError as e:
+            if not kilit_hatasi_mi(e):
+                raise
+            if deneme == YAZMA_DENEME_SAYISI:
+                yazma_sayaclari["kilit_hatasi"] += 1
+                raise
+        yazma_sayaclari["yeniden_deneme"] += 1
+        time.sleep(bekleme * random.uniform(0.5, 1.5))
+        bekleme = min(bekleme * 2, YAZMA_EN_UZUN_BEKLEME_SN)
+
+
 def tablolari_olustur():
     """Gerekli tabloları oluşturur (yoksa)"""
     conn = veritabani_baglantisi()
     cursor = conn.cursor()
     
+    # Yeni dosyalarda silinen kayıtların boşalttığı sayfalar dosyadan parça parça atılabilsin
+    # (eski dosyalar bakım servisinde bir kez dönüştürülür)
+    cursor.execute("PRAGMA auto_vacuum = INCREMENTAL")
+    
     # Müşteriler tablosu
     cursor.execute('''
         CREATE TABLE IF NOT EXISTS musteriler (
@@ -106,10 +214,464 @@ def tablolari_olustur():
         )
     ''')
     
+    # Soft delete: silinen kayıtlar silinme_tarihi ile işaretlenir (mezar taşı)
+    for tablo in ("musteriler", "islemler", "kasa"):
+        sutun_ekle(cursor, tablo, "silinme_tarihi", "TEXT")
+    
+    # Canlı kayıtlar için kısmi indeksler (mezar taşları indekse girmez)
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_musteriler_ad
+        ON musteriler(ad) WHERE silinme_tarihi IS NULL
+    ''')
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_islemler_musteri
+        ON islemler(musteri_id, tarih) WHERE silinme_tarihi IS NULL
+    ''')
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_kasa_tarih
+        ON kasa(tarih) WHERE silinme_tarihi IS NULL
+    ''')
+    
+    # Sıkıştırma işi için yalnızca mezar taşlarını içeren indeksler
+    for tablo in ("musteriler", "islemler", "kasa"):
+        cursor.execute(f'''
+            CREATE INDEX IF NOT EXISTS idx_{tablo}_silinen
+            ON {tablo}(silinme_tarihi) WHERE silinme_tarihi IS NOT NULL
+        ''')
+    
+    # Denetim günlüğü (yalnızca ekleme yapılabilir)
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS denetim_gunlugu (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            zaman TEXT NOT NULL DEFAULT (strftime('%Y-%m-%d %H:%M:%f', 'now', 'localtime')),
+            tablo TEXT NOT NULL,
+            kayit_id INTEGER NOT NULL,
+            eylem TEXT NOT NULL,
+            veri TEXT
+        )
+    ''')
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_denetim_kayit
+        ON denetim_gunlugu(tablo, kayit_id)
+    ''')
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS denetim_gunlugu_guncelleme_yasak
+        BEFORE UPDATE ON denetim_gunlugu
+        BEGIN
+            SELECT RAISE(ABORT, 'Denetim günlüğü değiştirilemez');
+        END
+    ''')
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS denetim_gunlugu_silme_yasak
+        BEFORE DELETE ON denetim_gunlugu
+        BEGIN
+            SELECT RAISE(ABORT, 'Denetim günlüğü silinemez');
+        END
+    ''')
+    
+    # Sıkıştırma ile sıcak tablolardan taşınan eski mezar taşları
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS silinen_kayitlar (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            tablo TEXT NOT NULL,
+            kayit_id INTEGER NOT NULL,
+            silinme_tarihi TEXT NOT NULL,
+            arsivlenme_tarihi TEXT DEFAULT CURRENT_TIMESTAMP,
+            veri TEXT NOT NULL
+        )
+    ''')
+    
+    # Kapanan mali yıllar ve devreden kasa toplamları
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS kapanan_donemler (
+            yil INTEGER PRIMARY KEY,
+            ciro REAL NOT NULL DEFAULT 0,
+            gider REAL NOT NULL DEFAULT 0,
+            kapanis_tarihi TEXT DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+    
+    # Tekrarlayan kasa tanımları (kira, maaş, fatura...)
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS tekrarlayan_kasa (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            aciklama TEXT,
+            tutar REAL NOT NULL,
+            islem_turu TEXT NOT NULL,
+            siklik TEXT NOT NULL,
+            baslangic TEXT NOT NULL,
+            bitis TEXT,
+            son_islenen TEXT,
+            olusturma_tarihi TEXT DEFAULT CURRENT_TIMESTAMP,
+            silinme_tarihi TEXT
+        )
+    ''')
+    # Üretilen kasa satırları tanıma bağlanır; aynı gün iki kez üretilemez
+    sutun_ekle(cursor, "kasa", "tekrar_id", "INTEGER")
+    cursor.execute('''
+        CREATE UNIQUE INDEX IF NOT EXISTS idx_kasa_tekrar
+        ON kasa(tekrar_id, tarih) WHERE tekrar_id IS NOT NULL
+    ''')
+    
+    # Kategoriler ve etiketler (kasa ve borç/alacak kayıtları için)
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS kategoriler (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            ad TEXT NOT NULL UNIQUE,
+            islem_turu TEXT,
+            olusturma_tarihi TEXT DEFAULT CURRENT_TIMESTAMP,
+            silinme_tarihi TEXT
+        )
+    ''')
+    for tablo in ("kasa", "islemler", "tekrarlayan_kasa"):
+        sutun_ekle(cursor, tablo, "kategori_id", "INTEGER REFERENCES kategoriler(id)")
+    
+    # Borçlar için isteğe bağlı vade; gecikme sorgusu yalnızca vadeli borçları tarar
+    sutun_ekle(cursor, "islemler", "vade", "TEXT")
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_islemler_vade
+        ON islemler(vade, musteri_id)
+        WHERE vade IS NOT NULL AND islem_turu = 'BORÇ' AND silinme_tarihi IS NULL
+    ''')
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_kasa_kategori
+        ON kasa(kategori_id, tarih) WHERE silinme_tarihi IS NULL
+    ''')
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_islemler_kategori
+        ON islemler(kategori_id, tarih) WHERE silinme_tarihi IS NULL
+    ''')
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS etiketler (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            ad TEXT NOT NULL UNIQUE
+        )
+    ''')
+    for tablo, sutun in ETIKET_TABLOLARI.items():
+        cursor.execute(f'''
+            CREATE TABLE IF NOT EXISTS {tablo}_etiketleri (
+                {sutun} INTEGER NOT NULL REFERENCES {tablo}(id),
+                etiket_id INTEGER NOT NULL REFERENCES etiketler(id),
+                PRIMARY KEY ({sutun}, etiket_id)
+            ) WITHOUT ROWID
+        ''')
+        cursor.execute(f'''
+            CREATE INDEX IF NOT EXISTS idx_{tablo}_etiketleri_etiket
+            ON {tablo}_etiketleri(etiket_id, {sutun})
+        ''')
+    
+    # Dövizli ve miktarlı borç/alacak (tutar işlemin kendi para biriminde tutulur)
+    sutun_ekle(cursor, "islemler", "para_birimi", "TEXT NOT NULL DEFAULT 'TL'")
+    sutun_ekle(cursor, "islemler", "miktar", "REAL")
+    sutun_ekle(cursor, "islemler", "birim_fiyat", "REAL")
+    # Kur sorgusu (para_birimi, tarih) birincil anahtarı üzerinden tek aramadır
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS doviz_kurlari (
+            para_birimi TEXT NOT NULL,
+            gecerlilik_tarihi TEXT NOT NULL,
+            kur REAL NOT NULL,
+            PRIMARY KEY (para_birimi, gecerlilik_tarihi)
+        ) WITHOUT ROWID
+    ''')
+    
+    # Ürün kataloğu; kod ve barkod canlı ürünler arasında tekildir
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS urunler (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            kod TEXT NOT NULL,
+            barkod TEXT,
+            ad TEXT NOT NULL,
+            fiyat REAL NOT NULL,
+            stok REAL,
+            olusturma_tarihi TEXT DEFAULT CURRENT_TIMESTAMP,
+            silinme_tarihi TEXT
+        )
+    ''')
+    cursor.execute('''
+        CREATE UNIQUE INDEX IF NOT EXISTS idx_urunler_kod
+        ON urunler(kod) WHERE silinme_tarihi IS NULL
+    ''')
+    cursor.execute('''
+        CREATE UNIQUE INDEX IF NOT EXISTS idx_urunler_barkod
+        ON urunler(barkod) WHERE barkod IS NOT NULL AND silinme_tarihi IS NULL
+    ''')
+    # Satış ekranından yazılan kasa/borç satırları ürüne ve miktara bağlanır
+    for tablo in ("kasa", "islemler"):
+        sutun_ekle(cursor, tablo, "urun_id", "INTEGER REFERENCES urunler(id)")
+    sutun_ekle(cursor, "kasa", "miktar", "REAL")
+    
+    # Şube eşitlemesi: kayıtların şubeler arasında değişmeyen kimliği (uuid)
+    for tablo in SENK_TABLOLARI:
+        sutun_ekle(cursor, tablo, "uuid", "TEXT")
+        cursor.execute(f"CREATE UNIQUE INDEX IF NOT EXISTS idx_{tablo}_uuid ON {tablo}(uuid)")
+        cursor.execute(f"UPDATE {tablo} SET uuid = {YENI_UUID} WHERE uuid IS NULL")
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS defter_bilgisi (
+            anahtar TEXT PRIMARY KEY,
+            deger TEXT
+        )
+    ''')
+    cursor.execute(f"INSERT OR IGNORE INTO defter_bilgisi (anahtar, deger) VALUES ('kimlik', {YENI_UUID})")
+    # Eşitlenen şubeler: kaynaktan uygulanan / eşin bizden aldığını bildirdiği son günlük no
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS senk_esleri (
+            kimlik TEXT PRIMARY KEY,
+            alinan INTEGER NOT NULL DEFAULT 0,
+            onaylanan INTEGER NOT NULL DEFAULT 0,
+            yerel_gunluk INTEGER NOT NULL DEFAULT 0,
+            son_alim TEXT
+        )
+    ''')
+    # Gönderilen ve alınan paketler; alımın ürettiği günlük kayıtları geri gönderilmez
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS senk_gecmisi (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            zaman TEXT NOT NULL DEFAULT (strftime('%Y-%m-%d %H:%M:%f', 'now', 'localtime')),
+            yon TEXT NOT NULL,
+            es TEXT,
+            onceki INTEGER NOT NULL,
+            son INTEGER NOT NULL,
+            ilk_gunluk INTEGER,
+            son_gunluk INTEGER,
+            satir INTEGER NOT NULL DEFAULT 0,
+            cakisma INTEGER NOT NULL DEFAULT 0
+        )
+    ''')
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS senk_cakismalari (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            zaman TEXT NOT NULL DEFAULT (strftime('%Y-%m-%d %H:%M:%f', 'now', 'localtime')),
+            kaynak TEXT NOT NULL,
+            tablo TEXT NOT NULL,
+            uuid TEXT NOT NULL,
+            yerel TEXT,
+            gelen TEXT,
+            sonuc TEXT NOT NULL
+        )
+    ''')
+    
+    # Bakım adımlarının son çalışma zamanları
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS bakim_durumu (
+            islem TEXT PRIMARY KEY,
+            son_calisma TEXT NOT NULL,
+            sure_ms REAL,
+            ayrinti TEXT
+        )
+    ''')
+    
+    # Ödeme hatırlatmalarının gönderim kutusu (şubeye özeldir, eşitlenmez; müşteri
+    # kaydı arşivlenebilsin diye yabancı anahtar yok)
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS hatirlatma_kutusu (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            musteri_id INTEGER NOT NULL,
+            telefon TEXT NOT NULL,
+            mesaj TEXT NOT NULL,
+            bakiye REAL NOT NULL,
+            durum TEXT NOT NULL DEFAULT 'BEKLİYOR',
+            deneme INTEGER NOT NULL DEFAULT 0,
+            olusturma_tarihi TEXT NOT NULL,
+            sonraki_deneme TEXT NOT NULL,
+            gonderim_tarihi TEXT,
+            hata TEXT
+        )
+    ''')
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_hatirlatma_sira
+        ON hatirlatma_kutusu(durum, sonraki_deneme)
+    ''')
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_hatirlatma_musteri
+        ON hatirlatma_kutusu(musteri_id, olusturma_tarihi)
+    ''')
+    
+    # Tüm sütunlar eklendikten sonra kurulur
+    denetim_tetikleyicilerini_olustur(cursor)
+    uuid_tetikleyicilerini_olustur(cursor)
+    
+    # Müşteri bakiye özeti (tetikleyicilerle güncel tutulur)
+    cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'musteri_bakiyeleri'")
+    ozet_yeni = cursor.fetchone() is None
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS musteri_bakiyeleri (
+            musteri_id INTEGER PRIMARY KEY,
+            borc REAL NOT NULL DEFAULT 0,
+            odeme REAL NOT NULL DEFAULT 0
+        )
+    ''')
+    bakiye_tetikleyicilerini_olustur(cursor)
+    if ozet_yeni:
+        bakiye_ozetini_doldur(cursor)
+    
     conn.commit()
     conn.close()
 
 
+def sutun_ekle(cursor, tablo, sutun, tanim):
+    """Tabloda sütun yoksa ekler (eski veritabanları için geçiş)"""
+    mevcut = {satir[1] for satir in cursor.execute(f"PRAGMA table_info({tablo})")}
+    if sutun not in mevcut:
+        cursor.execute(f"ALTER TABLE {tablo} ADD COLUMN {sutun} {tanim}")
+
+
+# Denetim günlüğüne yazılan sütunlar (tablo -> sütunlar)
+DENETIM_SUTUNLARI = {
+    "musteriler": ("ad", "telefon", "not_alani"),
+    "islemler": ("musteri_id", "tarih", "aciklama", "tutar", "islem_turu", "kategori_id", "vade",
+                 "para_birimi", "miktar", "birim_fiyat"),
+    "kasa": ("tarih", "aciklama", "tutar", "islem_turu", "kategori_id"),
+}
+
+
+def denetim_tetikleyicilerini_olustur(cursor):
+    """Ekleme, silme ve geri alma işlemlerini günlüğe yazan tetikleyicileri kurar"""
+    for tablo, sutunlar in DENETIM_SUTUNLARI.items():
+        veri = ", ".join(f"'{sutun}', NEW.{sutun}" for sutun in sutunlar)
+        tetikleyiciler = {
+            "ekle": f'''
+                AFTER INSERT ON {tablo}
+                BEGIN
+                    INSERT INTO denetim_gunlugu (tablo, kayit_id, eylem, veri)
+                    VALUES ('{tablo}', NEW.id, 'EKLE', json_object({veri}));
+                END
+            ''',
+            "sil": f'''
+                AFTER UPDATE OF silinme_tarihi ON {tablo}
+                WHEN OLD.silinme_tarihi IS NULL AND NEW.silinme_tarihi IS NOT NULL
+                BEGIN
+                    INSERT INTO denetim_gunlugu (tablo, kayit_id, eylem, veri)
+                    VALUES ('{tablo}', NEW.id, 'SİL', json_object('silinme_tarihi', NEW.silinme_tarihi));
+                END
+            ''',
+            "geri_al": f'''
+                AFTER UPDATE OF silinme_tarihi ON {tablo}
+                WHEN OLD.silinme_tarihi IS NOT NULL AND NEW.silinme_tarihi IS NULL
+                BEGIN
+                    INSERT INTO denetim_gunlugu (tablo, kayit_id, eylem, veri)
+                    VALUES ('{tablo}', NEW.id, 'GERİ AL', json_object('silinme_tarihi', OLD.silinme_tarihi));
+                END
+            ''',
+        }
+        for ad, govde in tetikleyiciler.items():
+            cursor.execute(f"DROP TRIGGER IF EXISTS denetim_{tablo}_{ad}")
+            cursor.execute(f"CREATE TRIGGER denetim_{tablo}_{ad} {govde}")
+
+
+# Şubeler arasında eşitlenen tablolar
+SENK_TABLOLARI = ("musteriler", "islemler", "kasa")
+# Yeni kayıt kimliği: 48 bit milisaniye + 80 bit rastgele (UUIDv7 düzeni, 32 onaltılık hane);
+# zamana göre artan kimlikler uuid indeksinin sonuna eklenir, indeks sayfaları bölünmez
+YENI_UUID = ("(printf('%012x', CAST((julianday('now') - 2440587.5) * 86400000 AS INTEGER))"
+             " || lower(hex(randomblob(10))))")
+
+
+def uuid_tetikleyicilerini_olustur(cursor):
+    """uuid verilmeden eklenen her kayda yeni bir uuid atayan tetikleyicileri kurar
+    
+    Sık kullanılan ekleme ifadeleri uuid'i kendisi verir (tetikleyicinin
+    ek UPDATE'i toplu kayıtta belirgin yavaşlama yapar); tetikleyici
+    diğer yollardan gelen kayıtlar içindir.
+    """
+    for tablo in SENK_TABLOLARI:
+        cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS senk_{tablo}_uuid
+            AFTER INSERT ON {tablo}
+            WHEN NEW.uuid IS NULL
+            BEGIN
+                UPDATE {tablo} SET uuid = {YENI_UUID} WHERE id = NEW.id;
+            END
+        ''')
+
+
+# Kural: işlem tarihinde geçerli kuru olmayan dövizli işlem bakiyeye girmez; tetikleyici
+# yazmayı bu mesajla durdurur, bakiye özetini baştan hesaplama da aynı mesajla reddeder
+KUR_YOK_MESAJI = "Döviz kuru yok: işlem tarihinde geçerli kuru olmayan dövizli işlem kaydedilemez"
+
+
+def tl_tutar(satir="islemler", kur_zorunlu=False):
+    """islemler satırının TL karşılığı için SQL ifadesi
+    
+    Dövizli işlemler işlem tarihinde geçerli kurla çevrilir; kur
+    doviz_kurlari birincil anahtarında tek aramayla bulunur. Kur yoksa
+    ifade NULL olur; kur_zorunlu=True ise (yalnızca tetikleyicilerde)
+    KUR_YOK_MESAJI ile işlem durdurulur.
+    """
+    kur = (f"(SELECT dk.kur FROM doviz_kurlari dk WHERE dk.para_birimi = {satir}.para_birimi "
+           f"AND dk.gecerlilik_tarihi <= {satir}.tarih ORDER BY dk.gecerlilik_tarihi DESC LIMIT 1)")
+    if kur_zorunlu:
+        kur = f"COALESCE({kur}, RAISE(ABORT, '{KUR_YOK_MESAJI}'))"
+    return f"(CASE WHEN {satir}.para_birimi = 'TL' THEN {satir}.tutar ELSE ROUND({satir}.tutar * {kur}, 2) END)"
+
+
+def kursuz_islemler_sorgusu():
+    """Kuru bulunmayan canlı dövizli işlemleri (id, musteri_id, para_birimi, tarih) seçen SQL"""
+    return f'''
+        SELECT id, musteri_id, para_birimi, tarih FROM islemler
+        WHERE silinme_tarihi IS NULL AND para_birimi <> 'TL' AND {tl_tutar()} IS NULL
+    '''
+
+
+def bakiye_tetikleyicilerini_olustur(cursor):
+    """islemler tablosundaki her değişikliği musteri_bakiyeleri özetine yansıtan tetikleyicileri kurar"""
+    ekle = f'''
+        INSERT INTO musteri_bakiyeleri (musteri_id, borc, odeme)
+        SELECT NEW.musteri_id,
+               CASE WHEN NEW.islem_turu = 'BORÇ' THEN {tl_tutar("NEW", kur_zorunlu=True)} ELSE 0 END,
+               CASE WHEN NEW.islem_turu = 'ÖDEME' THEN {tl_tutar("NEW", kur_zorunlu=True)} ELSE 0 END
+        WHERE NEW.silinme_tarihi IS NULL
+        ON CONFLICT(musteri_id) DO UPDATE SET
+            borc = borc + excluded.borc,
+            odeme = odeme + excluded.odeme;
+    '''
+    cikar = f'''
+        UPDATE musteri_bakiyeleri SET
+            borc = borc - CASE WHEN OLD.islem_turu = 'BORÇ' THEN {tl_tutar("OLD", kur_zorunlu=True)} ELSE 0 END,
+            odeme = odeme - CASE WHEN OLD.islem_turu = 'ÖDEME' THEN {tl_tutar("OLD", kur_zorunlu=True)} ELSE 0 END
+        WHERE musteri_id = OLD.musteri_id AND OLD.silinme_tarihi IS NULL;
+    '''
+    tetikleyiciler = {
+        "ekle": f"AFTER INSERT ON islemler BEGIN {ekle} END",
+        "sil": f"AFTER DELETE ON islemler BEGIN {cikar} END",
+        "guncelle": (f"AFTER UPDATE OF musteri_id, tarih, tutar, islem_turu, para_birimi, silinme_tarihi "
+                     f"ON islemler BEGIN {cikar} {ekle} END"),
+    }
+    for ad, govde in tetikleyiciler.items():
+        cursor.execute(f"DROP TRIGGER IF EXISTS bakiye_{ad}")
+        cursor.execute(f"CREATE TRIGGER bakiye_{ad} {govde}")
+
+
+def bakiye_ozeti_sorgusu():
+    """Müşteri başına (musteri_id, borc, odeme) toplamlarını islemler tablosundan hesaplayan SQL"""
+    return f'''
+        SELECT musteri_id,
+               COALESCE(SUM(CASE WHEN islem_turu = 'BORÇ' THEN {tl_tutar()} END), 0) AS borc,
+               COALESCE(SUM(CASE WHEN islem_turu = 'ÖDEME' THEN {tl_tutar()} END), 0) AS odeme
+        FROM islemler
+        WHERE silinme_tarihi IS NULL
+        GROUP BY musteri_id
+    '''
+
+
+def bakiye_ozetini_doldur(cursor):
+    """musteri_bakiyeleri özetini islemler tablosundan baştan hesaplar
+    
+    Kuru olmayan dövizli işlem varsa tetikleyicilerle aynı kural gereği
+    hiçbir şey yazılmaz, sqlite3.IntegrityError fırlatılır.
+    """
+    cursor.execute(f"SELECT DISTINCT para_birimi FROM ({kursuz_islemler_sorgusu()}) ORDER BY para_birimi")
+    kursuzlar = [satir[0] for satir in cursor.fetchall()]
+    if kursuzlar:
+        raise sqlite3.IntegrityError(f"{KUR_YOK_MESAJI} ({', '.join(kursuzlar)})")
+    cursor.execute("DELETE FROM musteri_bakiyeleri")
+    cursor.execute(f"INSERT INTO musteri_bakiyeleri (musteri_id, borc, odeme) {bakiye_ozeti_sorgusu()}")
+
+
+def simdi_damgasi():
+    """Mezar taşları için mikrosaniye hassasiyetinde zaman damgası"""
+    return datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")
+
+
 # ============================================================================
 # MÜŞTERİ FONKSİYONLARI
 # ============================================================================
@@ -122,7 +684,7 @@ def musteri_ekle(ad, telefon="", not_alani=""):
     conn = veritabani_baglantisi()
     cursor = conn.cursor()
     cursor.execute(
-        "INSERT INTO musteriler (ad, telefon, not_alani) VALUES (?, ?, ?)",
+        f"INSERT INTO musteriler (ad, telefon, not_alani, uuid) VALUES (?, ?, ?, {YENI_UUID})",
         (ad.strip(), telefon.strip(), not_alani.strip())
     )
     conn.commit()
@@ -134,18 +696,29 @@ def musteri_listele():
     """Tüm müşterileri listeler"""
     conn = veritabani_baglantisi()
     cursor = conn.cursor()
-    cursor.execute("SELECT * FROM musteriler ORDER BY ad")
+    cursor.execute("SELECT * FROM musteriler WHERE silinme_tarihi IS NULL ORDER BY ad")
     musteriler = cursor.fetchall()
     conn.close()
     return musteriler
 
 
 def musteri_sil(musteri_id):
-    """Müşteriyi ve işlemlerini siler"""
+    """Müşteriyi ve işlemlerini siler (geri alınabilir)
+    
+    Kayıtlar fiziksel olarak silinmez; aynı zaman damgasıyla mezar taşı
+    olarak işaretlenir ve her biri denetim günlüğüne yazılır.
+    """
+    damga = simdi_damgasi()
     conn = veritabani_baglantisi()
     cursor = conn.cursor()
-    cursor.execute("DELETE FROM islemler WHERE musteri_id = ?", (musteri_id,))
-    cursor.execute("DELETE FROM musteriler WHERE id = ?", (musteri_id,))
+    cursor.execute(
+        "UPDATE islemler SET silinme_tarihi = ? WHERE musteri_id = ? AND silinme_tarihi IS NULL",
+        (damga, musteri_id)
+    )
+    cursor.execute(
+        "UPDATE musteriler SET silinme_tarihi = ? WHERE id = ? AND silinme_tarihi IS NULL",
+        (damga, musteri_id)
+    )
     conn.commit()
     conn.close()
 
@@ -155,50 +728,332 @@ def musteri_bakiye_hesapla(musteri_id):
     conn = veritabani_baglantisi()
     cursor = conn.cursor()
     
-    # Borç toplamı
+    # Borç ve ödeme toplamları bakiye özetinden okunur
     cursor.execute(
-        "SELECT COALESCE(SUM(tutar), 0) FROM islemler WHERE musteri_id = ? AND islem_turu = 'BORÇ'",
+        "SELECT ROUND(borc, 2), ROUND(odeme, 2) FROM musteri_bakiyeleri WHERE musteri_id = ?",
         (musteri_id,)
     )
-    borc_toplam = cursor.fetchone()[0]
-    
-    # Ödeme toplamı
-    cursor.execute(
-        "SELECT COALESCE(SUM(tutar), 0) FROM islemler WHERE musteri_id = ? AND islem_turu = 'ÖDEME'",
-        (musteri_id,)
-    )
-    odeme_toplam = cursor.fetchone()[0]
+    satir = cursor.fetchone()
+    borc_toplam, odeme_toplam = satir if satir is not None else (0, 0)
     
     conn.close()
     
     # Bakiye = Borç - Ödeme (pozitif = müşteri borçlu, negatif = biz borçluyuz)
-    return borc_toplam - odeme_toplam
+    return round(borc_toplam - odeme_toplam, 2)
+
+
+def musteri_ozetleri(sinir=None):
+    """Canlı müşterileri bakiyeleriyle birlikte tek sorguda listeler (ada göre sıralı)
+    
+    sinir verilirse yalnızca ilk sinir müşteri döner (açılıştaki ilk sayfa).
+    """
+    conn = veritabani_baglantisi()
+    cursor = conn.cursor()
+    cursor.execute('''
+        SELECT m.id, m.ad, m.telefon, m.not_alani,
+               ROUND(COALESCE(b.borc, 0) - COALESCE(b.odeme, 0), 2) AS bakiye
+        FROM musteriler m
+        LEFT JOIN musteri_bakiyeleri b ON b.musteri_id = m.id
+        WHERE m.silinme_tarihi IS NULL
+        ORDER BY m.ad
+        LIMIT ?
+    ''', (-1 if sinir is None else sinir,))
+    musteriler = cursor.fetchall()
+    conn.close()
+    return musteriler
+
+
+def musteri_ozeti(musteri_id):
+    """Tek müşterinin musteri_ozetleri satırı (yoksa veya silinmişse None)"""
+    conn = veritabani_baglantisi()
+    cursor = conn.cursor()
+    cursor.execute('''
+        SELECT m.id, m.ad, m.telefon, m.not_alani,
+               ROUND(COALESCE(b.borc, 0) - COALESCE(b.odeme, 0), 2) AS bakiye
+        FROM musteriler m
+        LEFT JOIN musteri_bakiyeleri b ON b.musteri_id = m.id
+        WHERE m.id = ? AND m.silinme_tarihi IS NULL
+    ''', (musteri_id,))
+    musteri = cursor.fetchone()
+    conn.close()
+    return musteri
+
+
+# Benzer müşteri aramasında ad benzerliği eşiği (difflib oranı, 0-1)
+BENZERLIK_ESIGI = 0.88
+# Bundan kalabalık bloklar ("ahmet" gibi çok yaygın anahtarlar) çift üretmez
+BENZER_BLOK_SINIRI = 200
+# Türkçe büyük/küçük harf dönüşümü ve ASCII karşılıklar ("YILMAZ", "Yılmaz", "Yilmaz" aynı olsun)
+_TURKCE_KUCUK_HARF = str.maketrans({"İ": "i", "I": "ı"})
+_ASCII_KARSILIK = str.maketrans("çğıöşüâîû", "cgiosuaiu")
+
+
+def isim_normallestir(ad):
+    """Müşteri adını karşılaştırma için sadeleştirir
+    
+    Parantez içi notlar atılır, Türkçe kurallarıyla küçültülür ve ASCII'ye
+    indirgenir: "AHMET YILMAZ", "Ahmet Yilmaz (bakkal)" -> "ahmet yilmaz"
+    """
+    ad = re.sub(r"\(.*?\)", " ", ad or "")
+    ad = ad.translate(_TURKCE_KUCUK_HARF).lower().translate(_ASCII_KARSILIK)
+    return " ".join(re.findall(r"[a-z0-9]+", ad))
+
+
+def telefon_normallestir(telefon):
+    """Telefonu son 10 hanesine indirger ("0532 111 22 33", "+90 532 1112233" -> "5321112233")"""
+    rakamlar = re.sub(r"\D", "", telefon or "")
+    return rakamlar[-10:] if len(rakamlar) >= 7 else ""
+
+
+def blok_anahtarlari(ad, telefon):
+    """Aynı kişi olabilecek kayıtların paylaştığı anahtarlar
+    
+    Yalnızca aynı anahtarı paylaşan kayıtlar karşılaştırılır, tüm çiftler
+    (n²) taranmaz. Anahtarlar: sırasız ad, ilk iki kelime, ilk kelime +
+    ikincinin ilk üç harfi (yazım hatası için) ve telefon.
+    """
+    kelimeler = ad.split()
+    anahtarlar = set()
+    if kelimeler:
+        anahtarlar.add("a:" + " ".join(sorted(kelimeler)))
+        anahtarlar.add("o:" + " ".join(kelimeler[:2]))
+        if len(kelimeler) > 1:
+            anahtarlar.add(f"p:{kelimeler[0]} {kelimeler[1][:3]}")
+    if telefon:
+        anahtarlar.add("t:" + telefon)
+    return anahtarlar
+
+
+def benzerlik_sebebi(birinci, ikinci, esik=BENZERLIK_ESIGI):
+    """İki (ad, telefon) normal biçimi aynı kişi gibi görünüyorsa sebebini, değilse None döndürür"""
+    (ad1, tel1), (ad2, tel2) = birinci, ikinci
+    if tel1 and tel1 == tel2:
+        return "aynı telefon"
+    if tel1 and tel2:
+        return None  # Farklı telefonlu aynı adlar ayrı kişiler sayılır
+    # "Ahmet 1" ile "Ahmet 2" gibi numarayla ayrılmış adlar
+    if {k for k in ad1.split() if k.isdigit()} != {k for k in ad2.split() if k.isdigit()}:
+        return None
+    if ad1 == ad2 or sorted(ad1.split()) == sorted(ad2.split()):
+        return "aynı ad"
+    kelimeler1, kelimeler2 = set(ad1.split()), set(ad2.split())
+    if len(kelimeler1 & kelimeler2) >= 2 and (kelimeler1 <= kelimeler2 or kelimeler2 <= kelimeler1):
+        return "ad diğerini içeriyor"
+    if difflib.SequenceMatcher(None, ad1, ad2).ratio() >= esik:
+        return "benzer ad"
+    return None
+
+
+def musteri_benzerleri(esik=BENZERLIK_ESIGI):
+    """Aynı kişi olabilecek canlı müşteri gruplarını döndürür
+    
+    Her grup {"sebepler": [...], "musteriler": [{id, ad, telefon, bakiye,
+    islem_sayisi}, ...]} sözlüğüdür; önerilen hedef (en çok işlemi olan)
+    listenin başındadır.
+    """
+    conn = veritabani_baglantisi()
+    cursor = conn.cursor()
+    cursor.execute('''
+        SELECT m.id, m.ad, m.telefon,
+               ROUND(COALESCE(b.borc, 0) - COALESCE(b.odeme, 0), 2) AS bakiye,
+               (SELECT COUNT(*) FROM islemler i WHERE i.musteri_id = m.id AND i.silinme_tarihi IS NULL) AS islem_sayisi
+        FROM musteriler m
+        LEFT JOIN musteri_bakiyeleri b ON b.musteri_id = m.id
+        WHERE m.silinme_tarihi IS NULL
+    ''')
+    musteriler = {satir['id']: dict(satir) for satir in cursor.fetchall()}
+    conn.close()
+    
+    normaller = {mid: (isim_normallestir(m['ad']), telefon_normallestir(m['telefon'])) for mid, m in musteriler.items()}
+    bloklar = {}
+    for mid, (ad, telefon) in normaller.items():
+        for anahtar in blok_anahtarlari(ad, telefon):
+            bloklar.setdefault(anahtar, []).append(mid)
+    
+    # Eşleşen çiftler birleşim-bul (union-find) ile gruplanır; farklı
+    # telefonlu iki kişi telefonsuz bir ortak kayıt üzerinden birleşmesin
+    ust = {}
+    telefonlar = {mid: {telefon} - {""} for mid, (_, telefon) in normaller.items()}
+    
+    def kok(mid):
+        while ust.get(mid, mid) != mid:
+            mid = ust[mid]
+        return mid
+    
+    sebepler = {}
+    denenen = set()
+    for anahtar, uyeler in bloklar.items():
+        if len(uyeler) < 2 or len(uyeler) > BENZER_BLOK_SINIRI:
+            continue
+        if anahtar.startswith("t:"):
+            # Hepsi aynı telefonda; zincir halinde bağlamak yeter
+            ciftler = zip(uyeler, uyeler[1:])
+        else:
+            # Farklı telefonlu iki kayıt zaten eşleşmez; telefonsuzlar herkesle denenir
+            telefonsuz = [mid for mid in uyeler if not normaller[mid][1]]
+            ciftler = itertools.chain(
+                itertools.combinations(telefonsuz, 2),
+                ((birinci, ikinci) for birinci in telefonsuz for ikinci in uyeler if normaller[ikinci][1]),
+            )
+        for birinci, ikinci in ciftler:
+            cift = (min(birinci, ikinci), max(birinci, ikinci))
+            if cift in denenen:
+                continue
+            denenen.add(cift)
+            sebep = benzerlik_sebebi(normaller[birinci], normaller[ikinci], esik)
+            if not sebep:
+                continue
+            kok1, kok2 = kok(birinci), kok(ikinci)
+            if kok1 != kok2:
+                if telefonlar[kok1] and telefonlar[kok2] and telefonlar[kok1].isdisjoint(telefonlar[kok2]):
+                    continue
+                ust[kok1] = kok1
+                ust[kok2] = kok1
+                telefonlar[kok1] |= telefonlar[kok2]
+            sebepler.setdefault(cift, sebep)
+    
+    gruplar = {}
+    for mid in ust:
+        gruplar.setdefault(kok(mid), set()).add(mid)
+    sonuc = []
+    for uyeler in gruplar.values():
+        uyeler = sorted((musteriler[mid] for mid in uyeler), key=lambda m: (-m['islem_sayisi'], m['id']))
+        idler = {m['id'] for m in uyeler}
+        sonuc.append({
+            "sebepler": sorted({sebep for (a, b), sebep in sebepler.items() if a in idler}),
+            "musteriler": uyeler,
+        })
+    sonuc.sort(key=lambda grup: (-len(grup["musteriler"]), grup["musteriler"][0]['ad']))
+    return sonuc
+
+
+def musteri_birlestir(hedef_id, kaynak_idler):
+    """Kaynak müşterileri hedef müşteride tek veritabanı işleminde birleştirir
+    
+    Kaynakların tüm işlemleri (silinmişler ve arşivdekiler dahil) hedefe
+    taşınır; bakiye özeti tetikleyicilerle güncellenir. Hedefin boş
+    telefon/not alanları kaynaklardan doldurulur, kaynaklar silinir.
+    Taşınan her işlem denetim günlüğüne yazılır (şube eşitlemesi de
+    değişikliği buradan bulur).
+    """
+    hedef_id = int(hedef_id)
+    kaynak_idler = sorted({int(k) for k in kaynak_idler} - {hedef_id})
+    if not kaynak_idler:
+        return False, "Birleştirilecek müşteri seçin!"
+    yer = ", ".join("?" * len(kaynak_idler))
+    
+    conn = veritabani_baglantisi()
+    cursor = conn.cursor()
+    cursor.execute(f"SELECT * FROM musteriler WHERE id IN (?, {yer}) AND silinme_tarihi IS NULL",
+                   (hedef_id, *kaynak_idler))
+    musteriler = {satir['id']: satir for satir in cursor.fetchall()}
+    if len(musteriler) != len(kaynak_idler) + 1:
+        conn.close()
+        return False, "Müşteri bulunamadı!"
+    hedef = musteriler[hedef_id]
+    
+    try:
+        cursor.execute(f'''
+            INSERT INTO denetim_gunlugu (tablo, kayit_id, eylem, veri)
+            SELECT 'islemler', id, 'BİRLEŞTİR', json_object('musteri_id', ?, 'eski_musteri_id', musteri_id)
+            FROM islemler WHERE musteri_id IN ({yer})
+        ''', (hedef_id, *kaynak_idler))
+        cursor.execute(f"UPDATE islemler SET musteri_id = ? WHERE musteri_id IN ({yer})", (hedef_id, *kaynak_idler))
+        tasinan = cursor.rowcount
+        if arsiv_mevcut_mu():
+            arsivi_bagla(conn)
+            cursor.execute("SELECT 1 FROM arsiv.sqlite_master WHERE type = 'table' AND name = 'islemler'")
+            if cursor.fetchone():
+                cursor.execute(f"UPDATE arsiv.islemler SET musteri_id = ? WHERE musteri_id IN ({yer})",
+                               (hedef_id, *kaynak_idler))
+        
+        guncellenen = {}
+        for alan in ("telefon", "not_alani"):
+            if not (hedef[alan] or "").strip():
+                deger = next((musteriler[k][alan] for k in kaynak_idler if (musteriler[k][alan] or "").strip()), None)
+                if deger:
+                    guncellenen[alan] = deger
+        if guncellenen:
+            cursor.execute(f"UPDATE musteriler SET {', '.join(f'{alan} = ?' for alan in guncellenen)} WHERE id = ?",
+                           (*guncellenen.values(), hedef_id))
+        cursor.execute(
+            "INSERT INTO denetim_gunlugu (tablo, kayit_id, eylem, veri) VALUES ('musteriler', ?, 'BİRLEŞTİR', ?)",
+            (hedef_id, json.dumps({"birlesen": kaynak_idler, **guncellenen}, ensure_ascii=False))
+        )
+        cursor.execute(f"UPDATE musteriler SET silinme_tarihi = ? WHERE id IN ({yer})", (simdi_damgasi(), *kaynak_idler))
+        # Kaynakların işlemi kalmadı; özet satırları (kuruş altı artıklarıyla) atılır
+        cursor.execute(f"DELETE FROM musteri_bakiyeleri WHERE musteri_id IN ({yer})", kaynak_idler)
+        conn.commit()
+    except sqlite3.Error as e:
+        conn.rollback()
+        conn.close()
+        if kilit_hatasi_mi(e):
+            raise  # yazma_islemi yeniden dener
+        return False, f"Birleştirme yapılamadı: {e}"
+    
+    conn.close()
+    return True, f"{len(kaynak_idler)} müşteri \"{hedef['ad']}\" altında birleştirildi, {tasinan} işlem taşındı."
 
 
 # ============================================================================
 # İŞLEM FONKSİYONLARI
 # ============================================================================
 
-def islem_ekle(musteri_id, tarih, aciklama, tutar, islem_turu):
-    """Yeni işlem ekler"""
+def islem_ekle(musteri_id, tarih, aciklama, tutar, islem_turu, kategori_id=None, etiketler=None, vade=None,
+               para_birimi="TL", miktar=None, birim_fiyat=None):
+    """Yeni işlem ekler
+    
+    İsteğe bağlı: kategori, etiketler, borçlar için vade, para birimi
+    (kuru tanımlı olmalı) ve miktar x birim fiyat (verilirse tutar
+    bunlardan hesaplanır).
+    """
     # Tarih doğrulama
     tarih_gecerli, tarih_sonuc = tarih_dogrula(tarih)
     if not tarih_gecerli:
         return False, tarih_sonuc
     
-    try:
-        tutar = float(tutar)
-        if tutar <= 0:
-            return False, "Tutar sıfırdan büyük olmalı!"
-    except ValueError:
-        return False, "Geçerli bir tutar girin!"
+    if miktar or birim_fiyat:
+        miktar_gecerli, miktar = tutar_dogrula(miktar)
+        fiyat_gecerli, birim_fiyat = tutar_dogrula(birim_fiyat)
+        if not miktar_gecerli or not fiyat_gecerli:
+            return False, "Miktar ve birim fiyat birlikte, geçerli sayılar olarak girilmeli!"
+        tutar = round(miktar * birim_fiyat, 2)
+    else:
+        miktar = birim_fiyat = None
+    
+    tutar_gecerli, tutar = tutar_dogrula(tutar)
+    if not tutar_gecerli:
+        return False, tutar
+    
+    para_birimi = (para_birimi or "TL").strip().upper()
+    if para_birimi != "TL" and kur_getir(para_birimi, tarih_sonuc) is None:
+        return False, f"{tarih_sonuc} tarihinde geçerli {para_birimi} kuru yok. Önce kur girin!"
+    
+    if vade:
+        if islem_turu != "BORÇ":
+            return False, "Vade yalnızca borç işlemlerine verilebilir!"
+        vade_gecerli, vade = tarih_dogrula(vade)
+        if not vade_gecerli:
+            return False, f"Vade: {vade}"
+        if vade < tarih_sonuc:
+            return False, "Vade tarihi işlem tarihinden önce olamaz!"
+    else:
+        vade = None
     
     conn = veritabani_baglantisi()
     cursor = conn.cursor()
-    cursor.execute(
-        "INSERT INTO islemler (musteri_id, tarih, aciklama, tutar, islem_turu) VALUES (?, ?, ?, ?, ?)",
-        (musteri_id, tarih_sonuc, aciklama.strip(), tutar, islem_turu)
-    )
+    try:
+        cursor.execute(
+            "INSERT INTO islemler (musteri_id, tarih, aciklama, tutar, islem_turu, kategori_id, vade, "
+            f"para_birimi, miktar, birim_fiyat, uuid) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, {YENI_UUID})",
+            (musteri_id, tarih_sonuc, aciklama.strip(), tutar, islem_turu, kategori_id or None, vade,
+             para_birimi, miktar, birim_fiyat)
+        )
+    except sqlite3.IntegrityError:
+        conn.close()
+        return False, "Müşteri veya kategori bulunamadı!"
+    if etiketler:
+        etiketleri_bagla(cursor, "islemler", cursor.lastrowid, etiketler)
     conn.commit()
     conn.close()
     return True, "İşlem kaydedildi."
@@ -209,7 +1064,8 @@ def islem_listele(musteri_id):
     conn = veritabani_baglantisi()
     cursor = conn.cursor()
     cursor.execute(
-        "SELECT * FROM islemler WHERE musteri_id = ? ORDER BY tarih DESC, id DESC",
+        f"SELECT *, {tl_tutar()} AS tutar_tl FROM islemler "
+        f"WHERE musteri_id = ? AND silinme_tarihi IS NULL ORDER BY tarih DESC, id DESC",
         (musteri_id,)
     )
     islemler = cursor.fetchall()
@@ -217,57 +1073,247 @@ def islem_listele(musteri_id):
     return islemler
 
 
-def islem_sil(islem_id):
-    """İşlemi siler"""
-    conn = veritabani_baglantisi()
-    cursor = conn.cursor()
-    cursor.execute("DELETE FROM islemler WHERE id = ?", (islem_id,))
-    conn.commit()
-    conn.close()
+EKSTRE_SAYFA_BOYUTU = 100
 
 
-def genel_borc_ozeti():
-    """Tüm müşterilerin genel borç özetini döndürür"""
+def musteri_ekstresi(musteri_id, baslangic=None, bitis=None, imlec=None, sayfa_boyutu=EKSTRE_SAYFA_BOYUTU):
+    """Müşteri ekstresi: tarih aralığındaki işlemler, devir ve dönem sonu bakiyesi
+    
+    İşlemler (tarih, id) sırasıyla yeniden eskiye sayfa sayfa döner; bir
+    sonraki sayfa için dönen imleç (tarih, id) aynen geri verilir.
+    Sonuç: (devir, donem_sonu, islemler, sonraki_imlec). Son sayfada
+    sonraki_imlec None olur.
+    """
     conn = veritabani_baglantisi()
     cursor = conn.cursor()
     
-    # Toplam borç
-    cursor.execute("SELECT COALESCE(SUM(tutar), 0) FROM islemler WHERE islem_turu = 'BORÇ'")
-    toplam_borc = cursor.fetchone()[0]
+    # Devir ve dönem sonu bakiyesi tek bir indeksli toplamla hesaplanır
+    cursor.execute(f'''
+        SELECT
+            COALESCE(SUM(CASE WHEN ? IS NOT NULL AND tarih < ? THEN
+                CASE WHEN islem_turu = 'BORÇ' THEN {tl_tutar()} ELSE -{tl_tutar()} END END), 0),
+            COALESCE(SUM(CASE WHEN islem_turu = 'BORÇ' THEN {tl_tutar()} ELSE -{tl_tutar()} END), 0)
+        FROM islemler
+        WHERE musteri_id = ? AND silinme_tarihi IS NULL AND (? IS NULL OR tarih <= ?)
+    ''', (baslangic, baslangic, musteri_id, bitis, bitis))
+    devir, donem_sonu = cursor.fetchone()
     
-    # Toplam ödeme
-    cursor.execute("SELECT COALESCE(SUM(tutar), 0) FROM islemler WHERE islem_turu = 'ÖDEME'")
-    toplam_odeme = cursor.fetchone()[0]
+    kosullar = ["musteri_id = ?", "silinme_tarihi IS NULL"]
+    parametreler = [musteri_id]
+    if baslangic:
+        kosullar.append("tarih >= ?")
+        parametreler.append(baslangic)
+    if bitis:
+        kosullar.append("tarih <= ?")
+        parametreler.append(bitis)
+    if imlec:
+        kosullar.append("(tarih, id) < (?, ?)")
+        parametreler.extend(imlec)
     
+    cursor.execute(
+        f"SELECT *, {tl_tutar()} AS tutar_tl FROM islemler "
+        f"WHERE {' AND '.join(kosullar)} ORDER BY tarih DESC, id DESC LIMIT ?",
+        parametreler + [sayfa_boyutu + 1]
+    )
+    islemler = cursor.fetchall()
     conn.close()
     
-    return toplam_borc, toplam_odeme, toplam_borc - toplam_odeme
+    sonraki_imlec = None
+    if len(islemler) > sayfa_boyutu:
+        islemler = islemler[:sayfa_boyutu]
+        sonraki_imlec = (islemler[-1]['tarih'], islemler[-1]['id'])
+    
+    return round(devir, 2), round(donem_sonu, 2), islemler, sonraki_imlec
 
 
-# ============================================================================
-# KASA FONKSİYONLARI
-# ============================================================================
+def islem_sil(islem_id):
+    """İşlemi siler (geri alınabilir)"""
+    conn = veritabani_baglantisi()
+    cursor = conn.cursor()
+    cursor.execute(
+        "UPDATE islemler SET silinme_tarihi = ? WHERE id = ? AND silinme_tarihi IS NULL",
+        (simdi_damgasi(), islem_id)
+    )
+    conn.commit()
+    conn.close()
+
+
+def genel_borc_ozeti():
+    """Tüm müşterilerin genel borç özetini döndürür"""
+    conn = veritabani_baglantisi()
+    cursor = conn.cursor()
+    
+    # Toplam borç ve ödeme (bakiye özetinden)
+    cursor.execute("SELECT ROUND(COALESCE(SUM(borc), 0), 2), ROUND(COALESCE(SUM(odeme), 0), 2) FROM musteri_bakiyeleri")
+    toplam_borc, toplam_odeme = cursor.fetchone()
+    
+    conn.close()
+    
+    return toplam_borc, toplam_odeme, round(toplam_borc - toplam_odeme, 2)
+
+
+# Gecikme panelinin yenilenme aralığı
+VADE_KONTROL_ARALIGI_MS = 5 * 60 * 1000
+
+
+def gecikmis_borclar(bugun=None):
+    """Vadesi geçmiş borcu olan müşterileri gecikmiş tutara göre listeler
+    
+    Ödemeler önce vadeli borçlardan düşülür: gecikmiş = vadesi geçen
+    borçlar - toplam ödeme (sıfırın altına inmez). Vadesi geçen borçlar
+    vade indeksinden, ödemeler bakiye özetinden okunur; işlem geçmişi
+    taranmaz.
+    Satırlar: musteri_id, ad, telefon, gecikmis, en_eski_vade, gun
+    """
+    bugun = bugun or date.today().strftime("%Y-%m-%d")
+    conn = veritabani_baglantisi()
+    cursor = conn.cursor()
+    cursor.execute(f'''
+        SELECT m.id AS musteri_id, m.ad, m.telefon,
+               ROUND(v.vadesi_gecen - COALESCE(b.odeme, 0), 2) AS gecikmis,
+               v.en_eski_vade,
+               CAST(julianday(?) - julianday(v.en_eski_vade) AS INTEGER) AS gun
+        FROM (
+            SELECT musteri_id, SUM({tl_tutar()}) AS vadesi_gecen, MIN(vade) AS en_eski_vade
+            FROM islemler
+            WHERE vade IS NOT NULL AND vade < ? AND islem_turu = 'BORÇ' AND silinme_tarihi IS NULL
+            GROUP BY musteri_id
+        ) v
+        JOIN musteriler m ON m.id = v.musteri_id AND m.silinme_tarihi IS NULL
+        LEFT JOIN musteri_bakiyeleri b ON b.musteri_id = v.musteri_id
+        WHERE ROUND(v.vadesi_gecen - COALESCE(b.odeme, 0), 2) > 0
+        ORDER BY gecikmis DESC
+    ''', (bugun, bugun))
+    borclar = cursor.fetchall()
+    conn.close()
+    return borclar
+
+
+def musteri_doviz_bakiyesi(musteri_id):
+    """Müşterinin TL dışındaki para birimlerindeki bakiyeleri (kendi biriminde)"""
+    conn = veritabani_baglantisi()
+    cursor = conn.cursor()
+    cursor.execute('''
+        SELECT para_birimi,
+               ROUND(SUM(CASE WHEN islem_turu = 'BORÇ' THEN tutar ELSE -tutar END), 2) AS bakiye
+        FROM islemler
+        WHERE musteri_id = ? AND para_birimi <> 'TL' AND silinme_tarihi IS NULL
+        GROUP BY para_birimi
+        HAVING bakiye <> 0
+    ''', (musteri_id,))
+    bakiyeler = cursor.fetchall()
+    conn.close()
+    return bakiyeler
+
+
+# ============================================================================
+# DÖVİZ KURLARI
+# ============================================================================
+
+# Seçim kutularında önerilen para birimleri (kuru girilen her kod kullanılabilir)
+PARA_BIRIMLERI = ("TL", "USD", "EUR")
+
+
+def kur_ekle(para_birimi, gecerlilik_tarihi, kur):
+    """Kur ekler veya günceller; etkilenen bakiyeler aynı işlemde yeniden hesaplanır"""
+    para_birimi = (para_birimi or "").strip().upper()
+    if not re.fullmatch(r"[A-Z]{3}", para_birimi) or para_birimi == "TL":
+        return False, "Geçerli bir para birimi kodu girin (örn. USD)!"
+    tarih_gecerli, gecerlilik_tarihi = tarih_dogrula(gecerlilik_tarihi)
+    if not tarih_gecerli:
+        return False, gecerlilik_tarihi
+    kur_gecerli, kur = tutar_dogrula(kur)
+    if not kur_gecerli:
+        return False, "Geçerli bir kur girin!"
+    
+    conn = veritabani_baglantisi()
+    try:
+        with conn:
+            conn.execute('''
+                INSERT INTO doviz_kurlari (para_birimi, gecerlilik_tarihi, kur) VALUES (?, ?, ?)
+                ON CONFLICT(para_birimi, gecerlilik_tarihi) DO UPDATE SET kur = excluded.kur
+            ''', (para_birimi, gecerlilik_tarihi, kur))
+            # Bu tarihten sonraki işlemlerin TL karşılığı değişmiş olabilir
+            etkilenen = conn.execute(
+                "SELECT 1 FROM islemler WHERE para_birimi = ? AND tarih >= ? LIMIT 1",
+                (para_birimi, gecerlilik_tarihi)
+            ).fetchone()
+            if etkilenen:
+                bakiye_ozetini_doldur(conn.cursor())
+    except sqlite3.IntegrityError as e:
+        return False, str(e)
+    finally:
+        conn.close()
+    return True, "Kur kaydedildi."
+
+
+def kur_getir(para_birimi, tarih):
+    """Verilen tarihte geçerli kur (yoksa None)"""
+    if para_birimi == "TL":
+        return 1.0
+    conn = veritabani_baglantisi()
+    cursor = conn.cursor()
+    cursor.execute(
+        "SELECT kur FROM doviz_kurlari WHERE para_birimi = ? AND gecerlilik_tarihi <= ? "
+        "ORDER BY gecerlilik_tarihi DESC LIMIT 1",
+        (para_birimi, tarih)
+    )
+    satir = cursor.fetchone()
+    conn.close()
+    return satir[0] if satir else None
+
+
+def kur_listele(para_birimi=None):
+    """Kurları yeniden eskiye listeler"""
+    conn = veritabani_baglantisi()
+    cursor = conn.cursor()
+    cursor.execute(
+        "SELECT * FROM doviz_kurlari WHERE ? IS NULL OR para_birimi = ? "
+        "ORDER BY gecerlilik_tarihi DESC, para_birimi",
+        (para_birimi, para_birimi)
+    )
+    kurlar = cursor.fetchall()
+    conn.close()
+    return kurlar
+
+
+def tutar_metni(islem):
+    """Borç/alacak tutarını gösterim için biçimler (dövizlilerde TL karşılığıyla)"""
+    metin = f"{islem['tutar']:.2f} {islem['para_birimi']}"
+    if islem['para_birimi'] != "TL":
+        metin += f" ({islem['tutar_tl']:.2f} TL)"
+    if islem['miktar']:
+        metin += f" [{islem['miktar']:g} x {islem['birim_fiyat']:.2f}]"
+    return metin
+
+
+# ============================================================================
+# KASA FONKSİYONLARI
+# ============================================================================
 
-def kasa_islem_ekle(tarih, aciklama, tutar, islem_turu):
-    """Kasa işlemi ekler (CİRO veya GİDER)"""
+def kasa_islem_ekle(tarih, aciklama, tutar, islem_turu, kategori_id=None, etiketler=None):
+    """Kasa işlemi ekler (CİRO veya GİDER; isteğe bağlı kategori ve etiketlerle)"""
     # Tarih doğrulama
     tarih_gecerli, tarih_sonuc = tarih_dogrula(tarih)
     if not tarih_gecerli:
         return False, tarih_sonuc
     
-    try:
-        tutar = float(tutar)
-        if tutar <= 0:
-            return False, "Tutar sıfırdan büyük olmalı!"
-    except ValueError:
-        return False, "Geçerli bir tutar girin!"
+    tutar_gecerli, tutar = tutar_dogrula(tutar)
+    if not tutar_gecerli:
+        return False, tutar
+    
+    kapanis = kapali_donem_sonu()
+    if kapanis is not None and int(tarih_sonuc[:4]) <= kapanis:
+        return False, f"{kapanis} ve önceki yıllar kapatılmış. Bu tarihe kasa işlemi eklenemez!"
     
     conn = veritabani_baglantisi()
     cursor = conn.cursor()
     cursor.execute(
-        "INSERT INTO kasa (tarih, aciklama, tutar, islem_turu) VALUES (?, ?, ?, ?)",
-        (tarih_sonuc, aciklama.strip(), tutar, islem_turu)
+        f"INSERT INTO kasa (tarih, aciklama, tutar, islem_turu, kategori_id, uuid) VALUES (?, ?, ?, ?, ?, {YENI_UUID})",
+        (tarih_sonuc, aciklama.strip(), tutar, islem_turu, kategori_id or None)
     )
+    if etiketler:
+        etiketleri_bagla(cursor, "kasa", cursor.lastrowid, etiketler)
     conn.commit()
     conn.close()
     return True, "Kasa işlemi kaydedildi."
@@ -275,19 +1321,26 @@ def kasa_islem_ekle(tarih, aciklama, tutar, islem_turu):
 
 def kasa_gunluk_ozet(tarih):
     """Belirli bir günün kasa özetini döndürür"""
+    # Kolon görüntüsü açıksa önek toplamlarından
+    toplamlar = kolon_goruntusuyle("kasa", lambda goruntu: goruntu.toplamlar(
+        tarih, (date.fromisoformat(tarih) + timedelta(days=1)).isoformat()))
+    if toplamlar is not None:
+        (ciro, _), (gider, _) = toplamlar
+        return ciro / 100, gider / 100, (ciro - gider) / 100
+    
     conn = veritabani_baglantisi()
     cursor = conn.cursor()
     
     # Günlük ciro
     cursor.execute(
-        "SELECT COALESCE(SUM(tutar), 0) FROM kasa WHERE tarih = ? AND islem_turu = 'CİRO'",
+        "SELECT COALESCE(SUM(tutar), 0) FROM kasa WHERE tarih = ? AND islem_turu = 'CİRO' AND silinme_tarihi IS NULL",
         (tarih,)
     )
     ciro = cursor.fetchone()[0]
     
     # Günlük gider
     cursor.execute(
-        "SELECT COALESCE(SUM(tutar), 0) FROM kasa WHERE tarih = ? AND islem_turu = 'GİDER'",
+        "SELECT COALESCE(SUM(tutar), 0) FROM kasa WHERE tarih = ? AND islem_turu = 'GİDER' AND silinme_tarihi IS NULL",
         (tarih,)
     )
     gider = cursor.fetchone()[0]
@@ -297,27 +1350,41 @@ def kasa_gunluk_ozet(tarih):
     return ciro, gider, ciro - gider
 
 
-def kasa_aylik_ozet(yil, ay):
-    """Belirli bir ayın kasa özetini döndürür"""
+def ay_araligi(yil, ay):
+    """Ayın başlangıç tarihini ve bir sonraki ayın ilk gününü döndürür"""
     ay_baslangic = f"{yil}-{ay:02d}-01"
     if ay == 12:
         ay_bitis = f"{yil + 1}-01-01"
     else:
         ay_bitis = f"{yil}-{ay + 1:02d}-01"
+    return ay_baslangic, ay_bitis
+
+
+def kasa_aylik_ozet(yil, ay):
+    """Belirli bir ayın kasa özetini döndürür (kapanmış aylar arşivden okunur)"""
+    ay_baslangic, ay_bitis = ay_araligi(yil, ay)
+    
+    # Kolon görüntüsü açıksa önek toplamlarından (görüntü kapanmış yılları içermez)
+    toplamlar = kolon_goruntusuyle("kasa", lambda goruntu: (
+        None if yil <= goruntu.kapanis else goruntu.toplamlar(ay_baslangic, ay_bitis)))
+    if toplamlar is not None:
+        (ciro, _), (gider, _) = toplamlar
+        return ciro / 100, gider / 100, (ciro - gider) / 100
     
     conn = veritabani_baglantisi()
     cursor = conn.cursor()
+    tablo = kasa_kaynagi(conn, yil)
     
     # Aylık ciro
     cursor.execute(
-        "SELECT COALESCE(SUM(tutar), 0) FROM kasa WHERE tarih >= ? AND tarih < ? AND islem_turu = 'CİRO'",
+        f"SELECT COALESCE(SUM(tutar), 0) FROM {tablo} WHERE tarih >= ? AND tarih < ? AND islem_turu = 'CİRO' AND silinme_tarihi IS NULL",
         (ay_baslangic, ay_bitis)
     )
     ciro = cursor.fetchone()[0]
     
     # Aylık gider
     cursor.execute(
-        "SELECT COALESCE(SUM(tutar), 0) FROM kasa WHERE tarih >= ? AND tarih < ? AND islem_turu = 'GİDER'",
+        f"SELECT COALESCE(SUM(tutar), 0) FROM {tablo} WHERE tarih >= ? AND tarih < ? AND islem_turu = 'GİDER' AND silinme_tarihi IS NULL",
         (ay_baslangic, ay_bitis)
     )
     gider = cursor.fetchone()[0]
@@ -334,333 +1401,3986 @@ def kasa_islem_listele(tarih=None):
     
     if tarih:
         cursor.execute(
-            "SELECT * FROM kasa WHERE tarih = ? ORDER BY id DESC",
+            "SELECT * FROM kasa WHERE tarih = ? AND silinme_tarihi IS NULL ORDER BY id DESC",
             (tarih,)
         )
     else:
-        cursor.execute("SELECT * FROM kasa ORDER BY tarih DESC, id DESC")
+        cursor.execute("SELECT * FROM kasa WHERE silinme_tarihi IS NULL ORDER BY tarih DESC, id DESC")
+    
+    islemler = cursor.fetchall()
+    conn.close()
+    return islemler
+
+
+def kasa_ay_islemleri(yil, ay):
+    """Bir aya ait kasa işlemlerini listeler (kapanmış aylar arşivden okunur)"""
+    ay_baslangic, ay_bitis = ay_araligi(yil, ay)
     
+    conn = veritabani_baglantisi()
+    cursor = conn.cursor()
+    tablo = kasa_kaynagi(conn, yil)
+    cursor.execute(
+        f"SELECT * FROM {tablo} WHERE tarih >= ? AND tarih < ? AND silinme_tarihi IS NULL "
+        f"ORDER BY tarih DESC, id DESC",
+        (ay_baslangic, ay_bitis)
+    )
     islemler = cursor.fetchall()
     conn.close()
     return islemler
 
 
+def kasa_toplam_ozet():
+    """Tüm zamanların kasa özetini döndürür (kapanan dönemlerin devri dahil)"""
+    toplamlar = kolon_goruntusuyle("kasa", lambda goruntu: [
+        kurus + devir for (kurus, _), devir in zip(goruntu.toplamlar(), goruntu.devir)])
+    if toplamlar is not None:
+        ciro, gider = toplamlar
+        return ciro / 100, gider / 100, (ciro - gider) / 100
+    
+    conn = veritabani_baglantisi()
+    cursor = conn.cursor()
+    cursor.execute('''
+        SELECT
+            COALESCE(SUM(CASE WHEN islem_turu = 'CİRO' THEN tutar END), 0),
+            COALESCE(SUM(CASE WHEN islem_turu = 'GİDER' THEN tutar END), 0)
+        FROM kasa WHERE silinme_tarihi IS NULL
+    ''')
+    ciro, gider = cursor.fetchone()
+    cursor.execute("SELECT COALESCE(SUM(ciro), 0), COALESCE(SUM(gider), 0) FROM kapanan_donemler")
+    devir_ciro, devir_gider = cursor.fetchone()
+    conn.close()
+    
+    ciro += devir_ciro
+    gider += devir_gider
+    return ciro, gider, ciro - gider
+
+
 def kasa_islem_sil(islem_id):
-    """Kasa işlemini siler"""
+    """Kasa işlemini siler (geri alınabilir)"""
     conn = veritabani_baglantisi()
     cursor = conn.cursor()
-    cursor.execute("DELETE FROM kasa WHERE id = ?", (islem_id,))
+    cursor.execute(
+        "UPDATE kasa SET silinme_tarihi = ? WHERE id = ? AND silinme_tarihi IS NULL",
+        (simdi_damgasi(), islem_id)
+    )
     conn.commit()
     conn.close()
 
 
 # ============================================================================
-# RAPOR FONKSİYONLARI
+# TEKRARLAYAN KASA İŞLEMLERİ
 # ============================================================================
 
-def borc_raporu_olustur():
-    """Borç-alacak raporunu metin olarak oluşturur"""
-    rapor = []
-    rapor.append("=" * 60)
-    rapor.append("BORÇ - ALACAK RAPORU")
-    rapor.append(f"Rapor Tarihi: {datetime.now().strftime('%d.%m.%Y %H:%M')}")
-    rapor.append("=" * 60)
-    rapor.append("")
-    
-    musteriler = musteri_listele()
-    toplam_bakiye = 0
-    
-    for musteri in musteriler:
-        bakiye = musteri_bakiye_hesapla(musteri['id'])
-        toplam_bakiye += bakiye
-        
-        if bakiye != 0:
-            durum = "BORÇLU" if bakiye > 0 else "ALACAKLI"
-            rapor.append(f"Müşteri: {musteri['ad']}")
-            if musteri['telefon']:
-                rapor.append(f"Telefon: {musteri['telefon']}")
-            rapor.append(f"Bakiye: {abs(bakiye):.2f} TL ({durum})")
-            rapor.append("-" * 40)
-            
-            # İşlem detayları
-            islemler = islem_listele(musteri['id'])
-            for islem in islemler:
-                rapor.append(f"  {islem['tarih']} - {islem['islem_turu']}: {islem['tutar']:.2f} TL")
-                if islem['aciklama']:
-                    rapor.append(f"    Açıklama: {islem['aciklama']}")
-            rapor.append("")
-    
-    rapor.append("=" * 60)
-    if toplam_bakiye > 0:
-        rapor.append(f"GENEL TOPLAM: {toplam_bakiye:.2f} TL (Alacağınız var)")
-    elif toplam_bakiye < 0:
-        rapor.append(f"GENEL TOPLAM: {abs(toplam_bakiye):.2f} TL (Borcunuz var)")
-    else:
-        rapor.append("GENEL TOPLAM: 0.00 TL (Dengede)")
-    rapor.append("=" * 60)
-    
-    return "\n".join(rapor)
+TEKRAR_SIKLIKLARI = ("GÜNLÜK", "HAFTALIK", "AYLIK", "YILLIK")
 
+# Program açıkken vadesi gelen satırların kontrol aralığı
+TEKRAR_KONTROL_ARALIGI_MS = 60 * 60 * 1000
 
-def kasa_raporu_olustur(yil=None, ay=None):
-    """Kasa raporunu metin olarak oluşturur"""
-    rapor = []
-    rapor.append("=" * 60)
+
+def tekrar_tarihi(baslangic, siklik, sira):
+    """Tanımın sira'ncı (0'dan başlar) tekrar tarihi; ay sonları kırpılır (31 Ocak -> 28 Şubat)"""
+    if siklik == "GÜNLÜK":
+        return baslangic + timedelta(days=sira)
+    if siklik == "HAFTALIK":
+        return baslangic + timedelta(weeks=sira)
+    aylar = sira if siklik == "AYLIK" else 12 * sira
+    yil, ay = divmod(baslangic.month - 1 + aylar, 12)
+    yil += baslangic.year
+    gun = min(baslangic.day, calendar.monthrange(yil, ay + 1)[1])
+    return date(yil, ay + 1, gun)
+
+
+def vadesi_gelen_tarihler(baslangic, siklik, sonra, kadar):
+    """sonra < tarih <= kadar aralığına düşen tekrar tarihleri
     
-    if yil and ay:
-        rapor.append(f"KASA RAPORU - {ay:02d}/{yil}")
-        ciro, gider, net = kasa_aylik_ozet(yil, ay)
+    Baştan saymak yerine ilk adayın sırası doğrudan hesaplanır; haftalarca
+    kapalı kalan bir makinede de yalnızca eksik günler üretilir.
+    """
+    if sonra is None or sonra < baslangic:
+        sira = 0
+    elif siklik in ("GÜNLÜK", "HAFTALIK"):
+        adim = 1 if siklik == "GÜNLÜK" else 7
+        sira = (sonra - baslangic).days // adim
     else:
-        rapor.append("KASA RAPORU - TÜM ZAMANLAR")
-        conn = veritabani_baglantisi()
-        cursor = conn.cursor()
-        cursor.execute("SELECT COALESCE(SUM(tutar), 0) FROM kasa WHERE islem_turu = 'CİRO'")
-        ciro = cursor.fetchone()[0]
-        cursor.execute("SELECT COALESCE(SUM(tutar), 0) FROM kasa WHERE islem_turu = 'GİDER'")
-        gider = cursor.fetchone()[0]
-        net = ciro - gider
-        conn.close()
-    
-    rapor.append(f"Rapor Tarihi: {datetime.now().strftime('%d.%m.%Y %H:%M')}")
-    rapor.append("=" * 60)
-    rapor.append("")
-    
-    rapor.append(f"Toplam Ciro:  {ciro:.2f} TL")
-    rapor.append(f"Toplam Gider: {gider:.2f} TL")
-    rapor.append("-" * 40)
+        sira = (sonra.year - baslangic.year) * 12 + sonra.month - baslangic.month
+        if siklik == "YILLIK":
+            sira //= 12
     
-    if net >= 0:
-        rapor.append(f"NET KÂR:      {net:.2f} TL")
+    tarihler = []
+    tarih = tekrar_tarihi(baslangic, siklik, sira)
+    while tarih <= kadar:
+        if sonra is None or tarih > sonra:
+            tarihler.append(tarih)
+        sira += 1
+        tarih = tekrar_tarihi(baslangic, siklik, sira)
+    return tarihler
+
+
+def tekrarlayan_ekle(aciklama, tutar, islem_turu, siklik, baslangic, bitis=None, kategori_id=None):
+    """Tekrarlayan kasa işlemi tanımlar (kira, maaş, fatura...)"""
+    tarih_gecerli, baslangic = tarih_dogrula(baslangic)
+    if not tarih_gecerli:
+        return False, baslangic
+    if bitis:
+        tarih_gecerli, bitis = tarih_dogrula(bitis)
+        if not tarih_gecerli:
+            return False, bitis
+        if bitis < baslangic:
+            return False, "Bitiş tarihi başlangıçtan önce olamaz!"
     else:
-        rapor.append(f"NET ZARAR:    {abs(net):.2f} TL")
-    
-    rapor.append("")
-    rapor.append("=" * 60)
-    rapor.append("DETAYLI İŞLEMLER:")
-    rapor.append("=" * 60)
+        bitis = None
     
-    islemler = kasa_islem_listele()
-    for islem in islemler:
-        if yil and ay:
-            islem_tarihi = islem['tarih']
-            if not islem_tarihi.startswith(f"{yil}-{ay:02d}"):
-                continue
-        
-        rapor.append(f"{islem['tarih']} - {islem['islem_turu']}: {islem['tutar']:.2f} TL")
-        if islem['aciklama']:
-            rapor.append(f"  Açıklama: {islem['aciklama']}")
+    tutar_gecerli, tutar = tutar_dogrula(tutar)
+    if not tutar_gecerli:
+        return False, tutar
+    if islem_turu not in ("CİRO", "GİDER"):
+        return False, "Geçersiz işlem türü!"
+    if siklik not in TEKRAR_SIKLIKLARI:
+        return False, "Geçersiz sıklık!"
     
-    return "\n".join(rapor)
+    conn = veritabani_baglantisi()
+    cursor = conn.cursor()
+    cursor.execute(
+        "INSERT INTO tekrarlayan_kasa (aciklama, tutar, islem_turu, siklik, baslangic, bitis, kategori_id) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?)",
+        ((aciklama or "").strip(), tutar, islem_turu, siklik, baslangic, bitis, kategori_id or None)
+    )
+    conn.commit()
+    conn.close()
+    return True, "Tekrarlayan işlem kaydedildi."
 
 
-def borc_raporu_pdf_olustur(dosya_yolu=None):
-    """Borç-alacak raporunu PDF olarak oluşturur"""
-    if not dosya_yolu:
-        dosya_yolu = f"borc_alacak_raporu_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
-    
-    doc = SimpleDocTemplate(dosya_yolu, pagesize=A4, topMargin=1*cm, bottomMargin=1*cm)
-    elements = []
-    styles = getSampleStyleSheet()
-    
-    # Başlık stili
-    baslik_stili = ParagraphStyle(
-        'Baslik',
-        parent=styles['Heading1'],
-        fontSize=18,
-        alignment=1,
-        spaceAfter=20
-    )
-    
-    normal_stili = ParagraphStyle(
-        'Normal',
-        parent=styles['Normal'],
-        fontSize=10,
-        spaceAfter=5
+def tekrarlayan_listele():
+    """Silinmemiş tekrarlayan kasa tanımlarını listeler"""
+    conn = veritabani_baglantisi()
+    cursor = conn.cursor()
+    cursor.execute("SELECT * FROM tekrarlayan_kasa WHERE silinme_tarihi IS NULL ORDER BY baslangic, id")
+    tanimlar = cursor.fetchall()
+    conn.close()
+    return tanimlar
+
+
+def tekrarlayan_sil(tekrar_id):
+    """Tekrarlayan tanımı durdurur (daha önce üretilen kasa satırları kalır)"""
+    conn = veritabani_baglantisi()
+    cursor = conn.cursor()
+    cursor.execute(
+        "UPDATE tekrarlayan_kasa SET silinme_tarihi = ? WHERE id = ? AND silinme_tarihi IS NULL",
+        (simdi_damgasi(), tekrar_id)
     )
+    conn.commit()
+    conn.close()
+
+
+def tekrarlayanlari_uret(bugun=None):
+    """Vadesi gelen tekrarlayan kasa satırlarını tek işlemde üretir, üretilen satır sayısını döndürür
     
-    # Başlık
-    elements.append(Paragraph("BORC - ALACAK RAPORU", baslik_stili))
-    elements.append(Paragraph(f"Rapor Tarihi: {datetime.now().strftime('%d.%m.%Y %H:%M')}", normal_stili))
-    elements.append(Spacer(1, 20))
-    
-    # Müşteri verileri
-    musteriler = musteri_listele()
-    toplam_bakiye = 0
+    Her tanım son_islenen tarihini tutar; yalnızca bu tarihten sonrası
+    değerlendirildiği için kasa tablosu taranmaz. (tekrar_id, tarih)
+    tekil indeksi sayesinde aynı satır iki kez yazılamaz, yani işlem
+    istenildiği kadar tekrar çalıştırılabilir. Kapatılmış yıllara satır
+    üretilmez.
+    """
+    bugun = bugun or date.today().strftime("%Y-%m-%d")
+    kapanis = kapali_donem_sonu()
+    alt_sinir = f"{kapanis}-12-31" if kapanis is not None else None
     
-    for musteri in musteriler:
-        bakiye = musteri_bakiye_hesapla(musteri['id'])
-        toplam_bakiye += bakiye
-        
-        if bakiye != 0:
-            durum = "BORCLU" if bakiye > 0 else "ALACAKLI"
-            
-            # Müşteri başlığı
-            musteri_baslik = f"Musteri: {musteri['ad']}"
-            if musteri['telefon']:
-                musteri_baslik += f" - Tel: {musteri['telefon']}"
-            elements.append(Paragraph(musteri_baslik, normal_stili))
-            elements.append(Paragraph(f"Bakiye: {abs(bakiye):.2f} TL ({durum})", normal_stili))
+    conn = veritabani_baglantisi()
+    try:
+        with conn:
+            tanimlar = conn.execute('''
+                SELECT * FROM tekrarlayan_kasa
+                WHERE silinme_tarihi IS NULL AND baslangic <= ?
+                  AND (son_islenen IS NULL OR son_islenen < MIN(?, COALESCE(bitis, ?)))
+            ''', (bugun, bugun, bugun)).fetchall()
             
-            # İşlem tablosu
-            islemler = islem_listele(musteri['id'])
-            if islemler:
-                tablo_verisi = [["Tarih", "Tur", "Tutar (TL)", "Aciklama"]]
-                for islem in islemler:
-                    tablo_verisi.append([
-                        islem['tarih'],
-                        islem['islem_turu'],
-                        f"{islem['tutar']:.2f}",
-                        islem['aciklama'] or "-"
-                    ])
-                
-                tablo = Table(tablo_verisi, colWidths=[3*cm, 2.5*cm, 3*cm, 8*cm])
-                tablo.setStyle(TableStyle([
-                    ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-                    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                    ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                    ('FONTSIZE', (0, 0), (-1, -1), 9),
-                    ('BOTTOMPADDING', (0, 0), (-1, 0), 8),
-                    ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-                    ('GRID', (0, 0), (-1, -1), 1, colors.black),
-                ]))
-                elements.append(tablo)
+            satirlar = []
+            islenenler = []
+            for tanim in tanimlar:
+                kadar = min(bugun, tanim['bitis'] or bugun)
+                sonra = max(filter(None, (tanim['son_islenen'], alt_sinir)), default=None)
+                for tarih in vadesi_gelen_tarihler(
+                    date.fromisoformat(tanim['baslangic']), tanim['siklik'],
+                    date.fromisoformat(sonra) if sonra else None, date.fromisoformat(kadar)
+                ):
+                    satirlar.append((tarih.isoformat(), tanim['aciklama'], tanim['tutar'],
+                                     tanim['islem_turu'], tanim['kategori_id'], tanim['id']))
+                islenenler.append((kadar, tanim['id']))
             
-            elements.append(Spacer(1, 15))
-    
-    # Genel toplam
-    elements.append(Spacer(1, 20))
-    if toplam_bakiye > 0:
-        toplam_metin = f"GENEL TOPLAM: {toplam_bakiye:.2f} TL (Alacaginiz var)"
-    elif toplam_bakiye < 0:
-        toplam_metin = f"GENEL TOPLAM: {abs(toplam_bakiye):.2f} TL (Borcunuz var)"
-    else:
-        toplam_metin = "GENEL TOPLAM: 0.00 TL (Dengede)"
+            uretilen = conn.executemany(
+                "INSERT OR IGNORE INTO kasa (tarih, aciklama, tutar, islem_turu, kategori_id, tekrar_id, uuid) "
+                f"VALUES (?, ?, ?, ?, ?, ?, {YENI_UUID})",
+                satirlar
+            ).rowcount
+            conn.executemany("UPDATE tekrarlayan_kasa SET son_islenen = ? WHERE id = ?", islenenler)
+    finally:
+        conn.close()
+    return uretilen
+
+
+# ============================================================================
+# KATEGORİ VE ETİKETLER
+# ============================================================================
+
+# Etiketlenebilen tablolar (tablo -> bağlantı tablosundaki sütun)
+ETIKET_TABLOLARI = {"kasa": "kasa_id", "islemler": "islem_id"}
+
+
+def kategori_ekle(ad, islem_turu=None):
+    """Kategori ekler (islem_turu verilirse yalnızca o türde önerilir); silinmişse geri getirir"""
+    ad = (ad or "").strip()
+    if not ad:
+        return False, "Kategori adı boş olamaz!"
+    if islem_turu not in (None, "CİRO", "GİDER", "BORÇ", "ÖDEME"):
+        return False, "Geçersiz işlem türü!"
     
-    toplam_stili = ParagraphStyle(
-        'Toplam',
-        parent=styles['Heading2'],
-        fontSize=14,
-        alignment=1
+    conn = veritabani_baglantisi()
+    cursor = conn.cursor()
+    cursor.execute('''
+        INSERT INTO kategoriler (ad, islem_turu) VALUES (?, ?)
+        ON CONFLICT(ad) DO UPDATE SET islem_turu = excluded.islem_turu, silinme_tarihi = NULL
+    ''', (ad, islem_turu))
+    conn.commit()
+    conn.close()
+    return True, "Kategori kaydedildi."
+
+
+def kategori_listele(islem_turu=None):
+    """Canlı kategorileri listeler (islem_turu verilirse o türe uygun olanlar)"""
+    conn = veritabani_baglantisi()
+    cursor = conn.cursor()
+    cursor.execute(
+        "SELECT * FROM kategoriler WHERE silinme_tarihi IS NULL "
+        "AND (? IS NULL OR islem_turu IS NULL OR islem_turu = ?) ORDER BY ad",
+        (islem_turu, islem_turu)
     )
-    elements.append(Paragraph(toplam_metin, toplam_stili))
-    
-    doc.build(elements)
-    return dosya_yolu
+    kategoriler = cursor.fetchall()
+    conn.close()
+    return kategoriler
 
 
-def kasa_raporu_pdf_olustur(yil=None, ay=None, dosya_yolu=None):
-    """Kasa raporunu PDF olarak oluşturur"""
-    if not dosya_yolu:
-        if yil and ay:
-            dosya_yolu = f"kasa_raporu_{yil}_{ay:02d}_{datetime.now().strftime('%H%M%S')}.pdf"
-        else:
-            dosya_yolu = f"kasa_raporu_tum_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
-    
-    doc = SimpleDocTemplate(dosya_yolu, pagesize=A4, topMargin=1*cm, bottomMargin=1*cm)
-    elements = []
-    styles = getSampleStyleSheet()
-    
-    baslik_stili = ParagraphStyle(
-        'Baslik',
-        parent=styles['Heading1'],
-        fontSize=18,
-        alignment=1,
-        spaceAfter=20
+def kategori_sil(kategori_id):
+    """Kategoriyi listeden kaldırır (geçmiş kayıtlar kategorisini korur)"""
+    conn = veritabani_baglantisi()
+    cursor = conn.cursor()
+    cursor.execute(
+        "UPDATE kategoriler SET silinme_tarihi = ? WHERE id = ? AND silinme_tarihi IS NULL",
+        (simdi_damgasi(), kategori_id)
     )
-    
-    normal_stili = ParagraphStyle(
-        'Normal',
-        parent=styles['Normal'],
-        fontSize=10,
-        spaceAfter=5
+    conn.commit()
+    conn.close()
+
+
+def etiketleri_bagla(cursor, tablo, kayit_id, etiketler):
+    """Kayda etiket ekler; etiketler liste ya da virgülle ayrılmış metin olabilir"""
+    if isinstance(etiketler, str):
+        etiketler = etiketler.split(",")
+    adlar = sorted({e.strip() for e in etiketler if e and e.strip()})
+    cursor.executemany("INSERT OR IGNORE INTO etiketler (ad) VALUES (?)", [(ad,) for ad in adlar])
+    sutun = ETIKET_TABLOLARI[tablo]
+    cursor.executemany(
+        f"INSERT OR IGNORE INTO {tablo}_etiketleri ({sutun}, etiket_id) "
+        f"SELECT ?, id FROM etiketler WHERE ad = ?",
+        [(kayit_id, ad) for ad in adlar]
     )
+
+
+def etiketle(tablo, kayit_id, etiketler):
+    """Var olan bir kasa/borç-alacak kaydına etiket ekler"""
+    if tablo not in ETIKET_TABLOLARI:
+        return False, "Bu tablo etiketlenemez!"
+    conn = veritabani_baglantisi()
+    cursor = conn.cursor()
+    etiketleri_bagla(cursor, tablo, kayit_id, etiketler)
+    conn.commit()
+    conn.close()
+    return True, "Etiketler kaydedildi."
+
+
+def etiket_listele():
+    """Tüm etiket adlarını listeler"""
+    conn = veritabani_baglantisi()
+    cursor = conn.cursor()
+    cursor.execute("SELECT ad FROM etiketler ORDER BY ad")
+    etiketler = [satir['ad'] for satir in cursor.fetchall()]
+    conn.close()
+    return etiketler
+
+
+def kategori_ozeti(yil, ay=None, etiket=None):
+    """Kasa ciro/giderinin dönem ve kategoriye göre dağılımı (tek GROUP BY)
     
-    # Başlık
-    if yil and ay:
-        baslik = f"KASA RAPORU - {ay:02d}/{yil}"
-        ciro, gider, net = kasa_aylik_ozet(yil, ay)
+    ay verilirse o ay, verilmezse yılın ayları dönem olarak gruplanır.
+    etiket verilirse yalnızca o etiketi taşıyan kayıtlar sayılır.
+    Satırlar: donem, kategori, islem_turu, toplam, adet
+    """
+    yil = int(yil)
+    if ay:
+        baslangic, bitis = ay_araligi(yil, int(ay))
     else:
-        baslik = "KASA RAPORU - TUM ZAMANLAR"
-        conn = veritabani_baglantisi()
-        cursor = conn.cursor()
-        cursor.execute("SELECT COALESCE(SUM(tutar), 0) FROM kasa WHERE islem_turu = 'CİRO'")
-        ciro = cursor.fetchone()[0]
-        cursor.execute("SELECT COALESCE(SUM(tutar), 0) FROM kasa WHERE islem_turu = 'GİDER'")
-        gider = cursor.fetchone()[0]
-        net = ciro - gider
-        conn.close()
-    
-    elements.append(Paragraph(baslik, baslik_stili))
-    elements.append(Paragraph(f"Rapor Tarihi: {datetime.now().strftime('%d.%m.%Y %H:%M')}", normal_stili))
-    elements.append(Spacer(1, 20))
+        baslangic, bitis = f"{yil}-01-01", f"{yil + 1}-01-01"
     
-    # Özet tablosu
-    ozet_verisi = [
-        ["Toplam Ciro", f"{ciro:.2f} TL"],
-        ["Toplam Gider", f"{gider:.2f} TL"],
-        ["NET", f"{net:.2f} TL"]
-    ]
-    
-    ozet_tablo = Table(ozet_verisi, colWidths=[6*cm, 6*cm])
-    ozet_tablo.setStyle(TableStyle([
-        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-        ('FONTSIZE', (0, 0), (-1, -1), 12),
-        ('BOTTOMPADDING', (0, 0), (-1, -1), 10),
-        ('BACKGROUND', (0, 2), (-1, 2), colors.lightgreen if net >= 0 else colors.lightcoral),
-        ('GRID', (0, 0), (-1, -1), 1, colors.black),
-    ]))
-    elements.append(ozet_tablo)
-    elements.append(Spacer(1, 30))
-    
-    # Detaylı işlemler
-    elements.append(Paragraph("DETAYLI ISLEMLER", baslik_stili))
-    
-    islemler = kasa_islem_listele()
-    tablo_verisi = [["Tarih", "Tur", "Tutar (TL)", "Aciklama"]]
-    
-    for islem in islemler:
-        if yil and ay:
-            islem_tarihi = islem['tarih']
-            if not islem_tarihi.startswith(f"{yil}-{ay:02d}"):
-                continue
-        
-        tablo_verisi.append([
-            islem['tarih'],
-            islem['islem_turu'],
-            f"{islem['tutar']:.2f}",
-            islem['aciklama'] or "-"
-        ])
+    conn = veritabani_baglantisi()
+    cursor = conn.cursor()
+    tablo = kasa_kaynagi(conn, yil)
+    # Kategoriler eklenmeden önce arşivlenen yıllarda sütun bulunmayabilir
+    sema, ad = tablo.rpartition(".")[0] or "main", tablo.rpartition(".")[2]
+    sutunlar = {s[1] for s in cursor.execute(f"PRAGMA {sema}.table_info({ad})")}
+    kategori_sutunu = "k.kategori_id" if "kategori_id" in sutunlar else "NULL"
     
-    if len(tablo_verisi) > 1:
-        tablo = Table(tablo_verisi, colWidths=[3*cm, 2.5*cm, 3*cm, 8*cm])
-        tablo.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-            ('FONTSIZE', (0, 0), (-1, -1), 9),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 8),
-            ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black),
-        ]))
-        elements.append(tablo)
-    else:
-        elements.append(Paragraph("Bu donem icin islem bulunamadi.", normal_stili))
+    etiket_kosulu = ""
+    parametreler = [baslangic, bitis]
+    if etiket:
+        # Arşivlenen kayıtların etiket bağlantıları da arşive taşınır
+        cursor.execute(f"SELECT 1 FROM {sema}.sqlite_master WHERE type = 'table' AND name = 'kasa_etiketleri'")
+        etiket_tablosu = f"{sema}.kasa_etiketleri" if cursor.fetchone() else "main.kasa_etiketleri"
+        etiket_kosulu = f'''
+            AND EXISTS (SELECT 1 FROM {etiket_tablosu} ke JOIN main.etiketler e ON e.id = ke.etiket_id
+                        WHERE ke.kasa_id = k.id AND e.ad = ?)
+        '''
+        parametreler.append(etiket)
     
-    doc.build(elements)
-    return dosya_yolu
+    cursor.execute(f'''
+        SELECT substr(k.tarih, 1, 7) AS donem,
+               COALESCE(c.ad, 'Kategorisiz') AS kategori,
+               k.islem_turu AS islem_turu,
+               ROUND(SUM(k.tutar), 2) AS toplam,
+               COUNT(*) AS adet
+        FROM {tablo} k
+        LEFT JOIN main.kategoriler c ON c.id = {kategori_sutunu}
+        WHERE k.tarih >= ? AND k.tarih < ? AND k.silinme_tarihi IS NULL {etiket_kosulu}
+        GROUP BY donem, kategori, k.islem_turu
+        ORDER BY donem, k.islem_turu, toplam DESC
+    ''', parametreler)
+    satirlar = cursor.fetchall()
+    conn.close()
+    return satirlar
 
 
 # ============================================================================
-# ANA UYGULAMA SINIFI
+# ÜRÜNLER VE SATIŞ
 # ============================================================================
 
-class EsnafDefterUygulamasi:
-    def __init__(self, root):
-        self.root = root
-        self.root.title("Esnaf Defteri - Borç/Alacak ve Kasa Takip")
-        self.root.geometry("1000x700")
-        self.root.minsize(800, 600)
-        
+# Ürün dosyası (CSV) sütunları; Excel'in Türkçe ayarıyla kaydedilen dosyalar ';' ile ayrılır
+URUN_DOSYASI_SUTUNLARI = ("kod", "barkod", "ad", "fiyat", "stok")
+
+
+def urun_kodu_duzelt(kod):
+    """Kodları büyük harfe çevirir ('ekm1' ile 'EKM1' aynı üründür)"""
+    return (kod or "").strip().upper()
+
+
+def urunleri_kaydet(urunler):
+    """Ürünleri tek veritabanı işleminde ekler veya (aynı kodluyu) günceller
+    
+    urunler: (kod, ad, fiyat[, barkod[, stok]]) satırları. Önce tüm satırlar
+    doğrulanır; herhangi biri hatalıysa hiçbir şey yazılmaz. Barkod veya
+    stok boş bırakılırsa ürünün mevcut değeri korunur.
+    """
+    satirlar = []
+    for sira, urun in enumerate(urunler, 1):
+        kod, ad, fiyat = urun[:3]
+        barkod = (urun[3] if len(urun) > 3 else "") or ""
+        stok = urun[4] if len(urun) > 4 else None
+        kod = urun_kodu_duzelt(kod)
+        if not kod:
+            return False, f"{sira}. satır: Ürün kodu boş olamaz!"
+        if not (ad or "").strip():
+            return False, f"{sira}. satır: Ürün adı boş olamaz!"
+        fiyat_gecerli, fiyat = tutar_dogrula(str(fiyat).replace(",", "."))
+        if not fiyat_gecerli:
+            return False, f"{sira}. satır: {fiyat}"
+        if stok is not None and str(stok).strip():
+            try:
+                stok = float(str(stok).replace(",", "."))
+            except ValueError:
+                return False, f"{sira}. satır: Geçerli bir stok miktarı girin!"
+        else:
+            stok = None
+        satirlar.append((kod, barkod.strip() or None, ad.strip(), fiyat, stok))
+    if not satirlar:
+        return False, "Kaydedilecek ürün yok!"
+    
+    conn = veritabani_baglantisi()
+    try:
+        conn.executemany('''
+            INSERT INTO urunler (kod, barkod, ad, fiyat, stok) VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT(kod) WHERE silinme_tarihi IS NULL DO UPDATE SET
+                barkod = COALESCE(excluded.barkod, barkod),
+                ad = excluded.ad,
+                fiyat = excluded.fiyat,
+                stok = COALESCE(excluded.stok, stok)
+        ''', satirlar)
+        conn.commit()
+    except sqlite3.IntegrityError:
+        conn.rollback()
+        conn.close()
+        return False, "Aynı barkod başka bir üründe kayıtlı!"
+    conn.close()
+    return True, f"{len(satirlar)} ürün kaydedildi."
+
+
+def urun_kaydet(kod, ad, fiyat, barkod="", stok=None):
+    """Tek ürünü ekler veya aynı kodlu ürünü günceller"""
+    return urunleri_kaydet([(kod, ad, fiyat, barkod, stok)])
+
+
+def urun_sil(urun_id):
+    """Ürünü katalogdan kaldırır (geçmiş satışlar ürün bağlantısını korur)"""
+    conn = veritabani_baglantisi()
+    cursor = conn.cursor()
+    cursor.execute(
+        "UPDATE urunler SET silinme_tarihi = ? WHERE id = ? AND silinme_tarihi IS NULL",
+        (simdi_damgasi(), urun_id)
+    )
+    conn.commit()
+    conn.close()
+    return True, "Ürün silindi."
+
+
+def urun_listele(arama="", sinir=500):
+    """Canlı ürünleri koda göre listeler (arama kod, barkod veya adda geçenler)"""
+    conn = veritabani_baglantisi()
+    cursor = conn.cursor()
+    desen = f"%{arama.strip()}%"
+    cursor.execute('''
+        SELECT * FROM urunler
+        WHERE silinme_tarihi IS NULL AND (? = '' OR kod LIKE ? OR barkod LIKE ? OR ad LIKE ?)
+        ORDER BY kod LIMIT ?
+    ''', (arama.strip(), desen, desen, desen, sinir))
+    urunler = cursor.fetchall()
+    conn.close()
+    return urunler
+
+
+def urun_kodlari():
+    """Kod indeksi için tüm canlı ürünlerin (id, kod, barkod, ad, fiyat) satırları"""
+    conn = veritabani_baglantisi()
+    cursor = conn.cursor()
+    cursor.execute("SELECT id, kod, barkod, ad, fiyat FROM urunler WHERE silinme_tarihi IS NULL")
+    urunler = cursor.fetchall()
+    conn.close()
+    return urunler
+
+
+def satis_kaydet(kalemler, musteri_id=None, tarih=None):
+    """Satış sepetini tek veritabanı işleminde kaydeder
+    
+    kalemler: (urun_id, miktar[, birim_fiyat]) satırları; birim fiyat
+    verilmezse ürünün kayıtlı fiyatı kullanılır. Peşin satışta her kalem
+    kasaya CİRO, veresiye satışta (musteri_id verilirse) müşteriye BORÇ
+    olarak yazılır. Stoğu tutulan ürünlerin stoğu düşülür; stok yetmezse
+    satış hiç yazılmaz (stok eksiye düşmez).
+    """
+    tarih_gecerli, tarih = tarih_dogrula(tarih or date.today().strftime("%Y-%m-%d"))
+    if not tarih_gecerli:
+        return False, tarih
+    if not kalemler:
+        return False, "Sepet boş!"
+    
+    kapanis = kapali_donem_sonu()
+    if kapanis is not None and int(tarih[:4]) <= kapanis:
+        return False, f"{kapanis} ve önceki yıllar kapatılmış. Bu tarihe satış eklenemez!"
+    
+    conn = veritabani_baglantisi()
+    cursor = conn.cursor()
+    if musteri_id is not None:
+        # Silinmiş müşteri yabancı anahtarı hâlâ karşılar; canlı olduğu ayrıca denetlenir
+        cursor.execute("SELECT 1 FROM musteriler WHERE id = ? AND silinme_tarihi IS NULL", (musteri_id,))
+        if cursor.fetchone() is None:
+            conn.close()
+            return False, "Müşteri bulunamadı!"
+    urun_idleri = sorted({kalem[0] for kalem in kalemler})
+    cursor.execute(
+        f"SELECT id, ad, fiyat FROM urunler WHERE id IN ({', '.join('?' * len(urun_idleri))}) "
+        "AND silinme_tarihi IS NULL",
+        urun_idleri
+    )
+    urunler = {satir['id']: satir for satir in cursor.fetchall()}
+    
+    satirlar = []
+    for sira, kalem in enumerate(kalemler, 1):
+        urun = urunler.get(kalem[0])
+        if urun is None:
+            conn.close()
+            return False, f"{sira}. kalem: Ürün bulunamadı!"
+        miktar_gecerli, miktar = tutar_dogrula(kalem[1])
+        if not miktar_gecerli:
+            conn.close()
+            return False, f"{sira}. kalem: Miktar sıfırdan büyük olmalı!"
+        fiyat = urun['fiyat']
+        if len(kalem) > 2 and kalem[2] is not None:
+            fiyat_gecerli, fiyat = tutar_dogrula(kalem[2])
+            if not fiyat_gecerli:
+                conn.close()
+                return False, f"{sira}. kalem: Birim fiyat sıfırdan büyük olmalı!"
+        satirlar.append((urun, miktar, fiyat, round(miktar * fiyat, 2)))
+    
+    try:
+        if musteri_id is None:
+            cursor.executemany(
+                "INSERT INTO kasa (tarih, aciklama, tutar, islem_turu, urun_id, miktar, uuid) "
+                f"VALUES (?, ?, ?, 'CİRO', ?, ?, {YENI_UUID})",
+                [(tarih, f"{urun['ad']} x {miktar:g}", tutar, urun['id'], miktar)
+                 for urun, miktar, fiyat, tutar in satirlar]
+            )
+        else:
+            cursor.executemany(
+                "INSERT INTO islemler (musteri_id, tarih, aciklama, tutar, islem_turu, urun_id, miktar, "
+                f"birim_fiyat, uuid) VALUES (?, ?, ?, ?, 'BORÇ', ?, ?, ?, {YENI_UUID})",
+                [(musteri_id, tarih, urun['ad'], tutar, urun['id'], miktar, fiyat)
+                 for urun, miktar, fiyat, tutar in satirlar]
+            )
+        dusulecek = {}
+        for urun, miktar, _, _ in satirlar:
+            dusulecek[urun['id']] = dusulecek.get(urun['id'], 0) + miktar
+        for urun_id, miktar in dusulecek.items():
+            cursor.execute("UPDATE urunler SET stok = stok - ? WHERE id = ? AND stok >= ?", (miktar, urun_id, miktar))
+            if not cursor.rowcount:
+                # Stoğu tutulmayan (NULL) ürün güncellenmez; tutulan ürünün stoğu yetmiyordur
+                cursor.execute("SELECT stok FROM urunler WHERE id = ?", (urun_id,))
+                stok = cursor.fetchone()[0]
+                if stok is not None:
+                    conn.rollback()
+                    conn.close()
+                    return False, f"{urunler[urun_id]['ad']}: stok yetersiz (kalan {stok:g})!"
+        conn.commit()
+    except sqlite3.IntegrityError:
+        conn.rollback()
+        conn.close()
+        return False, "Müşteri bulunamadı!"
+    conn.close()
+    toplam = sum(tutar for _, _, _, tutar in satirlar)
+    return True, f"Satış kaydedildi: {len(satirlar)} kalem, toplam {toplam:.2f} TL."
+
+
+def urun_dosyasi_oku(yol):
+    """Ürün CSV dosyasını (kod;barkod;ad;fiyat;stok, başlık satırlı) urunleri_kaydet satırlarına çevirir"""
+    with open(yol, newline="", encoding="utf-8-sig") as f:
+        ornek = f.read(4096)
+        f.seek(0)
+        ayirici = ";" if ornek.count(";") >= ornek.count(",") else ","
+        okuyucu = csv.DictReader(f, delimiter=ayirici)
+        eksik = set(URUN_DOSYASI_SUTUNLARI[:4]) - {(ad or "").strip().lower() for ad in okuyucu.fieldnames or ()}
+        if eksik:
+            raise ValueError(f"Eksik sütunlar: {', '.join(sorted(eksik))}")
+        return [
+            tuple((satir.get(ad) or "").strip() for ad in ("kod", "ad", "fiyat", "barkod", "stok"))
+            for satir in ({(k or "").strip().lower(): v for k, v in satir.items()} for satir in okuyucu)
+        ]
+
+
+def urun_komutu(defter, dosya):
+    """Komut satırından ürün kataloğu yükler"""
+    veri = SqliteDefter(defter)
+    veri.hazirla()
+    try:
+        urunler = urun_dosyasi_oku(dosya)
+    except (OSError, ValueError, csv.Error) as e:
+        print(f"{dosya}: okunamadı ({e})")
+        return 1
+    basarili, mesaj = veri.urunleri_kaydet(urunler)
+    print(f"{dosya}: {mesaj}")
+    return 0 if basarili else 1
+
+
+# ============================================================================
+# GERİ ALMA VE SIKIŞTIRMA
+# ============================================================================
+
+# Başka müşteride birleştirilip silinen müşterilerin id'leri (musteri_birlestir günlüğünden)
+BIRLESEN_MUSTERILER = '''(
+    SELECT j.value FROM denetim_gunlugu d, json_each(d.veri, '$.birlesen') j
+    WHERE d.tablo = 'musteriler' AND d.eylem = 'BİRLEŞTİR'
+)'''
+
+
+def geri_al(tablo, kayit_id):
+    """Silinmiş bir kaydı geri getirir
+    
+    Müşteri geri alındığında, müşteriyle birlikte (aynı zaman damgasıyla)
+    silinen işlemler de geri gelir. Birleştirmede silinen müşteri geri
+    alınmaz: işlemleri hedef müşteride kalacağından boş bir kopya olurdu.
+    """
+    if tablo not in DENETIM_SUTUNLARI:
+        return False, "Geçersiz tablo!"
+    
+    conn = veritabani_baglantisi()
+    cursor = conn.cursor()
+    cursor.execute(f"SELECT * FROM {tablo} WHERE id = ?", (kayit_id,))
+    kayit = cursor.fetchone()
+    if kayit is None or kayit['silinme_tarihi'] is None:
+        conn.close()
+        return False, "Geri alınacak silinmiş kayıt bulunamadı!"
+    
+    if tablo == "islemler":
+        cursor.execute("SELECT silinme_tarihi FROM musteriler WHERE id = ?", (kayit['musteri_id'],))
+        musteri = cursor.fetchone()
+        if musteri is not None and musteri['silinme_tarihi'] is not None:
+            conn.close()
+            return False, "Bu işlemin müşterisi silinmiş. Önce müşteriyi geri alın!"
+    if tablo == "musteriler":
+        cursor.execute(f"SELECT 1 WHERE ? IN {BIRLESEN_MUSTERILER}", (kayit['id'],))
+        if cursor.fetchone():
+            conn.close()
+            return False, "Bu müşteri başka bir müşteriyle birleştirildi; birleştirme geri alınamaz!"
+    
+    cursor.execute(f"UPDATE {tablo} SET silinme_tarihi = NULL WHERE id = ?", (kayit_id,))
+    if tablo == "musteriler":
+        cursor.execute(
+            "UPDATE islemler SET silinme_tarihi = NULL WHERE musteri_id = ? AND silinme_tarihi = ?",
+            (kayit_id, kayit['silinme_tarihi'])
+        )
+    conn.commit()
+    conn.close()
+    return True, "Kayıt geri alındı."
+
+
+def son_silmeyi_geri_al(tablolar=None):
+    """Hâlâ silinmiş durumdaki en son silme işlemini geri alır
+    
+    Birleştirmede silinen müşteriler atlanır (birleştirme geri alınamaz);
+    atlanan birleştirme daha yeniyse mesajda belirtilir.
+    """
+    tablolar = tuple(tablolar or DENETIM_SUTUNLARI)
+    
+    conn = veritabani_baglantisi()
+    cursor = conn.cursor()
+    aday = None
+    for tablo in tablolar:
+        kosul = "silinme_tarihi IS NOT NULL"
+        # Müşteriyle birlikte silinen işlemler müşteri üzerinden geri alınır
+        if tablo == "islemler":
+            kosul += (" AND NOT EXISTS (SELECT 1 FROM musteriler m WHERE m.id = islemler.musteri_id"
+                      " AND m.silinme_tarihi IS NOT NULL)")
+        elif tablo == "musteriler":
+            kosul += f" AND id NOT IN {BIRLESEN_MUSTERILER}"
+        cursor.execute(
+            f"SELECT id, silinme_tarihi FROM {tablo} WHERE {kosul} "
+            f"ORDER BY silinme_tarihi DESC, id DESC LIMIT 1"
+        )
+        satir = cursor.fetchone()
+        if satir is not None and (aday is None or satir['silinme_tarihi'] > aday[2]):
+            aday = (tablo, satir['id'], satir['silinme_tarihi'])
+    son_birlestirme = None
+    if "musteriler" in tablolar:
+        cursor.execute(f"SELECT MAX(silinme_tarihi) FROM musteriler WHERE id IN {BIRLESEN_MUSTERILER}")
+        son_birlestirme = cursor.fetchone()[0]
+    conn.close()
+    
+    birlestirme_atlandi = son_birlestirme is not None and (aday is None or son_birlestirme > aday[2])
+    if aday is None:
+        if birlestirme_atlandi:
+            return False, "Son işlem bir müşteri birleştirmesi; birleştirme geri alınamaz."
+        return False, "Geri alınacak silme işlemi yok."
+    basarili, mesaj = geri_al(aday[0], aday[1])
+    if basarili and birlestirme_atlandi:
+        mesaj += " (Müşteri birleştirmesi geri alınamaz; ondan önceki son silme geri alındı.)"
+    return basarili, mesaj
+
+
+def silinenleri_arsivle(gun=90):
+    """Belirtilen günden eski mezar taşlarını silinen_kayitlar tablosuna taşır
+    
+    Sıcak tablolar (musteriler, islemler, kasa) sınırsız büyümesin diye
+    açılışta çalıştırılır. Taşınan kayıtlar artık geri alınamaz.
+    """
+    sinir = (datetime.now() - timedelta(days=gun)).strftime("%Y-%m-%d %H:%M:%S.%f")
+    
+    conn = veritabani_baglantisi()
+    cursor = conn.cursor()
+    toplam = 0
+    # İşlemler müşterilerden önce taşınır ki silinen müşteriye bağlı kayıt kalmasın
+    for tablo in ("islemler", "kasa", "musteriler"):
+        kosul = "silinme_tarihi IS NOT NULL AND silinme_tarihi < ?"
+        if tablo == "musteriler":
+            kosul += " AND NOT EXISTS (SELECT 1 FROM islemler WHERE islemler.musteri_id = musteriler.id)"
+        cursor.execute(f"SELECT * FROM {tablo} WHERE {kosul}", (sinir,))
+        kayitlar = cursor.fetchall()
+        if not kayitlar:
+            continue
+        
+        cursor.executemany(
+            "INSERT INTO silinen_kayitlar (tablo, kayit_id, silinme_tarihi, veri) VALUES (?, ?, ?, ?)",
+            [(tablo, k['id'], k['silinme_tarihi'], json.dumps(dict(k), ensure_ascii=False)) for k in kayitlar]
+        )
+        cursor.executemany(
+            "INSERT INTO denetim_gunlugu (tablo, kayit_id, eylem) VALUES (?, ?, 'ARŞİV')",
+            [(tablo, k['id']) for k in kayitlar]
+        )
+        if tablo in ETIKET_TABLOLARI:
+            cursor.executemany(
+                f"DELETE FROM {tablo}_etiketleri WHERE {ETIKET_TABLOLARI[tablo]} = ?",
+                [(k['id'],) for k in kayitlar]
+            )
+        cursor.executemany(f"DELETE FROM {tablo} WHERE id = ?", [(k['id'],) for k in kayitlar])
+        toplam += len(kayitlar)
+    
+    conn.commit()
+    conn.close()
+    return toplam
+
+
+# ============================================================================
+# DÖNEM KAPANIŞI VE ARŞİV
+# ============================================================================
+
+def arsiv_dosyasi():
+    """Kapanan dönemlerin taşındığı arşiv veritabanının yolu"""
+    yol = etkin_veritabani()
+    if yol.startswith("file:"):
+        ad, _, sorgu = yol[len("file:"):].partition("?")
+        return f"file:{ad}_arsiv?{sorgu}"
+    return os.path.splitext(yol)[0] + "_arsiv.db"
+
+
+def arsiv_mevcut_mu():
+    """Arşiv veritabanı oluşturulmuş mu"""
+    yol = arsiv_dosyasi()
+    return yol.startswith("file:") or os.path.exists(yol)
+
+
+def arsivi_bagla(conn):
+    """Arşiv veritabanını bağlantıya 'arsiv' adıyla bağlar (ATTACH)"""
+    conn.execute("ATTACH DATABASE ? AS arsiv", (arsiv_dosyasi(),))
+    return conn
+
+
+def kapali_donem_sonu():
+    """Kapatılmış en son mali yılı döndürür (yoksa None)"""
+    conn = veritabani_baglantisi()
+    cursor = conn.cursor()
+    cursor.execute("SELECT MAX(yil) FROM kapanan_donemler")
+    yil = cursor.fetchone()[0]
+    conn.close()
+    return yil
+
+
+def kasa_kaynagi(conn, yil):
+    """Verilen yılın kasa kayıtlarının bulunduğu tabloyu döndürür
+    
+    Kapanmış yıllar için arşiv veritabanı bağlantıya eklenir.
+    """
+    cursor = conn.cursor()
+    cursor.execute("SELECT MAX(yil) FROM kapanan_donemler")
+    kapanis = cursor.fetchone()[0]
+    if kapanis is None or int(yil) > kapanis or not arsiv_mevcut_mu():
+        return "kasa"
+    arsivi_bagla(conn)
+    return "arsiv.kasa"
+
+
+def arsiv_tablosunu_hazirla(cursor, tablo):
+    """Arşivde tabloyu oluşturur, eksik sütunları ekler ve sütun listesini döndürür"""
+    cursor.execute(f"CREATE TABLE IF NOT EXISTS arsiv.{tablo} AS SELECT * FROM main.{tablo} WHERE 0")
+    ana_sutunlar = [(s[1], s[2]) for s in cursor.execute(f"PRAGMA main.table_info({tablo})").fetchall()]
+    arsiv_sutunlari = {s[1] for s in cursor.execute(f"PRAGMA arsiv.table_info({tablo})").fetchall()}
+    for sutun, tur in ana_sutunlar:
+        if sutun not in arsiv_sutunlari:
+            cursor.execute(f"ALTER TABLE arsiv.{tablo} ADD COLUMN {sutun} {tur}")
+    return ", ".join(sutun for sutun, _ in ana_sutunlar)
+
+
+def etiketleri_arsive_tasi(cursor, tablo):
+    """Arşive taşınmış kayıtların etiket bağlantılarını da arşive taşır
+    
+    Bağlantılar ana veritabanında kalırsa yabancı anahtarları boşa düşer.
+    """
+    bag_tablosu, sutun = f"{tablo}_etiketleri", ETIKET_TABLOLARI[tablo]
+    sutunlar = arsiv_tablosunu_hazirla(cursor, bag_tablosu)
+    cursor.execute(f"CREATE INDEX IF NOT EXISTS arsiv.idx_{bag_tablosu}_etiket ON {bag_tablosu}(etiket_id, {sutun})")
+    kosul = f"{sutun} IN (SELECT id FROM arsiv.{tablo})"
+    cursor.execute(f"INSERT INTO arsiv.{bag_tablosu} ({sutunlar}) SELECT {sutunlar} FROM main.{bag_tablosu} WHERE {kosul}")
+    cursor.execute(f"DELETE FROM main.{bag_tablosu} WHERE {kosul}")
+    return cursor.rowcount
+
+
+def donem_kapat(yil):
+    """Verilen yıl ve öncesini kapatır, kayıtları arşiv veritabanına taşır
+    
+    - Kasa kayıtlarının tamamı taşınır; yıl bazında ciro/gider toplamları
+      kapanan_donemler tablosunda devir olarak kalır.
+    - Borç/alacak işlemlerinden yalnızca yıl sonunda bakiyesi sıfır olan
+      (tamamen kapanmış) müşterilerin kayıtları taşınır, böylece hiçbir
+      müşterinin bakiyesi değişmez.
+    """
+    try:
+        yil = int(yil)
+    except (TypeError, ValueError):
+        return False, "Geçerli bir yıl girin!"
+    if yil >= date.today().year:
+        return False, "Yalnızca geçmiş yıllar kapatılabilir!"
+    
+    kesim = f"{yil + 1}-01-01"
+    conn = arsivi_bagla(veritabani_baglantisi())
+    cursor = conn.cursor()
+    try:
+        kasa_sutunlari = arsiv_tablosunu_hazirla(cursor, "kasa")
+        islem_sutunlari = arsiv_tablosunu_hazirla(cursor, "islemler")
+        cursor.execute("CREATE INDEX IF NOT EXISTS arsiv.idx_kasa_tarih ON kasa(tarih)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS arsiv.idx_islemler_musteri ON islemler(musteri_id, tarih)")
+        
+        # Kasa devirleri (yıl bazında)
+        cursor.execute('''
+            INSERT INTO kapanan_donemler (yil, ciro, gider)
+            SELECT CAST(substr(tarih, 1, 4) AS INTEGER),
+                   COALESCE(SUM(CASE WHEN islem_turu = 'CİRO' THEN tutar END), 0),
+                   COALESCE(SUM(CASE WHEN islem_turu = 'GİDER' THEN tutar END), 0)
+            FROM kasa
+            WHERE tarih < ? AND silinme_tarihi IS NULL
+            GROUP BY substr(tarih, 1, 4)
+            ON CONFLICT(yil) DO UPDATE SET
+                ciro = ciro + excluded.ciro,
+                gider = gider + excluded.gider
+        ''', (kesim,))
+        cursor.execute("INSERT OR IGNORE INTO kapanan_donemler (yil) VALUES (?)", (yil,))
+        
+        # Yıl sonunda bakiyesi sıfır olan müşteriler
+        cursor.execute(f'''
+            CREATE TEMP TABLE kapanan_musteriler AS
+            SELECT musteri_id FROM islemler
+            WHERE tarih < ?
+            GROUP BY musteri_id
+            HAVING ROUND(SUM(CASE
+                WHEN silinme_tarihi IS NOT NULL THEN 0
+                WHEN islem_turu = 'BORÇ' THEN {tl_tutar()}
+                ELSE -{tl_tutar()} END), 2) = 0
+        ''', (kesim,))
+        
+        tasinanlar = {}
+        for tablo, sutunlar, kosul in (
+            ("kasa", kasa_sutunlari, "tarih < ?"),
+            ("islemler", islem_sutunlari,
+             "tarih < ? AND musteri_id IN (SELECT musteri_id FROM temp.kapanan_musteriler)"),
+        ):
+            cursor.execute(
+                f"INSERT INTO denetim_gunlugu (tablo, kayit_id, eylem, veri) "
+                f"SELECT '{tablo}', id, 'DÖNEM KAPANIŞI', json_object('yil', ?) FROM main.{tablo} WHERE {kosul}",
+                (yil, kesim)
+            )
+            cursor.execute(
+                f"INSERT INTO arsiv.{tablo} ({sutunlar}) SELECT {sutunlar} FROM main.{tablo} WHERE {kosul}",
+                (kesim,)
+            )
+            etiketleri_arsive_tasi(cursor, tablo)
+            cursor.execute(f"DELETE FROM main.{tablo} WHERE {kosul}", (kesim,))
+            tasinanlar[tablo] = cursor.rowcount
+        
+        cursor.execute("DROP TABLE temp.kapanan_musteriler")
+        conn.commit()
+    except sqlite3.Error as e:
+        conn.rollback()
+        conn.close()
+        if kilit_hatasi_mi(e):
+            raise  # yazma_islemi yeniden dener
+        return False, f"Dönem kapatılamadı: {e}"
+    
+    conn.close()
+    return True, (f"{yil} ve önceki yıllar kapatıldı. {tasinanlar['kasa']} kasa ve "
+                  f"{tasinanlar['islemler']} borç/alacak kaydı arşive taşındı.")
+
+
+def arsiv_islem_listele(musteri_id):
+    """Müşterinin arşive taşınmış (kapanmış dönem) işlemlerini listeler"""
+    if not arsiv_mevcut_mu():
+        return []
+    conn = arsivi_bagla(veritabani_baglantisi())
+    cursor = conn.cursor()
+    cursor.execute("SELECT name FROM arsiv.sqlite_master WHERE type = 'table' AND name = 'islemler'")
+    if cursor.fetchone() is None:
+        conn.close()
+        return []
+    cursor.execute(
+        "SELECT * FROM arsiv.islemler WHERE musteri_id = ? AND silinme_tarihi IS NULL ORDER BY tarih DESC, id DESC",
+        (musteri_id,)
+    )
+    islemler = cursor.fetchall()
+    conn.close()
+    return islemler
+
+
+# ============================================================================
+# BÜTÜNLÜK KONTROLÜ VE ONARIM
+# ============================================================================
+
+# tarih_dogrula biçiminde (YYYY-AA-GG) tutulması gereken sütunlar
+TARIH_SUTUNLARI = {
+    "islemler": ("tarih", "vade"),
+    "kasa": ("tarih",),
+    "tekrarlayan_kasa": ("baslangic", "bitis", "son_islenen"),
+}
+# Elle düzenlenmiş dosyalarda görülen ve anlamı açık olan tarih biçimleri
+ONARILABILIR_TARIH_BICIMLERI = ("%Y-%m-%d", "%Y/%m/%d", "%d.%m.%Y", "%d/%m/%Y", "%Y-%m-%d %H:%M:%S")
+# Müşterisi bulunamayan işlemlerin bağlandığı kayıt
+ONARIM_MUSTERISI = "Bilinmeyen Müşteri (onarım)"
+
+
+def tarih_onar(deger):
+    """Bozuk tarih metnini YYYY-AA-GG biçimine çevirir (çevrilemiyorsa None)"""
+    metin = str(deger).strip()
+    for bicim in ONARILABILIR_TARIH_BICIMLERI:
+        try:
+            return datetime.strptime(metin, bicim).date().isoformat()
+        except ValueError:
+            continue
+    return None
+
+
+def onarim_musterisi(cursor):
+    """Onarım müşterisinin id'sini döndürür, yoksa oluşturur"""
+    cursor.execute("SELECT id FROM musteriler WHERE ad = ? AND silinme_tarihi IS NULL", (ONARIM_MUSTERISI,))
+    satir = cursor.fetchone()
+    if satir is not None:
+        return satir['id']
+    cursor.execute(
+        f"INSERT INTO musteriler (ad, not_alani, uuid) VALUES (?, ?, {YENI_UUID})",
+        (ONARIM_MUSTERISI, "Bütünlük onarımında müşterisi bulunamayan işlemler bu kayda bağlandı.")
+    )
+    return cursor.lastrowid
+
+
+def yetimleri_onar(cursor, tablo, ust, satirlar):
+    """Üst kaydı bulunmayan satırları düzeltir, düzeltilen satır sayısını döndürür"""
+    if ust == "musteriler":
+        # İşlemler silinmez; tutarlar kaybolmasın diye onarım müşterisine bağlanır
+        musteri_id = onarim_musterisi(cursor)
+        cursor.executemany(
+            "INSERT INTO denetim_gunlugu (tablo, kayit_id, eylem, veri) "
+            f"SELECT '{tablo}', id, 'ONARIM', json_object('musteri_id', musteri_id) FROM {tablo} WHERE rowid = ?",
+            [(rowid,) for rowid in satirlar]
+        )
+        cursor.executemany(f"UPDATE {tablo} SET musteri_id = ? WHERE rowid = ?",
+                           [(musteri_id, rowid) for rowid in satirlar])
+        return len(satirlar)
+    if ust == "kategoriler":
+        cursor.executemany(f"UPDATE {tablo} SET kategori_id = NULL WHERE rowid = ?", [(rowid,) for rowid in satirlar])
+        return len(satirlar)
+    
+    # Etiket bağlantıları (WITHOUT ROWID): arşivdeki kayıtlara aitse taşınır, değilse silinir
+    ana_tablo = tablo[:-len("_etiketleri")]
+    sutun = "etiket_id" if ust == "etiketler" else ETIKET_TABLOLARI[ana_tablo]
+    onarilan = 0
+    if ust == ana_tablo and "arsiv" in {s[1] for s in cursor.execute("PRAGMA database_list")}:
+        cursor.execute("SELECT 1 FROM arsiv.sqlite_master WHERE type = 'table' AND name = ?", (ana_tablo,))
+        if cursor.fetchone() is not None:
+            onarilan = etiketleri_arsive_tasi(cursor, ana_tablo)
+    cursor.execute(f"DELETE FROM main.{tablo} WHERE {sutun} NOT IN (SELECT id FROM main.{ust})")
+    return onarilan + cursor.rowcount
+
+
+def butunluk_kontrol(onar=False, tam=False):
+    """Veritabanı bütünlüğünü denetler; onar=True ise düzeltilebilenleri düzeltir
+    
+    Sırasıyla SQLite sayfa/indeks yapısı (tam=False iken daha hızlı
+    quick_check), yabancı anahtarlar, tarih biçimleri, silinmiş müşterilerin
+    canlı işlemleri ve bakiye özeti denetlenir. Her adım tek tarama olduğu
+    için büyük dosyalarda da saniyeler içinde biter.
+    Sonuç: (temiz, bulgular) - bulgular [(kontrol, bulunan, onarilan, ayrinti)]
+    """
+    conn = veritabani_baglantisi()
+    cursor = conn.cursor()
+    bulgular = []
+    
+    # Sayfa ve indeks yapısı
+    pragma = "integrity_check" if tam else "quick_check"
+    hatalar = [s[0] for s in cursor.execute(f"PRAGMA {pragma}") if s[0] != "ok"]
+    onarilan = 0
+    if hatalar and onar and all("index" in hata for hata in hatalar):
+        # Yalnızca indeksler bozuksa tablolardan yeniden kurulabilir
+        cursor.execute("REINDEX")
+        if [s[0] for s in cursor.execute(f"PRAGMA {pragma}")] == ["ok"]:
+            onarilan = len(hatalar)
+    bulgular.append((pragma, len(hatalar), onarilan, "; ".join(hatalar[:3])))
+    if len(hatalar) > onarilan:
+        # Sayfa bozukluğunda veri onarımı denenmez
+        conn.close()
+        return False, bulgular + [("sonuç", 1, 0, "Dosya bozuk; yedekten geri dönün.")]
+    
+    if onar and arsiv_mevcut_mu():
+        arsivi_bagla(conn)
+    
+    # Yabancı anahtarlar (etiket bağlantı tablolarında rowid yoktur, satır None gelir)
+    yetimler = {}
+    for tablo, rowid, ust, _ in cursor.execute("PRAGMA main.foreign_key_check").fetchall():
+        yetimler.setdefault((tablo, ust), []).append(rowid)
+    for (tablo, ust), satirlar in sorted(yetimler.items()):
+        onarilan = yetimleri_onar(cursor, tablo, ust, satirlar) if onar else 0
+        bulgular.append((f"yabancı anahtar {tablo} -> {ust}", len(satirlar), onarilan, ""))
+    if not yetimler:
+        bulgular.append(("yabancı anahtarlar", 0, 0, ""))
+    
+    # Tarih biçimleri; '+0 days' takvimde olmayan günleri (2025-02-30) normalleştirdiği için onları da yakalar
+    for tablo, sutunlar in TARIH_SUTUNLARI.items():
+        for sutun in sutunlar:
+            cursor.execute(f'''
+                SELECT rowid AS satir_no, {sutun} AS deger FROM {tablo}
+                WHERE {sutun} IS NOT NULL
+                  AND ({sutun} NOT GLOB '[0-9][0-9][0-9][0-9]-[0-9][0-9]-[0-9][0-9]' OR date({sutun}, '+0 days') IS NOT {sutun})
+            ''')
+            hatali = cursor.fetchall()
+            duzeltmeler = [(yeni, satir['satir_no']) for satir in hatali if (yeni := tarih_onar(satir['deger']))]
+            onarilan = 0
+            if onar and duzeltmeler:
+                cursor.executemany(
+                    "INSERT INTO denetim_gunlugu (tablo, kayit_id, eylem, veri) "
+                    f"SELECT '{tablo}', id, 'ONARIM', json_object('{sutun}', {sutun}) FROM {tablo} WHERE rowid = ?",
+                    [(rowid,) for _, rowid in duzeltmeler]
+                )
+                cursor.executemany(f"UPDATE {tablo} SET {sutun} = ? WHERE rowid = ?", duzeltmeler)
+                onarilan = len(duzeltmeler)
+            duzelmeyen = {satir['satir_no'] for satir in hatali} - {rowid for _, rowid in duzeltmeler}
+            ayrinti = f"onarılamayan kayıtlar: {sorted(duzelmeyen)[:10]}" if duzelmeyen else ""
+            bulgular.append((f"tarih biçimi {tablo}.{sutun}", len(hatali), onarilan, ayrinti))
+    
+    # Müşteri silinirken yarıda kalmış silmeler: işlemler müşterinin damgasıyla silinir
+    kosul = "silinme_tarihi IS NULL AND musteri_id IN (SELECT id FROM musteriler WHERE silinme_tarihi IS NOT NULL)"
+    cursor.execute(f"SELECT COUNT(*) FROM islemler WHERE {kosul}")
+    bulunan = cursor.fetchone()[0]
+    onarilan = 0
+    if onar and bulunan:
+        cursor.execute(f'''
+            UPDATE islemler SET silinme_tarihi =
+                (SELECT m.silinme_tarihi FROM musteriler m WHERE m.id = islemler.musteri_id)
+            WHERE {kosul}
+        ''')
+        onarilan = cursor.rowcount
+    bulgular.append(("silinmiş müşterinin canlı işlemleri", bulunan, onarilan, ""))
+    
+    # Kuru olmayan dövizli işlemler bakiyeye çevrilemez; kur girilmeden onarılamaz
+    cursor.execute(f"SELECT para_birimi, MIN(tarih) AS ilk, COUNT(*) AS adet FROM ({kursuz_islemler_sorgusu()}) "
+                   "GROUP BY para_birimi ORDER BY para_birimi")
+    kursuzlar = cursor.fetchall()
+    bulgular.append(("kuru olmayan dövizli işlemler", sum(k['adet'] for k in kursuzlar), 0,
+                     "; ".join(f"{k['para_birimi']} için {k['ilk']} tarihinde geçerli kur girin" for k in kursuzlar)))
+    
+    # Bakiye özeti (tetikleyici dışı değişiklikler özeti kaydırır)
+    cursor.execute(f'''
+        WITH hesap AS ({bakiye_ozeti_sorgusu()})
+        SELECT COUNT(*) FROM (
+            SELECT h.musteri_id FROM hesap h
+            LEFT JOIN musteri_bakiyeleri b ON b.musteri_id = h.musteri_id
+            WHERE b.musteri_id IS NULL OR ABS(h.borc - b.borc) > 0.005 OR ABS(h.odeme - b.odeme) > 0.005
+            UNION ALL
+            SELECT b.musteri_id FROM musteri_bakiyeleri b
+            WHERE (ABS(b.borc) > 0.005 OR ABS(b.odeme) > 0.005)
+              AND NOT EXISTS (SELECT 1 FROM hesap h WHERE h.musteri_id = b.musteri_id)
+        )
+    ''')
+    bulunan = cursor.fetchone()[0]
+    onarilan = 0
+    if onar and bulunan and not kursuzlar:
+        bakiye_ozetini_doldur(cursor)
+        onarilan = bulunan
+    bulgular.append(("bakiye özeti", bulunan, onarilan, "önce eksik kurları girin" if bulunan and kursuzlar else ""))
+    
+    conn.commit()
+    conn.close()
+    if any(onarilan for _, _, onarilan, _ in bulgular):
+        kolon_goruntusunu_gecersiz_kil()
+    return all(bulunan == onarilan for _, bulunan, onarilan, _ in bulgular), bulgular
+
+
+def butunluk_raporu(bulgular):
+    """butunluk_kontrol bulgularını metin tablo olarak biçimlendirir"""
+    satirlar = [f"{'KONTROL':<45} {'BULUNAN':>8} {'ONARILAN':>9}", "-" * 64]
+    for kontrol, bulunan, onarilan, ayrinti in bulgular:
+        satirlar.append(f"{kontrol:<45} {bulunan:>8} {onarilan:>9}")
+        if ayrinti:
+            satirlar.append(f"    {ayrinti}")
+    return "\n".join(satirlar)
+
+
+def butunluk_komutu(dosyalar, onar=False, tam=False):
+    """Veritabanı dosyalarını sırayla denetler; sorun kalan dosya varsa 1 döndürür"""
+    cikis_kodu = 0
+    for dosya in dosyalar:
+        if not os.path.exists(dosya):
+            print(f"{dosya}: dosya bulunamadı")
+            cikis_kodu = 1
+            continue
+        baslangic = time.perf_counter()
+        veri = SqliteDefter(dosya)
+        try:
+            # Eski sürüm dosyalar önce güncel şemaya taşınır
+            veri.hazirla()
+            temiz, bulgular = veri.butunluk_kontrol(onar=onar, tam=tam)
+        except sqlite3.DatabaseError as e:
+            print(f"{dosya}: açılamadı ({e})")
+            cikis_kodu = 1
+            continue
+        sure = (time.perf_counter() - baslangic) * 1000
+        print(f"== {dosya} ({sure:.0f} ms): {'TEMİZ' if temiz else 'SORUN VAR'}")
+        print(butunluk_raporu(bulgular))
+        print()
+        if not temiz:
+            cikis_kodu = 1
+    return cikis_kodu
+
+
+# ============================================================================
+# VERİTABANI BAKIMI
+# ============================================================================
+
+# Bakım servisi kontrol aralığı ve son yazmadan sonra programın boşta sayılma süresi
+BAKIM_KONTROL_ARALIGI_SN = 60
+BAKIM_BOSTA_SN = 30
+# Bir dilimde dosyadan atılan en fazla boş sayfa (4 KB sayfada ~1 MB)
+BAKIM_DILIM_SAYFA = 256
+# İstatistik tazeleme aralıkları; ANALYZE tablo başına örneklem sınırıyla çalışır
+BAKIM_ANALYZE_ARALIGI_SAAT = 24 * 7
+BAKIM_OPTIMIZE_ARALIGI_SAAT = 24
+BAKIM_ANALIZ_SINIRI = 1000
+
+
+def bakim_zamani_geldi_mi(cursor, islem, saat):
+    """Bakım adımının son çalışmasından bu yana verilen saat geçmiş mi"""
+    cursor.execute("SELECT son_calisma FROM bakim_durumu WHERE islem = ?", (islem,))
+    satir = cursor.fetchone()
+    return satir is None or datetime.now() - datetime.fromisoformat(satir['son_calisma']) >= timedelta(hours=saat)
+
+
+def bakim_calistir(tam=False, dilim_sayfa=BAKIM_DILIM_SAYFA):
+    """Sırası gelen bakım adımlarını çalıştırır; yapılanları [(islem, sure_ms, ayrinti)] döndürür
+    
+    - tam=True ve auto_vacuum INCREMENTAL değilse dosya bir kez VACUUM ile
+      dönüştürülür (tüm dosyayı kilitler; boşta bakımda yapılmaz, --bakim ile)
+    - WAL kipindeyse PASSIVE checkpoint (okuyucu ve yazıcıları bekletmez)
+    - Boş sayfalar dilim_sayfa'lık dilimlerle dosyadan atılır (tam=True: hepsi)
+    - İstatistikler haftalık ANALYZE, günlük PRAGMA optimize ile tazelenir
+      (tam=True: örneklem sınırı olmadan hemen ANALYZE)
+    """
+    bellek = "mode=memory" in etkin_veritabani()
+    conn = veritabani_baglantisi()
+    cursor = conn.cursor()
+    yapilanlar = []
+    
+    def adim(islem, fonksiyon):
+        baslangic = time.perf_counter()
+        ayrinti = fonksiyon()
+        yapilanlar.append((islem, (time.perf_counter() - baslangic) * 1000, ayrinti))
+    
+    def auto_vacuum_gecisi():
+        cursor.execute("PRAGMA auto_vacuum = INCREMENTAL")
+        cursor.execute("VACUUM")
+        return "INCREMENTAL"
+    
+    def checkpoint():
+        _, gunluk, aktarilan = cursor.execute("PRAGMA wal_checkpoint(PASSIVE)").fetchone()
+        return f"{aktarilan}/{gunluk} sayfa aktarıldı"
+    
+    def bos_sayfalari_at():
+        once = cursor.execute("PRAGMA freelist_count").fetchone()[0]
+        # execute() ilk adımdan sonra durur (tek sayfa); executescript ifadeyi sonuna kadar yürütür
+        cursor.executescript("PRAGMA incremental_vacuum;" if tam else f"PRAGMA incremental_vacuum({int(dilim_sayfa)});")
+        return f"{once - cursor.execute('PRAGMA freelist_count').fetchone()[0]} sayfa"
+    
+    def analyze():
+        cursor.execute(f"PRAGMA analysis_limit = {0 if tam else BAKIM_ANALIZ_SINIRI}")
+        cursor.execute("ANALYZE")
+        return "tam" if tam else f"örneklem {BAKIM_ANALIZ_SINIRI}"
+    
+    def optimize():
+        cursor.execute("PRAGMA optimize")
+        return ""
+    
+    artimli = cursor.execute("PRAGMA auto_vacuum").fetchone()[0] == 2
+    if not bellek and not artimli and tam:
+        adim("auto_vacuum", auto_vacuum_gecisi)
+        artimli = True
+    if cursor.execute("PRAGMA journal_mode").fetchone()[0] == "wal":
+        adim("wal_checkpoint", checkpoint)
+    # Dönüştürülmemiş dosyada incremental_vacuum bir şey yapmaz
+    if not bellek and artimli and cursor.execute("PRAGMA freelist_count").fetchone()[0]:
+        adim("incremental_vacuum", bos_sayfalari_at)
+    if tam or bakim_zamani_geldi_mi(cursor, "ANALYZE", BAKIM_ANALYZE_ARALIGI_SAAT):
+        adim("ANALYZE", analyze)
+    elif bakim_zamani_geldi_mi(cursor, "optimize", BAKIM_OPTIMIZE_ARALIGI_SAAT):
+        adim("optimize", optimize)
+    
+    simdi = datetime.now().isoformat(sep=" ", timespec="seconds")
+    cursor.executemany(
+        "INSERT OR REPLACE INTO bakim_durumu (islem, son_calisma, sure_ms, ayrinti) VALUES (?, ?, ?, ?)",
+        [(islem, simdi, sure, ayrinti) for islem, sure, ayrinti in yapilanlar]
+    )
+    conn.commit()
+    conn.close()
+    return yapilanlar
+
+
+def bakim_metrikleri():
+    """Dosya boyutu, sayfa ve boş sayfa sayıları, kipler ve son bakım zamanları"""
+    yol = etkin_veritabani()
+    conn = veritabani_baglantisi()
+    cursor = conn.cursor()
+    metrikler = {
+        "sayfa_boyutu": cursor.execute("PRAGMA page_size").fetchone()[0],
+        "sayfa_sayisi": cursor.execute("PRAGMA page_count").fetchone()[0],
+        "bos_sayfa": cursor.execute("PRAGMA freelist_count").fetchone()[0],
+        "auto_vacuum": ("NONE", "FULL", "INCREMENTAL")[cursor.execute("PRAGMA auto_vacuum").fetchone()[0]],
+        "journal_mode": cursor.execute("PRAGMA journal_mode").fetchone()[0],
+        "son_bakim": {
+            satir['islem']: (satir['son_calisma'], satir['sure_ms'], satir['ayrinti'])
+            for satir in cursor.execute("SELECT * FROM bakim_durumu ORDER BY islem")
+        },
+    }
+    conn.close()
+    metrikler["dosya_boyutu"] = os.path.getsize(yol) if os.path.exists(yol) else None
+    metrikler["wal_boyutu"] = os.path.getsize(yol + "-wal") if os.path.exists(yol + "-wal") else None
+    return metrikler
+
+
+def bakim_raporu(metrikler):
+    """bakim_metrikleri sonucunu okunur metne çevirir"""
+    def mb(bayt):
+        return "-" if bayt is None else f"{bayt / 1024 / 1024:.2f} MB"
+    
+    bos_oran = 100 * metrikler['bos_sayfa'] / max(metrikler['sayfa_sayisi'], 1)
+    satirlar = [
+        f"Dosya: {mb(metrikler['dosya_boyutu'])} | WAL: {mb(metrikler['wal_boyutu'])} | "
+        f"Sayfa: {metrikler['sayfa_sayisi']} x {metrikler['sayfa_boyutu']} B",
+        f"Boş sayfa: {metrikler['bos_sayfa']} (%{bos_oran:.1f}, "
+        f"{mb(metrikler['bos_sayfa'] * metrikler['sayfa_boyutu'])}) | "
+        f"auto_vacuum: {metrikler['auto_vacuum']} | journal_mode: {metrikler['journal_mode']}",
+    ]
+    for islem, (zaman, sure, ayrinti) in metrikler['son_bakim'].items():
+        satirlar.append(f"  {islem:<20} {zaman}  {sure:>9.1f} ms  {ayrinti or ''}")
+    return "\n".join(satirlar)
+
+
+def bakim_komutu(dosyalar):
+    """Verilen dosyalarda tam bakım yapar, önceki ve sonraki ölçümleri yazdırır"""
+    for dosya in dosyalar:
+        if not os.path.exists(dosya):
+            print(f"{dosya}: dosya bulunamadı")
+            return 1
+        veri = SqliteDefter(dosya)
+        veri.hazirla()
+        print(f"== {dosya}")
+        print(bakim_raporu(veri.bakim_metrikleri()))
+        for islem, sure, ayrinti in veri.bakim_calistir(tam=True):
+            print(f"-> {islem}: {sure:.0f} ms {ayrinti}")
+        print(bakim_raporu(veri.bakim_metrikleri()))
+        print()
+    return 0
+
+
+class BakimServisi:
+    """Program boştayken bakım adımlarını arka planda çalıştıran servis
+    
+    Son yazmadan (veri.yazma_surumu) bu yana BAKIM_BOSTA_SN geçtiyse her
+    BAKIM_KONTROL_ARALIGI_SN'de bir bakim_calistir çağrılır. Her çağrı
+    küçük bir dilimdir; yazma kilidi kısa süre tutulur.
+    """
+    
+    def __init__(self, veri):
+        self.veri = veri
+        self.son_yapilanlar = []
+        self._dur = threading.Event()
+        self._surum = veri.yazma_surumu
+        self._son_yazma = time.monotonic()
+        self.is_parcacigi = threading.Thread(target=self._calis, daemon=True)
+        self.is_parcacigi.start()
+    
+    def durdur(self):
+        self._dur.set()
+    
+    def _calis(self):
+        while not self._dur.wait(BAKIM_KONTROL_ARALIGI_SN):
+            if self.veri.yazma_surumu != self._surum:
+                self._surum = self.veri.yazma_surumu
+                self._son_yazma = time.monotonic()
+                continue
+            if time.monotonic() - self._son_yazma < BAKIM_BOSTA_SN:
+                continue
+            try:
+                self.son_yapilanlar = self.veri.bakim_calistir() or self.son_yapilanlar
+            except (sqlite3.Error, OSError):
+                pass  # Dosya meşgulse bir sonraki boş anda denenir
+            # Bakımın kendi yazması programı meşgul göstermesin
+            self._surum = self.veri.yazma_surumu
+
+
+# ============================================================================
+# KOLON GÖRÜNTÜSÜ (HIZLI DÖNEM TOPLAMLARI)
+# ============================================================================
+
+# Tablo -> (işlem türleri, gruplama sütunu, grup adı); tür kodu türün listedeki sırasıdır
+KOLON_TABLOLARI = {
+    "kasa": (("CİRO", "GİDER"), "kategori_id", "kategori"),
+    "islemler": (("BORÇ", "ÖDEME"), "musteri_id", "musteri"),
+}
+# Dosya başlığı: sihirli sözcük, sürüm, işlenen son günlük kaydı, satır sayısı, kapasite,
+# kur sayısı ve kur toplamı (x10^6), kapalı son yıl, tür başına devir (kuruş); veri 128. bayttan başlar
+KOLON_SURUMU = 1
+KOLON_BASLIK = struct.Struct("<4sI8q")
+KOLON_VERI_BASLANGICI = 128
+# Bellekte biriken düzeltme (geriye tarihli ekleme, silme, geri alma) sınırı; aşılınca dosya yeniden kurulur
+KOLON_DUZELTME_SINIRI = 2000
+# SQLite julianday ile Python gün sırası (date.toordinal) arasındaki fark
+JULIANDAY_FARKI = 1721424.5
+
+# Süreçteki açık görüntüler (dosya yolu -> KolonGoruntusu)
+_kolon_goruntuleri = {}
+_kolon_kilidi = threading.Lock()
+
+
+def kolon_dosyasi(tablo):
+    """Tablonun kolon görüntüsü dosyasının yolu (bellek veritabanında None)"""
+    yol = etkin_veritabani()
+    if yol.startswith("file:"):
+        return None
+    return f"{os.path.splitext(yol)[0]}_{tablo}.kolon"
+
+
+def donem_anahtari(gun, grup):
+    """Günün dönem anahtarını ve bir sonraki dönemin ilk gün sırasını döndürür (grup: gun, ay, yil)"""
+    if grup == "gun":
+        return gun.isoformat(), gun.toordinal() + 1
+    if grup == "ay":
+        sonraki = date(gun.year + 1, 1, 1) if gun.month == 12 else date(gun.year, gun.month + 1, 1)
+        return f"{gun.year}-{gun.month:02d}", sonraki.toordinal()
+    if grup == "yil":
+        return str(gun.year), date(gun.year + 1, 1, 1).toordinal()
+    raise ValueError(f"Bilinmeyen gruplama: {grup}")
+
+
+class KolonGoruntusu:
+    """kasa veya islemler tablosunun canlı kayıtlarının bellek eşlemli kolon görüntüsü
+    
+    Satırlar tarih sırasıyla tip dizileri olarak tutulur: gün sırası
+    (int32), tür kodu (int8), kategori/müşteri (int32) ve kuruş tutar
+    (int64). Her tür için önek toplamı ve sayacı da saklandığından bir
+    tarih aralığının toplamı iki ikili aramayla bulunur.
+    
+    Görüntü denetim günlüğünden artımlı güncellenir: son tarihten sonraki
+    yeni kayıtlar dosyanın boş kapasitesine yazılır; geriye tarihli
+    ekleme, silme ve geri alma bellekteki düzeltme listesine eklenir.
+    Diğer değişikliklerde (birleştirme, dönem kapanışı, kur girişi)
+    dosya baştan kurulur.
+    """
+    
+    def __init__(self, tablo, yol):
+        self.tablo = tablo
+        self.yol = yol
+        self.turler, self.grup_sutunu, self.grup_adi = KOLON_TABLOLARI[tablo]
+        self.kilit = threading.Lock()
+        self.duzeltmeler = []
+        self.gunluk = None
+        self._mm = None
+        self._gorunumler = []
+        self._dugum = None
+        self._baslik = None
+    
+    # --- Dosya ---
+    
+    def kapat(self):
+        for gorunum in reversed(self._gorunumler):
+            gorunum.release()
+        self._gorunumler = []
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
+        self._dugum = None
+        self._baslik = None
+    
+    def _ac(self):
+        self.kapat()
+        with open(self.yol, "r+b") as f:
+            self._mm = mmap.mmap(f.fileno(), 0)
+            self._dugum = os.fstat(f.fileno()).st_ino
+        sihirli, surum, *_ = KOLON_BASLIK.unpack_from(self._mm)
+        if sihirli != b"EKOL" or surum != KOLON_SURUMU:
+            raise ValueError(f"{self.yol}: tanınmayan kolon dosyası")
+        self._basligi_oku()
+        
+        tamami = memoryview(self._mm)
+        self._gorunumler.append(tamami)
+        konum = KOLON_VERI_BASLANGICI
+        
+        def kolon(bicim, uzunluk):
+            nonlocal konum
+            boyut = struct.calcsize(bicim) * uzunluk
+            gorunum = tamami[konum:konum + boyut].cast(bicim)
+            self._gorunumler.append(gorunum)
+            konum += boyut
+            return gorunum
+        
+        kapasite = self.kapasite
+        self.tarih = kolon("i", kapasite)
+        self.tur = kolon("b", kapasite)
+        self.grup = kolon("i", kapasite)
+        self.kurus = kolon("q", kapasite)
+        self.onek = [kolon("q", kapasite + 1) for _ in self.turler]
+        self.sayac = [kolon("i", kapasite + 1) for _ in self.turler]
+        # Dosyadan yeni açılan görüntünün bellekte düzeltmesi yoktur
+        self.duzeltmeler = []
+        self.gunluk = self.dosya_gunlugu
+    
+    def _basligi_oku(self):
+        self._baslik = KOLON_BASLIK.unpack_from(self._mm)
+        (_, _, self.dosya_gunlugu, self.adet, self.kapasite, kur_sayisi, kur_toplami,
+         self.kapanis, *self.devir) = self._baslik
+        self.iz = (kur_sayisi, kur_toplami, self.kapanis)
+    
+    def _basligi_yaz(self, gunluk, adet):
+        KOLON_BASLIK.pack_into(self._mm, 0, b"EKOL", KOLON_SURUMU, gunluk, adet, self.kapasite,
+                               *self.iz[:2], self.kapanis, *self.devir)
+        self._basligi_oku()
+    
+    # --- Veritabanından okuma ---
+    
+    def _sorgu(self, kosul="", yalnizca_canli=True):
+        tutar = tl_tutar() if self.tablo == "islemler" else f"{self.tablo}.tutar"
+        turler = ", ".join(f"'{tur}'" for tur in self.turler)
+        kodlar = " ".join(f"WHEN '{tur}' THEN {kod}" for kod, tur in enumerate(self.turler))
+        return f'''
+            SELECT CAST(julianday(tarih) - {JULIANDAY_FARKI} AS INTEGER),
+                   CASE islem_turu {kodlar} END,
+                   COALESCE({self.grup_sutunu}, 0),
+                   CAST(ROUND(COALESCE({tutar}, 0) * 100) AS INTEGER)
+                   {"" if yalnizca_canli else ", id, silinme_tarihi IS NULL"}
+            FROM {self.tablo}
+            WHERE julianday(tarih) IS NOT NULL AND islem_turu IN ({turler})
+              {"AND silinme_tarihi IS NULL" if yalnizca_canli else ""} {kosul}
+        '''
+    
+    def _iz(self, cursor):
+        """(son günlük kaydı, kur sayısı, kur toplamı, kapalı son yıl); kur ve kapanış değişince baştan kurulur"""
+        cursor.execute('''
+            SELECT (SELECT COALESCE(MAX(id), 0) FROM denetim_gunlugu),
+                   (SELECT COUNT(*) FROM doviz_kurlari),
+                   (SELECT CAST(ROUND(TOTAL(kur) * 1000000) AS INTEGER) FROM doviz_kurlari),
+                   (SELECT COALESCE(MAX(yil), 0) FROM kapanan_donemler)
+        ''')
+        gunluk, kur_sayisi, kur_toplami, kapanis = cursor.fetchone()
+        if self.tablo != "islemler":
+            kur_sayisi = kur_toplami = 0  # Kasa tutarları kurdan etkilenmez
+        return gunluk, (kur_sayisi, kur_toplami, kapanis)
+    
+    def kur(self, cursor):
+        """Görüntüyü veritabanından baştan kurar; dosya geçici adla yazılıp yerine taşınır"""
+        gunluk, iz = self._iz(cursor)
+        cursor.execute(self._sorgu("ORDER BY tarih, id"))
+        satirlar = cursor.fetchall()
+        adet = len(satirlar)
+        # Yeni kayıtlara yer kalsın; kapasite 8'in katı (kolonlar hizalı başlasın)
+        kapasite = (max(1024, adet + adet // 4) + 7) // 8 * 8
+        devir = [0, 0]
+        if self.tablo == "kasa":
+            cursor.execute("SELECT CAST(ROUND(TOTAL(ciro) * 100) AS INTEGER), "
+                           "CAST(ROUND(TOTAL(gider) * 100) AS INTEGER) FROM kapanan_donemler")
+            devir = list(cursor.fetchone())
+        
+        tarihler, turler, gruplar, kuruslar = (zip(*satirlar) if satirlar else ((), (), (), ()))
+        bos = bytes(4 * (kapasite - adet))
+        gecici = self.yol + ".yeni"
+        with open(gecici, "wb") as f:
+            f.write(KOLON_BASLIK.pack(b"EKOL", KOLON_SURUMU, gunluk, adet, kapasite, *iz, *devir)
+                    .ljust(KOLON_VERI_BASLANGICI, b"\0"))
+            for bicim, degerler in (("i", tarihler), ("b", turler), ("i", gruplar), ("q", kuruslar)):
+                f.write(array(bicim, degerler).tobytes())
+                f.write(bytes(struct.calcsize(bicim) * (kapasite - adet)))
+            for kod in range(len(self.turler)):
+                f.write(array("q", itertools.accumulate(
+                    (kurus if tur == kod else 0 for tur, kurus in zip(turler, kuruslar)), initial=0)).tobytes())
+                f.write(bytes(8 * (kapasite - adet)))
+            for kod in range(len(self.turler)):
+                f.write(array("i", itertools.accumulate((tur == kod for tur in turler), initial=0)).tobytes())
+                f.write(bos)
+        self.kapat()
+        os.replace(gecici, self.yol)
+        self._ac()
+    
+    def _sona_ekle(self, satirlar):
+        """Son tarihten sonraki satırları boş kapasiteye yazar (satırlar tarih sırasında)"""
+        for satir in satirlar:
+            i = self.adet
+            tarih, tur, grup, kurus = satir
+            self.tarih[i], self.tur[i], self.grup[i], self.kurus[i] = tarih, tur, grup, kurus
+            for kod in range(len(self.turler)):
+                self.onek[kod][i + 1] = self.onek[kod][i] + (kurus if tur == kod else 0)
+                self.sayac[kod][i + 1] = self.sayac[kod][i] + (tur == kod)
+            self.adet += 1
+    
+    def gecersiz_kil(self):
+        """Bir sonraki kullanımda dosyanın baştan kurulmasını sağlar (tüm süreçler için)"""
+        if self._mm is not None:
+            self._basligi_yaz(-1, self.adet)
+    
+    def guncelle(self, cursor):
+        """Görüntüyü veritabanıyla eşitler (cursor tek okuma işlemi içinde olmalı)"""
+        try:
+            dugum = os.stat(self.yol).st_ino
+        except FileNotFoundError:
+            dugum = None
+        if dugum is None:
+            self.kur(cursor)
+            return
+        if dugum != self._dugum:
+            self._ac()  # Dosya başka bir süreçte yeniden kurulmuş
+        elif KOLON_BASLIK.unpack_from(self._mm) != self._baslik:
+            self._ac()  # Başka bir süreç ekleme yapmış veya geçersiz kılmış
+        gunluk, iz = self._iz(cursor)
+        if self.dosya_gunlugu < 0 or iz != self.iz:
+            self.kur(cursor)
+            return
+        if gunluk == self.gunluk:
+            return
+        
+        # Görüntünün gününden sonra değişen kayıtlar ve bu aralıktaki ilk eylemleri
+        cursor.execute(
+            "SELECT kayit_id, eylem FROM denetim_gunlugu WHERE tablo = ? AND id > ? AND id <= ? ORDER BY id",
+            (self.tablo, self.gunluk, gunluk)
+        )
+        ilk_eylemler = {}
+        for kayit_id, eylem in cursor.fetchall():
+            if eylem not in ("EKLE", "SİL", "GERİ AL"):
+                self.kur(cursor)
+                return
+            ilk_eylemler.setdefault(kayit_id, eylem)
+        
+        simdiki = {}
+        idler = list(ilk_eylemler)
+        for parca in range(0, len(idler), 500):
+            grup = idler[parca:parca + 500]
+            cursor.execute(self._sorgu(f"AND id IN ({','.join('?' * len(grup))})", yalnizca_canli=False), grup)
+            for tarih, tur, grup_id, kurus, kayit_id, canli in cursor.fetchall():
+                simdiki[kayit_id] = ((tarih, tur, grup_id, kurus), canli)
+        
+        eklenenler, cikanlar = [], []
+        for kayit_id, eylem in ilk_eylemler.items():
+            # Aralıktaki ilk eylemi SİL olan kayıt önceden canlıydı; EKLE ve GERİ AL değildi
+            vardi = eylem == "SİL"
+            satir, canli = simdiki.get(kayit_id, (None, False))
+            if satir is None:
+                if vardi:
+                    self.kur(cursor)  # Değerleri bilinmeyen kayıt (türü değişmiş vb.)
+                    return
+                continue
+            if canli and not vardi:
+                eklenenler.append((satir, kayit_id))
+            elif vardi and not canli:
+                cikanlar.append(satir)
+        
+        eklenenler.sort(key=lambda satir: (satir[0][0], satir[1]))
+        son_tarih = self.tarih[self.adet - 1] if self.adet else 0
+        if (not self.duzeltmeler and not cikanlar
+                and (not eklenenler or eklenenler[0][0][0] >= son_tarih)
+                and self.adet + len(eklenenler) <= self.kapasite):
+            self._sona_ekle([satir for satir, _ in eklenenler])
+            self._basligi_yaz(gunluk, self.adet)
+            self.gunluk = gunluk
+            return
+        
+        self.duzeltmeler += [(*satir, 1) for satir, _ in eklenenler] + [(*satir, -1) for satir in cikanlar]
+        if len(self.duzeltmeler) > KOLON_DUZELTME_SINIRI:
+            self.kur(cursor)
+            return
+        self.gunluk = gunluk
+    
+    # --- Sorgular ---
+    
+    def _aralik(self, baslangic, bitis):
+        """[baslangic, bitis) tarih aralığının gün sıraları ve satır aralığı (None: sınırsız)"""
+        alt = date.fromisoformat(baslangic).toordinal() if baslangic else 0
+        ust = date.fromisoformat(bitis).toordinal() if bitis else date.max.toordinal() + 1
+        bas = bisect.bisect_left(self.tarih, alt, 0, self.adet)
+        bit = bisect.bisect_left(self.tarih, ust, bas, self.adet)
+        return alt, ust, bas, bit
+    
+    def toplamlar(self, baslangic=None, bitis=None):
+        """[baslangic, bitis) aralığında tür başına [kuruş, adet]"""
+        alt, ust, bas, bit = self._aralik(baslangic, bitis)
+        sonuc = [[self.onek[kod][bit] - self.onek[kod][bas], self.sayac[kod][bit] - self.sayac[kod][bas]]
+                 for kod in range(len(self.turler))]
+        for tarih, tur, _, kurus, isaret in self.duzeltmeler:
+            if alt <= tarih < ust:
+                sonuc[tur][0] += isaret * kurus
+                sonuc[tur][1] += isaret
+        return sonuc
+    
+    def grupla(self, baslangic=None, bitis=None, grup="ay"):
+        """Aralığı döneme (gun, ay, yil) veya kategori/müşteriye göre gruplar
+        
+        Dönemler önek toplamlarından dönem başına iki ikili aramayla,
+        kategori/müşteri grupları aralığın tek taramasıyla hesaplanır.
+        Sonuç {(anahtar, tür kodu): [kuruş, adet]} sözlüğüdür.
+        """
+        alt, ust, bas, bit = self._aralik(baslangic, bitis)
+        toplam = {}
+        
+        def ekle(anahtar, tur, kurus, adet):
+            deger = toplam.setdefault((anahtar, tur), [0, 0])
+            deger[0] += kurus
+            deger[1] += adet
+        
+        if grup == self.grup_adi:
+            for tur, grup_id, kurus in zip(self.tur[bas:bit], self.grup[bas:bit], self.kurus[bas:bit]):
+                ekle(grup_id or None, tur, kurus, 1)
+            for tarih, tur, grup_id, kurus, isaret in self.duzeltmeler:
+                if alt <= tarih < ust:
+                    ekle(grup_id or None, tur, isaret * kurus, isaret)
+        else:
+            i = bas
+            while i < bit:
+                anahtar, sonraki = donem_anahtari(date.fromordinal(self.tarih[i]), grup)
+                j = bisect.bisect_left(self.tarih, sonraki, i, bit)
+                for kod in range(len(self.turler)):
+                    adet = self.sayac[kod][j] - self.sayac[kod][i]
+                    if adet:
+                        ekle(anahtar, kod, self.onek[kod][j] - self.onek[kod][i], adet)
+                i = j
+            for tarih, tur, _, kurus, isaret in self.duzeltmeler:
+                if alt <= tarih < ust:
+                    ekle(donem_anahtari(date.fromordinal(tarih), grup)[0], tur, isaret * kurus, isaret)
+        return {anahtar: deger for anahtar, deger in toplam.items() if deger[1]}
+
+
+def kolon_goruntusuyle(tablo, islem, olustur=False):
+    """Güncellenmiş kolon görüntüsüyle islem(görüntü) sonucunu döndürür
+    
+    Görüntü isteğe bağlıdır: dosyası yoksa (olustur verilmedikçe) veya
+    okunamıyorsa None döner ve çağıran satır tablolarını sorgular.
+    """
+    yol = kolon_dosyasi(tablo)
+    if yol is None or not (olustur or os.path.exists(yol)):
+        return None
+    with _kolon_kilidi:
+        goruntu = _kolon_goruntuleri.get(yol)
+        if goruntu is None:
+            goruntu = _kolon_goruntuleri[yol] = KolonGoruntusu(tablo, yol)
+    with goruntu.kilit:
+        conn = veritabani_baglantisi()
+        try:
+            # Günlük ve satırlar aynı anlık görüntüden okunsun
+            conn.execute("BEGIN")
+            goruntu.guncelle(conn.cursor())
+            return islem(goruntu)
+        except (OSError, ValueError, struct.error, BufferError):
+            goruntu.kapat()
+            return None
+        finally:
+            conn.rollback()
+            conn.close()
+
+
+def kolon_goruntusu_olustur():
+    """kasa ve islemler için kolon görüntüsünü kurar (varsa günceller); dönem toplamları ondan okunur"""
+    if kolon_dosyasi("kasa") is None:
+        return False, "Bellek veritabanında kolon görüntüsü kullanılamaz!"
+    adetler = {}
+    for tablo in KOLON_TABLOLARI:
+        adetler[tablo] = kolon_goruntusuyle(tablo, lambda goruntu: goruntu.adet + len(goruntu.duzeltmeler),
+                                            olustur=True)
+        if adetler[tablo] is None:
+            return False, f"{tablo} kolon görüntüsü yazılamadı!"
+    return True, f"Kolon görüntüsü hazır: {adetler['kasa']} kasa, {adetler['islemler']} borç/alacak kaydı."
+
+
+def kolon_goruntusu_kaldir():
+    """Kolon görüntüsü dosyalarını siler; özetler yeniden satır tablolarından hesaplanır"""
+    for tablo in KOLON_TABLOLARI:
+        yol = kolon_dosyasi(tablo)
+        if yol is None:
+            continue
+        with _kolon_kilidi:
+            goruntu = _kolon_goruntuleri.pop(yol, None)
+        if goruntu is not None:
+            with goruntu.kilit:
+                goruntu.kapat()
+        if os.path.exists(yol):
+            os.remove(yol)
+    return True, "Kolon görüntüsü kaldırıldı."
+
+
+def kolon_goruntusunu_gecersiz_kil():
+    """Günlüğe yazılmayan değişikliklerden (onarım, eşitleme) sonra görüntünün baştan kurulmasını sağlar"""
+    for tablo in KOLON_TABLOLARI:
+        yol = kolon_dosyasi(tablo)
+        if yol is None or not os.path.exists(yol):
+            continue
+        # Başlıktaki günlük numarası -1 yapılır; görüntüyü açık tutan diğer süreçler de görür
+        with open(yol, "r+b") as f:
+            f.seek(struct.calcsize("<4sI"))
+            f.write(struct.pack("<q", -1))
+
+
+def kolon_ozeti(tablo, baslangic=None, bitis=None, grup=None):
+    """Kolon görüntüsünden [baslangic, bitis) aralığının toplamları
+    
+    grup: None (tek satır), "gun", "ay", "yil" veya tabloya göre
+    "kategori" / "musteri". Satırlar: anahtar, islem_turu, toplam, adet.
+    Görüntü oluşturulmamışsa None döner.
+    """
+    turler = KOLON_TABLOLARI[tablo][0]
+    
+    def hesapla(goruntu):
+        if grup is None:
+            return {(None, kod): deger for kod, deger in enumerate(goruntu.toplamlar(baslangic, bitis))}
+        return goruntu.grupla(baslangic, bitis, grup)
+    
+    toplam = kolon_goruntusuyle(tablo, hesapla)
+    if toplam is None:
+        return None
+    return [
+        {"anahtar": anahtar, "islem_turu": turler[kod], "toplam": round(kurus / 100, 2), "adet": adet}
+        for (anahtar, kod), (kurus, adet) in sorted(toplam.items(), key=lambda oge: (
+            oge[0][0] is None, oge[0][0] if oge[0][0] is not None else 0, oge[0][1]))
+    ]
+
+
+def kolon_komutu(defter, kaldir=False):
+    """Komut satırından kolon görüntüsünü kurar (veya kaldırır) ve yıllık özeti yazdırır"""
+    veri = SqliteDefter(defter)
+    veri.hazirla()
+    if kaldir:
+        print(veri.kolon_goruntusu_kaldir()[1])
+        return 0
+    baslangic = time.perf_counter()
+    basarili, mesaj = veri.kolon_goruntusu_olustur()
+    print(f"{mesaj} ({(time.perf_counter() - baslangic) * 1000:.0f} ms)")
+    if not basarili:
+        return 1
+    for tablo in KOLON_TABLOLARI:
+        baslangic = time.perf_counter()
+        satirlar = veri.kolon_ozeti(tablo, grup="yil")
+        print(f"== {tablo} (yıllık, {(time.perf_counter() - baslangic) * 1000:.2f} ms)")
+        for satir in satirlar:
+            print(f"  {satir['anahtar']}  {satir['islem_turu']:<6} {satir['toplam']:>15.2f} TL  ({satir['adet']} kayıt)")
+    return 0
+
+
+# ============================================================================
+# ŞUBELER ARASI EŞİTLEME
+# ============================================================================
+
+# Eşitleme dosyası biçim sürümü
+SENK_SURUMU = 1
+SENK_UZANTISI = ".esnafsenk.gz"
+
+
+def defter_kimligi(cursor):
+    """Bu veritabanının şubeler arasında değişmeyen kimliği"""
+    cursor.execute("SELECT deger FROM defter_bilgisi WHERE anahtar = 'kimlik'")
+    return cursor.fetchone()[0]
+
+
+def senk_kimligi_yenile():
+    """Defter kimliğini yeniler (başka şubenin dosyası kopyalanarak kurulan defterler için)"""
+    conn = veritabani_baglantisi()
+    cursor = conn.cursor()
+    cursor.execute(f"UPDATE defter_bilgisi SET deger = {YENI_UUID} WHERE anahtar = 'kimlik'")
+    cursor.execute("DELETE FROM senk_esleri")
+    kimlik = defter_kimligi(cursor)
+    conn.commit()
+    conn.close()
+    return True, f"Yeni defter kimliği: {kimlik}"
+
+
+def senk_sutunlari(tablo):
+    """Pakette taşınan sütunlar [(ad, SELECT ifadesi)]
+    
+    Yerel kimlikler şubeden şubeye değiştiği için müşteri uuid'i,
+    kategori ve etiket adlarıyla taşınır.
+    """
+    sutunlar = [("uuid", "t.uuid")]
+    for sutun in DENETIM_SUTUNLARI[tablo] + ("olusturma_tarihi", "silinme_tarihi"):
+        if sutun == "musteri_id":
+            sutunlar.append(("musteri_uuid", "(SELECT m.uuid FROM musteriler m WHERE m.id = t.musteri_id)"))
+        elif sutun == "kategori_id":
+            sutunlar.append(("kategori", "(SELECT k.ad FROM kategoriler k WHERE k.id = t.kategori_id)"))
+        else:
+            sutunlar.append((sutun, f"t.{sutun}"))
+    if tablo in ETIKET_TABLOLARI:
+        sutunlar.append(("etiketler", f'''(SELECT json_group_array(e.ad) FROM {tablo}_etiketleri b
+            JOIN etiketler e ON e.id = b.etiket_id WHERE b.{ETIKET_TABLOLARI[tablo]} = t.id)'''))
+    return sutunlar
+
+
+def senk_satirlari(cursor, tablo, kosul="", parametreler=(), degisim="NULL"):
+    """Tablodan paket biçiminde satırlar okur; her satır sütun adı -> değer sözlüğüdür"""
+    secim = ", ".join(f"{ifade} AS {ad}" for ad, ifade in senk_sutunlari(tablo))
+    cursor.execute(f"SELECT t.id AS _id, {secim}, {degisim} AS degisim FROM {tablo} t {kosul}", parametreler)
+    satirlar = []
+    for satir in cursor.fetchall():
+        satir = dict(satir)
+        if "etiketler" in satir:
+            satir["etiketler"] = sorted(json.loads(satir["etiketler"]))
+        satirlar.append(satir)
+    return satirlar
+
+
+# Alımın ürettiği günlük kayıtları (aynı değişiklik gönderene geri dönmesin)
+SENK_ALIM_DISI = '''NOT EXISTS (
+    SELECT 1 FROM senk_gecmisi g
+    WHERE g.yon = 'GELEN' AND d.id BETWEEN g.ilk_gunluk AND g.son_gunluk
+)'''
+
+
+def senk_paketi_olustur(bastan=False):
+    """Son onaylanan eşitlemeden bu yana değişen kayıtları paket olarak döndürür
+    
+    Değişen kayıtlar denetim günlüğünden bulunur ve güncel halleriyle
+    gönderilir. Başlangıç noktası, eşlerin bu defterden aldığını bildirdiği
+    en küçük günlük numarasıdır; eşlerden dönüş gelmediyse (veya
+    bastan=True) tüm kayıtlar gönderilir. Kaybolan bir dosya böylece
+    sonraki pakette yeniden gider.
+    """
+    conn = veritabani_baglantisi()
+    cursor = conn.cursor()
+    kimlik = defter_kimligi(cursor)
+    cursor.execute("SELECT MIN(onaylanan) FROM senk_esleri")
+    onceki = 0 if bastan else (cursor.fetchone()[0] or 0)
+    cursor.execute("SELECT COALESCE(MAX(id), 0) FROM denetim_gunlugu")
+    son = cursor.fetchone()[0]
+    
+    tablolar = {}
+    for tablo in SENK_TABLOLARI:
+        if onceki == 0:
+            # Günlükten önceki eski kayıtlar da gitsin diye tablonun tamamı
+            tablolar[tablo] = senk_satirlari(
+                cursor, tablo,
+                degisim=f"COALESCE((SELECT MAX(d.zaman) FROM denetim_gunlugu d "
+                        f"WHERE d.tablo = '{tablo}' AND d.kayit_id = t.id), t.olusturma_tarihi)"
+            )
+            continue
+        tablolar[tablo] = senk_satirlari(cursor, tablo, f'''
+            JOIN (
+                SELECT d.kayit_id, MAX(d.zaman) AS degisim FROM denetim_gunlugu d
+                WHERE d.tablo = ? AND d.id > ? AND d.id <= ? AND {SENK_ALIM_DISI}
+                GROUP BY d.kayit_id
+            ) s ON s.kayit_id = t.id
+        ''', (tablo, onceki, son), degisim="s.degisim")
+    
+    # Değişen işlemlerin müşterisi pakette yoksa yalnızca eksikse eklensin diye ayrıca gider
+    gonderilen = {satir["uuid"] for satir in tablolar["musteriler"]}
+    eksik = {satir["musteri_uuid"] for satir in tablolar["islemler"]} - gonderilen
+    referanslar = []
+    for parca in range(0, len(eksik), 500):
+        uuidler = sorted(eksik)[parca:parca + 500]
+        referanslar += senk_satirlari(cursor, "musteriler",
+                                      f"WHERE t.uuid IN ({','.join('?' * len(uuidler))})", uuidler)
+    
+    # Dövizli işlemler karşı şubede kursuz yazılamaz; kullanılan birimlerin kurları da gider
+    birimler = sorted({satir["para_birimi"] for satir in tablolar["islemler"]} - {"TL"})
+    cursor.execute(
+        f"SELECT para_birimi, gecerlilik_tarihi, kur FROM doviz_kurlari "
+        f"WHERE para_birimi IN ({','.join('?' * len(birimler))}) ORDER BY para_birimi, gecerlilik_tarihi",
+        birimler
+    )
+    kurlar = [list(satir) for satir in cursor.fetchall()]
+    
+    cursor.execute("SELECT kimlik, alinan FROM senk_esleri")
+    alinanlar = {satir['kimlik']: satir['alinan'] for satir in cursor.fetchall()}
+    satir_sayisi = sum(len(satirlar) for satirlar in tablolar.values())
+    cursor.execute(
+        "INSERT INTO senk_gecmisi (yon, es, onceki, son, satir) VALUES ('GİDEN', NULL, ?, ?, ?)",
+        (onceki, son, satir_sayisi)
+    )
+    conn.commit()
+    conn.close()
+    
+    # Sütun adları her tabloda bir kez yazılır
+    def sikistir(satirlar, tablo):
+        adlar = [ad for ad, _ in senk_sutunlari(tablo)] + ["degisim"]
+        return {"sutunlar": adlar, "satirlar": [[satir[ad] for ad in adlar] for satir in satirlar]}
+    
+    return {
+        "surum": SENK_SURUMU,
+        "kaynak": kimlik,
+        "onceki": onceki,
+        "son": son,
+        "olusturma": simdi_damgasi(),
+        "alinanlar": alinanlar,
+        "tablolar": {tablo: sikistir(satirlar, tablo) for tablo, satirlar in tablolar.items()},
+        "referans_musteriler": sikistir(referanslar, "musteriler"),
+        "referans_kurlar": {"sutunlar": ["para_birimi", "gecerlilik_tarihi", "kur"], "satirlar": kurlar},
+    }
+
+
+def senk_satirini_yaz(cursor, tablo, satir, kayit_id=None):
+    """Paket satırını ekler (kayit_id None) veya yerel kaydın üzerine yazar
+    
+    Müşterisi bu defterde bulunmayan işlem yazılmaz (False döner).
+    """
+    degerler = {}
+    for sutun in DENETIM_SUTUNLARI[tablo] + ("silinme_tarihi",):
+        if sutun == "musteri_id":
+            cursor.execute("SELECT id FROM musteriler WHERE uuid = ?", (satir["musteri_uuid"],))
+            musteri = cursor.fetchone()
+            if musteri is None:
+                return False
+            degerler[sutun] = musteri[0]
+        elif sutun == "kategori_id":
+            degerler[sutun] = None
+            if satir["kategori"] is not None:
+                cursor.execute("INSERT OR IGNORE INTO kategoriler (ad) VALUES (?)", (satir["kategori"],))
+                cursor.execute("SELECT id FROM kategoriler WHERE ad = ?", (satir["kategori"],))
+                degerler[sutun] = cursor.fetchone()[0]
+        else:
+            degerler[sutun] = satir[sutun]
+    
+    if kayit_id is None:
+        degerler["uuid"] = satir["uuid"]
+        degerler["olusturma_tarihi"] = satir["olusturma_tarihi"]
+        cursor.execute(
+            f"INSERT INTO {tablo} ({', '.join(degerler)}) VALUES ({', '.join('?' * len(degerler))})",
+            tuple(degerler.values())
+        )
+        kayit_id = cursor.lastrowid
+    else:
+        cursor.execute(
+            f"UPDATE {tablo} SET {', '.join(f'{sutun} = ?' for sutun in degerler)} WHERE id = ?",
+            tuple(degerler.values()) + (kayit_id,)
+        )
+    
+    if tablo in ETIKET_TABLOLARI:
+        cursor.execute(f"DELETE FROM {tablo}_etiketleri WHERE {ETIKET_TABLOLARI[tablo]} = ?", (kayit_id,))
+        etiketleri_bagla(cursor, tablo, kayit_id, satir["etiketler"])
+    return True
+
+
+def senk_paketini_uygula(paket):
+    """Başka şubenin eşitleme paketini uygular
+    
+    Kayıtlar uuid ile eşleştirilir. Aynı kayıt son eşitlemeden bu yana
+    iki şubede de değiştiyse çakışma sayılır: son değişiklik (zamanı
+    büyük olan) kazanır ve iki hal senk_cakismalari tablosuna yazılır.
+    Paketle gelen kurlardan yalnızca bu defterde olmayanlar eklenir
+    (aynı tarihli yerel kur korunur). Önceki bir paket eksikse hiçbir
+    şey yazılmaz.
+    """
+    if paket.get("surum") != SENK_SURUMU:
+        return False, "Desteklenmeyen eşitleme dosyası sürümü!"
+    
+    conn = veritabani_baglantisi()
+    cursor = conn.cursor()
+    kaynak = paket["kaynak"]
+    if kaynak == defter_kimligi(cursor):
+        conn.close()
+        return False, ("Bu dosya bu defterin kendi eşitleme dosyası! Defter başka şubenin "
+                       "dosyası kopyalanarak kurulduysa bir tarafta --senk-yeni-kimlik çalıştırın.")
+    cursor.execute("INSERT OR IGNORE INTO senk_esleri (kimlik) VALUES (?)", (kaynak,))
+    cursor.execute("SELECT * FROM senk_esleri WHERE kimlik = ?", (kaynak,))
+    es = cursor.fetchone()
+    if paket["son"] <= es['alinan']:
+        conn.close()
+        return True, "Bu dosya daha önce alınmış, değişiklik yok."
+    if paket["onceki"] > es['alinan']:
+        conn.close()
+        return False, ("Bu şubeden daha önceki bir eşitleme dosyası alınmamış! Karşı şubede "
+                       "--senk-disa ... --bastan ile tam dosya oluşturun.")
+    
+    # Karşı şubenin bizden aldığı değişiklikler onun halinde zaten vardır; çakışma sayılmaz
+    onaylanan = max(es['onaylanan'], paket["alinanlar"].get(defter_kimligi(cursor), 0))
+    sinir = max(es['yerel_gunluk'], onaylanan)
+    cursor.execute("SELECT COALESCE(MAX(id), 0) FROM denetim_gunlugu")
+    ilk_gunluk = cursor.fetchone()[0] + 1
+    
+    arsivdekiler = set()
+    if arsiv_mevcut_mu():
+        arsivi_bagla(conn)
+        for tablo in SENK_TABLOLARI:
+            if "uuid" in {s[1] for s in cursor.execute(f"PRAGMA arsiv.table_info({tablo})").fetchall()}:
+                arsivdekiler.add(tablo)
+    
+    sayilar = {"yeni": 0, "guncellenen": 0, "cakisma": 0, "atlanan": 0}
+    
+    def uygula(tablo, satir, yalnizca_eksikse=False):
+        yerel = senk_satirlari(cursor, tablo, "WHERE t.uuid = ?", (satir["uuid"],))
+        if not yerel:
+            if satir["silinme_tarihi"] is not None:
+                return  # Hiç görülmemiş kaydın mezar taşı
+            if tablo in arsivdekiler:
+                cursor.execute(f"SELECT 1 FROM arsiv.{tablo} WHERE uuid = ?", (satir["uuid"],))
+                if cursor.fetchone():
+                    sayilar["atlanan"] += 1  # Bu şubede dönemi kapanmış kayıt
+                    return
+            sayilar["yeni" if senk_satirini_yaz(cursor, tablo, satir) else "atlanan"] += 1
+            return
+        if yalnizca_eksikse:
+            return
+        yerel = yerel[0]
+        karsilastir = [ad for ad, _ in senk_sutunlari(tablo)]
+        if all(yerel[ad] == satir[ad] for ad in karsilastir):
+            return
+        cursor.execute(f'''
+            SELECT MAX(d.zaman) FROM denetim_gunlugu d
+            WHERE d.tablo = ? AND d.kayit_id = ? AND d.id > ? AND {SENK_ALIM_DISI}
+        ''', (tablo, yerel["_id"], sinir))
+        yerel_degisim = cursor.fetchone()[0]
+        if yerel_degisim is not None:
+            sonuc = "GELEN" if (satir["degisim"] or "") > yerel_degisim else "YEREL"
+            cursor.execute(
+                "INSERT INTO senk_cakismalari (kaynak, tablo, uuid, yerel, gelen, sonuc) VALUES (?, ?, ?, ?, ?, ?)",
+                (kaynak, tablo, satir["uuid"],
+                 json.dumps({ad: yerel[ad] for ad in karsilastir} | {"degisim": yerel_degisim}, ensure_ascii=False),
+                 json.dumps(satir, ensure_ascii=False), sonuc)
+            )
+            sayilar["cakisma"] += 1
+            if sonuc == "YEREL":
+                return
+        sayilar["guncellenen" if senk_satirini_yaz(cursor, tablo, satir, yerel["_id"]) else "atlanan"] += 1
+    
+    try:
+        referanslar = paket["referans_musteriler"]
+        for degerler in referanslar["satirlar"]:
+            uygula("musteriler", dict(zip(referanslar["sutunlar"], degerler)), yalnizca_eksikse=True)
+        # Kurlar işlemlerden önce yazılır (bakiye tetikleyicisi kursuz dövizli işlemi reddeder)
+        kurlar = paket.get("referans_kurlar", {"sutunlar": [], "satirlar": []})
+        cursor.executemany(
+            "INSERT INTO doviz_kurlari (para_birimi, gecerlilik_tarihi, kur) VALUES (?, ?, ?) "
+            "ON CONFLICT(para_birimi, gecerlilik_tarihi) DO NOTHING",
+            [(kur["para_birimi"], kur["gecerlilik_tarihi"], kur["kur"])
+             for kur in (dict(zip(kurlar["sutunlar"], degerler)) for degerler in kurlar["satirlar"])]
+        )
+        if cursor.rowcount > 0:
+            # Yeni kur mevcut dövizli işlemlerin TL karşılığını değiştirmiş olabilir
+            bakiye_ozetini_doldur(cursor)
+        # Müşteriler önce yazılır; işlemler onların uuid'ine bağlanır
+        for tablo in SENK_TABLOLARI:
+            bolum = paket["tablolar"][tablo]
+            for degerler in bolum["satirlar"]:
+                uygula(tablo, dict(zip(bolum["sutunlar"], degerler)))
+        
+        cursor.execute("SELECT COALESCE(MAX(id), 0) FROM denetim_gunlugu")
+        son_gunluk = cursor.fetchone()[0]
+        cursor.execute('''
+            UPDATE senk_esleri SET alinan = ?, onaylanan = ?, yerel_gunluk = ?,
+                son_alim = strftime('%Y-%m-%d %H:%M:%S', 'now', 'localtime')
+            WHERE kimlik = ?
+        ''', (paket["son"], onaylanan, son_gunluk, kaynak))
+        cursor.execute('''
+            INSERT INTO senk_gecmisi (yon, es, onceki, son, ilk_gunluk, son_gunluk, satir, cakisma)
+            VALUES ('GELEN', ?, ?, ?, ?, ?, ?, ?)
+        ''', (kaynak, paket["onceki"], paket["son"], ilk_gunluk, son_gunluk,
+              sayilar["yeni"] + sayilar["guncellenen"], sayilar["cakisma"]))
+        conn.commit()
+    except (sqlite3.IntegrityError, KeyError, TypeError) as e:
+        conn.rollback()
+        conn.close()
+        return False, f"Eşitleme dosyası uygulanamadı: {e}"
+    
+    conn.close()
+    if sayilar["guncellenen"]:
+        # Üzerine yazılan kayıtlar günlüğe düşmez
+        kolon_goruntusunu_gecersiz_kil()
+    mesaj = f"{sayilar['yeni']} yeni, {sayilar['guncellenen']} güncellenen kayıt alındı."
+    if sayilar["atlanan"]:
+        mesaj += f" {sayilar['atlanan']} kayıt atlandı (arşivde veya müşterisi yok)."
+    if sayilar["cakisma"]:
+        mesaj += f" {sayilar['cakisma']} çakışma son değişiklik lehine çözüldü (senk_cakismalari)."
+    return True, mesaj
+
+
+def senk_dosya_adi(paket):
+    """Paket için önerilen dosya adı (kaynak şube ve günlük aralığı)"""
+    return f"esnaf_{paket['kaynak'][:8]}_{paket['onceki']}-{paket['son']}{SENK_UZANTISI}"
+
+
+def senk_dosyasi_yaz(paket, yol):
+    """Paketi sıkıştırılmış JSON olarak yazar"""
+    with gzip.open(yol, "wt", encoding="utf-8") as f:
+        json.dump(paket, f, ensure_ascii=False, separators=(",", ":"))
+
+
+def senk_dosyasi_oku(yol):
+    """senk_dosyasi_yaz ile yazılmış paketi okur"""
+    with gzip.open(yol, "rt", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def senk_ozeti(paket):
+    """Paketteki kayıt sayılarını tek satır metin olarak döndürür"""
+    return ", ".join(f"{tablo}: {len(bolum['satirlar'])}" for tablo, bolum in paket["tablolar"].items())
+
+
+def senk_komutu(defter, disa=None, ice=(), bastan=False, yeni_kimlik=False):
+    """Komut satırından eşitleme: önce verilen dosyaları alır, sonra dışa aktarır"""
+    veri = SqliteDefter(defter)
+    veri.hazirla()
+    if yeni_kimlik:
+        print(veri.senk_kimligi_yenile()[1])
+    for dosya in ice:
+        try:
+            paket = senk_dosyasi_oku(dosya)
+        except (OSError, ValueError) as e:
+            print(f"{dosya}: okunamadı ({e})")
+            return 1
+        basarili, mesaj = veri.senk_paketini_uygula(paket)
+        print(f"{dosya}: {mesaj}")
+        if not basarili:
+            return 1
+    if disa:
+        paket = veri.senk_paketi_olustur(bastan)
+        yol = os.path.join(disa, senk_dosya_adi(paket)) if os.path.isdir(disa) else disa
+        senk_dosyasi_yaz(paket, yol)
+        print(f"{yol}: {senk_ozeti(paket)} ({os.path.getsize(yol)} bayt)")
+    return 0
+
+
+# ============================================================================
+# TOPLU KAYIT (TEK İŞLEMDE ÇOK SATIR)
+# ============================================================================
+
+def toplu_kaydet(islemler=(), kasa=(), satirlari_dondur=False):
+    """Çok sayıda borç/alacak ve kasa satırını tek veritabanı işleminde kaydeder
+    
+    islemler: (musteri_id, tarih, aciklama, tutar, islem_turu) satırları
+    kasa:     (tarih, aciklama, tutar, islem_turu[, kategori_id[, etiketler]]) satırları
+    
+    Önce tüm satırlar doğrulanır; herhangi biri hatalıysa hiçbir şey
+    yazılmaz. Yazma tek commit ile (tek disk senkronu) yapılır.
+    satirlari_dondur=True ise başarıda mesaj yerine yazılan kasa kayıtları
+    (id'leriyle, verilen sırada) döner.
+    """
+    islem_satirlari = []
+    for sira, (musteri_id, tarih, aciklama, tutar, islem_turu) in enumerate(islemler, 1):
+        tarih_gecerli, tarih_sonuc = tarih_dogrula(tarih)
+        tutar_gecerli, tutar_sonuc = tutar_dogrula(tutar)
+        if not tarih_gecerli or not tutar_gecerli:
+            return False, f"İşlem {sira}. satır: {tarih_sonuc if not tarih_gecerli else tutar_sonuc}"
+        if islem_turu not in ("BORÇ", "ÖDEME"):
+            return False, f"İşlem {sira}. satır: Geçersiz işlem türü!"
+        islem_satirlari.append((musteri_id, tarih_sonuc, (aciklama or "").strip(), tutar_sonuc, islem_turu))
+    
+    kasa_satirlari = []
+    kapanis = kapali_donem_sonu() if kasa else None
+    for sira, (tarih, aciklama, tutar, islem_turu, *ek) in enumerate(kasa, 1):
+        kategori_id, etiketler = (list(ek) + [None, None])[:2]
+        tarih_gecerli, tarih_sonuc = tarih_dogrula(tarih)
+        tutar_gecerli, tutar_sonuc = tutar_dogrula(tutar)
+        if not tarih_gecerli or not tutar_gecerli:
+            return False, f"Kasa {sira}. satır: {tarih_sonuc if not tarih_gecerli else tutar_sonuc}"
+        if islem_turu not in ("CİRO", "GİDER"):
+            return False, f"Kasa {sira}. satır: Geçersiz işlem türü!"
+        if kapanis is not None and int(tarih_sonuc[:4]) <= kapanis:
+            return False, f"Kasa {sira}. satır: {kapanis} ve önceki yıllar kapatılmış!"
+        kasa_satirlari.append(((tarih_sonuc, (aciklama or "").strip(), tutar_sonuc, islem_turu, kategori_id or None),
+                               etiketler))
+    
+    if not islem_satirlari and not kasa_satirlari:
+        return False, "Kaydedilecek satır yok!"
+    
+    conn = veritabani_baglantisi()
+    try:
+        with conn:
+            conn.executemany(
+                f"INSERT INTO islemler (musteri_id, tarih, aciklama, tutar, islem_turu, uuid) VALUES (?, ?, ?, ?, ?, {YENI_UUID})",
+                islem_satirlari
+            )
+            kasa_idleri = []
+            if not satirlari_dondur:
+                conn.executemany(
+                    f"INSERT INTO kasa (tarih, aciklama, tutar, islem_turu, kategori_id, uuid) VALUES (?, ?, ?, ?, ?, {YENI_UUID})",
+                    [satir for satir, etiketler in kasa_satirlari if not etiketler]
+                )
+            # Etiketli satırlar bağlantı için kendi id'lerine ihtiyaç duyar
+            for satir, etiketler in kasa_satirlari:
+                if etiketler or satirlari_dondur:
+                    imlec = conn.execute(
+                        f"INSERT INTO kasa (tarih, aciklama, tutar, islem_turu, kategori_id, uuid) "
+                        f"VALUES (?, ?, ?, ?, ?, {YENI_UUID})",
+                        satir
+                    )
+                    kasa_idleri.append(imlec.lastrowid)
+                    if etiketler:
+                        etiketleri_bagla(imlec, "kasa", imlec.lastrowid, etiketler)
+            if satirlari_dondur:
+                kayitlar = {}
+                for i in range(0, len(kasa_idleri), 500):
+                    grup = kasa_idleri[i:i + 500]
+                    imlec = conn.execute(f"SELECT * FROM kasa WHERE id IN ({','.join('?' * len(grup))})", grup)
+                    kayitlar.update((kayit['id'], kayit) for kayit in imlec)
+    except sqlite3.Error as e:
+        if kilit_hatasi_mi(e):
+            raise  # yazma_islemi yeniden dener
+        return False, f"Kayıt yapılamadı, hiçbir satır yazılmadı: {e}"
+    finally:
+        conn.close()
+    if satirlari_dondur:
+        return True, [kayitlar[kimlik] for kimlik in kasa_idleri]
+    return True, f"{len(islem_satirlari) + len(kasa_satirlari)} satır kaydedildi."
+
+
+class IslemPaketi:
+    """Satırları biriktirip tek seferde (ya hep ya hiç) kaydeden iş birimi
+        
+        paket = IslemPaketi()
+        paket.kasa_islem_ekle("2025-12-14", "Kira", 5000, "GİDER")
+        paket.islem_ekle(3, "2025-12-14", "Ekmek", 40, "BORÇ")
+        basarili, mesaj = paket.kaydet()
+    """
+    
+    def __init__(self, veri=None):
+        self.veri = veri
+        self.islemler = []
+        self.kasa = []
+    
+    def islem_ekle(self, musteri_id, tarih, aciklama, tutar, islem_turu):
+        self.islemler.append((musteri_id, tarih, aciklama, tutar, islem_turu))
+    
+    def kasa_islem_ekle(self, tarih, aciklama, tutar, islem_turu):
+        self.kasa.append((tarih, aciklama, tutar, islem_turu))
+    
+    def __len__(self):
+        return len(self.islemler) + len(self.kasa)
+    
+    def kaydet(self):
+        """Biriken satırları tek işlemde yazar; başarılıysa paketi boşaltır"""
+        veri = self.veri if self.veri is not None else SqliteDefter()
+        basarili, mesaj = veri.toplu_kaydet(self.islemler, self.kasa)
+        if basarili:
+            self.islemler = []
+            self.kasa = []
+        return basarili, mesaj
+
+
+# Hızlı girişte bir pakette yazılan en fazla satır ve paketin toplanma süresi
+KUYRUK_PAKET_BOYUTU = 200
+KUYRUK_TOPLAMA_SN = 0.25
+# Arayüzün kuyruk sonuçlarını okuma aralığı
+KUYRUK_IZLEME_ARALIGI_MS = 100
+# Veritabanı başka bir programca kilitliyken paketin yeniden denenme aralığı
+KUYRUK_MESGUL_BEKLEME_SN = 2
+
+
+class KasaKuyrugu:
+    """Kasa satırlarını arka planda paketler halinde kaydeden yazma kuyruğu
+    
+    ekle() hiç beklemez. Yazıcı iş parçacığı gelen satırları
+    KUYRUK_TOPLAMA_SN boyunca biriktirir ve toplu_kaydet ile tek işlemde
+    yazar. Her paketin sonucu 'sonuclar' kuyruğuna konur:
+    ("yazildi", sonuclar, ozet) - sonuclar paketle aynı sırada, her satır için
+    yazılan kasa kaydı ya da hata mesajı; ozet kuyruk boşaldığında okunan
+    (tarih, gunluk_ozet) ya da None. Veritabanı kilitliyken paket atılmaz,
+    ("mesgul", mesaj, None) bildirilip kilit kalkana kadar yeniden denenir.
+    """
+    
+    def __init__(self, veri):
+        self.veri = veri
+        self.satirlar = queue.Queue()
+        self.sonuclar = queue.Queue()
+        self.is_parcacigi = threading.Thread(target=self._calis, daemon=True)
+        self.is_parcacigi.start()
+    
+    def ekle(self, satir):
+        """(tarih, aciklama, tutar, islem_turu, kategori_id, etiketler) satırını sıraya koyar"""
+        self.satirlar.put(satir)
+    
+    def kapat(self, zaman_asimi=5):
+        """Sıradaki satırlar yazılana kadar (en fazla zaman_asimi sn) bekler"""
+        self.satirlar.put(None)
+        self.is_parcacigi.join(zaman_asimi)
+    
+    def _calis(self):
+        bitti = False
+        while not bitti:
+            paket = []
+            satir = self.satirlar.get()
+            son = time.monotonic() + KUYRUK_TOPLAMA_SN
+            while satir is not None:
+                paket.append(satir)
+                if len(paket) >= KUYRUK_PAKET_BOYUTU:
+                    break
+                try:
+                    satir = self.satirlar.get(timeout=max(0, son - time.monotonic()))
+                except queue.Empty:
+                    break
+            else:
+                # None: kapatma isteği; elde kalan paket yine yazılır
+                bitti = True
+            if paket:
+                self._yaz(paket)
+    
+    def _kaydet(self, satirlar):
+        """toplu_kaydet'i kilit kalkana kadar dener (yazma_islemi denemeleri tükense de)"""
+        while True:
+            try:
+                return self.veri.toplu_kaydet(kasa=satirlar, satirlari_dondur=True)
+            except sqlite3.OperationalError as e:
+                if not kilit_hatasi_mi(e):
+                    raise
+                self.sonuclar.put(("mesgul", str(e), None))
+                time.sleep(KUYRUK_MESGUL_BEKLEME_SN)
+    
+    def _yaz(self, paket):
+        try:
+            basarili, sonuc = self._kaydet(paket)
+            if basarili:
+                sonuclar = sonuc
+            else:
+                # Paket ya hep ya hiç yazılır; hatalı satır diğerlerini engellemesin
+                sonuclar = []
+                for satir in paket:
+                    basarili, sonuc = self._kaydet([satir])
+                    sonuclar.append(sonuc[0] if basarili else sonuc)
+            ozet = None
+            if self.satirlar.empty():
+                bugun = date.today().strftime("%Y-%m-%d")
+                ozet = (bugun, self.veri.kasa_gunluk_ozet(bugun))
+        except (sqlite3.Error, OSError, UzakDefterHatasi) as e:
+            sonuclar, ozet = [str(e)] * len(paket), None
+        self.sonuclar.put(("yazildi", sonuclar, ozet))
+
+
+# ============================================================================
+# ÖDEME HATIRLATMALARI
+# ============================================================================
+
+# Hatırlatma eşikleri: en az bakiye (TL) ve ödenmemiş en eski borcun yaşı (gün)
+HATIRLATMA_ALT_BAKIYE = 100
+HATIRLATMA_ALT_GUN = 30
+# Aynı müşteriye yeniden hatırlatma kuyruğa alınmadan önce geçmesi gereken süre (gün)
+HATIRLATMA_TEKRAR_GUN = 7
+# Varsayılan mesaj şablonu; {ad}, {bakiye}, {gun} ve {en_eski} alanları doldurulur
+HATIRLATMA_SABLONU = ("Sayın {ad}, {en_eski} tarihinden bu yana {bakiye} TL borcunuz bulunmaktadır. "
+                      "Ödemeniz için şimdiden teşekkür ederiz.")
+# Gönderici: saniyede en fazla gönderim, aynı anda süren gönderim, kutudan bir seferde alınan kayıt
+HATIRLATMA_SANIYEDE = 5
+HATIRLATMA_ES_ZAMANLI = 4
+HATIRLATMA_PAKET = 50
+# Tek gönderimin zaman aşımı ve hatalı gönderimin ilk yeniden deneme beklemesi (her denemede iki katı)
+HATIRLATMA_ZAMAN_ASIMI_SN = 30
+HATIRLATMA_ILK_BEKLEME_SN = 60
+HATIRLATMA_EN_FAZLA_DENEME = 5
+# Alınıp sonucu yazılmayan kayıt (program kapandı, bağlantı koptu) bu süreden sonra yeniden sıraya girer
+HATIRLATMA_SAHIPSIZ_SN = 10 * 60
+# Kutu boşken göndericinin yeni kayıt kontrol aralığı ve arayüzün sonuçları okuma aralığı
+HATIRLATMA_KONTROL_SN = 60
+HATIRLATMA_IZLEME_ARALIGI_MS = 500
+
+
+def _hatirlatma_zamani(an=None):
+    """Kutudaki zaman sütunlarının biçimi (yerel saat, sözlük sırası zaman sırasıdır)"""
+    return (an or datetime.now()).strftime("%Y-%m-%d %H:%M:%S")
+
+
+def _hatirlatma_adaylari(cursor, alt_bakiye, alt_gun, bugun):
+    """hatirlatma_adaylari sorgusunu verilen imleçte çalıştırır"""
+    cursor.execute(f'''
+        WITH adaylar AS (
+            SELECT musteri_id, ROUND(borc - odeme, 2) AS bakiye, odeme
+            FROM musteri_bakiyeleri
+            WHERE ROUND(borc - odeme, 2) >= ?
+        ),
+        borclar AS (
+            SELECT i.musteri_id, i.tarih,
+                   SUM({tl_tutar("i")}) OVER (PARTITION BY i.musteri_id ORDER BY i.tarih, i.id) AS birikimli
+            FROM islemler i
+            JOIN adaylar a ON a.musteri_id = i.musteri_id
+            WHERE i.islem_turu = 'BORÇ' AND i.silinme_tarihi IS NULL
+        )
+        SELECT m.id AS musteri_id, m.ad, m.telefon, a.bakiye, MIN(b.tarih) AS en_eski,
+               CAST(julianday(?) - julianday(MIN(b.tarih)) AS INTEGER) AS gun
+        FROM adaylar a
+        JOIN musteriler m ON m.id = a.musteri_id AND m.silinme_tarihi IS NULL
+                          AND TRIM(COALESCE(m.telefon, '')) != ''
+        JOIN borclar b ON b.musteri_id = a.musteri_id AND b.birikimli > a.odeme + 0.005
+        WHERE NOT EXISTS (
+            SELECT 1 FROM hatirlatma_kutusu h
+            WHERE h.musteri_id = a.musteri_id
+              AND (h.durum IN ('BEKLİYOR', 'GÖNDERİLİYOR')
+                   OR (h.durum = 'GÖNDERİLDİ' AND h.olusturma_tarihi >= date(?, ?)))
+        )
+        GROUP BY m.id
+        HAVING gun >= ?
+        ORDER BY a.bakiye DESC
+    ''', (alt_bakiye, bugun, bugun, f"-{HATIRLATMA_TEKRAR_GUN} days", alt_gun))
+    return cursor.fetchall()
+
+
+def hatirlatma_adaylari(alt_bakiye=HATIRLATMA_ALT_BAKIYE, alt_gun=HATIRLATMA_ALT_GUN, bugun=None):
+    """Ödeme hatırlatması gönderilecek müşterileri tek sorguda seçer
+    
+    Bakiyesi en az alt_bakiye olan, ödenmemiş en eski borcu en az alt_gun
+    günlük ve telefonu kayıtlı müşteriler. Ödemeler önce en eski borçlardan
+    düşülür: borçların tarih sırasıyla birikimli toplamının toplam ödemeyi
+    ilk aştığı borç ödenmemiş en eski borçtur. Gönderimi bekleyen ya da son
+    HATIRLATMA_TEKRAR_GUN içinde gönderilmiş hatırlatması olanlar atlanır.
+    Satırlar: musteri_id, ad, telefon, bakiye, en_eski, gun
+    """
+    conn = veritabani_baglantisi()
+    adaylar = _hatirlatma_adaylari(conn.cursor(), alt_bakiye, alt_gun,
+                                   bugun or date.today().strftime("%Y-%m-%d"))
+    conn.close()
+    return adaylar
+
+
+def hatirlatma_mesaji(sablon, aday):
+    """Şablonu müşteri satırıyla doldurur (tutar Türkçe biçimde: 1.234,50)"""
+    try:
+        return sablon.format_map({
+            "ad": aday['ad'],
+            "bakiye": f"{aday['bakiye']:,.2f}".translate(str.maketrans(",.", ".,")),
+            "gun": aday['gun'],
+            "en_eski": datetime.strptime(aday['en_eski'], "%Y-%m-%d").strftime("%d.%m.%Y"),
+        })
+    except (KeyError, IndexError, ValueError) as e:
+        raise ValueError(f"Şablonda geçersiz alan: {e}")
+
+
+def hatirlatmalari_kuyruga_al(alt_bakiye=HATIRLATMA_ALT_BAKIYE, alt_gun=HATIRLATMA_ALT_GUN,
+                              sablon=HATIRLATMA_SABLONU, bugun=None):
+    """Eşiği aşan müşterilerin hatırlatma mesajlarını gönderim kutusuna ekler
+    
+    Adaylar hatirlatma_adaylari sorgusuyla seçilir; seçim ve ekleme aynı
+    işlemde yapılır, iki kasa aynı müşteriyi iki kez kuyruğa alamaz.
+    """
+    try:
+        alt_bakiye, alt_gun = float(alt_bakiye), int(alt_gun)
+        hatirlatma_mesaji(sablon, {"ad": "", "bakiye": 0, "gun": 0, "en_eski": "2000-01-01"})
+    except ValueError as e:
+        return False, f"Geçersiz hatırlatma ayarı: {e}"
+    
+    simdi = _hatirlatma_zamani()
+    conn = veritabani_baglantisi()
+    cursor = conn.cursor()
+    try:
+        cursor.execute("BEGIN IMMEDIATE")
+        kayitlar = [(aday['musteri_id'], aday['telefon'], hatirlatma_mesaji(sablon, aday), aday['bakiye'], simdi, simdi)
+                    for aday in _hatirlatma_adaylari(cursor, alt_bakiye, alt_gun,
+                                                     bugun or date.today().strftime("%Y-%m-%d"))]
+        cursor.executemany('''
+            INSERT INTO hatirlatma_kutusu (musteri_id, telefon, mesaj, bakiye, olusturma_tarihi, sonraki_deneme)
+            VALUES (?, ?, ?, ?, ?, ?)
+        ''', kayitlar)
+        conn.commit()
+    except sqlite3.Error as e:
+        conn.rollback()
+        conn.close()
+        if kilit_hatasi_mi(e):
+            raise  # yazma_islemi yeniden dener
+        return False, f"Hatırlatmalar kuyruğa alınamadı: {e}"
+    conn.close()
+    if not kayitlar:
+        return True, "Eşiği aşan ve hatırlatma bekleyen müşteri yok."
+    return True, f"{len(kayitlar)} hatırlatma gönderim kutusuna eklendi."
+
+
+def hatirlatmalari_al(sinir=HATIRLATMA_PAKET):
+    """Gönderime hazır en fazla 'sinir' hatırlatmayı gönderici için ayırır
+    
+    Ayrılan kayıtlar GÖNDERİLİYOR olur; sonraki_deneme ayırmanın bitiş
+    zamanını tutar. Sonucu HATIRLATMA_SAHIPSIZ_SN içinde yazılmayan kayıtlar
+    (program kapandı, bağlantı koptu) bir sonraki çağrıda sıraya döner.
+    Satırlar: id, musteri_id, telefon, mesaj, deneme
+    """
+    simdi = datetime.now()
+    conn = veritabani_baglantisi()
+    cursor = conn.cursor()
+    cursor.execute('''
+        UPDATE hatirlatma_kutusu SET durum = 'BEKLİYOR'
+        WHERE durum = 'GÖNDERİLİYOR' AND sonraki_deneme < ?
+    ''', (_hatirlatma_zamani(simdi),))
+    cursor.execute('''
+        SELECT id, musteri_id, telefon, mesaj, deneme FROM hatirlatma_kutusu
+        WHERE durum = 'BEKLİYOR' AND sonraki_deneme <= ?
+        ORDER BY sonraki_deneme, id
+        LIMIT ?
+    ''', (_hatirlatma_zamani(simdi), sinir))
+    hatirlatmalar = cursor.fetchall()
+    kira_sonu = _hatirlatma_zamani(simdi + timedelta(seconds=HATIRLATMA_SAHIPSIZ_SN))
+    cursor.executemany(
+        "UPDATE hatirlatma_kutusu SET durum = 'GÖNDERİLİYOR', sonraki_deneme = ? WHERE id = ?",
+        [(kira_sonu, h['id']) for h in hatirlatmalar]
+    )
+    conn.commit()
+    conn.close()
+    return hatirlatmalar
+
+
+def hatirlatma_sonuclarini_yaz(sonuclar, birakilanlar=()):
+    """Gönderim sonuçlarını kutuya tek işlemde işler
+    
+    sonuclar: [(id, hata)] - hata None ise gönderildi. Hatalı kayıtlar
+    HATIRLATMA_ILK_BEKLEME_SN'den başlayıp her denemede iki katına çıkan
+    beklemeyle sıraya döner, HATIRLATMA_EN_FAZLA_DENEME denemeden sonra HATA
+    olarak kalır. birakilanlar: denenmeden bırakılan kayıt id'leri (gönderici
+    durdurulurken); deneme sayılmadan sıraya döner.
+    """
+    simdi = _hatirlatma_zamani()
+    conn = veritabani_baglantisi()
+    cursor = conn.cursor()
+    cursor.executemany('''
+        UPDATE hatirlatma_kutusu SET durum = 'GÖNDERİLDİ', gonderim_tarihi = ?, hata = NULL, deneme = deneme + 1
+        WHERE id = ? AND durum = 'GÖNDERİLİYOR'
+    ''', [(simdi, hid) for hid, hata in sonuclar if hata is None])
+    cursor.executemany('''
+        UPDATE hatirlatma_kutusu SET
+            durum = CASE WHEN deneme + 1 >= ? THEN 'HATA' ELSE 'BEKLİYOR' END,
+            deneme = deneme + 1,
+            hata = ?,
+            sonraki_deneme = datetime(?, '+' || (? << deneme) || ' seconds')
+        WHERE id = ? AND durum = 'GÖNDERİLİYOR'
+    ''', [(HATIRLATMA_EN_FAZLA_DENEME, hata, simdi, HATIRLATMA_ILK_BEKLEME_SN, hid)
+          for hid, hata in sonuclar if hata is not None])
+    cursor.executemany(
+        "UPDATE hatirlatma_kutusu SET durum = 'BEKLİYOR', sonraki_deneme = ? WHERE id = ? AND durum = 'GÖNDERİLİYOR'",
+        [(simdi, hid) for hid in birakilanlar]
+    )
+    conn.commit()
+    conn.close()
+    return True, f"{len(sonuclar)} gönderim sonucu kaydedildi."
+
+
+def hatirlatma_iptal(hatirlatma_id=None):
+    """Gönderilmemiş hatırlatmayı (id verilmezse bekleyen ve hatalı tümünü) iptal eder"""
+    conn = veritabani_baglantisi()
+    cursor = conn.cursor()
+    kosul, parametreler = ("AND id = ?", (hatirlatma_id,)) if hatirlatma_id is not None else ("", ())
+    cursor.execute(f'''
+        UPDATE hatirlatma_kutusu SET durum = 'İPTAL'
+        WHERE durum IN ('BEKLİYOR', 'HATA') {kosul}
+    ''', parametreler)
+    iptal = cursor.rowcount
+    conn.commit()
+    conn.close()
+    return True, f"{iptal} hatırlatma iptal edildi."
+
+
+def hatirlatma_ozeti():
+    """Gönderim kutusundaki kayıt sayıları: {durum: adet}, ayrıca 'hazir' (şimdi gönderilebilecek)"""
+    conn = veritabani_baglantisi()
+    cursor = conn.cursor()
+    cursor.execute('''
+        SELECT durum, COUNT(*) AS adet,
+               SUM(durum = 'BEKLİYOR' AND sonraki_deneme <= ?) AS hazir
+        FROM hatirlatma_kutusu
+        GROUP BY durum
+    ''', (_hatirlatma_zamani(),))
+    ozet = {"hazir": 0}
+    for satir in cursor.fetchall():
+        ozet[satir['durum']] = satir['adet']
+        ozet["hazir"] += satir['hazir']
+    conn.close()
+    return ozet
+
+
+def hatirlatma_listele(durum=None, sinir=500):
+    """Gönderim kutusunu son eklenenden başlayarak listeler (durum verilirse yalnızca o durumdakiler)"""
+    conn = veritabani_baglantisi()
+    cursor = conn.cursor()
+    kosul, parametreler = ("WHERE h.durum = ?", (durum,)) if durum else ("", ())
+    cursor.execute(f'''
+        SELECT h.id, h.musteri_id, m.ad, h.telefon, h.mesaj, h.bakiye, h.durum, h.deneme,
+               h.olusturma_tarihi, h.gonderim_tarihi, h.hata
+        FROM hatirlatma_kutusu h
+        LEFT JOIN musteriler m ON m.id = h.musteri_id
+        {kosul}
+        ORDER BY h.id DESC
+        LIMIT ?
+    ''', (*parametreler, sinir))
+    hatirlatmalar = cursor.fetchall()
+    conn.close()
+    return hatirlatmalar
+
+
+def hatirlatma_dosyasi(db_dosyasi=None):
+    """Dosya taşıyıcısının varsayılan çıktısı: veritabanının yanındaki <ad>_hatirlatmalar.jsonl"""
+    yol = db_dosyasi or etkin_veritabani()
+    if yol.startswith("file:"):
+        return "hatirlatmalar.jsonl"
+    return os.path.splitext(yol)[0] + "_hatirlatmalar.jsonl"
+
+
+class DosyaTasiyici:
+    """Hatırlatmaları JSON satırları olarak dosyaya ekleyen taşıyıcı
+    
+    Gerçek gönderim yerine geçer (denemeler, ya da dosyayı okuyup SMS/WhatsApp
+    ile gönderen harici bir araç için). Taşıyıcılar tek bir eşzamansız
+    gonder(hatirlatma) metodu sağlar; hata fırlatırsa gönderim yeniden denenir.
+    """
+    
+    def __init__(self, yol):
+        self.yol = yol
+        self._kilit = threading.Lock()
+    
+    async def gonder(self, hatirlatma):
+        satir = json.dumps({
+            "id": hatirlatma['id'],
+            "zaman": _hatirlatma_zamani(),
+            "telefon": hatirlatma['telefon'],
+            "mesaj": hatirlatma['mesaj'],
+        }, ensure_ascii=False)
+        await asyncio.to_thread(self._ekle, satir)
+    
+    def _ekle(self, satir):
+        with self._kilit, open(self.yol, "a", encoding="utf-8") as f:
+            f.write(satir + "\n")
+
+
+class HttpTasiyici:
+    """Hatırlatmaları bir SMS/WhatsApp ağ geçidine JSON olarak POST eden taşıyıcı
+    
+    Gövde: {"kimlik", "telefon" (kayıtlı hali), "numara" (son 10 hane), "mesaj"}.
+    2xx dışındaki yanıtlar ve bağlantı hataları gönderim hatası sayılır;
+    kimlik, yeniden denemede ağ geçidinin çift gönderimi ayıklaması içindir.
+    """
+    
+    def __init__(self, url, zaman_asimi=HATIRLATMA_ZAMAN_ASIMI_SN):
+        self.url = url
+        self.zaman_asimi = zaman_asimi
+    
+    async def gonder(self, hatirlatma):
+        govde = json.dumps({
+            "kimlik": hatirlatma['id'],
+            "telefon": hatirlatma['telefon'],
+            "numara": telefon_normallestir(hatirlatma['telefon']),
+            "mesaj": hatirlatma['mesaj'],
+        }, ensure_ascii=False).encode("utf-8")
+        await asyncio.to_thread(self._gonder, govde)
+    
+    def _gonder(self, govde):
+        istek = urllib.request.Request(self.url, data=govde, headers={"Content-Type": "application/json"})
+        with urllib.request.urlopen(istek, timeout=self.zaman_asimi) as yanit:
+            yanit.read()
+
+
+def tasiyici_olustur(hedef):
+    """Hedefe uygun taşıyıcı: http(s):// adresi için HttpTasiyici, diğerleri için DosyaTasiyici"""
+    if hedef.startswith(("http://", "https://")):
+        return HttpTasiyici(hedef)
+    return DosyaTasiyici(hedef)
+
+
+class HatirlatmaGonderici:
+    """Gönderim kutusundaki hatırlatmaları hız sınırıyla ileten asyncio göndericisi
+    
+    Kutudan HATIRLATMA_PAKET kayıtlık paketler ayrılır; gönderimler en az
+    1/saniyede sn arayla başlar, en fazla HATIRLATMA_ES_ZAMANLI tanesi aynı
+    anda sürer. Paketin sonuçları tek yazma işlemiyle kutuya işlenir.
+    Veritabanı çağrıları iş parçacığı havuzunda yapılır, olay döngüsü
+    beklemez. baslat() göndericiyi arka plan iş parçacığında çalıştırır;
+    her paketin sonucu 'sonuclar' kuyruğuna (gonderilen, hatali) olarak konur.
+    """
+    
+    def __init__(self, veri, tasiyici, saniyede=HATIRLATMA_SANIYEDE):
+        self.veri = veri
+        self.tasiyici = tasiyici
+        self.aralik = 1 / saniyede
+        self.sonuclar = queue.Queue()
+        self.is_parcacigi = None
+        self._dur = False
+        self._dongu = None
+        self._uyari = None
+        self._siradaki = 0.0
+    
+    async def _sira_bekle(self):
+        """Hız sınırı: her gönderim bir öncekinden en az self.aralik sn sonra başlar"""
+        simdi = asyncio.get_running_loop().time()
+        bekleme = self._siradaki - simdi
+        self._siradaki = max(self._siradaki, simdi) + self.aralik
+        if bekleme > 0:
+            await asyncio.sleep(bekleme)
+    
+    async def _gonder(self, hatirlatma, sinir):
+        """Tek hatırlatmayı gönderir: (id, hata) ya da durdurulurken denenmediyse None"""
+        async with sinir:
+            await self._sira_bekle()
+            if self._dur:
+                return None
+            try:
+                await asyncio.wait_for(self.tasiyici.gonder(hatirlatma), HATIRLATMA_ZAMAN_ASIMI_SN)
+            except Exception as e:
+                # Taşıyıcının her hatası kaydı düşürmez, yeniden deneme sırasına koyar
+                return hatirlatma['id'], f"{type(e).__name__}: {e}"
+            return hatirlatma['id'], None
+    
+    async def paket_gonder(self):
+        """Kutudan bir paket ayırıp gönderir; (gonderilen, hatali) ya da gönderilecek yoksa None"""
+        if not (await asyncio.to_thread(self.veri.hatirlatma_ozeti))["hazir"]:
+            # Boş kutuda yazma yapılmaz; bakım servisi programı boşta görebilsin
+            return None
+        paket = await asyncio.to_thread(self.veri.hatirlatmalari_al, HATIRLATMA_PAKET)
+        if not paket:
+            return None
+        sinir = asyncio.Semaphore(HATIRLATMA_ES_ZAMANLI)
+        sonuclar = await asyncio.gather(*(self._gonder(h, sinir) for h in paket))
+        birakilanlar = [h['id'] for h, sonuc in zip(paket, sonuclar) if sonuc is None]
+        sonuclar = [sonuc for sonuc in sonuclar if sonuc is not None]
+        await asyncio.to_thread(self.veri.hatirlatma_sonuclarini_yaz, sonuclar, birakilanlar)
+        hatali = sum(1 for _, hata in sonuclar if hata is not None)
+        self.sonuclar.put((len(sonuclar) - hatali, hatali))
+        return len(sonuclar) - hatali, hatali
+    
+    async def bosalt(self):
+        """Şimdi gönderilebilecek kayıt kalmayana kadar gönderir; toplam (gonderilen, hatali)"""
+        gonderilen = hatali = 0
+        while not self._dur:
+            sonuc = await self.paket_gonder()
+            if sonuc is None:
+                break
+            gonderilen, hatali = gonderilen + sonuc[0], hatali + sonuc[1]
+        return gonderilen, hatali
+    
+    async def _calis(self):
+        self._dongu = asyncio.get_running_loop()
+        self._uyari = asyncio.Event()
+        while not self._dur:
+            try:
+                await self.bosalt()
+            except (sqlite3.Error, OSError, UzakDefterHatasi):
+                pass  # Dosya meşgul ya da sunucuya ulaşılamıyor; bir sonraki kontrolde denenir
+            if self._dur:
+                break
+            try:
+                await asyncio.wait_for(self._uyari.wait(), HATIRLATMA_KONTROL_SN)
+            except asyncio.TimeoutError:
+                pass
+            # Gönderim sürerken gelen uyarı kaybolmasın diye beklemeden sonra temizlenir
+            self._uyari.clear()
+    
+    def baslat(self):
+        """Göndericiyi arka plan iş parçacığında çalıştırır (arayüz beklemez)"""
+        if self.is_parcacigi is None or not self.is_parcacigi.is_alive():
+            self._dur = False
+            self.is_parcacigi = threading.Thread(target=asyncio.run, args=(self._calis(),), daemon=True)
+            self.is_parcacigi.start()
+    
+    def uyandir(self):
+        """Kutuya yeni kayıt eklendiğini bildirir; kontrol aralığı beklenmez"""
+        if self._dongu is not None and not self._dongu.is_closed():
+            self._dongu.call_soon_threadsafe(self._uyari.set)
+    
+    def durdur(self, zaman_asimi=5):
+        """Göndericiyi durdurur; süren gönderimler biter, başlamamış olanlar sıraya döner"""
+        self._dur = True
+        self.uyandir()
+        if self.is_parcacigi is not None:
+            self.is_parcacigi.join(zaman_asimi)
+
+
+def hatirlatma_komutu(defter, alt_bakiye, alt_gun, hedef=None, saniyede=HATIRLATMA_SANIYEDE):
+    """Komut satırından hatırlatmaları kuyruğa alır ve gönderim kutusunu boşaltır"""
+    veri = SqliteDefter(defter)
+    veri.hazirla()
+    basarili, mesaj = veri.hatirlatmalari_kuyruga_al(alt_bakiye, alt_gun)
+    print(mesaj)
+    if not basarili:
+        return 1
+    hedef = hedef or hatirlatma_dosyasi(defter or DB_FILE)
+    baslangic = time.perf_counter()
+    gonderilen, hatali = asyncio.run(HatirlatmaGonderici(veri, tasiyici_olustur(hedef), saniyede).bosalt())
+    print(f"{hedef}: {gonderilen} hatırlatma gönderildi, {hatali} hata "
+          f"({time.perf_counter() - baslangic:.1f} sn)")
+    if hatali:
+        print("Hatalı gönderimler beklemeyle yeniden denenecek.")
+    return 0
+
+
+# ============================================================================
+# RAPOR FONKSİYONLARI
+# ============================================================================
+
+# PDF yazı tipleri: reportlab ile gelen Bitstream Vera Türkçe harflerin tamamını içerir
+PDF_YAZI_TIPI = "EsnafSans"
+PDF_KALIN_YAZI_TIPI = "EsnafSans-Kalin"
+PDF_YAZI_DOSYALARI = {PDF_YAZI_TIPI: "Vera.ttf", PDF_KALIN_YAZI_TIPI: "VeraBd.ttf"}
+
+# Süreç başına bir kez hazırlanan rapor stilleri (pdf_stilleri)
+_pdf_stilleri = None
+_pdf_kilidi = threading.Lock()
+
+
+def pdf_stilleri():
+    """PDF raporlarının paragraf ve tablo stillerini döndürür
+    
+    Yazı tipleri ilk çağrıda bir kez ayrıştırılıp kaydedilir; her belgeye
+    yalnızca kullanılan harfler (alt küme) gömülür. Stil nesneleri
+    raporlar arasında paylaşılır, her dışa aktarımda yeniden kurulmaz.
+    """
+    global _pdf_stilleri
+    if _pdf_stilleri is not None:
+        return _pdf_stilleri
+    with _pdf_kilidi:
+        if _pdf_stilleri is not None:
+            return _pdf_stilleri
+        for ad, dosya in PDF_YAZI_DOSYALARI.items():
+            pdfmetrics.registerFont(TTFont(ad, dosya))
+        pdfmetrics.registerFontFamily(PDF_YAZI_TIPI, normal=PDF_YAZI_TIPI, bold=PDF_KALIN_YAZI_TIPI,
+                                      italic=PDF_YAZI_TIPI, boldItalic=PDF_KALIN_YAZI_TIPI)
+        styles = getSampleStyleSheet()
+        
+        tablo_komutlari = [
+            ('FONTNAME', (0, 0), (-1, -1), PDF_YAZI_TIPI),
+            ('FONTNAME', (0, 0), (-1, 0), PDF_KALIN_YAZI_TIPI),
+            ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+            ('FONTSIZE', (0, 0), (-1, -1), 9),
+            ('BOTTOMPADDING', (0, 0), (-1, 0), 8),
+            ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+            ('GRID', (0, 0), (-1, -1), 1, colors.black),
+        ]
+        ozet_komutlari = [
+            ('FONTNAME', (0, 0), (-1, -1), PDF_YAZI_TIPI),
+            ('FONTNAME', (0, 2), (-1, 2), PDF_KALIN_YAZI_TIPI),
+            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+            ('FONTSIZE', (0, 0), (-1, -1), 12),
+            ('BOTTOMPADDING', (0, 0), (-1, -1), 10),
+            ('GRID', (0, 0), (-1, -1), 1, colors.black),
+        ]
+        _pdf_stilleri = {
+            "baslik": ParagraphStyle('Baslik', parent=styles['Heading1'], fontName=PDF_KALIN_YAZI_TIPI,
+                                     fontSize=18, alignment=1, spaceAfter=20),
+            "normal": ParagraphStyle('Normal', parent=styles['Normal'], fontName=PDF_YAZI_TIPI,
+                                     fontSize=10, spaceAfter=5),
+            "toplam": ParagraphStyle('Toplam', parent=styles['Heading2'], fontName=PDF_KALIN_YAZI_TIPI,
+                                     fontSize=14, alignment=1),
+            # Sağa yaslı sütunlu türevleri pdf_tablo_stili ilk kullanımda ekler
+            "tablo": TableStyle(tablo_komutlari),
+            "ozet_kar": TableStyle(ozet_komutlari + [('BACKGROUND', (0, 2), (-1, 2), colors.lightgreen)]),
+            "ozet_zarar": TableStyle(ozet_komutlari + [('BACKGROUND', (0, 2), (-1, 2), colors.lightcoral)]),
+        }
+    return _pdf_stilleri
+
+
+def _rapor_modeli(tur, baslik, dosya_adi, bolumler):
+    """Rapor modelini oluşturur
+    
+    Model JSON'a yazılabilir bir sözlüktür: başlık, oluşturma tarihi,
+    varsayılan dosya adı (uzantısız) ve sırayla yazılacak bölümler. Bölüm
+    türleri: baslik, alt_baslik, metin, ozet (etiket/tutar satırları),
+    tablo (sütunlar, satırlar, cm genişlikleri, sağa yaslı sütunlar) ve toplam.
+    """
+    return {
+        "tur": tur,
+        "baslik": baslik,
+        "tarih": datetime.now().strftime('%d.%m.%Y %H:%M'),
+        "dosya_adi": dosya_adi,
+        "bolumler": bolumler,
+    }
+
+
+def borc_raporu_modeli(veri=None):
+    """Borç-alacak raporunun modelini oluşturur (veri: arka uç, varsayılan yerel)"""
+    if veri is None:
+        veri = SqliteDefter()
+    bolumler = []
+    toplam_bakiye = 0
+    
+    for musteri in veri.musteri_ozetleri():
+        bakiye = musteri['bakiye']
+        toplam_bakiye += bakiye
+        
+        if bakiye != 0:
+            durum = "BORÇLU" if bakiye > 0 else "ALACAKLI"
+            bolumler.append({"tur": "alt_baslik", "metin": f"Müşteri: {musteri['ad']}"})
+            if musteri['telefon']:
+                bolumler.append({"tur": "metin", "metin": f"Telefon: {musteri['telefon']}"})
+            bolumler.append({"tur": "metin", "metin": f"Bakiye: {abs(bakiye):.2f} TL ({durum})"})
+            
+            # İşlem detayları
+            islemler = veri.islem_listele(musteri['id'])
+            if islemler:
+                bolumler.append({
+                    "tur": "tablo",
+                    "sutunlar": ["Tarih", "Tür", "Tutar", "Açıklama"],
+                    "satirlar": [[islem['tarih'], islem['islem_turu'], tutar_metni(islem), islem['aciklama'] or "-"]
+                                 for islem in islemler],
+                    "genislikler": [2.5, 2, 6, 6],
+                    "sag": [],
+                })
+    
+    if toplam_bakiye > 0:
+        toplam_metin = f"GENEL TOPLAM: {toplam_bakiye:.2f} TL (Alacağınız var)"
+    elif toplam_bakiye < 0:
+        toplam_metin = f"GENEL TOPLAM: {abs(toplam_bakiye):.2f} TL (Borcunuz var)"
+    else:
+        toplam_metin = "GENEL TOPLAM: 0.00 TL (Dengede)"
+    bolumler.append({"tur": "toplam", "metin": toplam_metin})
+    
+    return _rapor_modeli("borc", "BORÇ - ALACAK RAPORU",
+                         f"borc_alacak_raporu_{datetime.now().strftime('%Y%m%d_%H%M%S')}", bolumler)
+
+
+def kasa_raporu_modeli(yil=None, ay=None, veri=None):
+    """Kasa raporunun modelini oluşturur (veri: arka uç, varsayılan yerel)"""
+    if veri is None:
+        veri = SqliteDefter()
+    bolumler = []
+    
+    if yil and ay:
+        baslik = f"KASA RAPORU - {ay:02d}/{yil}"
+        dosya_adi = f"kasa_raporu_{yil}_{ay:02d}_{datetime.now().strftime('%H%M%S')}"
+        ciro, gider, net = veri.kasa_aylik_ozet(yil, ay)
+    else:
+        baslik = "KASA RAPORU - TÜM ZAMANLAR"
+        dosya_adi = f"kasa_raporu_tum_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        ciro, gider, net = veri.kasa_toplam_ozet()
+    
+    bolumler.append({
+        "tur": "ozet",
+        "satirlar": [["Toplam Ciro", ciro], ["Toplam Gider", gider],
+                     ["NET KÂR" if net >= 0 else "NET ZARAR", abs(net)]],
+        "birim": "TL",
+        "vurgu": "kar" if net >= 0 else "zarar",
+    })
+    bolumler.append({"tur": "baslik", "metin": "DETAYLI İŞLEMLER"})
+    
+    if yil and ay:
+        islemler = veri.kasa_ay_islemleri(yil, ay)
+    else:
+        islemler = veri.kasa_islem_listele()
+        kapanis = veri.kapali_donem_sonu()
+        if kapanis is not None:
+            bolumler.append({"tur": "metin", "metin": f"({kapanis} ve önceki yılların işlemleri arşivdedir)"})
+    
+    if islemler:
+        bolumler.append({
+            "tur": "tablo",
+            "sutunlar": ["Tarih", "Tür", "Tutar (TL)", "Açıklama"],
+            "satirlar": [[islem['tarih'], islem['islem_turu'], islem['tutar'], islem['aciklama'] or "-"]
+                         for islem in islemler],
+            "genislikler": [3, 2.5, 3, 8],
+            "sag": [2],
+        })
+    else:
+        bolumler.append({"tur": "metin", "metin": "Bu dönem için işlem bulunamadı."})
+    
+    return _rapor_modeli("kasa", baslik, dosya_adi, bolumler)
+
+
+def kategori_raporu_modeli(yil, ay=None, etiket=None, veri=None):
+    """Kategori bazında ciro/gider raporunun modelini oluşturur"""
+    if veri is None:
+        veri = SqliteDefter()
+    baslik = (f"KATEGORİ RAPORU - {f'{int(ay):02d}/' if ay else ''}{yil}"
+              + (f" (Etiket: {etiket})" if etiket else ""))
+    
+    satirlar = [[satir['donem'], satir['islem_turu'], satir['kategori'], satir['toplam'], satir['adet']]
+                for satir in veri.kategori_ozeti(yil, ay, etiket)]
+    if satirlar:
+        bolumler = [{
+            "tur": "tablo",
+            "sutunlar": ["Dönem", "Tür", "Kategori", "Tutar (TL)", "Adet"],
+            "satirlar": satirlar,
+            "genislikler": [2.5, 2.5, 6, 3.5, 2],
+            "sag": [3, 4],
+        }]
+    else:
+        bolumler = [{"tur": "metin", "metin": "Bu dönem için işlem bulunamadı."}]
+    
+    return _rapor_modeli("kategori", baslik,
+                         f"kategori_raporu_{yil}{f'_{int(ay):02d}' if ay else ''}_{datetime.now().strftime('%H%M%S')}",
+                         bolumler)
+
+
+def rapor_modeli(tur, yil=None, ay=None, etiket=None, veri=None):
+    """Raporu bir kez hesaplayıp biçimden bağımsız modelini döndürür
+    
+    tur: "borc", "kasa" veya "kategori". Uzak arka uçta model sunucuda tek
+    istekle hesaplanır; metin, PDF, HTML ve CSV çıktıları bu modelden yerelde
+    üretilir.
+    """
+    if tur == "borc":
+        return borc_raporu_modeli(veri)
+    if tur == "kasa":
+        return kasa_raporu_modeli(yil, ay, veri)
+    if tur == "kategori":
+        return kategori_raporu_modeli(yil or date.today().year, ay, etiket, veri)
+    raise ValueError(f"Bilinmeyen rapor türü: {tur}")
+
+
+def rapor_hucresi(deger):
+    """Rapor tablosundaki bir değeri metne çevirir (tutarlar iki ondalıklı)"""
+    if isinstance(deger, float):
+        return f"{deger:.2f}"
+    return "-" if deger is None else str(deger)
+
+
+def _metin_tablosu(bolum):
+    """Tablo bölümünü hizalı metin satırlarına çevirir"""
+    hucreler = [bolum["sutunlar"]] + [[rapor_hucresi(d) for d in satir] for satir in bolum["satirlar"]]
+    genislikler = [max(map(len, sutun)) for sutun in zip(*hucreler)]
+    # Satır biçimi bir kez kurulur, her satır tek format çağrısıyla hizalanır
+    bicim = "  " + "  ".join(f"{{:{'>' if i in bolum['sag'] else '<'}{g}}}" for i, g in enumerate(genislikler))
+    cizgi = "  " + "-" * (sum(genislikler) + 2 * (len(genislikler) - 1))
+    satirlar = [bicim.format(*satir).rstrip() for satir in hucreler]
+    satirlar.insert(1, cizgi)
+    return satirlar
+
+
+def metin_yazici(model):
+    """Rapor modelini düz metin olarak yazar"""
+    rapor = ["=" * 60, model["baslik"], f"Rapor Tarihi: {model['tarih']}", "=" * 60]
+    for bolum in model["bolumler"]:
+        tur = bolum["tur"]
+        if tur in ("baslik", "toplam"):
+            rapor += ["", "=" * 60, bolum["metin"], "=" * 60]
+        elif tur == "alt_baslik":
+            rapor += ["", bolum["metin"]]
+        elif tur == "metin":
+            rapor.append(bolum["metin"])
+        elif tur == "ozet":
+            genislik = max(len(etiket) for etiket, _ in bolum["satirlar"]) + 2
+            rapor.append("")
+            for i, (etiket, tutar) in enumerate(bolum["satirlar"]):
+                if i == len(bolum["satirlar"]) - 1:
+                    rapor.append("-" * 40)
+                rapor.append(f"{etiket + ':':<{genislik}}{tutar:>14.2f} {bolum['birim']}")
+        elif tur == "tablo":
+            rapor += _metin_tablosu(bolum)
+    return "\n".join(rapor)
+
+
+def pdf_tablo_stili(sag_sutunlar):
+    """Verilen sütunları sağa yaslı tablo stili (sütun kümesi başına bir kez kurulur)"""
+    stiller = pdf_stilleri()
+    anahtar = ("tablo", *sag_sutunlar)
+    stil = stiller.get(anahtar)
+    if stil is None:
+        stil = stiller[anahtar] = TableStyle([('ALIGN', (i, 1), (i, -1), 'RIGHT') for i in sag_sutunlar],
+                                             parent=stiller["tablo"])
+    return stil
+
+
+def pdf_yazici(model):
+    """Rapor modelini PDF olarak yazar, belgenin baytlarını döndürür"""
+    stiller = pdf_stilleri()
+    elements = [
+        Paragraph(escape(model["baslik"]), stiller["baslik"]),
+        Paragraph(f"Rapor Tarihi: {model['tarih']}", stiller["normal"]),
+        Spacer(1, 20),
+    ]
+    for bolum in model["bolumler"]:
+        tur = bolum["tur"]
+        if tur == "baslik":
+            elements.append(Paragraph(escape(bolum["metin"]), stiller["baslik"]))
+        elif tur in ("alt_baslik", "metin"):
+            elements.append(Paragraph(escape(bolum["metin"]), stiller["normal"]))
+        elif tur == "ozet":
+            tablo = Table([[etiket, f"{tutar:.2f} {bolum['birim']}"] for etiket, tutar in bolum["satirlar"]],
+                          colWidths=[6*cm, 6*cm])
+            tablo.setStyle(stiller[f"ozet_{bolum['vurgu']}"])
+            elements += [tablo, Spacer(1, 30)]
+        elif tur == "tablo":
+            tablo = Table([bolum["sutunlar"]] + [[rapor_hucresi(d) for d in satir] for satir in bolum["satirlar"]],
+                          colWidths=[g*cm for g in bolum["genislikler"]], repeatRows=1)
+            tablo.setStyle(pdf_tablo_stili(bolum["sag"]))
+            elements += [tablo, Spacer(1, 15)]
+        elif tur == "toplam":
+            elements += [Spacer(1, 20), Paragraph(escape(bolum["metin"]), stiller["toplam"])]
+    
+    cikti = io.BytesIO()
+    SimpleDocTemplate(cikti, pagesize=A4, topMargin=1*cm, bottomMargin=1*cm).build(elements)
+    return cikti.getvalue()
+
+
+# HTML raporlarının gömülü stili (dosya tek başına açılabilsin diye harici CSS yok)
+RAPOR_HTML_STILI = """
+body { font-family: Arial, sans-serif; margin: 2em; color: #222; }
+h1, h2, .toplam { text-align: center; }
+.tarih { color: #666; }
+table { border-collapse: collapse; margin: 0.5em 0 1.5em; }
+th, td { border: 1px solid #000; padding: 4px 8px; }
+thead th { background: #808080; color: #fff; }
+tbody td { background: #f5f5dc; }
+td.sag { text-align: right; }
+.ozet td { text-align: right; font-size: 1.1em; }
+.ozet tr:last-child { font-weight: bold; }
+.ozet.kar tr:last-child { background: #90ee90; }
+.ozet.zarar tr:last-child { background: #f08080; }
+.toplam { font-size: 1.3em; font-weight: bold; }
+"""
+
+
+def html_yazici(model):
+    """Rapor modelini tek başına açılabilen HTML sayfası olarak yazar"""
+    parcalar = [
+        '<!DOCTYPE html>',
+        '<html lang="tr"><head><meta charset="utf-8">',
+        f'<title>{escape(model["baslik"])}</title>',
+        f'<style>{RAPOR_HTML_STILI}</style></head><body>',
+        f'<h1>{escape(model["baslik"])}</h1>',
+        f'<p class="tarih">Rapor Tarihi: {model["tarih"]}</p>',
+    ]
+    for bolum in model["bolumler"]:
+        tur = bolum["tur"]
+        if tur == "baslik":
+            parcalar.append(f'<h2>{escape(bolum["metin"])}</h2>')
+        elif tur == "alt_baslik":
+            parcalar.append(f'<h3>{escape(bolum["metin"])}</h3>')
+        elif tur == "metin":
+            parcalar.append(f'<p>{escape(bolum["metin"])}</p>')
+        elif tur == "ozet":
+            parcalar.append(f'<table class="ozet {bolum["vurgu"]}">')
+            parcalar += [f'<tr><th>{escape(etiket)}</th><td>{tutar:.2f} {bolum["birim"]}</td></tr>'
+                         for etiket, tutar in bolum["satirlar"]]
+            parcalar.append('</table>')
+        elif tur == "tablo":
+            sag = set(bolum["sag"])
+            parcalar.append('<table><thead><tr>'
+                            + "".join(f'<th>{escape(s)}</th>' for s in bolum["sutunlar"])
+                            + '</tr></thead><tbody>')
+            parcalar += ['<tr>' + "".join(f'<td class="sag">{escape(rapor_hucresi(d))}</td>' if i in sag
+                                          else f'<td>{escape(rapor_hucresi(d))}</td>'
+                                          for i, d in enumerate(satir)) + '</tr>'
+                         for satir in bolum["satirlar"]]
+            parcalar.append('</tbody></table>')
+        elif tur == "toplam":
+            parcalar.append(f'<p class="toplam">{escape(bolum["metin"])}</p>')
+    parcalar.append('</body></html>')
+    return "\n".join(parcalar)
+
+
+def csv_hucresi(deger):
+    """CSV hücresi: tutarlar Türkçe Excel'in okuduğu virgüllü ondalıkla yazılır"""
+    if isinstance(deger, float):
+        return f"{deger:.2f}".replace(".", ",")
+    metin = rapor_hucresi(deger)
+    # Açıklamadaki "=..." gibi metinler Excel'de formül olarak çalışmasın
+    if isinstance(deger, str) and metin[:1] in ("=", "+", "-", "@"):
+        return "'" + metin
+    return metin
+
+
+def csv_yazici(model):
+    """Rapor modelini Excel'in doğrudan açtığı ';' ayırıcılı CSV olarak yazar"""
+    cikti = io.StringIO()
+    yazici = csv.writer(cikti, delimiter=";", lineterminator="\r\n")
+    yazici.writerow([model["baslik"]])
+    yazici.writerow(["Rapor Tarihi", model["tarih"]])
+    for bolum in model["bolumler"]:
+        tur = bolum["tur"]
+        if tur in ("baslik", "alt_baslik", "toplam"):
+            yazici.writerow([])
+            yazici.writerow([bolum["metin"]])
+        elif tur == "metin":
+            yazici.writerow([bolum["metin"]])
+        elif tur == "ozet":
+            yazici.writerow([])
+            yazici.writerows([etiket, csv_hucresi(tutar), bolum["birim"]] for etiket, tutar in bolum["satirlar"])
+        elif tur == "tablo":
+            yazici.writerow(bolum["sutunlar"])
+            yazici.writerows([csv_hucresi(d) for d in satir] for satir in bolum["satirlar"])
+    return cikti.getvalue()
+
+
+# Rapor biçimleri: yazıcı, dosya uzantısı ve metin kodlaması (None: yazıcı bayt döndürür).
+# Yeni bir biçim için modeli alıp metin/bayt döndüren bir yazıcı eklemek yeterlidir.
+# CSV'deki BOM, Excel'in dosyayı Türkçe harflerle açması içindir.
+RAPOR_BICIMLERI = {
+    "metin": (metin_yazici, ".txt", "utf-8"),
+    "html": (html_yazici, ".html", "utf-8"),
+    "csv": (csv_yazici, ".csv", "utf-8-sig"),
+    "pdf": (pdf_yazici, ".pdf", None),
+}
+
+
+def rapor_dosyasi_yaz(model, bicim, dosya_yolu=None):
+    """Rapor modelini verilen biçimde dosyaya yazar, dosya yolunu döndürür"""
+    yazici, uzanti, kodlama = RAPOR_BICIMLERI[bicim]
+    if not dosya_yolu:
+        dosya_yolu = model["dosya_adi"] + uzanti
+    icerik = yazici(model)
+    if kodlama is None:
+        with open(dosya_yolu, "wb") as f:
+            f.write(icerik)
+    else:
+        with open(dosya_yolu, "w", encoding=kodlama, newline="") as f:
+            f.write(icerik)
+    return dosya_yolu
+
+
+def rapor_disa_aktar(model, bicimler, dosya_koku=None):
+    """Bir kez hesaplanmış raporu birden çok biçimde yazar
+    
+    dosya_koku uzantısız dosya yoludur (varsayılan modelin dosya adı); her
+    biçim kendi uzantısıyla yazılır. Yazılan dosyaların yollarını döndürür.
+    """
+    kok = dosya_koku or model["dosya_adi"]
+    return [rapor_dosyasi_yaz(model, bicim, kok + RAPOR_BICIMLERI[bicim][1]) for bicim in bicimler]
+
+
+def borc_raporu_olustur(veri=None):
+    """Borç-alacak raporunu metin olarak oluşturur (veri: arka uç, varsayılan yerel)"""
+    return metin_yazici(borc_raporu_modeli(veri))
+
+
+def kasa_raporu_olustur(yil=None, ay=None, veri=None):
+    """Kasa raporunu metin olarak oluşturur (veri: arka uç, varsayılan yerel)"""
+    return metin_yazici(kasa_raporu_modeli(yil, ay, veri))
+
+
+def kategori_raporu_olustur(yil, ay=None, etiket=None, veri=None):
+    """Kategori bazında ciro/gider raporunu metin olarak oluşturur"""
+    return metin_yazici(kategori_raporu_modeli(yil, ay, etiket, veri))
+
+
+def borc_raporu_pdf_olustur(dosya_yolu=None, veri=None):
+    """Borç-alacak raporunu PDF olarak oluşturur (veri: arka uç, varsayılan yerel)"""
+    return rapor_dosyasi_yaz(borc_raporu_modeli(veri), "pdf", dosya_yolu)
+
+
+def kasa_raporu_pdf_olustur(yil=None, ay=None, dosya_yolu=None, veri=None):
+    """Kasa raporunu PDF olarak oluşturur (veri: arka uç, varsayılan yerel)"""
+    return rapor_dosyasi_yaz(kasa_raporu_modeli(yil, ay, veri), "pdf", dosya_yolu)
+
+
+def kategori_raporu_pdf_olustur(yil, ay=None, etiket=None, dosya_yolu=None, veri=None):
+    """Kategori raporunu PDF olarak oluşturur (veri: arka uç, varsayılan yerel)"""
+    return rapor_dosyasi_yaz(kategori_raporu_modeli(yil, ay, etiket, veri), "pdf", dosya_yolu)
+
+
+def rapor_komutu(defter, tur, bicimler, dosya_koku=None, yil=None, ay=None, etiket=None):
+    """Komut satırından raporu bir kez hesaplayıp istenen biçimlerde dosyaya yazar"""
+    veri = SqliteDefter(defter)
+    veri.hazirla()
+    baslangic = time.perf_counter()
+    model = veri.rapor_modeli(tur, yil, ay, etiket)
+    print(f"{model['baslik']} hazırlandı ({(time.perf_counter() - baslangic) * 1000:.0f} ms)")
+    try:
+        for dosya in rapor_disa_aktar(model, bicimler, dosya_koku):
+            print(f"  {dosya}")
+    except OSError as e:
+        print(f"Rapor yazılamadı: {e}")
+        return 1
+    return 0
+
+
+# ============================================================================
+# VERİ ARKA UÇLARI
+# ============================================================================
+
+# Arka uçların sunduğu veri fonksiyonları
+OKUMA_FONKSIYONLARI = (
+    "musteri_listele", "musteri_ozetleri", "musteri_ozeti", "musteri_bakiye_hesapla",
+    "islem_listele", "musteri_ekstresi", "genel_borc_ozeti", "gecikmis_borclar",
+    "musteri_doviz_bakiyesi", "kur_getir", "kur_listele",
+    "kasa_gunluk_ozet", "kasa_aylik_ozet", "kasa_islem_listele", "kasa_ay_islemleri",
+    "kasa_toplam_ozet", "kapali_donem_sonu", "arsiv_islem_listele", "tekrarlayan_listele",
+    "kategori_listele", "etiket_listele", "kategori_ozeti", "bakim_metrikleri",
+    "urun_listele", "urun_kodlari", "musteri_benzerleri",
+    "kolon_goruntusu_olustur", "kolon_goruntusu_kaldir", "kolon_ozeti",
+    "hatirlatma_adaylari", "hatirlatma_ozeti", "hatirlatma_listele",
+    "rapor_modeli", "borc_raporu_olustur", "kasa_raporu_olustur", "kategori_raporu_olustur",
+)
+YAZMA_FONKSIYONLARI = (
+    "musteri_ekle", "musteri_sil", "islem_ekle", "islem_sil",
+    "kasa_islem_ekle", "kasa_islem_sil", "geri_al", "son_silmeyi_geri_al",
+    "donem_kapat", "silinenleri_arsivle", "toplu_kaydet",
+    "tekrarlayan_ekle", "tekrarlayan_sil", "tekrarlayanlari_uret",
+    "kategori_ekle", "kategori_sil", "etiketle", "kur_ekle", "butunluk_kontrol", "bakim_calistir",
+    "senk_paketi_olustur", "senk_paketini_uygula", "senk_kimligi_yenile",
+    "urunleri_kaydet", "urun_kaydet", "urun_sil", "satis_kaydet", "musteri_birlestir",
+    "hatirlatmalari_kuyruga_al", "hatirlatmalari_al", "hatirlatma_sonuclarini_yaz", "hatirlatma_iptal",
+)
+# Ürün kataloğunu değiştiren yazma fonksiyonları (ürün kod indeksi bunlardan sonra yenilenir)
+URUN_FONKSIYONLARI = ("urunleri_kaydet", "urun_kaydet", "urun_sil")
+# Müşteri listesini veya bakiyeleri değiştirebilen yazma fonksiyonları (müşteri önbelleği bunlardan sonra yenilenir)
+MUSTERI_FONKSIYONLARI = (
+    "musteri_ekle", "musteri_sil", "islem_ekle", "islem_sil", "geri_al", "son_silmeyi_geri_al",
+    "donem_kapat", "silinenleri_arsivle", "toplu_kaydet", "butunluk_kontrol", "senk_paketini_uygula",
+    "satis_kaydet", "musteri_birlestir",
+)
+PDF_FONKSIYONLARI = ("borc_raporu_pdf_olustur", "kasa_raporu_pdf_olustur", "kategori_raporu_pdf_olustur")
+
+
+class DefterArkaUcu:
+    """Arayüzün ve raporların bağlı olduğu veri arka ucu
+    
+    OKUMA_FONKSIYONLARI, YAZMA_FONKSIYONLARI ve PDF_FONKSIYONLARI'ndaki her
+    ad bu sınıfta aynı imzalı bir metottur. Alt sınıflar yalnızca
+    _cagir(ad, *args, **kwargs) metodunu sağlar.
+    
+    Her yazma çağrısından sonra yazma_surumu artar; önbellekler bu
+    sayaçla geçerliliklerini kontrol eder. Ürün kataloğunu değiştiren
+    çağrılar ayrıca urun_surumu'nu, müşterileri veya bakiyeleri
+    değiştirebilenler musteri_surumu'nu artırır.
+    """
+    
+    yazma_surumu = 0
+    urun_surumu = 0
+    musteri_surumu = 0
+    
+    def _cagir(self, ad, *args, **kwargs):
+        raise NotImplementedError
+
+
+def _arka_uc_metodu(ad):
+    """DefterArkaUcu için ada göre _cagir'a yönlendiren metot üretir"""
+    if ad in YAZMA_FONKSIYONLARI:
+        def metot(self, *args, **kwargs):
+            try:
+                return self._cagir(ad, *args, **kwargs)
+            finally:
+                # Önbellekler bu sayaç değişince kendini yeniler
+                self.yazma_surumu += 1
+                if ad in URUN_FONKSIYONLARI:
+                    self.urun_surumu += 1
+                if ad in MUSTERI_FONKSIYONLARI:
+                    self.musteri_surumu += 1
+    else:
+        def metot(self, *args, **kwargs):
+            return self._cagir(ad, *args, **kwargs)
+    metot.__name__ = ad
+    metot.__doc__ = globals()[ad].__doc__
+    return metot
+
+
+for _ad in OKUMA_FONKSIYONLARI + YAZMA_FONKSIYONLARI + PDF_FONKSIYONLARI:
+    setattr(DefterArkaUcu, _ad, _arka_uc_metodu(_ad))
+
+
+class SqliteDefter(DefterArkaUcu):
+    """Yerel SQLite dosyası üzerinde çalışan arka uç
+    
+    db_dosyasi verilmezse DB_FILE kullanılır. Çağrı süresince modül
+    fonksiyonlarının açtığı bağlantılar bu dosyaya yönlenir.
+    """
+    
+    def __init__(self, db_dosyasi=None):
+        self.db_dosyasi = db_dosyasi
+    
+    def _cagir(self, ad, *args, **kwargs):
+        fonksiyon = globals()[ad]
+        if ad in YAZMA_FONKSIYONLARI or ad == "tablolari_olustur":
+            fonksiyon = partial(yazma_islemi, fonksiyon)
+        if self.db_dosyasi is None:
+            return fonksiyon(*args, **kwargs)
+        belirtec = _etkin_veritabani.set(self.db_dosyasi)
+        try:
+            return fonksiyon(*args, **kwargs)
+        finally:
+            _etkin_veritabani.reset(belirtec)
+    
+    def hazirla(self):
+        """Tabloları oluşturur (yoksa)"""
+        self._cagir("tablolari_olustur")
+    
+    def baglanti(self):
+        """Bu arka ucun veritabanına yeni bir bağlantı açar"""
+        return self._cagir("veritabani_baglantisi")
+
+
+class BellekDefter(SqliteDefter):
+    """Tamamen bellekte çalışan arka uç (testler ve ölçümler için)
+    
+    Aynı SQL kodunu paylaşımlı önbellekli bir bellek veritabanı üzerinde
+    çalıştırır. Nesne kapatılınca veriler kaybolur.
+    """
+    
+    _sayac = itertools.count(1)
+    
+    def __init__(self):
+        super().__init__(f"file:esnaf_bellek_{os.getpid()}_{next(self._sayac)}?mode=memory&cache=shared")
+        # Bellek veritabanı en az bir bağlantı açık kaldıkça yaşar
+        self._tutucu = sqlite3.connect(self.db_dosyasi, uri=True, check_same_thread=False)
+        self._tutucu.execute("ATTACH DATABASE ? AS arsiv", (self._cagir("arsiv_dosyasi"),))
+        self.hazirla()
+    
+    def kapat(self):
+        """Bellek veritabanını serbest bırakır"""
+        self._tutucu.close()
+
+
+# ============================================================================
+# MÜŞTERİ ÖNBELLEĞİ
+# ============================================================================
+
+class MusteriKaydi:
+    """Bellekte tutulan müşteri kaydı (__slots__ ile satır başına az bellek)"""
+    
+    __slots__ = ("id", "ad", "telefon", "not_alani", "bakiye")
+    
+    def __init__(self, id, ad, telefon, not_alani, bakiye):
+        self.id = id
+        self.ad = ad
+        self.telefon = telefon
+        self.not_alani = not_alani
+        self.bakiye = bakiye
+    
+    def __getitem__(self, anahtar):
+        # sqlite3.Row ile aynı kullanım: musteri['ad']
+        return getattr(self, anahtar)
+
+
+class MusteriOnbellegi:
+    """Arka uçtaki müşterilerin id ile erişilen bellek kopyası
+    
+    Kayıtlar ada göre sıralı bir listede, id -> konum eşlemesiyle tutulur.
+    Arka ucun musteri_surumu değiştiğinde (müşteri veya bakiye değiştiren
+    bir yazmadan sonra) ilk erişimde tek sorguyla yeniden yüklenir; kasa,
+    ürün gibi yazmalar önbelleği bozmaz. Tek müşteriyi etkileyen yazmadan
+    sonra kaydi_yenile yalnızca o kaydı okur.
+    """
+    
+    def __init__(self, veri):
+        self.veri = veri
+        self._kayitlar = []
+        self._konumlar = {}
+        self._surum = None
+    
+    def gecersiz_kil(self):
+        self._surum = None
+    
+    def _guncelle(self):
+        if self._surum == self.veri.musteri_surumu:
+            return
+        surum = self.veri.musteri_surumu
+        self.yukle(self.veri.musteri_ozetleri(), surum)
+    
+    def kaydi_yenile(self, musteri_id, onceki_surum):
+        """Tek müşteriyi etkileyen yazmadan sonra yalnızca o müşterinin kaydını okur
+        
+        onceki_surum yazmadan önceki musteri_surumu'dur. Önbellek o sürümde
+        güncel değilse ya da arada başka yazma olduysa tam yükleme
+        ilk erişime bırakılır.
+        """
+        surum = self.veri.musteri_surumu
+        konum = self._konumlar.get(musteri_id)
+        if self._surum != onceki_surum or surum != onceki_surum + 1 or konum is None:
+            return
+        m = self.veri.musteri_ozeti(musteri_id)
+        if m is None or m['ad'] != self._kayitlar[konum].ad:
+            return  # silinmiş ya da adı (sırası) değişmiş
+        self._kayitlar[konum] = MusteriKaydi(m['id'], m['ad'], m['telefon'], m['not_alani'], m['bakiye'])
+        self._surum = surum
+    
+    def yukle(self, satirlar, surum):
+        """Başka yerde (ör. arka planda) okunmuş musteri_ozetleri satırlarını yerleştirir
+        
+        surum, satırlar okunmadan önceki musteri_surumu olmalıdır; arada yazma
+        olduysa ilk erişimde yeniden yüklenir.
+        """
+        self._kayitlar = [
+            MusteriKaydi(m['id'], m['ad'], m['telefon'], m['not_alani'], m['bakiye'])
+            for m in satirlar
+        ]
+        self._konumlar = {kayit.id: konum for konum, kayit in enumerate(self._kayitlar)}
+        self._surum = surum
+    
+    def kayitlar(self):
+        """Ada göre sıralı müşteri kayıtları"""
+        self._guncelle()
+        return self._kayitlar
+    
+    def getir(self, musteri_id):
+        """id ile müşteri kaydı (yoksa None)"""
+        self._guncelle()
+        konum = self._konumlar.get(musteri_id)
+        return None if konum is None else self._kayitlar[konum]
+    
+    def konum(self, musteri_id):
+        """Müşterinin sıralı listedeki konumu (yoksa None)"""
+        self._guncelle()
+        return self._konumlar.get(musteri_id)
+    
+    def __len__(self):
+        self._guncelle()
+        return len(self._kayitlar)
+
+
+# ============================================================================
+# ÜRÜN KOD İNDEKSİ
+# ============================================================================
+
+class UrunKaydi:
+    """Bellekte tutulan ürün kaydı"""
+    
+    __slots__ = ("id", "kod", "barkod", "ad", "fiyat")
+    
+    def __init__(self, id, kod, barkod, ad, fiyat):
+        self.id = id
+        self.kod = kod
+        self.barkod = barkod
+        self.ad = ad
+        self.fiyat = fiyat
+    
+    def __getitem__(self, anahtar):
+        return getattr(self, anahtar)
+
+
+class UrunIndeksi:
+    """Satış ekranı için kod ve barkodla sabit sürede ürün arama
+    
+    Katalog ilk aramada tek sorguyla iki sözlüğe (barkod -> ürün,
+    kod -> ürün) yüklenir. Satışlar kataloğu değiştirmediğinden yazma_surumu
+    yerine arka ucun urun_surumu izlenir; yalnızca ürün ekleme, silme ve
+    toplu yüklemeden sonra yeniden yüklenir.
+    """
+    
+    def __init__(self, veri):
+        self.veri = veri
+        self._barkodlar = {}
+        self._kodlar = {}
+        self._surum = None
+    
+    def gecersiz_kil(self):
+        self._surum = None
+    
+    def _guncelle(self):
+        if self._surum == self.veri.urun_surumu:
+            return
+        surum = self.veri.urun_surumu
+        kayitlar = [UrunKaydi(u['id'], u['kod'], u['barkod'], u['ad'], u['fiyat']) for u in self.veri.urun_kodlari()]
+        self._barkodlar = {kayit.barkod: kayit for kayit in kayitlar if kayit.barkod}
+        self._kodlar = {kayit.kod: kayit for kayit in kayitlar}
+        self._surum = surum
+    
+    def bul(self, kod):
+        """Barkod veya ürün koduyla ürünü bulur (yoksa None)"""
+        self._guncelle()
+        kod = (kod or "").strip()
+        return self._barkodlar.get(kod) or self._kodlar.get(urun_kodu_duzelt(kod))
+    
+    def __len__(self):
+        self._guncelle()
+        return len(self._kodlar)
+
+
+# ============================================================================
+# ÖLÇÜM (PROFİL)
+# ============================================================================
+
+# Ölçüm kapalıyken veri fonksiyonları hiç sarılmaz; tek maliyet
+# bağlantı açılırken yapılan bu bayrak kontrolüdür.
+_olcum_acik = False
+_olcum_orijinaller = {}
+_olcum_kilidi = threading.Lock()
+_olcum_is_parcacigi = threading.local()
+
+# Gecikme histogramı: kova i = [2^(i-1), 2^i) ms, son kova ve üstü
+OLCUM_KOVA_SAYISI = 12
+
+_fonksiyon_olcumleri = {}
+_sql_olcumleri = {}
+
+
+def _yeni_fonksiyon_olcumu():
+    return {"cagri": 0, "hata": 0, "toplam_ms": 0.0, "en_uzun_ms": 0.0,
+            "satir": 0, "histogram": [0] * OLCUM_KOVA_SAYISI}
+
+
+def _kova(ms):
+    return min(int(ms).bit_length(), OLCUM_KOVA_SAYISI - 1)
+
+
+def _sql_normallestir(sql):
+    """SQL ifadesindeki sabitleri ? ile değiştirip tek satıra indirir (gruplama için)"""
+    sql = re.sub(r"'(?:[^']|'')*'", "?", sql)
+    sql = re.sub(r"\b\d+(?:\.\d+)?\b", "?", sql)
+    return " ".join(sql.split())
+
+
+def _bekleyen_sql_kapat(simdi=None):
+    """Bu iş parçacığında süresi ölçülmekte olan SQL ifadesini kaydeder"""
+    bekleyen = getattr(_olcum_is_parcacigi, "sql", None)
+    if bekleyen is None:
+        return
+    _olcum_is_parcacigi.sql = None
+    sql, baslangic = bekleyen
+    sure = ((simdi or time.perf_counter()) - baslangic) * 1000
+    with _olcum_kilidi:
+        olcum = _sql_olcumleri.setdefault(sql, {"cagri": 0, "toplam_ms": 0.0, "en_uzun_ms": 0.0})
+        olcum["cagri"] += 1
+        olcum["toplam_ms"] += sure
+        olcum["en_uzun_ms"] = max(olcum["en_uzun_ms"], sure)
+
+
+def _sql_izle(sql):
+    """sqlite3 iz geri çağrısı
+    
+    SQLite yalnızca ifadenin başladığını bildirir; bir ifadenin süresi,
+    aynı iş parçacığındaki bir sonraki ifadeye ya da çağıran veri
+    fonksiyonunun dönüşüne kadar geçen süre olarak (satır okuma dahil)
+    ölçülür.
+    """
+    simdi = time.perf_counter()
+    _bekleyen_sql_kapat(simdi)
+    _olcum_is_parcacigi.sql = (_sql_normallestir(sql), simdi)
+
+
+def _olculen(ad, fonksiyon):
+    """Veri fonksiyonunu çağrı sayısı, süre ve satır sayısı ölçen sarmalayıcıyla sarar"""
+    @wraps(fonksiyon)
+    def sarmalayici(*args, **kwargs):
+        baslangic = time.perf_counter()
+        hata = False
+        sonuc = None
+        try:
+            sonuc = fonksiyon(*args, **kwargs)
+            return sonuc
+        except Exception:
+            hata = True
+            raise
+        finally:
+            bitis = time.perf_counter()
+            _bekleyen_sql_kapat(bitis)
+            sure = (bitis - baslangic) * 1000
+            with _olcum_kilidi:
+                olcum = _fonksiyon_olcumleri.setdefault(ad, _yeni_fonksiyon_olcumu())
+                olcum["cagri"] += 1
+                olcum["hata"] += hata
+                olcum["toplam_ms"] += sure
+                olcum["en_uzun_ms"] = max(olcum["en_uzun_ms"], sure)
+                olcum["histogram"][_kova(sure)] += 1
+                if isinstance(sonuc, list):
+                    olcum["satir"] += len(sonuc)
+    return sarmalayici
+
+
+def olcumu_ac():
+    """Tüm veri fonksiyonlarını ve SQL ifadelerini ölçmeye başlar"""
+    global _olcum_acik
+    if _olcum_acik:
+        return
+    modul = globals()
+    for ad in OKUMA_FONKSIYONLARI + YAZMA_FONKSIYONLARI + PDF_FONKSIYONLARI:
+        _olcum_orijinaller[ad] = modul[ad]
+        modul[ad] = _olculen(ad, modul[ad])
+    _olcum_acik = True
+
+
+def olcumu_kapat():
+    """Ölçümü kapatır; veri fonksiyonları orijinal (sarılmamış) hallerine döner"""
+    global _olcum_acik
+    if not _olcum_acik:
+        return
+    globals().update(_olcum_orijinaller)
+    _olcum_orijinaller.clear()
+    _olcum_acik = False
+
+
+def olcum_acik_mi():
+    return _olcum_acik
+
+
+def olcumu_sifirla():
+    """Toplanan ölçümleri temizler"""
+    with _olcum_kilidi:
+        _fonksiyon_olcumleri.clear()
+        _sql_olcumleri.clear()
+
+
+def olcum_verisi():
+    """Ölçümlerin JSON'a yazılabilir bir kopyasını döndürür"""
+    with _olcum_kilidi:
+        return {
+            "acik": _olcum_acik,
+            "fonksiyonlar": json.loads(json.dumps(_fonksiyon_olcumleri)),
+            "sql": json.loads(json.dumps(_sql_olcumleri)),
+        }
+
+
+def olcum_raporu(veri=None, sql_sayisi=15):
+    """Ölçümleri okunabilir metin olarak döndürür (veri verilmezse bu sürecinkiler)"""
+    if veri is None:
+        veri = olcum_verisi()
+    kova_basliklari = ["<1"] + [f"<{2 ** i}" for i in range(1, OLCUM_KOVA_SAYISI - 1)] + [f">={2 ** (OLCUM_KOVA_SAYISI - 2)}"]
+    
+    rapor = []
+    rapor.append("=" * 60)
+    rapor.append(f"ÖLÇÜM RAPORU ({'açık' if veri['acik'] else 'kapalı'})")
+    rapor.append("=" * 60)
+    rapor.append(f"{'Fonksiyon':<28}{'Çağrı':>7}{'Ort.ms':>9}{'Maks.ms':>9}{'Satır':>8}")
+    fonksiyonlar = sorted(veri["fonksiyonlar"].items(), key=lambda x: -x[1]["toplam_ms"])
+    for ad, o in fonksiyonlar:
+        rapor.append(f"{ad:<28}{o['cagri']:>7}{o['toplam_ms'] / o['cagri']:>9.2f}"
+                     f"{o['en_uzun_ms']:>9.2f}{o['satir']:>8}")
+        dagilim = ", ".join(f"{kova_basliklari[i]}ms: {n}" for i, n in enumerate(o["histogram"]) if n)
+        rapor.append(f"    {dagilim}" + (f" | hata: {o['hata']}" if o["hata"] else ""))
+    
+    rapor.append("")
+    rapor.append(f"EN PAHALI {sql_sayisi} SQL İFADESİ (toplam süreye göre)")
+    rapor.append("-" * 60)
+    ifadeler = sorted(veri["sql"].items(), key=lambda x: -x[1]["toplam_ms"])[:sql_sayisi]
+    for sql, o in ifadeler:
+        rapor.append(f"{o['toplam_ms']:>9.2f} ms  {o['cagri']:>6}x  {sql[:110]}")
+    return "\n".join(rapor)
+
+
+# ============================================================================
+# AĞ MODU (ÇOK KASALI KULLANIM)
+# ============================================================================
+
+VARSAYILAN_PORT = 8765
+# Sunucu anahtarla başlatıldıysa her API isteğinde bu başlıkta aynı anahtar gönderilmelidir
+ANAHTAR_BASLIGI = "X-Defter-Anahtar"
+
+
+class UzakDefterHatasi(Exception):
+    """Sunucuya ulaşılamadığında veya sunucu hata döndürdüğünde fırlatılır"""
+
+
+def jsona_uygun(deger):
+    """sqlite3.Row ve demetleri JSON'a yazılabilir hale getirir"""
+    if isinstance(deger, sqlite3.Row):
+        return dict(deger)
+    if isinstance(deger, (list, tuple)):
+        return [jsona_uygun(d) for d in deger]
+    if isinstance(deger, dict):
+        return {k: jsona_uygun(d) for k, d in deger.items()}
+    return deger
+
+
+class DefterSunucusu:
+    """Defter veritabanını yerel ağa HTTP/JSON olarak sunan asyncio sunucusu
+    
+    Okumalar birden çok iş parçacığında eşzamanlı çalışır; bir yazma
+    commit edilirken meşgul zaman aşımı kadar beklerler. Dosyanın günlük
+    kipine dokunulmaz: WAL kipinde ana dosya ile ekli arşiv arasındaki
+    işlem atomik olmadığından donem_kapat yarım kalabilirdi. Yazmalar tek
+    bir yazıcı görevine kuyruklanır ve sırayla uygulanır.
+    
+    anahtar verilirse /api ve /tanilama istekleri ANAHTAR_BASLIGI başlığında
+    aynı anahtarı taşımalıdır; yoksa ağdaki herkes yıl kapatma, onarım gibi
+    yazma işlemlerini çağırabilir.
+    
+    İstek: POST /api/<fonksiyon>  {"args": [...], "kwargs": {...}}
+    Yanıt: {"sonuc": ...} veya {"hata": "..."}
+    """
+    
+    def __init__(self, adres="127.0.0.1", port=VARSAYILAN_PORT, okuyucu_sayisi=4, db_dosyasi=None,
+                 anahtar=None):
+        self.adres = adres
+        self.port = port
+        self.anahtar = anahtar
+        self.arka_uc = SqliteDefter(db_dosyasi)
+        self.okuma_havuzu = ThreadPoolExecutor(max_workers=okuyucu_sayisi)
+        self.yazma_havuzu = ThreadPoolExecutor(max_workers=1)
+        self.sunucu = None
+        self.dongu = None
+        self.yazma_kuyrugu = None
+    
+    async def baslat(self):
+        """Sunucuyu ve yazıcı görevini başlatır"""
+        self.arka_uc.hazirla()
+        conn = self.arka_uc.baglanti()
+        # Önceki sürümlerin kalıcı olarak açtığı WAL kipi geri alınır
+        if conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal":
+            conn.execute("PRAGMA journal_mode=DELETE")
+        conn.close()
+        self.bakim = BakimServisi(self.arka_uc)
+        
+        self.dongu = asyncio.get_running_loop()
+        self.yazma_kuyrugu = asyncio.Queue()
+        self.yazici_gorevi = asyncio.create_task(self._yazici())
+        self.sunucu = await asyncio.start_server(self._istek_isle, self.adres, self.port)
+        self.port = self.sunucu.sockets[0].getsockname()[1]
+    
+    async def calistir(self):
+        """Sunucuyu başlatır ve durdurulana kadar çalıştırır"""
+        await self.baslat()
+        async with self.sunucu:
+            try:
+                await self.sunucu.serve_forever()
+            except asyncio.CancelledError:
+                pass
+        self.yazici_gorevi.cancel()
+    
+    def arka_planda_baslat(self):
+        """Sunucuyu ayrı bir iş parçacığında başlatır ve portu döndürür"""
+        hazir = threading.Event()
+        hata = []
+        
+        async def calis():
+            try:
+                await self.baslat()
+            except BaseException as e:
+                # Port kullanımda vb.: bekleyen çağıran takılı kalmasın, hatayı görsün
+                hata.append(e)
+                return
+            finally:
+                hazir.set()
+            async with self.sunucu:
+                try:
+                    await self.sunucu.serve_forever()
+                except asyncio.CancelledError:
+                    pass
+        
+        self.is_parcacigi = threading.Thread(target=asyncio.run, args=(calis(),), daemon=True)
+        self.is_parcacigi.start()
+        hazir.wait()
+        if hata:
+            raise hata[0]
+        return self.port
+    
+    def durdur(self):
+        """Sunucuyu durdurur (başka bir iş parçacığından çağrılabilir)"""
+        if self.dongu is not None and self.sunucu is not None:
+            self.dongu.call_soon_threadsafe(self.sunucu.close)
+    
+    async def _yazici(self):
+        """Yazma isteklerini tek tek, sırayla uygular"""
+        while True:
+            fonksiyon, args, kwargs, gelecek = await self.yazma_kuyrugu.get()
+            try:
+                sonuc = await self.dongu.run_in_executor(
+                    self.yazma_havuzu, partial(fonksiyon, *args, **kwargs)
+                )
+                gelecek.set_result(sonuc)
+            except Exception as e:
+                gelecek.set_exception(e)
+    
+    async def _cagir(self, ad, args, kwargs):
+        """Fonksiyonu türüne göre okuyucu havuzunda veya yazıcı kuyruğunda çalıştırır"""
+        fonksiyon = getattr(self.arka_uc, ad)
+        if ad in YAZMA_FONKSIYONLARI:
+            gelecek = self.dongu.create_future()
+            await self.yazma_kuyrugu.put((fonksiyon, args, kwargs, gelecek))
+            return jsona_uygun(await gelecek)
+        if ad in PDF_FONKSIYONLARI:
+            return await self.dongu.run_in_executor(self.okuma_havuzu, partial(pdf_baytlari, fonksiyon, args, kwargs))
+        return jsona_uygun(await self.dongu.run_in_executor(
+            self.okuma_havuzu, partial(fonksiyon, *args, **kwargs)
+        ))
+    
+    async def _istek_isle(self, reader, writer):
+        """Tek bir HTTP isteğini okur, yanıtlar ve bağlantıyı kapatır"""
+        try:
+            istek_satiri = (await reader.readline()).decode("latin-1").split()
+            basliklar = {}
+            while True:
+                satir = (await reader.readline()).decode("latin-1").strip()
+                if not satir:
+                    break
+                anahtar, _, deger = satir.partition(":")
+                basliklar[anahtar.strip().lower()] = deger.strip()
+            uzunluk = int(basliklar.get("content-length", 0))
+            govde = await reader.readexactly(uzunluk) if uzunluk else b""
+            
+            if len(istek_satiri) < 2:
+                durum, yanit = 400, {"hata": "Geçersiz istek"}
+            elif istek_satiri[1] == "/saglik":
+                durum, yanit = 200, {"sonuc": "ok"}
+            elif self.anahtar and not hmac.compare_digest(
+                    basliklar.get(ANAHTAR_BASLIGI.lower(), "").encode("utf-8"), self.anahtar.encode("utf-8")):
+                durum, yanit = 401, {"hata": "Geçersiz sunucu anahtarı"}
+            elif istek_satiri[1] == "/tanilama":
+                durum, yanit = 200, {"sonuc": olcum_verisi()}
+            elif istek_satiri[0] == "POST" and istek_satiri[1].startswith("/api/"):
+                ad = istek_satiri[1][len("/api/"):]
+                if ad not in OKUMA_FONKSIYONLARI + YAZMA_FONKSIYONLARI + PDF_FONKSIYONLARI:
+                    durum, yanit = 404, {"hata": f"Bilinmeyen fonksiyon: {ad}"}
+                else:
+                    veri = json.loads(govde or b"{}")
+                    try:
+                        sonuc = await self._cagir(ad, veri.get("args", []), veri.get("kwargs", {}))
+                        durum, yanit = 200, {"sonuc": sonuc}
+                    except Exception as e:
+                        durum, yanit = 500, {"hata": str(e)}
+            else:
+                durum, yanit = 404, {"hata": "Bulunamadı"}
+        except (ValueError, asyncio.IncompleteReadError) as e:
+            durum, yanit = 400, {"hata": str(e)}
+        
+        govde = json.dumps(yanit, ensure_ascii=False).encode("utf-8")
+        writer.write(
+            f"HTTP/1.1 {durum} {'OK' if durum == 200 else 'Error'}\r\n"
+            f"Content-Type: application/json; charset=utf-8\r\n"
+            f"Content-Length: {len(govde)}\r\n"
+            f"Connection: close\r\n\r\n".encode("latin-1") + govde
+        )
+        try:
+            await writer.drain()
+        finally:
+            writer.close()
+
+
+def pdf_baytlari(fonksiyon, args, kwargs):
+    """PDF raporunu geçici dosyada oluşturup içeriğini base64 olarak döndürür"""
+    fd, gecici = tempfile.mkstemp(suffix=".pdf")
+    os.close(fd)
+    try:
+        kwargs = dict(kwargs, dosya_yolu=gecici)
+        fonksiyon(*args, **kwargs)
+        with open(gecici, "rb") as f:
+            return base64.b64encode(f.read()).decode("ascii")
+    finally:
+        os.remove(gecici)
+
+
+class UzakDefter(DefterArkaUcu):
+    """DefterSunucusu'na HTTP üzerinden bağlanan arka uç
+    
+    Satırlar sözlük olarak döner (satir['ad'] erişimi aynen çalışır).
+    """
+    
+    def __init__(self, adres, zaman_asimi=30, anahtar=None):
+        self.adres = adres.rstrip("/")
+        self.zaman_asimi = zaman_asimi
+        self.basliklar = {"Content-Type": "application/json; charset=utf-8"}
+        if anahtar:
+            self.basliklar[ANAHTAR_BASLIGI] = anahtar
+    
+    def _istek(self, yol, veri=None):
+        govde = json.dumps(veri or {}, ensure_ascii=False).encode("utf-8")
+        istek = urllib.request.Request(self.adres + yol, data=govde, method="POST", headers=self.basliklar)
+        try:
+            with urllib.request.urlopen(istek, timeout=self.zaman_asimi) as yanit:
+                sonuc = json.loads(yanit.read().decode("utf-8"))
+        except urllib.error.HTTPError as e:
+            try:
+                sonuc = json.loads(e.read().decode("utf-8"))
+            except ValueError:
+                raise UzakDefterHatasi(f"Sunucu hatası: {e.code}")
+        except (urllib.error.URLError, OSError) as e:
+            raise UzakDefterHatasi(f"Sunucuya bağlanılamadı: {e}")
+        if "hata" in sonuc:
+            raise UzakDefterHatasi(sonuc["hata"])
+        return sonuc["sonuc"]
+    
+    def _cagir(self, ad, *args, **kwargs):
+        return self._istek(f"/api/{ad}", {"args": list(args), "kwargs": kwargs})
+    
+    def saglik(self):
+        """Sunucu ayakta mı kontrol eder"""
+        return self._istek("/saglik") == "ok"
+    
+    def tanilama(self):
+        """Sunucunun ölçüm verilerini döndürür"""
+        return self._istek("/tanilama")
+    
+    def _pdf_kaydet(self, ad, dosya_yolu, **kwargs):
+        icerik = base64.b64decode(self._cagir(ad, **kwargs))
+        with open(dosya_yolu, "wb") as f:
+            f.write(icerik)
+        return dosya_yolu
+    
+    def borc_raporu_pdf_olustur(self, dosya_yolu=None):
+        if not dosya_yolu:
+            dosya_yolu = f"borc_alacak_raporu_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
+        return self._pdf_kaydet("borc_raporu_pdf_olustur", dosya_yolu)
+    
+    def kasa_raporu_pdf_olustur(self, yil=None, ay=None, dosya_yolu=None):
+        if not dosya_yolu:
+            dosya_yolu = f"kasa_raporu_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
+        return self._pdf_kaydet("kasa_raporu_pdf_olustur", dosya_yolu, yil=yil, ay=ay)
+    
+    def kategori_raporu_pdf_olustur(self, yil, ay=None, etiket=None, dosya_yolu=None):
+        if not dosya_yolu:
+            dosya_yolu = f"kategori_raporu_{yil}_{datetime.now().strftime('%H%M%S')}.pdf"
+        return self._pdf_kaydet("kategori_raporu_pdf_olustur", dosya_yolu, yil=yil, ay=ay, etiket=etiket)
+
+
+# ============================================================================
+# ANA UYGULAMA SINIFI
+# ============================================================================
+
+# Açılışta pencereyle birlikte yüklenen müşteri sayısı; geri kalanı arka planda gelir
+ILK_SAYFA_MUSTERI = 50
+# Pencerenin ilk dolu görüntüsü (kasa özeti + ilk müşteri sayfası) için hedef süre
+ILK_BOYAMA_HEDEF_MS = 250
+
+
+class EsnafDefterUygulamasi:
+    def __init__(self, root, veri=None):
+        self.acilis_baslangic = time.perf_counter()
+        self.ilk_boyama_ms = None
+        self.acilis_tamamlandi = False
+        self.root = root
+        
+        # Veri arka ucu: varsayılan olarak yerel SQLite dosyası
+        self.veri = veri if veri is not None else SqliteDefter()
+        self.musteri_onbellegi = MusteriOnbellegi(self.veri)
+        self.urun_indeksi = UrunIndeksi(self.veri)
+        self.root.title("Esnaf Defteri - Borç/Alacak ve Kasa Takip")
+        self.root.geometry("1000x700")
+        self.root.minsize(800, 600)
+        
         # Stil ayarları
         self.stil_ayarla()
         
@@ -668,26 +5388,133 @@ class EsnafDefterUygulamasi:
         self.notebook = ttk.Notebook(root)
         self.notebook.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
         
-        # Sekmeler
-        self.borc_alacak_sekmesi = ttk.Frame(self.notebook)
-        self.kasa_sekmesi = ttk.Frame(self.notebook)
-        self.rapor_sekmesi = ttk.Frame(self.notebook)
+        # Sekmeler
+        self.borc_alacak_sekmesi = ttk.Frame(self.notebook)
+        self.kasa_sekmesi = ttk.Frame(self.notebook)
+        self.satis_sekmesi = ttk.Frame(self.notebook)
+        self.rapor_sekmesi = ttk.Frame(self.notebook)
+        
+        self.notebook.add(self.borc_alacak_sekmesi, text="  📒 Borç / Alacak  ")
+        self.notebook.add(self.kasa_sekmesi, text="  💰 Günlük Kasa  ")
+        self.notebook.add(self.satis_sekmesi, text="  🛒 Satış  ")
+        self.notebook.add(self.rapor_sekmesi, text="  📊 Raporlar  ")
+        
+        # Seçili müşteri
+        self.secili_musteri_id = None
+        # Ödeme hatırlatmalarının arka plan göndericisi (Ödeme Hatırlatmaları penceresinden başlatılır)
+        self.hatirlatma_gonderici = None
+        
+        # Sekmeleri oluştur
+        self.borc_alacak_olustur()
+        self.kasa_olustur()
+        self.satis_olustur()
+        self.rapor_olustur()
+        self.notebook.bind("<<NotebookTabChanged>>", self.satis_sekmesi_acildi)
+        
+        # Gizli tanılama penceresi (Ctrl+Shift+D)
+        self.root.bind_all("<Control-Shift-D>", lambda e: self.tanilama_penceresi())
+        self.root.protocol("WM_DELETE_WINDOW", self.kapat)
+        
+        # Aşamalı açılış: pencere boş çizilir, veriler ilk boştaki anda ve arka planda yüklenir
+        self.musteriler = []
+        self.acilis_sonuclari = queue.Queue()
+        self.root.after_idle(self.ilk_boyama)
+        self.root.after(VADE_KONTROL_ARALIGI_MS, self.gecikme_kontrolu)
+    
+    def ilk_boyama(self):
+        """Açılışın ilk aşaması: bugünün kasa özeti ve ilk müşteri sayfası"""
+        bugun = date.today().strftime("%Y-%m-%d")
+        self.gunluk_ozet_goster(bugun, self.veri.kasa_gunluk_ozet(bugun))
+        self.musteri_listbox_doldur([
+            MusteriKaydi(m['id'], m['ad'], m['telefon'], m['not_alani'], m['bakiye'])
+            for m in self.veri.musteri_ozetleri(ILK_SAYFA_MUSTERI)
+        ])
+        self.genel_ozet_label.config(text="Yükleniyor...")
+        self.root.update_idletasks()
+        self.ilk_boyama_ms = (time.perf_counter() - self.acilis_baslangic) * 1000
+        
+        threading.Thread(target=self.arka_planda_yukle, daemon=True).start()
+        self.acilis_sonucunu_bekle()
+    
+    def arka_planda_yukle(self):
+        """Açılışın ikinci aşaması (yardımcı iş parçacığında): tüm listeler ve özetler"""
+        try:
+            self.veri.tekrarlayanlari_uret()
+            surum = self.veri.yazma_surumu
+            bugun = date.today().strftime("%Y-%m-%d")
+            sonuc = {
+                "surum": surum,
+                "musteri_surumu": self.veri.musteri_surumu,
+                "musteriler": self.veri.musteri_ozetleri(),
+                "genel_ozet": self.veri.genel_borc_ozeti(),
+                "gecikmeler": self.veri.gecikmis_borclar(),
+                "kasa": (self.veri.kasa_islem_listele(), bugun, self.veri.kasa_gunluk_ozet(bugun)),
+            }
+        except (sqlite3.Error, OSError, UzakDefterHatasi) as e:
+            sonuc = {"hata": str(e)}
+        self.acilis_sonuclari.put(sonuc)
+    
+    def acilis_sonucunu_bekle(self):
+        """Arka plan yüklemesi bitince listeleri arayüz iş parçacığında doldurur"""
+        try:
+            sonuc = self.acilis_sonuclari.get_nowait()
+        except queue.Empty:
+            self.root.after(KUYRUK_IZLEME_ARALIGI_MS, self.acilis_sonucunu_bekle)
+            return
+        
+        if "hata" in sonuc:
+            messagebox.showerror("Hata", f"Veriler yüklenemedi: {sonuc['hata']}")
+        elif sonuc["surum"] != self.veri.yazma_surumu:
+            # Yükleme sürerken kullanıcı kayıt yaptı; listeler baştan okunur
+            self.musteri_listesini_guncelle()
+            self.kasa_listesini_guncelle()
+        else:
+            self.musteri_onbellegi.yukle(sonuc["musteriler"], sonuc["musteri_surumu"])
+            self.musteri_listbox_doldur(self.musteri_onbellegi.kayitlar())
+            self.genel_ozet_guncelle(sonuc["genel_ozet"])
+            self.gecikmeleri_guncelle(sonuc["gecikmeler"])
+            self.kasa_listesini_doldur(*sonuc["kasa"])
+        self.acilis_tamamlandi = True
+        self.root.after(TEKRAR_KONTROL_ARALIGI_MS, lambda: self.tekrarlayanlari_kontrol_et(yenile=True))
+    
+    def tanilama_penceresi(self):
+        """Veri fonksiyonu ve SQL ölçümlerini gösteren tanılama penceresi"""
+        pencere = tk.Toplevel(self.root)
+        pencere.title("Tanılama - Ölçümler")
+        pencere.geometry("900x600")
+        
+        metin = tk.Text(pencere, font=("Courier", 9), wrap=tk.NONE)
+        
+        def yenile():
+            if isinstance(self.veri, UzakDefter):
+                rapor = olcum_raporu(self.veri.tanilama())
+            else:
+                rapor = olcum_raporu()
+            rapor += "\n\nVERİTABANI BAKIMI\n" + bakim_raporu(self.veri.bakim_metrikleri())
+            metin.delete(1.0, tk.END)
+            metin.insert(tk.END, rapor)
+            ac_kapat_btn.config(text="⏸️ Ölçümü Kapat" if olcum_acik_mi() else "▶️ Ölçümü Aç")
         
-        self.notebook.add(self.borc_alacak_sekmesi, text="  📒 Borç / Alacak  ")
-        self.notebook.add(self.kasa_sekmesi, text="  💰 Günlük Kasa  ")
-        self.notebook.add(self.rapor_sekmesi, text="  📊 Raporlar  ")
+        def ac_kapat():
+            if olcum_acik_mi():
+                olcumu_kapat()
+            else:
+                olcumu_ac()
+            yenile()
         
-        # Seçili müşteri
-        self.secili_musteri_id = None
+        def sifirla():
+            olcumu_sifirla()
+            yenile()
         
-        # Sekmeleri oluştur
-        self.borc_alacak_olustur()
-        self.kasa_olustur()
-        self.rapor_olustur()
+        btn_frame = ttk.Frame(pencere)
+        btn_frame.pack(fill=tk.X, padx=10, pady=5)
+        ac_kapat_btn = ttk.Button(btn_frame, command=ac_kapat)
+        ac_kapat_btn.pack(side=tk.LEFT, padx=5)
+        ttk.Button(btn_frame, text="🔄 Yenile", command=yenile).pack(side=tk.LEFT, padx=5)
+        ttk.Button(btn_frame, text="🧹 Sıfırla", command=sifirla).pack(side=tk.LEFT, padx=5)
         
-        # İlk yükleme
-        self.musteri_listesini_guncelle()
-        self.kasa_listesini_guncelle()
+        metin.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
+        yenile()
     
     def stil_ayarla(self):
         """Uygulama stilini ayarlar"""
@@ -724,6 +5551,26 @@ class EsnafDefterUygulamasi:
         
         ttk.Button(btn_frame, text="➕ Yeni Müşteri", command=self.musteri_ekle_dialog).pack(fill=tk.X, pady=2)
         ttk.Button(btn_frame, text="🗑️ Müşteri Sil", command=self.musteri_sil_onay).pack(fill=tk.X, pady=2)
+        ttk.Button(btn_frame, text="👥 Benzer Müşteriler", command=self.benzer_musteriler_dialog).pack(fill=tk.X, pady=2)
+        ttk.Button(btn_frame, text="📨 Ödeme Hatırlatmaları", command=self.hatirlatma_dialog).pack(fill=tk.X, pady=2)
+        ttk.Button(btn_frame, text="↩️ Silmeyi Geri Al", command=self.borc_silmeyi_geri_al).pack(fill=tk.X, pady=2)
+        ttk.Button(btn_frame, text="💱 Döviz Kurları", command=self.kur_dialog).pack(fill=tk.X, pady=2)
+        
+        # Vadesi geçenler (açılışta ve periyodik olarak yenilenir)
+        self.gecikme_frame = ttk.LabelFrame(sol_frame, text="⏰ VADESİ GEÇENLER", padding=5)
+        self.gecikme_frame.pack(fill=tk.X, pady=5)
+        
+        self.gecikme_tree = ttk.Treeview(self.gecikme_frame, columns=("Müşteri", "Tutar", "Gün"),
+                                         show="headings", height=5)
+        self.gecikme_tree.heading("Müşteri", text="Müşteri")
+        self.gecikme_tree.heading("Tutar", text="Tutar")
+        self.gecikme_tree.heading("Gün", text="Gün")
+        self.gecikme_tree.column("Müşteri", width=110)
+        self.gecikme_tree.column("Tutar", width=70, anchor=tk.E)
+        self.gecikme_tree.column("Gün", width=40, anchor=tk.CENTER)
+        self.gecikme_tree.tag_configure("gecikmis", foreground="red")
+        self.gecikme_tree.pack(fill=tk.X)
+        self.gecikme_tree.bind("<Double-1>", self.gecikmis_musteriyi_sec)
         
         # Sağ panel - İşlem detayları
         sag_frame = ttk.LabelFrame(ana_frame, text="İŞLEM GEÇMİŞİ", padding=10)
@@ -733,22 +5580,37 @@ class EsnafDefterUygulamasi:
         self.musteri_bilgi_label = ttk.Label(sag_frame, text="Müşteri seçin...", font=("Arial", 14, "bold"))
         self.musteri_bilgi_label.pack(anchor=tk.W, pady=5)
         
+        # Ekstre tarih filtresi
+        filtre_frame = ttk.Frame(sag_frame)
+        filtre_frame.pack(fill=tk.X, pady=2)
+        
+        ttk.Label(filtre_frame, text="Başlangıç:").pack(side=tk.LEFT)
+        self.ekstre_baslangic_entry = ttk.Entry(filtre_frame, width=12)
+        self.ekstre_baslangic_entry.pack(side=tk.LEFT, padx=5)
+        ttk.Label(filtre_frame, text="Bitiş:").pack(side=tk.LEFT)
+        self.ekstre_bitis_entry = ttk.Entry(filtre_frame, width=12)
+        self.ekstre_bitis_entry.pack(side=tk.LEFT, padx=5)
+        ttk.Button(filtre_frame, text="🔍 Filtrele", command=self.islem_listesini_guncelle).pack(side=tk.LEFT, padx=2)
+        ttk.Button(filtre_frame, text="✖ Temizle", command=self.ekstre_filtresini_temizle).pack(side=tk.LEFT, padx=2)
+        
         # İşlem listesi
         islem_frame = ttk.Frame(sag_frame)
         islem_frame.pack(fill=tk.BOTH, expand=True)
         
         # Treeview ile işlem listesi
-        columns = ("Tarih", "Tür", "Tutar", "Açıklama")
+        columns = ("Tarih", "Tür", "Tutar", "Vade", "Açıklama")
         self.islem_tree = ttk.Treeview(islem_frame, columns=columns, show="headings", height=12)
         
         self.islem_tree.heading("Tarih", text="Tarih")
         self.islem_tree.heading("Tür", text="Tür")
         self.islem_tree.heading("Tutar", text="Tutar (TL)")
+        self.islem_tree.heading("Vade", text="Vade")
         self.islem_tree.heading("Açıklama", text="Açıklama")
         
         self.islem_tree.column("Tarih", width=100, anchor=tk.CENTER)
         self.islem_tree.column("Tür", width=80, anchor=tk.CENTER)
-        self.islem_tree.column("Tutar", width=100, anchor=tk.E)
+        self.islem_tree.column("Tutar", width=140, anchor=tk.E)
+        self.islem_tree.column("Vade", width=100, anchor=tk.CENTER)
         self.islem_tree.column("Açıklama", width=200)
         
         scrollbar = ttk.Scrollbar(islem_frame, orient=tk.VERTICAL, command=self.islem_tree.yview)
@@ -757,6 +5619,17 @@ class EsnafDefterUygulamasi:
         self.islem_tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
         scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
         
+        # Ekstre devir bilgisi ve sayfalama
+        ekstre_frame = ttk.Frame(sag_frame)
+        ekstre_frame.pack(fill=tk.X, pady=2)
+        
+        self.ekstre_label = ttk.Label(ekstre_frame, text="", font=("Arial", 10))
+        self.ekstre_label.pack(side=tk.LEFT)
+        self.daha_fazla_btn = ttk.Button(ekstre_frame, text="⬇ Daha Fazla Yükle",
+                                         command=self.islem_sayfasi_yukle, state=tk.DISABLED)
+        self.daha_fazla_btn.pack(side=tk.RIGHT)
+        self.ekstre_imleci = None
+        
         # Bakiye gösterimi
         self.bakiye_frame = tk.Frame(sag_frame, bg="#f0f0f0", pady=10)
         self.bakiye_frame.pack(fill=tk.X, pady=10)
@@ -783,26 +5656,72 @@ class EsnafDefterUygulamasi:
         self.genel_ozet_label = ttk.Label(ozet_frame, text="", font=("Arial", 11))
         self.genel_ozet_label.pack()
     
-    def musteri_listesini_guncelle(self):
-        """Müşteri listesini günceller"""
-        self.musteri_listbox.delete(0, tk.END)
-        self.musteriler = musteri_listele()
+    def musteri_listesini_guncelle(self, yeniden_oku=True):
+        """Müşteri listesini günceller (yeniden_oku=False ise önbellek güncelse okunmaz)"""
+        if yeniden_oku:
+            self.musteri_onbellegi.gecersiz_kil()
+        self.musteri_listbox_doldur(self.musteri_onbellegi.kayitlar())
+        self.genel_ozet_guncelle()
+        self.gecikmeleri_guncelle()
+    
+    def musteri_listbox_doldur(self, musteriler):
+        """Müşteri listesini verilen kayıtlarla doldurur, seçili müşteriyi korur"""
+        self.musteriler = musteriler
         
+        satirlar = []
         for musteri in self.musteriler:
-            bakiye = musteri_bakiye_hesapla(musteri['id'])
+            bakiye = musteri.bakiye
             if bakiye > 0:
                 durum = f" (+{bakiye:.0f})"
             elif bakiye < 0:
                 durum = f" ({bakiye:.0f})"
             else:
                 durum = ""
-            self.musteri_listbox.insert(tk.END, f"{musteri['ad']}{durum}")
+            satirlar.append(f"{musteri.ad}{durum}")
         
-        self.genel_ozet_guncelle()
+        # Tek seferde doldur, seçili müşteriyi id ile geri yükle
+        self.musteri_listbox.delete(0, tk.END)
+        self.musteri_listbox.insert(tk.END, *satirlar)
+        konum = next((i for i, m in enumerate(musteriler) if m.id == self.secili_musteri_id), None)
+        if konum is not None:
+            self.musteri_listbox.selection_set(konum)
+            self.musteri_listbox.see(konum)
+    
+    def gecikmeleri_guncelle(self, borclar=None):
+        """Vadesi geçen borçlar panelini günceller (borclar verilmezse okunur)"""
+        self.gecikme_tree.delete(*self.gecikme_tree.get_children())
+        if borclar is None:
+            borclar = self.veri.gecikmis_borclar()
+        for borc in borclar:
+            self.gecikme_tree.insert("", tk.END, iid=borc['musteri_id'], tags=("gecikmis",), values=(
+                borc['ad'], f"{borc['gecikmis']:.2f}", borc['gun']
+            ))
+        toplam = sum(borc['gecikmis'] for borc in borclar)
+        self.gecikme_frame.config(
+            text=f"⏰ VADESİ GEÇENLER ({len(borclar)} - {toplam:.0f} TL)" if borclar else "⏰ VADESİ GEÇENLER"
+        )
+    
+    def gecikme_kontrolu(self):
+        """Gecikme panelini periyodik olarak yeniler (gün değişince de güncel kalır)"""
+        self.gecikmeleri_guncelle()
+        self.root.after(VADE_KONTROL_ARALIGI_MS, self.gecikme_kontrolu)
     
-    def genel_ozet_guncelle(self):
-        """Genel borç özetini günceller"""
-        toplam_borc, toplam_odeme, net = genel_borc_ozeti()
+    def gecikmis_musteriyi_sec(self, event=None):
+        """Gecikme panelinde çift tıklanan müşteriyi açar"""
+        secili = self.gecikme_tree.selection()
+        if not secili:
+            return
+        konum = self.musteri_onbellegi.konum(int(secili[0]))
+        if konum is None:
+            return
+        self.musteri_listbox.selection_clear(0, tk.END)
+        self.musteri_listbox.selection_set(konum)
+        self.musteri_listbox.see(konum)
+        self.musteri_secildi(None)
+    
+    def genel_ozet_guncelle(self, ozet=None):
+        """Genel borç özetini günceller (ozet verilmezse okunur)"""
+        toplam_borc, toplam_odeme, net = ozet if ozet is not None else self.veri.genel_borc_ozeti()
         
         if net > 0:
             durum = f"Toplam Alacağınız: {net:.2f} TL"
@@ -823,53 +5742,90 @@ class EsnafDefterUygulamasi:
         
         index = selection[0]
         musteri = self.musteriler[index]
-        self.secili_musteri_id = musteri['id']
+        self.secili_musteri_id = musteri.id
         
         # Müşteri bilgilerini göster
-        bilgi = f"{musteri['ad']}"
-        if musteri['telefon']:
-            bilgi += f" - Tel: {musteri['telefon']}"
+        bilgi = f"{musteri.ad}"
+        if musteri.telefon:
+            bilgi += f" - Tel: {musteri.telefon}"
         self.musteri_bilgi_label.config(text=bilgi)
         
         # İşlemleri listele
         self.islem_listesini_guncelle()
     
+    def ekstre_filtresini_temizle(self):
+        """Ekstre tarih filtresini temizler"""
+        self.ekstre_baslangic_entry.delete(0, tk.END)
+        self.ekstre_bitis_entry.delete(0, tk.END)
+        self.islem_listesini_guncelle()
+    
     def islem_listesini_guncelle(self):
-        """İşlem listesini günceller"""
+        """İşlem listesini günceller (ekstrenin ilk sayfası)"""
         # Listeyi temizle
-        for item in self.islem_tree.get_children():
-            self.islem_tree.delete(item)
+        self.islem_tree.delete(*self.islem_tree.get_children())
+        self.ekstre_imleci = None
+        self.daha_fazla_btn.config(state=tk.DISABLED)
+        self.ekstre_label.config(text="")
         
         if not self.secili_musteri_id:
             return
         
-        # İşlemleri getir
-        islemler = islem_listele(self.secili_musteri_id)
-        self.islemler = islemler
-        
-        for islem in islemler:
-            self.islem_tree.insert("", tk.END, values=(
-                islem['tarih'],
-                islem['islem_turu'],
-                f"{islem['tutar']:.2f}",
-                islem['aciklama'] or ""
-            ), iid=islem['id'])
+        # İlk sayfayı getir
+        self.islem_sayfasi_yukle()
         
-        # Bakiyeyi güncelle
-        bakiye = musteri_bakiye_hesapla(self.secili_musteri_id)
+        # Bakiyeyi güncelle (önbellek müşteri yazmalarından sonra kendini yeniler)
+        musteri = self.musteri_onbellegi.getir(self.secili_musteri_id)
+        bakiye = musteri.bakiye if musteri is not None else 0
+        doviz = "".join(f" | {b['bakiye']:.2f} {b['para_birimi']}"
+                        for b in self.veri.musteri_doviz_bakiyesi(self.secili_musteri_id))
         if bakiye > 0:
-            self.bakiye_label.config(text=f"BAKİYE: {bakiye:.2f} TL (BORÇLU)", fg="red")
+            self.bakiye_label.config(text=f"BAKİYE: {bakiye:.2f} TL (BORÇLU){doviz}", fg="red")
             self.bakiye_frame.config(bg="#ffcccc")
             self.bakiye_label.config(bg="#ffcccc")
         elif bakiye < 0:
-            self.bakiye_label.config(text=f"BAKİYE: {abs(bakiye):.2f} TL (ALACAKLI)", fg="green")
+            self.bakiye_label.config(text=f"BAKİYE: {abs(bakiye):.2f} TL (ALACAKLI){doviz}", fg="green")
             self.bakiye_frame.config(bg="#ccffcc")
             self.bakiye_label.config(bg="#ccffcc")
         else:
-            self.bakiye_label.config(text="BAKİYE: 0.00 TL (DENGELİ)", fg="black")
+            self.bakiye_label.config(text=f"BAKİYE: 0.00 TL (DENGELİ){doviz}", fg="black")
             self.bakiye_frame.config(bg="#f0f0f0")
             self.bakiye_label.config(bg="#f0f0f0")
     
+    def islem_sayfasi_yukle(self):
+        """Ekstrenin bir sonraki sayfasını listeye ekler"""
+        if not self.secili_musteri_id:
+            return
+        
+        baslangic = self.ekstre_baslangic_entry.get().strip() or None
+        bitis = self.ekstre_bitis_entry.get().strip() or None
+        for tarih in (baslangic, bitis):
+            if tarih:
+                gecerli, sonuc = tarih_dogrula(tarih)
+                if not gecerli:
+                    messagebox.showerror("Hata", sonuc)
+                    return
+        
+        devir, donem_sonu, islemler, self.ekstre_imleci = self.veri.musteri_ekstresi(
+            self.secili_musteri_id, baslangic, bitis, self.ekstre_imleci
+        )
+        
+        for islem in islemler:
+            if islem['para_birimi'] == "TL":
+                tutar = f"{islem['tutar']:.2f}"
+            else:
+                tutar = f"{islem['tutar']:.2f} {islem['para_birimi']} = {islem['tutar_tl']:.2f}"
+            self.islem_tree.insert("", tk.END, values=(
+                islem['tarih'],
+                islem['islem_turu'],
+                tutar,
+                islem['vade'] or "",
+                islem['aciklama'] or ""
+            ), iid=islem['id'])
+        
+        if baslangic or bitis:
+            self.ekstre_label.config(text=f"Devir: {devir:.2f} TL | Dönem Sonu: {donem_sonu:.2f} TL")
+        self.daha_fazla_btn.config(state=tk.NORMAL if self.ekstre_imleci else tk.DISABLED)
+    
     def musteri_ekle_dialog(self):
         """Müşteri ekleme penceresi"""
         dialog = tk.Toplevel(self.root)
@@ -895,7 +5851,7 @@ class EsnafDefterUygulamasi:
         not_entry.grid(row=2, column=1, pady=5)
         
         def kaydet():
-            basarili, mesaj = musteri_ekle(ad_entry.get(), tel_entry.get(), not_entry.get())
+            basarili, mesaj = self.veri.musteri_ekle(ad_entry.get(), tel_entry.get(), not_entry.get())
             if basarili:
                 self.musteri_listesini_guncelle()
                 dialog.destroy()
@@ -908,6 +5864,200 @@ class EsnafDefterUygulamasi:
         ttk.Button(btn_frame, text="💾 Kaydet", command=kaydet).pack(side=tk.LEFT, padx=10)
         ttk.Button(btn_frame, text="❌ İptal", command=dialog.destroy).pack(side=tk.LEFT, padx=10)
     
+    def benzer_musteriler_dialog(self):
+        """Aynı kişi olabilecek müşterileri gruplar halinde gösterir ve birleştirir"""
+        dialog = tk.Toplevel(self.root)
+        dialog.title("Benzer Müşteriler")
+        dialog.geometry("650x450")
+        dialog.transient(self.root)
+        dialog.grab_set()
+        
+        ttk.Label(dialog, text="Grupta kalacak müşteriyi seçip birleştirin; diğerlerinin işlemleri ona taşınır.",
+                  font=("Arial", 10)).pack(padx=10, pady=5, anchor=tk.W)
+        
+        columns = ("Telefon", "Bakiye", "İşlem")
+        benzer_tree = ttk.Treeview(dialog, columns=columns, show="tree headings", height=15)
+        benzer_tree.heading("#0", text="Müşteri")
+        benzer_tree.column("#0", width=300)
+        for sutun, genislik in zip(columns, (130, 100, 60)):
+            benzer_tree.heading(sutun, text=sutun)
+            benzer_tree.column(sutun, width=genislik, anchor=tk.W if sutun == "Telefon" else tk.E)
+        benzer_tree.pack(fill=tk.BOTH, expand=True, padx=10)
+        
+        gruplar = {}
+        
+        def listeyi_guncelle():
+            benzer_tree.delete(*benzer_tree.get_children())
+            gruplar.clear()
+            for sira, grup in enumerate(self.veri.musteri_benzerleri(), 1):
+                ust = benzer_tree.insert("", tk.END, iid=f"g{sira}", open=True,
+                                         text=f"Grup {sira}: {', '.join(grup['sebepler'])}")
+                gruplar[ust] = [m['id'] for m in grup['musteriler']]
+                for musteri in grup['musteriler']:
+                    benzer_tree.insert(ust, tk.END, iid=str(musteri['id']), text=musteri['ad'], values=(
+                        musteri['telefon'] or "", f"{musteri['bakiye']:.2f}", musteri['islem_sayisi']))
+            if not gruplar:
+                benzer_tree.insert("", tk.END, text="Benzer müşteri bulunamadı.")
+        
+        def birlestir():
+            secili = benzer_tree.selection()
+            if not secili or benzer_tree.parent(secili[0]) not in gruplar:
+                messagebox.showwarning("Uyarı", "Grupta kalacak müşteriyi seçin!", parent=dialog)
+                return
+            hedef_id = int(secili[0])
+            kaynaklar = [mid for mid in gruplar[benzer_tree.parent(secili[0])] if mid != hedef_id]
+            if not messagebox.askyesno(
+                    "Onay", f"{len(kaynaklar)} müşterinin işlemleri \"{benzer_tree.item(secili[0], 'text')}\" "
+                            f"müşterisine taşınacak ve bu müşteriler silinecek. Devam edilsin mi?", parent=dialog):
+                return
+            basarili, mesaj = self.veri.musteri_birlestir(hedef_id, kaynaklar)
+            if not basarili:
+                messagebox.showerror("Hata", mesaj, parent=dialog)
+                return
+            self.musteri_listesini_guncelle()
+            self.islem_listesini_guncelle()
+            listeyi_guncelle()
+            messagebox.showinfo("Başarılı", mesaj, parent=dialog)
+        
+        btn_frame = ttk.Frame(dialog)
+        btn_frame.pack(pady=10)
+        
+        ttk.Button(btn_frame, text="🔗 Seçiliye Birleştir", command=birlestir).pack(side=tk.LEFT, padx=5)
+        ttk.Button(btn_frame, text="❌ Kapat", command=dialog.destroy).pack(side=tk.LEFT, padx=5)
+        
+        listeyi_guncelle()
+    
+    def hatirlatma_dialog(self):
+        """Borçlulara ödeme hatırlatması: adayları seçer, gönderim kutusuna ekler ve arka planda gönderir"""
+        dialog = tk.Toplevel(self.root)
+        dialog.title("Ödeme Hatırlatmaları")
+        dialog.geometry("700x560")
+        dialog.transient(self.root)
+        
+        ayar_frame = ttk.Frame(dialog, padding=10)
+        ayar_frame.pack(fill=tk.X)
+        ttk.Label(ayar_frame, text="En az bakiye (TL):", font=("Arial", 11)).grid(row=0, column=0, sticky=tk.W)
+        bakiye_entry = ttk.Entry(ayar_frame, font=("Arial", 11), width=10)
+        bakiye_entry.insert(0, str(HATIRLATMA_ALT_BAKIYE))
+        bakiye_entry.grid(row=0, column=1, sticky=tk.W, padx=5)
+        ttk.Label(ayar_frame, text="En eski borç (gün):", font=("Arial", 11)).grid(row=0, column=2, sticky=tk.W)
+        gun_entry = ttk.Entry(ayar_frame, font=("Arial", 11), width=6)
+        gun_entry.insert(0, str(HATIRLATMA_ALT_GUN))
+        gun_entry.grid(row=0, column=3, sticky=tk.W, padx=5)
+        
+        ttk.Label(ayar_frame, text="Mesaj ({ad}, {bakiye}, {gun}, {en_eski}):",
+                  font=("Arial", 11)).grid(row=1, column=0, columnspan=4, sticky=tk.W, pady=(8, 2))
+        sablon_text = tk.Text(ayar_frame, font=("Arial", 10), height=3, width=80, wrap=tk.WORD)
+        sablon_text.insert(tk.END, HATIRLATMA_SABLONU)
+        sablon_text.grid(row=2, column=0, columnspan=4, sticky=tk.W)
+        
+        ttk.Label(ayar_frame, text="Gönderim hedefi (dosya ya da http://...):",
+                  font=("Arial", 11)).grid(row=3, column=0, columnspan=2, sticky=tk.W, pady=(8, 0))
+        hedef_entry = ttk.Entry(ayar_frame, font=("Arial", 10), width=45)
+        hedef_entry.insert(0, hatirlatma_dosyasi(getattr(self.veri, "db_dosyasi", None)))
+        hedef_entry.grid(row=3, column=2, columnspan=2, sticky=tk.W, pady=(8, 0))
+        
+        columns = ("Müşteri", "Telefon", "Bakiye", "Gün")
+        aday_tree = ttk.Treeview(dialog, columns=columns, show="headings", height=10)
+        for sutun, genislik in zip(columns, (260, 150, 110, 60)):
+            aday_tree.heading(sutun, text=sutun)
+            aday_tree.column(sutun, width=genislik, anchor=tk.E if sutun in ("Bakiye", "Gün") else tk.W)
+        aday_tree.pack(fill=tk.BOTH, expand=True, padx=10)
+        
+        durum_label = tk.Label(dialog, text="", font=("Arial", 11), anchor=tk.W)
+        durum_label.pack(fill=tk.X, padx=10, pady=5)
+        
+        def esikler():
+            return float(bakiye_entry.get().replace(",", ".")), int(gun_entry.get())
+        
+        def kutuyu_goster():
+            ozet = self.veri.hatirlatma_ozeti()
+            gonderici = "gönderiliyor" if self.hatirlatma_gonderici is not None else "gönderim durdu"
+            durum_label.config(text=(
+                f"📬 Kutu: {ozet.get('BEKLİYOR', 0) + ozet.get('GÖNDERİLİYOR', 0)} bekleyen, "
+                f"{ozet.get('GÖNDERİLDİ', 0)} gönderildi, {ozet.get('HATA', 0)} hatalı ({gonderici})"
+            ))
+        
+        def adaylari_goster():
+            try:
+                alt_bakiye, alt_gun = esikler()
+            except ValueError:
+                messagebox.showwarning("Uyarı", "Bakiye ve gün için sayı girin!", parent=dialog)
+                return
+            aday_tree.delete(*aday_tree.get_children())
+            adaylar = self.veri.hatirlatma_adaylari(alt_bakiye, alt_gun)
+            for aday in adaylar:
+                aday_tree.insert("", tk.END, values=(aday['ad'], aday['telefon'], f"{aday['bakiye']:.2f}", aday['gun']))
+            kutuyu_goster()
+        
+        def kutuya_ekle():
+            try:
+                alt_bakiye, alt_gun = esikler()
+            except ValueError:
+                messagebox.showwarning("Uyarı", "Bakiye ve gün için sayı girin!", parent=dialog)
+                return
+            basarili, mesaj = self.veri.hatirlatmalari_kuyruga_al(alt_bakiye, alt_gun,
+                                                                   sablon_text.get(1.0, tk.END).strip())
+            if not basarili:
+                messagebox.showerror("Hata", mesaj, parent=dialog)
+                return
+            if self.hatirlatma_gonderici is not None:
+                self.hatirlatma_gonderici.uyandir()
+            adaylari_goster()
+            messagebox.showinfo("Bilgi", mesaj, parent=dialog)
+        
+        def gonderimi_baslat():
+            hedef = hedef_entry.get().strip()
+            if not hedef:
+                messagebox.showwarning("Uyarı", "Gönderim hedefini girin!", parent=dialog)
+                return
+            if self.hatirlatma_gonderici is not None:
+                self.hatirlatma_gonderici.durdur(zaman_asimi=0)
+            self.hatirlatma_gonderici = HatirlatmaGonderici(self.veri, tasiyici_olustur(hedef))
+            self.hatirlatma_gonderici.baslat()
+            kutuyu_goster()
+        
+        def gonderimi_durdur():
+            if self.hatirlatma_gonderici is not None:
+                # Pencere beklemez; süren gönderim biter, başlamamışlar sıraya döner
+                self.hatirlatma_gonderici.durdur(zaman_asimi=0)
+                self.hatirlatma_gonderici = None
+            kutuyu_goster()
+        
+        def bekleyenleri_iptal():
+            if messagebox.askyesno("Onay", "Gönderilmemiş tüm hatırlatmalar iptal edilsin mi?", parent=dialog):
+                messagebox.showinfo("Bilgi", self.veri.hatirlatma_iptal()[1], parent=dialog)
+                adaylari_goster()
+        
+        def sonuclari_izle():
+            # Gönderici arka planda çalışır; pencere yalnızca paket sonuçlarını okur
+            if not dialog.winfo_exists():
+                return
+            gonderici = self.hatirlatma_gonderici
+            yeni = False
+            while gonderici is not None:
+                try:
+                    gonderici.sonuclar.get_nowait()
+                except queue.Empty:
+                    break
+                yeni = True
+            if yeni:
+                kutuyu_goster()
+            dialog.after(HATIRLATMA_IZLEME_ARALIGI_MS, sonuclari_izle)
+        
+        btn_frame = ttk.Frame(dialog)
+        btn_frame.pack(pady=10)
+        
+        ttk.Button(btn_frame, text="🔍 Adayları Göster", command=adaylari_goster).pack(side=tk.LEFT, padx=5)
+        ttk.Button(btn_frame, text="📥 Kutuya Ekle", command=kutuya_ekle).pack(side=tk.LEFT, padx=5)
+        ttk.Button(btn_frame, text="📤 Gönderimi Başlat", command=gonderimi_baslat).pack(side=tk.LEFT, padx=5)
+        ttk.Button(btn_frame, text="⏸️ Durdur", command=gonderimi_durdur).pack(side=tk.LEFT, padx=5)
+        ttk.Button(btn_frame, text="🚫 Bekleyenleri İptal Et", command=bekleyenleri_iptal).pack(side=tk.LEFT, padx=5)
+        ttk.Button(btn_frame, text="❌ Kapat", command=dialog.destroy).pack(side=tk.LEFT, padx=5)
+        
+        adaylari_goster()
+        sonuclari_izle()
+    
     def musteri_sil_onay(self):
         """Müşteri silme onayı"""
         if not self.secili_musteri_id:
@@ -916,12 +6066,21 @@ class EsnafDefterUygulamasi:
         
         onay = messagebox.askyesno("Onay", "Bu müşteriyi ve tüm işlemlerini silmek istediğinize emin misiniz?")
         if onay:
-            musteri_sil(self.secili_musteri_id)
+            self.veri.musteri_sil(self.secili_musteri_id)
             self.secili_musteri_id = None
             self.musteri_bilgi_label.config(text="Müşteri seçin...")
             self.musteri_listesini_guncelle()
             self.islem_listesini_guncelle()
     
+    def borc_silmeyi_geri_al(self):
+        """Borç/alacak sekmesindeki son silmeyi geri alır"""
+        basarili, mesaj = self.veri.son_silmeyi_geri_al(("musteriler", "islemler"))
+        if basarili:
+            self.musteri_listesini_guncelle()
+            self.islem_listesini_guncelle()
+        else:
+            messagebox.showinfo("Bilgi", mesaj)
+    
     def islem_ekle_dialog(self, islem_turu):
         """İşlem ekleme penceresi"""
         if not self.secili_musteri_id:
@@ -930,7 +6089,7 @@ class EsnafDefterUygulamasi:
         
         dialog = tk.Toplevel(self.root)
         dialog.title(f"{'Borç' if islem_turu == 'BORÇ' else 'Ödeme'} Ekle")
-        dialog.geometry("400x250")
+        dialog.geometry("480x440")
         dialog.transient(self.root)
         dialog.grab_set()
         
@@ -951,27 +6110,120 @@ class EsnafDefterUygulamasi:
         aciklama_entry = ttk.Entry(frame, font=("Arial", 12), width=30)
         aciklama_entry.grid(row=2, column=1, pady=5)
         
+        kategoriler = self.kategori_haritasi(islem_turu)
+        ttk.Label(frame, text="Kategori:", font=("Arial", 12)).grid(row=3, column=0, sticky=tk.W, pady=5)
+        kategori_combo = ttk.Combobox(frame, values=[""] + list(kategoriler), font=("Arial", 12),
+                                      width=18, state="readonly")
+        kategori_combo.grid(row=3, column=1, pady=5, sticky=tk.W)
+        
+        # Vade yalnızca borçlar için (boş bırakılabilir)
+        vade_entry = ttk.Entry(frame, font=("Arial", 12), width=20)
+        if islem_turu == "BORÇ":
+            ttk.Label(frame, text="Vade:", font=("Arial", 12)).grid(row=4, column=0, sticky=tk.W, pady=5)
+            vade_entry.grid(row=4, column=1, pady=5, sticky=tk.W)
+        
+        # Döviz ve miktar x birim fiyat (miktar girilirse tutar hesaplanır)
+        ttk.Label(frame, text="Para Birimi:", font=("Arial", 12)).grid(row=5, column=0, sticky=tk.W, pady=5)
+        para_combo = ttk.Combobox(frame, values=list(PARA_BIRIMLERI), font=("Arial", 12), width=8)
+        para_combo.set("TL")
+        para_combo.grid(row=5, column=1, pady=5, sticky=tk.W)
+        
+        ttk.Label(frame, text="Miktar x Fiyat:", font=("Arial", 12)).grid(row=6, column=0, sticky=tk.W, pady=5)
+        miktar_frame = ttk.Frame(frame)
+        miktar_frame.grid(row=6, column=1, pady=5, sticky=tk.W)
+        miktar_entry = ttk.Entry(miktar_frame, font=("Arial", 12), width=8)
+        miktar_entry.pack(side=tk.LEFT)
+        ttk.Label(miktar_frame, text=" x ", font=("Arial", 12)).pack(side=tk.LEFT)
+        fiyat_entry = ttk.Entry(miktar_frame, font=("Arial", 12), width=10)
+        fiyat_entry.pack(side=tk.LEFT)
+        
         def kaydet():
-            basarili, mesaj = islem_ekle(
+            surum = self.veri.musteri_surumu
+            basarili, mesaj = self.veri.islem_ekle(
                 self.secili_musteri_id,
                 tarih_entry.get(),
                 aciklama_entry.get(),
                 tutar_entry.get(),
-                islem_turu
+                islem_turu,
+                kategoriler.get(kategori_combo.get()),
+                vade=vade_entry.get().strip() or None,
+                para_birimi=para_combo.get(),
+                miktar=miktar_entry.get().strip() or None,
+                birim_fiyat=fiyat_entry.get().strip() or None
             )
             if basarili:
+                # Yalnızca seçili müşterinin bakiyesi değişti; liste baştan okunmaz
+                self.musteri_onbellegi.kaydi_yenile(self.secili_musteri_id, surum)
                 self.islem_listesini_guncelle()
-                self.musteri_listesini_guncelle()
+                self.musteri_listesini_guncelle(yeniden_oku=False)
                 dialog.destroy()
             else:
                 messagebox.showerror("Hata", mesaj)
         
         btn_frame = ttk.Frame(frame)
-        btn_frame.grid(row=3, column=0, columnspan=2, pady=20)
+        btn_frame.grid(row=7, column=0, columnspan=2, pady=20)
         
         ttk.Button(btn_frame, text="💾 Kaydet", command=kaydet).pack(side=tk.LEFT, padx=10)
         ttk.Button(btn_frame, text="❌ İptal", command=dialog.destroy).pack(side=tk.LEFT, padx=10)
     
+    def kur_dialog(self):
+        """Döviz kuru giriş ve listeleme penceresi"""
+        dialog = tk.Toplevel(self.root)
+        dialog.title("Döviz Kurları")
+        dialog.geometry("450x400")
+        dialog.transient(self.root)
+        dialog.grab_set()
+        
+        giris_frame = ttk.Frame(dialog, padding=10)
+        giris_frame.pack(fill=tk.X)
+        
+        ttk.Label(giris_frame, text="Birim:", font=("Arial", 11)).grid(row=0, column=0, padx=3)
+        para_combo = ttk.Combobox(giris_frame, values=list(PARA_BIRIMLERI[1:]), width=6, font=("Arial", 11))
+        para_combo.set(PARA_BIRIMLERI[1])
+        para_combo.grid(row=0, column=1, padx=3)
+        
+        ttk.Label(giris_frame, text="Tarih:", font=("Arial", 11)).grid(row=0, column=2, padx=3)
+        tarih_entry = ttk.Entry(giris_frame, font=("Arial", 11), width=11)
+        tarih_entry.insert(0, date.today().strftime("%Y-%m-%d"))
+        tarih_entry.grid(row=0, column=3, padx=3)
+        
+        ttk.Label(giris_frame, text="Kur:", font=("Arial", 11)).grid(row=0, column=4, padx=3)
+        kur_entry = ttk.Entry(giris_frame, font=("Arial", 11), width=9)
+        kur_entry.grid(row=0, column=5, padx=3)
+        kur_entry.focus()
+        
+        kur_tree = ttk.Treeview(dialog, columns=("Birim", "Geçerlilik", "Kur"), show="headings", height=10)
+        for sutun, genislik in zip(("Birim", "Geçerlilik", "Kur"), (80, 120, 120)):
+            kur_tree.heading(sutun, text=sutun)
+            kur_tree.column(sutun, width=genislik, anchor=tk.CENTER)
+        kur_tree.pack(fill=tk.BOTH, expand=True, padx=10)
+        
+        def listeyi_guncelle():
+            kur_tree.delete(*kur_tree.get_children())
+            for kur in self.veri.kur_listele():
+                kur_tree.insert("", tk.END, values=(kur['para_birimi'], kur['gecerlilik_tarihi'], f"{kur['kur']:.4f}"))
+        
+        def kaydet(event=None):
+            basarili, mesaj = self.veri.kur_ekle(para_combo.get(), tarih_entry.get(), kur_entry.get())
+            if not basarili:
+                messagebox.showerror("Hata", mesaj, parent=dialog)
+                return
+            kur_entry.delete(0, tk.END)
+            listeyi_guncelle()
+            # Kur değişimi bakiyeleri etkileyebilir
+            self.musteri_listesini_guncelle()
+            self.islem_listesini_guncelle()
+        
+        kur_entry.bind("<Return>", kaydet)
+        
+        btn_frame = ttk.Frame(dialog)
+        btn_frame.pack(pady=10)
+        
+        ttk.Button(btn_frame, text="💾 Kaydet", command=kaydet).pack(side=tk.LEFT, padx=5)
+        ttk.Button(btn_frame, text="❌ Kapat", command=dialog.destroy).pack(side=tk.LEFT, padx=5)
+        
+        listeyi_guncelle()
+    
     def islem_sil_onay(self):
         """İşlem silme onayı"""
         selection = self.islem_tree.selection()
@@ -982,9 +6234,11 @@ class EsnafDefterUygulamasi:
         onay = messagebox.askyesno("Onay", "Bu işlemi silmek istediğinize emin misiniz?")
         if onay:
             islem_id = selection[0]
-            islem_sil(islem_id)
+            surum = self.veri.musteri_surumu
+            self.veri.islem_sil(islem_id)
+            self.musteri_onbellegi.kaydi_yenile(self.secili_musteri_id, surum)
             self.islem_listesini_guncelle()
-            self.musteri_listesini_guncelle()
+            self.musteri_listesini_guncelle(yeniden_oku=False)
     
     # ========================================================================
     # KASA SEKMESİ
@@ -1012,14 +6266,46 @@ class EsnafDefterUygulamasi:
         self.kasa_aciklama_entry = ttk.Entry(ust_frame, font=("Arial", 12), width=25)
         self.kasa_aciklama_entry.grid(row=0, column=5, padx=5, pady=5)
         
+        # Kategori ve etiketler
+        ttk.Label(ust_frame, text="Kategori:", font=("Arial", 12)).grid(row=1, column=0, padx=5, pady=5)
+        self.kasa_kategori_combo = ttk.Combobox(ust_frame, font=("Arial", 12), width=13, state="readonly",
+                                                postcommand=self.kasa_kategorilerini_yukle)
+        self.kasa_kategori_combo.grid(row=1, column=1, padx=5, pady=5)
+        self.kasa_kategorileri = {}
+        
+        ttk.Label(ust_frame, text="Etiketler:", font=("Arial", 12)).grid(row=1, column=2, padx=5, pady=5)
+        self.kasa_etiket_entry = ttk.Entry(ust_frame, font=("Arial", 12), width=15)
+        self.kasa_etiket_entry.grid(row=1, column=3, padx=5, pady=5)
+        ttk.Label(ust_frame, text="(virgülle ayırın)", font=("Arial", 9)).grid(row=1, column=4, columnspan=2, sticky=tk.W)
+        
         # Butonlar
         btn_frame = ttk.Frame(ust_frame)
-        btn_frame.grid(row=1, column=0, columnspan=6, pady=15)
+        btn_frame.grid(row=2, column=0, columnspan=6, pady=15)
         
         ttk.Button(btn_frame, text="💰 CİRO EKLE", 
                    command=lambda: self.kasa_islem_kaydet("CİRO")).pack(side=tk.LEFT, padx=10)
         ttk.Button(btn_frame, text="📤 GİDER EKLE", 
                    command=lambda: self.kasa_islem_kaydet("GİDER")).pack(side=tk.LEFT, padx=10)
+        ttk.Button(btn_frame, text="📋 ÇOKLU GİRİŞ", 
+                   command=self.kasa_coklu_giris_dialog).pack(side=tk.LEFT, padx=10)
+        ttk.Button(btn_frame, text="🔁 TEKRARLAYANLAR", 
+                   command=self.tekrarlayan_dialog).pack(side=tk.LEFT, padx=10)
+        ttk.Button(btn_frame, text="🏷️ KATEGORİLER", 
+                   command=self.kategori_dialog).pack(side=tk.LEFT, padx=10)
+        
+        # Hızlı giriş: Enter kaydeder, kayıt arka planda yapılır, sonuç durum satırında görünür
+        self.kasa_hizli_giris = tk.BooleanVar(value=False)
+        ttk.Checkbutton(ust_frame, text="⚡ Hızlı giriş (Enter: ciro, Shift+Enter: gider)",
+                        variable=self.kasa_hizli_giris,
+                        command=self.kasa_tutar_entry.focus).grid(row=3, column=0, columnspan=3, sticky=tk.W)
+        self.kasa_durum_label = tk.Label(ust_frame, text="", font=("Arial", 11), anchor=tk.W)
+        self.kasa_durum_label.grid(row=3, column=3, columnspan=3, sticky=tk.W)
+        self.kasa_kuyrugu = None
+        # Kuyrukta bekleyen (gri) satırların liste kimlikleri, sıraya alınma sırasıyla
+        self.kasa_bekleyen = []
+        for entry in (self.kasa_tutar_entry, self.kasa_aciklama_entry):
+            entry.bind("<Return>", lambda e: self.hizli_kasa_kaydet("CİRO"))
+            entry.bind("<Shift-Return>", lambda e: self.hizli_kasa_kaydet("GİDER"))
         
         # Orta panel - Günlük özet
         ozet_frame = ttk.LabelFrame(self.kasa_sekmesi, text="GÜNLÜK ÖZET", padding=15)
@@ -1036,74 +6322,432 @@ class EsnafDefterUygulamasi:
         columns = ("Tarih", "Tür", "Tutar", "Açıklama")
         self.kasa_tree = ttk.Treeview(alt_frame, columns=columns, show="headings", height=15)
         
-        self.kasa_tree.heading("Tarih", text="Tarih")
-        self.kasa_tree.heading("Tür", text="Tür")
-        self.kasa_tree.heading("Tutar", text="Tutar (TL)")
-        self.kasa_tree.heading("Açıklama", text="Açıklama")
+        self.kasa_tree.heading("Tarih", text="Tarih")
+        self.kasa_tree.heading("Tür", text="Tür")
+        self.kasa_tree.heading("Tutar", text="Tutar (TL)")
+        self.kasa_tree.heading("Açıklama", text="Açıklama")
+        
+        self.kasa_tree.column("Tarih", width=120, anchor=tk.CENTER)
+        self.kasa_tree.column("Tür", width=100, anchor=tk.CENTER)
+        self.kasa_tree.column("Tutar", width=120, anchor=tk.E)
+        self.kasa_tree.column("Açıklama", width=300)
+        
+        scrollbar = ttk.Scrollbar(alt_frame, orient=tk.VERTICAL, command=self.kasa_tree.yview)
+        self.kasa_tree.configure(yscrollcommand=scrollbar.set)
+        
+        self.kasa_tree.tag_configure("bekliyor", foreground="gray")
+        
+        self.kasa_tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        
+        # Silme ve geri alma butonları
+        sil_frame = ttk.Frame(alt_frame)
+        sil_frame.pack(pady=10)
+        
+        ttk.Button(sil_frame, text="🗑️ Seçili İşlemi Sil", 
+                   command=self.kasa_islem_sil_onay).pack(side=tk.LEFT, padx=5)
+        ttk.Button(sil_frame, text="↩️ Silmeyi Geri Al", 
+                   command=self.kasa_silmeyi_geri_al).pack(side=tk.LEFT, padx=5)
+    
+    def kasa_listesini_guncelle(self):
+        """Kasa listesini günceller"""
+        bugun = date.today().strftime("%Y-%m-%d")
+        self.kasa_listesini_doldur(self.veri.kasa_islem_listele(), bugun, self.veri.kasa_gunluk_ozet(bugun))
+    
+    def kasa_listesini_doldur(self, islemler, bugun, ozet):
+        """Kasa listesini ve günlük özeti verilen (önceden okunmuş) verilerle doldurur"""
+        # Listeyi temizle
+        self.kasa_tree.delete(*self.kasa_tree.get_children())
+        
+        for islem in islemler:
+            self.kasa_tree.insert("", tk.END, values=(
+                islem['tarih'],
+                islem['islem_turu'],
+                f"{islem['tutar']:.2f}",
+                islem['aciklama'] or ""
+            ), iid=islem['id'])
+        
+        self.gunluk_ozet_goster(bugun, ozet)
+    
+    def gunluk_ozet_goster(self, bugun, ozet):
+        """Bugünün kasa özetini (ciro, gider, net) etikete yazar"""
+        ciro, gider, net = ozet
+        
+        if net >= 0:
+            renk = "green"
+            durum = "KÂR"
+        else:
+            renk = "red"
+            durum = "ZARAR"
+        
+        self.gunluk_ozet_label.config(
+            text=f"Bugün ({bugun}): Ciro: {ciro:.2f} TL | Gider: {gider:.2f} TL | Net: {net:.2f} TL ({durum})",
+            fg=renk
+        )
+    
+    def kasa_islem_kaydet(self, islem_turu):
+        """Kasa işlemini kaydeder"""
+        tarih = self.kasa_tarih_entry.get()
+        tutar = self.kasa_tutar_entry.get()
+        aciklama = self.kasa_aciklama_entry.get()
+        
+        kategori_id = self.kasa_kategorileri.get(self.kasa_kategori_combo.get())
+        etiketler = self.kasa_etiket_entry.get()
+        
+        basarili, mesaj = self.veri.kasa_islem_ekle(tarih, aciklama, tutar, islem_turu, kategori_id, etiketler)
+        
+        if basarili:
+            self.kasa_tutar_entry.delete(0, tk.END)
+            self.kasa_aciklama_entry.delete(0, tk.END)
+            self.kasa_etiket_entry.delete(0, tk.END)
+            self.kasa_listesini_guncelle()
+            messagebox.showinfo("Başarılı", mesaj)
+        else:
+            messagebox.showerror("Hata", mesaj)
+    
+    def hizli_kasa_kaydet(self, islem_turu):
+        """Hızlı girişte satırı doğrulayıp yazma kuyruğuna koyar (arayüz diski beklemez)"""
+        if not self.kasa_hizli_giris.get():
+            return None
+        tarih_gecerli, tarih = tarih_dogrula(self.kasa_tarih_entry.get())
+        tutar_gecerli, tutar = tutar_dogrula(self.kasa_tutar_entry.get())
+        if not tarih_gecerli or not tutar_gecerli:
+            self.kasa_durum_label.config(text=f"✖ {tarih if not tarih_gecerli else tutar}", fg="red")
+            self.root.bell()
+            return "break"
+        
+        if self.kasa_kuyrugu is None:
+            self.kasa_kuyrugu = KasaKuyrugu(self.veri)
+            self.kasa_kuyrugunu_izle()
+        aciklama = self.kasa_aciklama_entry.get()
+        self.kasa_kuyrugu.ekle((tarih, aciklama, tutar, islem_turu,
+                                self.kasa_kategorileri.get(self.kasa_kategori_combo.get()),
+                                self.kasa_etiket_entry.get()))
+        
+        # Satır yazılana kadar gri görünür; yazılınca yerinde gerçek kaydıyla değiştirilir
+        self.kasa_bekleyen.append(
+            self.kasa_tree.insert("", 0, values=(tarih, islem_turu, f"{tutar:.2f}", aciklama), tags=("bekliyor",))
+        )
+        self.kasa_durum_label.config(
+            text=f"⏳ {tutar:.2f} TL {islem_turu} sıraya alındı (bekleyen: {len(self.kasa_bekleyen)})", fg="gray"
+        )
+        self.kasa_tutar_entry.delete(0, tk.END)
+        self.kasa_aciklama_entry.delete(0, tk.END)
+        self.kasa_etiket_entry.delete(0, tk.END)
+        self.kasa_tutar_entry.focus()
+        return "break"
+    
+    def kasa_kuyrugunu_izle(self):
+        """Yazma kuyruğunun sonuçlarını arayüz iş parçacığında işler"""
+        while True:
+            try:
+                tur, sonuclar, ozet = self.kasa_kuyrugu.sonuclar.get_nowait()
+            except queue.Empty:
+                break
+            if tur == "mesgul":
+                self.kasa_durum_label.config(
+                    text=f"⏳ Veritabanı meşgul, {len(self.kasa_bekleyen)} satır yazılmayı bekliyor ({sonuclar})",
+                    fg="orange"
+                )
+                continue
+            
+            # Sonuçlar sıraya alınma sırasıyla gelir; gri satırlar yerinde değiştirilir.
+            # Liste arada yeniden okunduysa gri satır zaten gitmiştir.
+            hatalar = []
+            for sonuc in sonuclar:
+                gri = self.kasa_bekleyen.pop(0)
+                if not self.kasa_tree.exists(gri):
+                    if isinstance(sonuc, str):
+                        hatalar.append(sonuc)
+                    continue
+                tarih, islem_turu, tutar, _ = self.kasa_tree.item(gri, "values")
+                if isinstance(sonuc, str):
+                    hatalar.append(f"{tarih} {tutar} TL {islem_turu}: {sonuc}")
+                elif not self.kasa_tree.exists(sonuc['id']):
+                    self.kasa_tree.insert("", self.kasa_tree.index(gri), iid=sonuc['id'], values=(
+                        sonuc['tarih'], sonuc['islem_turu'], f"{sonuc['tutar']:.2f}", sonuc['aciklama'] or ""
+                    ))
+                self.kasa_tree.delete(gri)
+            if hatalar:
+                self.kasa_durum_label.config(text=f"✖ {len(hatalar)} satır kaydedilemedi ({hatalar[0]})", fg="red")
+                self.root.bell()
+            else:
+                self.kasa_durum_label.config(
+                    text=f"✔ {len(sonuclar)} satır kaydedildi (bekleyen: {len(self.kasa_bekleyen)})", fg="green"
+                )
+            if ozet is not None:
+                self.gunluk_ozet_goster(*ozet)
+        self.root.after(KUYRUK_IZLEME_ARALIGI_MS, self.kasa_kuyrugunu_izle)
+    
+    def kapat(self):
+        """Bekleyen hızlı giriş satırlarını yazıp pencereyi kapatır"""
+        if self.kasa_kuyrugu is not None:
+            self.kasa_kuyrugu.kapat()
+        if self.hatirlatma_gonderici is not None:
+            self.hatirlatma_gonderici.durdur()
+        self.root.destroy()
+    
+    def kategori_haritasi(self, islem_turu=None):
+        """Kategori adı -> id eşlemesi (seçim kutuları için)"""
+        return {k['ad']: k['id'] for k in self.veri.kategori_listele(islem_turu)}
+    
+    def kasa_kategorilerini_yukle(self):
+        """Kasa formundaki kategori listesini tazeler"""
+        self.kasa_kategorileri = self.kategori_haritasi()
+        self.kasa_kategori_combo.config(values=[""] + list(self.kasa_kategorileri))
+    
+    def kategori_dialog(self):
+        """Kategori yönetim penceresi"""
+        dialog = tk.Toplevel(self.root)
+        dialog.title("Kategoriler")
+        dialog.geometry("450x400")
+        dialog.transient(self.root)
+        dialog.grab_set()
+        
+        giris_frame = ttk.Frame(dialog, padding=10)
+        giris_frame.pack(fill=tk.X)
+        
+        ttk.Label(giris_frame, text="Ad:", font=("Arial", 11)).grid(row=0, column=0, padx=3)
+        ad_entry = ttk.Entry(giris_frame, font=("Arial", 11), width=20)
+        ad_entry.grid(row=0, column=1, padx=3)
+        ad_entry.focus()
+        
+        ttk.Label(giris_frame, text="Tür:", font=("Arial", 11)).grid(row=0, column=2, padx=3)
+        tur_combo = ttk.Combobox(giris_frame, values=["", "CİRO", "GİDER", "BORÇ", "ÖDEME"], width=7,
+                                 font=("Arial", 11), state="readonly")
+        tur_combo.grid(row=0, column=3, padx=3)
+        
+        kategori_tree = ttk.Treeview(dialog, columns=("Ad", "Tür"), show="headings", height=10)
+        kategori_tree.heading("Ad", text="Ad")
+        kategori_tree.heading("Tür", text="Tür")
+        kategori_tree.column("Ad", width=250)
+        kategori_tree.column("Tür", width=100, anchor=tk.CENTER)
+        kategori_tree.pack(fill=tk.BOTH, expand=True, padx=10)
+        
+        def listeyi_guncelle():
+            kategori_tree.delete(*kategori_tree.get_children())
+            for kategori in self.veri.kategori_listele():
+                kategori_tree.insert("", tk.END, iid=kategori['id'],
+                                     values=(kategori['ad'], kategori['islem_turu'] or "Tümü"))
+        
+        def ekle(event=None):
+            basarili, mesaj = self.veri.kategori_ekle(ad_entry.get(), tur_combo.get() or None)
+            if not basarili:
+                messagebox.showerror("Hata", mesaj, parent=dialog)
+                return
+            ad_entry.delete(0, tk.END)
+            listeyi_guncelle()
+        
+        def sil():
+            for item in kategori_tree.selection():
+                self.veri.kategori_sil(int(item))
+            listeyi_guncelle()
+        
+        ad_entry.bind("<Return>", ekle)
+        
+        btn_frame = ttk.Frame(dialog)
+        btn_frame.pack(pady=10)
+        
+        ttk.Button(btn_frame, text="➕ Ekle", command=ekle).pack(side=tk.LEFT, padx=5)
+        ttk.Button(btn_frame, text="🗑️ Seçiliyi Kaldır", command=sil).pack(side=tk.LEFT, padx=5)
+        ttk.Button(btn_frame, text="❌ Kapat", command=dialog.destroy).pack(side=tk.LEFT, padx=5)
+        
+        listeyi_guncelle()
+    
+    def kasa_coklu_giris_dialog(self):
+        """Çok satırlı kasa girişi penceresi (tüm satırlar tek seferde kaydedilir)"""
+        dialog = tk.Toplevel(self.root)
+        dialog.title("Çoklu Kasa Girişi")
+        dialog.geometry("750x500")
+        dialog.transient(self.root)
+        dialog.grab_set()
+        
+        paket = IslemPaketi(self.veri)
+        
+        giris_frame = ttk.Frame(dialog, padding=10)
+        giris_frame.pack(fill=tk.X)
+        
+        ttk.Label(giris_frame, text="Tarih:", font=("Arial", 11)).grid(row=0, column=0, padx=3)
+        tarih_entry = ttk.Entry(giris_frame, font=("Arial", 11), width=12)
+        tarih_entry.insert(0, self.kasa_tarih_entry.get())
+        tarih_entry.grid(row=0, column=1, padx=3)
+        
+        ttk.Label(giris_frame, text="Tür:", font=("Arial", 11)).grid(row=0, column=2, padx=3)
+        tur_combo = ttk.Combobox(giris_frame, values=["CİRO", "GİDER"], width=7,
+                                 font=("Arial", 11), state="readonly")
+        tur_combo.set("CİRO")
+        tur_combo.grid(row=0, column=3, padx=3)
+        
+        ttk.Label(giris_frame, text="Tutar:", font=("Arial", 11)).grid(row=0, column=4, padx=3)
+        tutar_entry = ttk.Entry(giris_frame, font=("Arial", 11), width=10)
+        tutar_entry.grid(row=0, column=5, padx=3)
+        tutar_entry.focus()
+        
+        ttk.Label(giris_frame, text="Açıklama:", font=("Arial", 11)).grid(row=0, column=6, padx=3)
+        aciklama_entry = ttk.Entry(giris_frame, font=("Arial", 11), width=20)
+        aciklama_entry.grid(row=0, column=7, padx=3)
+        
+        columns = ("Tarih", "Tür", "Tutar", "Açıklama")
+        satir_tree = ttk.Treeview(dialog, columns=columns, show="headings", height=10)
+        for sutun, genislik in zip(columns, (100, 80, 100, 300)):
+            satir_tree.heading(sutun, text=sutun)
+            satir_tree.column(sutun, width=genislik, anchor=tk.W if sutun == "Açıklama" else tk.CENTER)
+        satir_tree.pack(fill=tk.BOTH, expand=True, padx=10)
+        
+        toplam_label = ttk.Label(dialog, text="", font=("Arial", 11, "bold"))
+        toplam_label.pack(pady=5)
+        
+        def toplam_guncelle():
+            ciro = sum(float(t) for _, _, t, tur in paket.kasa if tur == "CİRO")
+            gider = sum(float(t) for _, _, t, tur in paket.kasa if tur == "GİDER")
+            toplam_label.config(text=f"{len(paket)} satır | Ciro: {ciro:.2f} TL | Gider: {gider:.2f} TL")
+        
+        def satir_ekle(event=None):
+            tarih_gecerli, tarih = tarih_dogrula(tarih_entry.get())
+            tutar_gecerli, tutar = tutar_dogrula(tutar_entry.get())
+            if not tarih_gecerli or not tutar_gecerli:
+                messagebox.showerror("Hata", tarih if not tarih_gecerli else tutar, parent=dialog)
+                return
+            paket.kasa_islem_ekle(tarih, aciklama_entry.get(), tutar, tur_combo.get())
+            satir_tree.insert("", tk.END, values=(tarih, tur_combo.get(), f"{tutar:.2f}", aciklama_entry.get()))
+            tutar_entry.delete(0, tk.END)
+            aciklama_entry.delete(0, tk.END)
+            tutar_entry.focus()
+            toplam_guncelle()
+        
+        def satir_cikar():
+            for item in satir_tree.selection():
+                del paket.kasa[satir_tree.index(item)]
+                satir_tree.delete(item)
+            toplam_guncelle()
+        
+        def hepsini_kaydet():
+            if not len(paket):
+                messagebox.showwarning("Uyarı", "Önce satır ekleyin!", parent=dialog)
+                return
+            basarili, mesaj = paket.kaydet()
+            if basarili:
+                self.kasa_listesini_guncelle()
+                dialog.destroy()
+                messagebox.showinfo("Başarılı", mesaj)
+            else:
+                messagebox.showerror("Hata", mesaj, parent=dialog)
+        
+        tutar_entry.bind("<Return>", satir_ekle)
+        aciklama_entry.bind("<Return>", satir_ekle)
+        
+        btn_frame = ttk.Frame(dialog)
+        btn_frame.pack(pady=10)
+        
+        ttk.Button(btn_frame, text="➕ Satır Ekle", command=satir_ekle).pack(side=tk.LEFT, padx=5)
+        ttk.Button(btn_frame, text="➖ Seçili Satırı Çıkar", command=satir_cikar).pack(side=tk.LEFT, padx=5)
+        ttk.Button(btn_frame, text="💾 Hepsini Kaydet", command=hepsini_kaydet).pack(side=tk.LEFT, padx=5)
+        ttk.Button(btn_frame, text="❌ İptal", command=dialog.destroy).pack(side=tk.LEFT, padx=5)
+        
+        toplam_guncelle()
+    
+    def tekrarlayanlari_kontrol_et(self, yenile=False):
+        """Vadesi gelen tekrarlayan kasa satırlarını üretir ve bir sonraki kontrolü kurar"""
+        if self.veri.tekrarlayanlari_uret() and yenile:
+            self.kasa_listesini_guncelle()
+        self.root.after(TEKRAR_KONTROL_ARALIGI_MS, lambda: self.tekrarlayanlari_kontrol_et(yenile=True))
+    
+    def tekrarlayan_dialog(self):
+        """Tekrarlayan kasa işlemleri (kira, maaş, fatura) yönetim penceresi"""
+        dialog = tk.Toplevel(self.root)
+        dialog.title("Tekrarlayan Kasa İşlemleri")
+        dialog.geometry("950x450")
+        dialog.transient(self.root)
+        dialog.grab_set()
+        
+        giris_frame = ttk.Frame(dialog, padding=10)
+        giris_frame.pack(fill=tk.X)
+        
+        ttk.Label(giris_frame, text="Açıklama:", font=("Arial", 11)).grid(row=0, column=0, padx=3, sticky=tk.W)
+        aciklama_entry = ttk.Entry(giris_frame, font=("Arial", 11), width=20)
+        aciklama_entry.grid(row=0, column=1, padx=3)
+        
+        ttk.Label(giris_frame, text="Tutar:", font=("Arial", 11)).grid(row=0, column=2, padx=3)
+        tutar_entry = ttk.Entry(giris_frame, font=("Arial", 11), width=10)
+        tutar_entry.grid(row=0, column=3, padx=3)
+        
+        ttk.Label(giris_frame, text="Tür:", font=("Arial", 11)).grid(row=0, column=4, padx=3)
+        tur_combo = ttk.Combobox(giris_frame, values=["GİDER", "CİRO"], width=7,
+                                 font=("Arial", 11), state="readonly")
+        tur_combo.set("GİDER")
+        tur_combo.grid(row=0, column=5, padx=3)
         
-        self.kasa_tree.column("Tarih", width=120, anchor=tk.CENTER)
-        self.kasa_tree.column("Tür", width=100, anchor=tk.CENTER)
-        self.kasa_tree.column("Tutar", width=120, anchor=tk.E)
-        self.kasa_tree.column("Açıklama", width=300)
+        ttk.Label(giris_frame, text="Sıklık:", font=("Arial", 11)).grid(row=1, column=0, padx=3, pady=5, sticky=tk.W)
+        siklik_combo = ttk.Combobox(giris_frame, values=list(TEKRAR_SIKLIKLARI), width=10,
+                                    font=("Arial", 11), state="readonly")
+        siklik_combo.set("AYLIK")
+        siklik_combo.grid(row=1, column=1, padx=3, sticky=tk.W)
         
-        scrollbar = ttk.Scrollbar(alt_frame, orient=tk.VERTICAL, command=self.kasa_tree.yview)
-        self.kasa_tree.configure(yscrollcommand=scrollbar.set)
+        ttk.Label(giris_frame, text="Başlangıç:", font=("Arial", 11)).grid(row=1, column=2, padx=3)
+        baslangic_entry = ttk.Entry(giris_frame, font=("Arial", 11), width=12)
+        baslangic_entry.insert(0, date.today().strftime("%Y-%m-%d"))
+        baslangic_entry.grid(row=1, column=3, padx=3)
         
-        self.kasa_tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        ttk.Label(giris_frame, text="Bitiş:", font=("Arial", 11)).grid(row=1, column=4, padx=3)
+        bitis_entry = ttk.Entry(giris_frame, font=("Arial", 11), width=12)
+        bitis_entry.grid(row=1, column=5, padx=3)
         
-        # Silme butonu
-        ttk.Button(alt_frame, text="🗑️ Seçili İşlemi Sil", 
-                   command=self.kasa_islem_sil_onay).pack(pady=10)
-    
-    def kasa_listesini_guncelle(self):
-        """Kasa listesini günceller"""
-        # Listeyi temizle
-        for item in self.kasa_tree.get_children():
-            self.kasa_tree.delete(item)
+        kategoriler = self.kategori_haritasi()
+        ttk.Label(giris_frame, text="Kategori:", font=("Arial", 11)).grid(row=0, column=6, padx=3)
+        kategori_combo = ttk.Combobox(giris_frame, values=[""] + list(kategoriler), width=12,
+                                      font=("Arial", 11), state="readonly")
+        kategori_combo.grid(row=0, column=7, padx=3)
         
-        # İşlemleri getir
-        islemler = kasa_islem_listele()
+        columns = ("Açıklama", "Tür", "Tutar", "Sıklık", "Başlangıç", "Bitiş", "Son")
+        tanim_tree = ttk.Treeview(dialog, columns=columns, show="headings", height=10)
+        for sutun, genislik in zip(columns, (200, 70, 90, 80, 100, 100, 100)):
+            tanim_tree.heading(sutun, text=sutun)
+            tanim_tree.column(sutun, width=genislik, anchor=tk.W if sutun == "Açıklama" else tk.CENTER)
+        tanim_tree.pack(fill=tk.BOTH, expand=True, padx=10)
         
-        for islem in islemler:
-            self.kasa_tree.insert("", tk.END, values=(
-                islem['tarih'],
-                islem['islem_turu'],
-                f"{islem['tutar']:.2f}",
-                islem['aciklama'] or ""
-            ), iid=islem['id'])
+        def listeyi_guncelle():
+            tanim_tree.delete(*tanim_tree.get_children())
+            for tanim in self.veri.tekrarlayan_listele():
+                tanim_tree.insert("", tk.END, iid=tanim['id'], values=(
+                    tanim['aciklama'] or "", tanim['islem_turu'], f"{tanim['tutar']:.2f}",
+                    tanim['siklik'], tanim['baslangic'], tanim['bitis'] or "-", tanim['son_islenen'] or "-"
+                ))
         
-        # Günlük özeti güncelle
-        bugun = date.today().strftime("%Y-%m-%d")
-        ciro, gider, net = kasa_gunluk_ozet(bugun)
+        def kaydet():
+            basarili, mesaj = self.veri.tekrarlayan_ekle(
+                aciklama_entry.get(), tutar_entry.get(), tur_combo.get(),
+                siklik_combo.get(), baslangic_entry.get(), bitis_entry.get().strip() or None,
+                kategoriler.get(kategori_combo.get())
+            )
+            if not basarili:
+                messagebox.showerror("Hata", mesaj, parent=dialog)
+                return
+            # Başlangıcı geçmişte olan tanımların eksik satırları hemen üretilir
+            if self.veri.tekrarlayanlari_uret():
+                self.kasa_listesini_guncelle()
+            aciklama_entry.delete(0, tk.END)
+            tutar_entry.delete(0, tk.END)
+            listeyi_guncelle()
         
-        if net >= 0:
-            renk = "green"
-            durum = "KÂR"
-        else:
-            renk = "red"
-            durum = "ZARAR"
+        def durdur():
+            secili = tanim_tree.selection()
+            if not secili:
+                messagebox.showwarning("Uyarı", "Lütfen bir tanım seçin!", parent=dialog)
+                return
+            if messagebox.askyesno("Onay", "Seçili tekrarlayan işlem durdurulsun mu?\n"
+                                   "Daha önce oluşturulan kasa kayıtları silinmez.", parent=dialog):
+                for item in secili:
+                    self.veri.tekrarlayan_sil(int(item))
+                listeyi_guncelle()
         
-        self.gunluk_ozet_label.config(
-            text=f"Bugün ({bugun}): Ciro: {ciro:.2f} TL | Gider: {gider:.2f} TL | Net: {net:.2f} TL ({durum})",
-            fg=renk
-        )
-    
-    def kasa_islem_kaydet(self, islem_turu):
-        """Kasa işlemini kaydeder"""
-        tarih = self.kasa_tarih_entry.get()
-        tutar = self.kasa_tutar_entry.get()
-        aciklama = self.kasa_aciklama_entry.get()
+        btn_frame = ttk.Frame(dialog)
+        btn_frame.pack(pady=10)
         
-        basarili, mesaj = kasa_islem_ekle(tarih, aciklama, tutar, islem_turu)
+        ttk.Button(btn_frame, text="➕ Ekle", command=kaydet).pack(side=tk.LEFT, padx=5)
+        ttk.Button(btn_frame, text="⏹ Seçiliyi Durdur", command=durdur).pack(side=tk.LEFT, padx=5)
+        ttk.Button(btn_frame, text="❌ Kapat", command=dialog.destroy).pack(side=tk.LEFT, padx=5)
         
-        if basarili:
-            self.kasa_tutar_entry.delete(0, tk.END)
-            self.kasa_aciklama_entry.delete(0, tk.END)
-            self.kasa_listesini_guncelle()
-            messagebox.showinfo("Başarılı", mesaj)
-        else:
-            messagebox.showerror("Hata", mesaj)
+        listeyi_guncelle()
     
     def kasa_islem_sil_onay(self):
         """Kasa işlemi silme onayı"""
@@ -1111,13 +6755,259 @@ class EsnafDefterUygulamasi:
         if not selection:
             messagebox.showwarning("Uyarı", "Lütfen bir işlem seçin!")
             return
+        if "bekliyor" in self.kasa_tree.item(selection[0], "tags"):
+            messagebox.showwarning("Uyarı", "Bu satır henüz kaydediliyor, birazdan tekrar deneyin.")
+            return
         
         onay = messagebox.askyesno("Onay", "Bu işlemi silmek istediğinize emin misiniz?")
         if onay:
             islem_id = selection[0]
-            kasa_islem_sil(islem_id)
+            self.veri.kasa_islem_sil(islem_id)
+            self.kasa_listesini_guncelle()
+    
+    def kasa_silmeyi_geri_al(self):
+        """Kasa sekmesindeki son silmeyi geri alır"""
+        basarili, mesaj = self.veri.son_silmeyi_geri_al(("kasa",))
+        if basarili:
+            self.kasa_listesini_guncelle()
+        else:
+            messagebox.showinfo("Bilgi", mesaj)
+    
+    # ========================================================================
+    # SATIŞ SEKMESİ
+    # ========================================================================
+    
+    def satis_olustur(self):
+        """Satış sekmesini oluşturur (kod/barkod ile sepete ekleme)"""
+        ust_frame = ttk.LabelFrame(self.satis_sekmesi, text="SATIŞ", padding=15)
+        ust_frame.pack(fill=tk.X, padx=10, pady=10)
+        
+        ttk.Label(ust_frame, text="Kod / Barkod:", font=("Arial", 12)).grid(row=0, column=0, padx=5, pady=5)
+        self.satis_kod_entry = ttk.Entry(ust_frame, font=("Arial", 14), width=25)
+        self.satis_kod_entry.grid(row=0, column=1, padx=5, pady=5)
+        self.satis_kod_entry.bind("<Return>", self.satis_kalem_ekle)
+        ttk.Label(ust_frame, text="(Enter ekler; 3*KOD: 3 adet)", font=("Arial", 9)).grid(row=0, column=2, sticky=tk.W)
+        
+        ttk.Label(ust_frame, text="Tarih:", font=("Arial", 12)).grid(row=0, column=3, padx=5, pady=5)
+        self.satis_tarih_entry = ttk.Entry(ust_frame, font=("Arial", 12), width=12)
+        self.satis_tarih_entry.insert(0, date.today().strftime("%Y-%m-%d"))
+        self.satis_tarih_entry.grid(row=0, column=4, padx=5, pady=5)
+        
+        self.satis_durum_label = tk.Label(ust_frame, text="", font=("Arial", 11), anchor=tk.W)
+        self.satis_durum_label.grid(row=1, column=0, columnspan=5, sticky=tk.W)
+        
+        # Sepet
+        sepet_frame = ttk.LabelFrame(self.satis_sekmesi, text="SEPET", padding=10)
+        sepet_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
+        
+        columns = ("Kod", "Ürün", "Miktar", "Fiyat", "Tutar")
+        self.satis_tree = ttk.Treeview(sepet_frame, columns=columns, show="headings", height=12)
+        for sutun, genislik in zip(columns, (120, 300, 80, 100, 120)):
+            self.satis_tree.heading(sutun, text=sutun)
+            self.satis_tree.column(sutun, width=genislik, anchor=tk.W if sutun == "Ürün" else tk.E)
+        self.satis_tree.pack(fill=tk.BOTH, expand=True)
+        self.satis_tree.bind("<Delete>", lambda e: self.satis_kalem_sil())
+        
+        self.satis_toplam_label = tk.Label(sepet_frame, text="", font=("Arial", 16, "bold"))
+        self.satis_toplam_label.pack(pady=5)
+        
+        alt_frame = ttk.Frame(self.satis_sekmesi)
+        alt_frame.pack(pady=10)
+        
+        ttk.Label(alt_frame, text="Veresiye müşteri:", font=("Arial", 11)).pack(side=tk.LEFT, padx=5)
+        self.satis_musteri_combo = ttk.Combobox(alt_frame, font=("Arial", 11), width=25, state="readonly",
+                                                postcommand=self.satis_musterilerini_yukle)
+        self.satis_musteri_combo.pack(side=tk.LEFT, padx=5)
+        self.satis_musterileri = {}
+        
+        ttk.Button(alt_frame, text="💵 PEŞİN SATIŞ", 
+                   command=lambda: self.satis_tamamla(veresiye=False)).pack(side=tk.LEFT, padx=5)
+        ttk.Button(alt_frame, text="📒 VERESİYE", 
+                   command=lambda: self.satis_tamamla(veresiye=True)).pack(side=tk.LEFT, padx=5)
+        ttk.Button(alt_frame, text="🗑️ Satırı Sil", 
+                   command=self.satis_kalem_sil).pack(side=tk.LEFT, padx=5)
+        ttk.Button(alt_frame, text="🧹 Temizle", 
+                   command=self.sepeti_temizle).pack(side=tk.LEFT, padx=5)
+        ttk.Button(alt_frame, text="📦 ÜRÜNLER", 
+                   command=self.urun_dialog).pack(side=tk.LEFT, padx=5)
+        
+        # Sepet: urun_id -> [UrunKaydi, miktar]
+        self.sepet = {}
+        self.sepet_goster()
+    
+    def satis_sekmesi_acildi(self, event=None):
+        """Satış sekmesine geçildiğinde (başka kasada eklenen ürünler için) indeks yenilenir ve kod alanı odaklanır"""
+        if self.notebook.select() == str(self.satis_sekmesi):
+            self.urun_indeksi.gecersiz_kil()
+            self.satis_kod_entry.focus()
+    
+    def satis_kalem_ekle(self, event=None):
+        """Okutulan/yazılan kodu sepete ekler (aynı ürün tekrar okutulursa miktar artar)"""
+        girdi = self.satis_kod_entry.get().strip()
+        if not girdi:
+            return "break"
+        miktar, _, kod = girdi.rpartition("*")
+        try:
+            miktar = float(miktar.replace(",", ".")) if miktar else 1.0
+        except ValueError:
+            miktar = 0
+        urun = self.urun_indeksi.bul(kod)
+        self.satis_kod_entry.delete(0, tk.END)
+        if urun is None or miktar <= 0:
+            self.satis_durum_label.config(
+                text=f"✖ {'Ürün bulunamadı' if urun is None else 'Geçersiz miktar'}: {girdi}", fg="red")
+            self.root.bell()
+            return "break"
+        kalem = self.sepet.setdefault(urun.id, [urun, 0])
+        kalem[1] += miktar
+        self.satis_durum_label.config(text=f"✔ {urun.ad} x {kalem[1]:g} ({urun.fiyat:.2f} TL)", fg="green")
+        self.sepet_goster()
+        return "break"
+    
+    def sepet_goster(self):
+        """Sepet listesini ve toplamı yeniler"""
+        self.satis_tree.delete(*self.satis_tree.get_children())
+        toplam = 0
+        for urun, miktar in self.sepet.values():
+            tutar = round(urun.fiyat * miktar, 2)
+            toplam += tutar
+            self.satis_tree.insert("", tk.END, iid=urun.id, values=(
+                urun.kod, urun.ad, f"{miktar:g}", f"{urun.fiyat:.2f}", f"{tutar:.2f}"))
+        self.satis_toplam_label.config(text=f"TOPLAM: {toplam:.2f} TL")
+    
+    def satis_kalem_sil(self):
+        """Seçili sepet satırlarını çıkarır"""
+        for item in self.satis_tree.selection():
+            self.sepet.pop(int(item), None)
+        self.sepet_goster()
+        self.satis_kod_entry.focus()
+    
+    def sepeti_temizle(self):
+        """Sepeti ve veresiye müşteri seçimini boşaltır"""
+        self.sepet.clear()
+        self.satis_musteri_combo.set("")
+        self.sepet_goster()
+        self.satis_kod_entry.focus()
+    
+    def satis_musterilerini_yukle(self):
+        """Veresiye müşteri seçim kutusunu önbellekteki müşterilerle doldurur"""
+        self.satis_musterileri = {f"{m.ad} (#{m.id})": m.id for m in self.musteri_onbellegi.kayitlar()}
+        self.satis_musteri_combo.config(values=list(self.satis_musterileri))
+    
+    def satis_tamamla(self, veresiye):
+        """Sepeti peşin (kasaya) ya da veresiye (seçili müşteriye) kaydeder"""
+        musteri_id = None
+        if veresiye:
+            musteri_id = self.satis_musterileri.get(self.satis_musteri_combo.get())
+            if musteri_id is None:
+                messagebox.showwarning("Uyarı", "Veresiye satış için müşteri seçin!")
+                return
+        kalemler = [(urun.id, miktar, urun.fiyat) for urun, miktar in self.sepet.values()]
+        basarili, mesaj = self.veri.satis_kaydet(kalemler, musteri_id, self.satis_tarih_entry.get())
+        if not basarili:
+            messagebox.showerror("Hata", mesaj)
+            return
+        self.sepeti_temizle()
+        self.satis_durum_label.config(text=f"✔ {mesaj}", fg="green")
+        if veresiye:
+            self.musteri_listesini_guncelle()
+            self.islem_listesini_guncelle()
+        else:
             self.kasa_listesini_guncelle()
     
+    def urun_dialog(self):
+        """Ürün kataloğu yönetim penceresi"""
+        dialog = tk.Toplevel(self.root)
+        dialog.title("Ürünler")
+        dialog.geometry("700x500")
+        dialog.transient(self.root)
+        dialog.grab_set()
+        
+        giris_frame = ttk.Frame(dialog, padding=10)
+        giris_frame.pack(fill=tk.X)
+        
+        girisler = {}
+        for sutun, (etiket, genislik) in enumerate((("Kod:", 10), ("Barkod:", 14), ("Ad:", 20),
+                                                    ("Fiyat:", 8), ("Stok:", 6))):
+            ttk.Label(giris_frame, text=etiket, font=("Arial", 11)).grid(row=0, column=2 * sutun, padx=3)
+            girisler[etiket] = ttk.Entry(giris_frame, font=("Arial", 11), width=genislik)
+            girisler[etiket].grid(row=0, column=2 * sutun + 1, padx=3)
+        girisler["Kod:"].focus()
+        
+        arama_frame = ttk.Frame(dialog, padding=(10, 0))
+        arama_frame.pack(fill=tk.X)
+        ttk.Label(arama_frame, text="Ara:", font=("Arial", 11)).pack(side=tk.LEFT, padx=3)
+        arama_entry = ttk.Entry(arama_frame, font=("Arial", 11), width=25)
+        arama_entry.pack(side=tk.LEFT, padx=3)
+        
+        columns = ("Kod", "Barkod", "Ad", "Fiyat", "Stok")
+        urun_tree = ttk.Treeview(dialog, columns=columns, show="headings", height=12)
+        for sutun, genislik in zip(columns, (90, 130, 250, 80, 70)):
+            urun_tree.heading(sutun, text=sutun)
+            urun_tree.column(sutun, width=genislik, anchor=tk.E if sutun in ("Fiyat", "Stok") else tk.W)
+        urun_tree.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
+        
+        def listeyi_guncelle(event=None):
+            urun_tree.delete(*urun_tree.get_children())
+            for urun in self.veri.urun_listele(arama_entry.get()):
+                urun_tree.insert("", tk.END, iid=urun['id'], values=(
+                    urun['kod'], urun['barkod'] or "", urun['ad'], f"{urun['fiyat']:.2f}",
+                    "" if urun['stok'] is None else f"{urun['stok']:g}"))
+        
+        def secileni_doldur(event=None):
+            secili = urun_tree.selection()
+            if not secili:
+                return
+            for etiket, deger in zip(("Kod:", "Barkod:", "Ad:", "Fiyat:", "Stok:"), urun_tree.item(secili[0], "values")):
+                girisler[etiket].delete(0, tk.END)
+                girisler[etiket].insert(0, deger)
+        
+        def kaydet(event=None):
+            basarili, mesaj = self.veri.urun_kaydet(
+                girisler["Kod:"].get(), girisler["Ad:"].get(), girisler["Fiyat:"].get(),
+                girisler["Barkod:"].get(), girisler["Stok:"].get())
+            if not basarili:
+                messagebox.showerror("Hata", mesaj, parent=dialog)
+                return
+            for giris in girisler.values():
+                giris.delete(0, tk.END)
+            girisler["Kod:"].focus()
+            listeyi_guncelle()
+        
+        def sil():
+            for item in urun_tree.selection():
+                self.veri.urun_sil(int(item))
+            listeyi_guncelle()
+        
+        def dosyadan_yukle():
+            dosya = filedialog.askopenfilename(
+                parent=dialog, filetypes=[("CSV dosyası", "*.csv"), ("Tüm dosyalar", "*.*")])
+            if not dosya:
+                return
+            try:
+                urunler = urun_dosyasi_oku(dosya)
+            except (OSError, ValueError, csv.Error) as e:
+                messagebox.showerror("Hata", f"Dosya okunamadı: {e}", parent=dialog)
+                return
+            basarili, mesaj = self.veri.urunleri_kaydet(urunler)
+            (messagebox.showinfo if basarili else messagebox.showerror)("Ürünler", mesaj, parent=dialog)
+            listeyi_guncelle()
+        
+        for giris in girisler.values():
+            giris.bind("<Return>", kaydet)
+        arama_entry.bind("<KeyRelease>", listeyi_guncelle)
+        urun_tree.bind("<<TreeviewSelect>>", secileni_doldur)
+        
+        btn_frame = ttk.Frame(dialog)
+        btn_frame.pack(pady=10)
+        
+        ttk.Button(btn_frame, text="💾 Kaydet", command=kaydet).pack(side=tk.LEFT, padx=5)
+        ttk.Button(btn_frame, text="🗑️ Seçiliyi Kaldır", command=sil).pack(side=tk.LEFT, padx=5)
+        ttk.Button(btn_frame, text="📂 Dosyadan Yükle (CSV)", command=dosyadan_yukle).pack(side=tk.LEFT, padx=5)
+        ttk.Button(btn_frame, text="❌ Kapat", command=dialog.destroy).pack(side=tk.LEFT, padx=5)
+        
+        listeyi_guncelle()
+    
     # ========================================================================
     # RAPOR SEKMESİ
     # ========================================================================
@@ -1169,8 +7059,42 @@ class EsnafDefterUygulamasi:
                    command=self.kasa_raporu_goster).pack(side=tk.LEFT, padx=5)
         ttk.Button(kasa_btn_frame, text="📄 PDF Olarak Kaydet", 
                    command=self.kasa_raporu_pdf_kaydet).pack(side=tk.LEFT, padx=5)
+        ttk.Button(kasa_btn_frame, text="🔒 Yılı Kapat", 
+                   command=self.donem_kapat_onay).pack(side=tk.LEFT, padx=5)
+        ttk.Button(kasa_btn_frame, text="🩺 Bütünlük Kontrolü", 
+                   command=self.butunluk_kontrolu).pack(side=tk.LEFT, padx=5)
+        
+        # Kategori Raporu (kasa ay/yıl seçimini kullanır)
+        kategori_frame = ttk.LabelFrame(frame, text="KATEGORİ RAPORU", padding=10)
+        kategori_frame.pack(fill=tk.X, pady=10)
+        
+        kategori_secim_frame = ttk.Frame(kategori_frame)
+        kategori_secim_frame.pack(pady=5)
         
-        # Rapor görüntüleme alanı
+        self.kategori_tum_yil = tk.BooleanVar(value=False)
+        ttk.Checkbutton(kategori_secim_frame, text="Tüm yıl (aylara göre)",
+                        variable=self.kategori_tum_yil).pack(side=tk.LEFT, padx=5)
+        ttk.Label(kategori_secim_frame, text="Etiket:", font=("Arial", 11)).pack(side=tk.LEFT, padx=5)
+        self.kategori_etiket_combo = ttk.Combobox(
+            kategori_secim_frame, width=15, font=("Arial", 11), state="readonly",
+            postcommand=lambda: self.kategori_etiket_combo.config(values=[""] + self.veri.etiket_listele())
+        )
+        self.kategori_etiket_combo.pack(side=tk.LEFT, padx=5)
+        ttk.Button(kategori_secim_frame, text="📋 Raporu Görüntüle", 
+                   command=self.kategori_raporu_goster).pack(side=tk.LEFT, padx=5)
+        ttk.Button(kategori_secim_frame, text="📄 PDF Olarak Kaydet", 
+                   command=self.kategori_raporu_pdf_kaydet).pack(side=tk.LEFT, padx=5)
+        
+        columns = ("Dönem", "Tür", "Kategori", "Tutar", "Adet")
+        self.kategori_tree = ttk.Treeview(kategori_frame, columns=columns, show="headings", height=5)
+        for sutun, genislik in zip(columns, (90, 70, 250, 120, 60)):
+            self.kategori_tree.heading(sutun, text=sutun)
+            self.kategori_tree.column(sutun, width=genislik,
+                                      anchor=tk.W if sutun == "Kategori" else tk.E if sutun == "Tutar" else tk.CENTER)
+        self.kategori_tree.pack(fill=tk.X)
+        
+        # Rapor görüntüleme alanı; son gösterilen raporun modeli kaydetmede yeniden kullanılır
+        self.son_rapor_modeli = None
         rapor_frame = ttk.LabelFrame(frame, text="RAPOR", padding=10)
         rapor_frame.pack(fill=tk.BOTH, expand=True, pady=10)
         
@@ -1181,47 +7105,103 @@ class EsnafDefterUygulamasi:
         self.rapor_text.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
         scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
         
-        # Kaydetme butonu
-        ttk.Button(frame, text="💾 Raporu Dosyaya Kaydet", 
-                   command=self.raporu_kaydet).pack(pady=10)
+        # Kaydetme ve şube eşitleme butonları
+        alt_frame = ttk.Frame(frame)
+        alt_frame.pack(pady=10)
+        ttk.Button(alt_frame, text="💾 Raporu Dosyaya Kaydet", 
+                   command=self.raporu_kaydet).pack(side=tk.LEFT, padx=5)
+        ttk.Button(alt_frame, text="📤 Eşitleme Dosyası Oluştur", 
+                   command=self.senk_disa_aktar).pack(side=tk.LEFT, padx=5)
+        ttk.Button(alt_frame, text="📥 Eşitleme Dosyası Al", 
+                   command=self.senk_ice_aktar).pack(side=tk.LEFT, padx=5)
+    
+    def raporu_goster(self, model):
+        """Rapor modelini metin olarak gösterir; dosyaya kaydetme aynı modeli kullanır"""
+        self.son_rapor_modeli = model
+        self.rapor_text.delete(1.0, tk.END)
+        self.rapor_text.insert(tk.END, metin_yazici(model))
     
     def borc_raporu_goster(self):
         """Borç-alacak raporunu gösterir"""
-        rapor = borc_raporu_olustur()
-        self.rapor_text.delete(1.0, tk.END)
-        self.rapor_text.insert(tk.END, rapor)
+        self.raporu_goster(self.veri.rapor_modeli("borc"))
     
     def kasa_raporu_goster(self):
         """Kasa raporunu gösterir"""
         try:
             ay = int(self.rapor_ay.get())
             yil = int(self.rapor_yil.get())
-            rapor = kasa_raporu_olustur(yil, ay)
+            model = self.veri.rapor_modeli("kasa", yil, ay)
         except ValueError:
-            rapor = kasa_raporu_olustur()
+            model = self.veri.rapor_modeli("kasa")
         
-        self.rapor_text.delete(1.0, tk.END)
-        self.rapor_text.insert(tk.END, rapor)
+        self.raporu_goster(model)
+    
+    def kategori_raporu_secimi(self):
+        """Kategori raporu için (yıl, ay, etiket); ay None ise tüm yıl"""
+        yil = int(self.rapor_yil.get())
+        ay = None if self.kategori_tum_yil.get() else int(self.rapor_ay.get())
+        return yil, ay, self.kategori_etiket_combo.get() or None
+    
+    def kategori_raporu_goster(self):
+        """Kategori raporunu tabloda ve metin olarak gösterir"""
+        try:
+            yil, ay, etiket = self.kategori_raporu_secimi()
+        except ValueError:
+            messagebox.showwarning("Uyarı", "Lütfen geçerli bir ay ve yıl seçin!")
+            return
+        
+        self.kategori_tree.delete(*self.kategori_tree.get_children())
+        for satir in self.veri.kategori_ozeti(yil, ay, etiket):
+            self.kategori_tree.insert("", tk.END, values=(
+                satir['donem'], satir['islem_turu'], satir['kategori'],
+                f"{satir['toplam']:.2f}", satir['adet']
+            ))
+        
+        self.raporu_goster(self.veri.rapor_modeli("kategori", yil, ay, etiket))
+    
+    def kategori_raporu_pdf_kaydet(self):
+        """Kategori raporunu PDF olarak kaydeder"""
+        try:
+            yil, ay, etiket = self.kategori_raporu_secimi()
+        except ValueError:
+            messagebox.showwarning("Uyarı", "Lütfen geçerli bir ay ve yıl seçin!")
+            return
+        
+        dosya = filedialog.asksaveasfilename(
+            defaultextension=".pdf",
+            initialfile=f"kategori_raporu_{yil}{f'_{ay:02d}' if ay else ''}.pdf",
+            filetypes=[("PDF Dosyası", "*.pdf"), ("Tüm Dosyalar", "*.*")]
+        )
+        
+        if dosya:
+            try:
+                self.veri.kategori_raporu_pdf_olustur(yil, ay, etiket, dosya)
+                messagebox.showinfo("Başarılı", f"PDF rapor kaydedildi:\n{dosya}")
+            except Exception as e:
+                messagebox.showerror("Hata", f"PDF oluşturulurken hata oluştu:\n{str(e)}")
     
     def raporu_kaydet(self):
-        """Raporu dosyaya kaydeder"""
-        rapor = self.rapor_text.get(1.0, tk.END).strip()
-        if not rapor:
+        """Görüntülenen raporu dosyaya kaydeder (biçim uzantıdan seçilir, rapor yeniden hesaplanmaz)"""
+        model = self.son_rapor_modeli
+        if model is None:
             messagebox.showwarning("Uyarı", "Önce bir rapor oluşturun!")
             return
         
-        dosya_adi = f"rapor_{datetime.now().strftime('%Y%m%d_%H%M%S')}.txt"
-        
         dosya = filedialog.asksaveasfilename(
             defaultextension=".txt",
-            initialfile=dosya_adi,
-            filetypes=[("Metin Dosyası", "*.txt"), ("Tüm Dosyalar", "*.*")]
+            initialfile=model["dosya_adi"] + ".txt",
+            filetypes=[("Metin Dosyası", "*.txt"), ("Web Sayfası", "*.html"),
+                       ("Excel (CSV)", "*.csv"), ("PDF Dosyası", "*.pdf"), ("Tüm Dosyalar", "*.*")]
         )
         
         if dosya:
-            with open(dosya, 'w', encoding='utf-8') as f:
-                f.write(rapor)
-            messagebox.showinfo("Başarılı", f"Rapor kaydedildi:\n{dosya}")
+            uzanti = os.path.splitext(dosya)[1].lower()
+            bicim = next((b for b, (_, u, _) in RAPOR_BICIMLERI.items() if u == uzanti), "metin")
+            try:
+                rapor_dosyasi_yaz(model, bicim, dosya)
+                messagebox.showinfo("Başarılı", f"Rapor kaydedildi:\n{dosya}")
+            except Exception as e:
+                messagebox.showerror("Hata", f"Rapor kaydedilirken hata oluştu:\n{str(e)}")
     
     def borc_raporu_pdf_kaydet(self):
         """Borç-alacak raporunu PDF olarak kaydeder"""
@@ -1235,11 +7215,99 @@ class EsnafDefterUygulamasi:
         
         if dosya:
             try:
-                borc_raporu_pdf_olustur(dosya)
+                self.veri.borc_raporu_pdf_olustur(dosya)
                 messagebox.showinfo("Başarılı", f"PDF rapor kaydedildi:\n{dosya}")
             except Exception as e:
                 messagebox.showerror("Hata", f"PDF oluşturulurken hata oluştu:\n{str(e)}")
     
+    def donem_kapat_onay(self):
+        """Seçili yılın dönem kapanışını onay alarak yapar"""
+        try:
+            yil = int(self.rapor_yil.get())
+        except ValueError:
+            messagebox.showwarning("Uyarı", "Lütfen geçerli bir yıl seçin!")
+            return
+        
+        onay = messagebox.askyesno(
+            "Onay",
+            f"{yil} ve önceki yıllar kapatılacak.\n\n"
+            "Kasa kayıtları ve bakiyesi kapanmış müşterilerin işlemleri arşive taşınacak, "
+            "bu yıllara yeni kasa işlemi eklenemeyecek. Devam edilsin mi?"
+        )
+        if onay:
+            basarili, mesaj = self.veri.donem_kapat(yil)
+            if basarili:
+                self.musteri_listesini_guncelle()
+                self.islem_listesini_guncelle()
+                self.kasa_listesini_guncelle()
+                messagebox.showinfo("Başarılı", mesaj)
+            else:
+                messagebox.showerror("Hata", mesaj)
+    
+    def butunluk_kontrolu(self):
+        """Veritabanını denetler, sorun bulunursa onay alarak onarır"""
+        temiz, bulgular = self.veri.butunluk_kontrol()
+        self.rapor_text.delete(1.0, tk.END)
+        self.rapor_text.insert(tk.END, butunluk_raporu(bulgular))
+        if temiz:
+            messagebox.showinfo("Bütünlük Kontrolü", "Sorun bulunmadı.")
+            return
+        
+        if not messagebox.askyesno("Bütünlük Kontrolü",
+                                   "Sorunlar bulundu (ayrıntılar rapor alanında).\n\n"
+                                   "Düzeltilebilenler onarılsın mı?"):
+            return
+        temiz, bulgular = self.veri.butunluk_kontrol(onar=True)
+        self.rapor_text.delete(1.0, tk.END)
+        self.rapor_text.insert(tk.END, butunluk_raporu(bulgular))
+        self.musteri_listesini_guncelle()
+        self.islem_listesini_guncelle()
+        self.kasa_listesini_guncelle()
+        if temiz:
+            messagebox.showinfo("Bütünlük Kontrolü", "Tüm sorunlar onarıldı.")
+        else:
+            messagebox.showwarning("Bütünlük Kontrolü",
+                                   "Bazı sorunlar otomatik onarılamadı; ayrıntılar rapor alanında.")
+    
+    def senk_disa_aktar(self):
+        """Diğer şubelere götürülecek eşitleme dosyasını kaydeder"""
+        paket = self.veri.senk_paketi_olustur()
+        dosya = filedialog.asksaveasfilename(
+            initialfile=senk_dosya_adi(paket), defaultextension=SENK_UZANTISI,
+            filetypes=[("Eşitleme dosyası", f"*{SENK_UZANTISI}"), ("Tüm dosyalar", "*.*")]
+        )
+        if not dosya:
+            return  # Kaydedilmeyen değişiklikler bir sonraki dosyada yeniden gider
+        try:
+            senk_dosyasi_yaz(paket, dosya)
+        except OSError as e:
+            messagebox.showerror("Hata", f"Dosya yazılamadı: {e}")
+            return
+        messagebox.showinfo("Eşitleme", f"Eşitleme dosyası kaydedildi.\n{senk_ozeti(paket)}")
+    
+    def senk_ice_aktar(self):
+        """Başka şubeden gelen eşitleme dosyalarını uygular"""
+        dosyalar = filedialog.askopenfilenames(
+            filetypes=[("Eşitleme dosyası", f"*{SENK_UZANTISI}"), ("Tüm dosyalar", "*.*")]
+        )
+        mesajlar = []
+        for dosya in sorted(dosyalar):
+            try:
+                basarili, mesaj = self.veri.senk_paketini_uygula(senk_dosyasi_oku(dosya))
+            except (OSError, ValueError) as e:
+                basarili, mesaj = False, f"Dosya okunamadı: {e}"
+            mesajlar.append(f"{os.path.basename(dosya)}: {mesaj}")
+            if not basarili:
+                messagebox.showerror("Eşitleme", "\n".join(mesajlar))
+                break
+        else:
+            if not mesajlar:
+                return
+            messagebox.showinfo("Eşitleme", "\n".join(mesajlar))
+        self.musteri_listesini_guncelle()
+        self.islem_listesini_guncelle()
+        self.kasa_listesini_guncelle()
+    
     def kasa_raporu_pdf_kaydet(self):
         """Kasa raporunu PDF olarak kaydeder"""
         try:
@@ -1259,24 +7327,490 @@ class EsnafDefterUygulamasi:
         
         if dosya:
             try:
-                kasa_raporu_pdf_olustur(yil, ay, dosya)
+                self.veri.kasa_raporu_pdf_olustur(yil, ay, dosya)
                 messagebox.showinfo("Başarılı", f"PDF rapor kaydedildi:\n{dosya}")
             except Exception as e:
                 messagebox.showerror("Hata", f"PDF oluşturulurken hata oluştu:\n{str(e)}")
 
 
+# ============================================================================
+# SENTETİK VERİ VE PERFORMANS ÖLÇÜMÜ
+# ============================================================================
+
+# Ölçek adı -> (müşteri, borç/alacak işlemi, kasa işlemi, yıl)
+BENCHMARK_OLCEKLERI = {
+    "kucuk": (200, 5_000, 5_000, 3),
+    "orta": (2_000, 50_000, 50_000, 5),
+    "buyuk": (10_000, 500_000, 300_000, 10),
+}
+
+# Temel ölçüme göre bu oranın üstündeki yavaşlamalar gerileme sayılır
+BENCHMARK_TOLERANS = 1.25
+
+BENCHMARK_TEMEL_DOSYASI = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmark_temel.json")
+
+_ADLAR = ("Ahmet", "Mehmet", "Ayşe", "Fatma", "Mustafa", "Emine", "Ali", "Hatice", "Hüseyin", "Zeynep",
+          "İbrahim", "Elif", "Hasan", "Şükrü", "Gülşen", "Özlem", "Çetin", "Ümit", "Ömer", "Derya")
+_SOYADLAR = ("Yılmaz", "Kaya", "Demir", "Şahin", "Çelik", "Yıldız", "Yıldırım", "Öztürk", "Aydın",
+             "Özdemir", "Arslan", "Doğan", "Kılıç", "Aslan", "Çetin", "Kara", "Koç", "Kurt", "Özkan", "Şimşek")
+_KASA_ACIKLAMALARI = {
+    "CİRO": ("Günlük satış", "Kartlı satış", "Nakit satış", "Toptan satış"),
+    "GİDER": ("Kira", "Elektrik", "Su", "Personel", "Mal alımı", "Nakliye", "Vergi"),
+}
+
+
+def sentetik_defter_olustur(arka_uc=None, musteri_sayisi=200, islem_sayisi=5_000, kasa_sayisi=5_000,
+                            yil_sayisi=3, tohum=42, bitis=date(2025, 12, 31)):
+    """Tekrarlanabilir sentetik defter verisi üretir (aynı tohum -> aynı veri)
+    
+    İşlemler müşterilere Zipf benzeri çarpık dağılır: az sayıda müşteri
+    işlemlerin büyük kısmını oluşturur. Tutarlar log-normal dağılır.
+    arka_uc bir SqliteDefter olmalıdır (varsayılan: yerel dosya).
+    """
+    if arka_uc is None:
+        arka_uc = SqliteDefter()
+    rng = random.Random(tohum)
+    gun_sayisi = yil_sayisi * 365
+    
+    def rastgele_tarih():
+        return (bitis - timedelta(days=rng.randrange(gun_sayisi))).strftime("%Y-%m-%d")
+    
+    conn = arka_uc.baglanti()
+    cursor = conn.cursor()
+    cursor.executemany(
+        f"INSERT INTO musteriler (ad, telefon, not_alani, uuid) VALUES (?, ?, ?, {YENI_UUID})",
+        [(f"{rng.choice(_ADLAR)} {rng.choice(_SOYADLAR)} {i + 1}",
+          f"05{rng.randrange(30, 56)}{rng.randrange(10**7):07d}", "") for i in range(musteri_sayisi)]
+    )
+    cursor.execute("SELECT id FROM musteriler WHERE silinme_tarihi IS NULL ORDER BY id DESC LIMIT ?",
+                   (musteri_sayisi,))
+    musteri_idleri = [satir[0] for satir in cursor.fetchall()]
+    agirliklar = list(itertools.accumulate(1 / (sira + 1) ** 1.1 for sira in range(len(musteri_idleri))))
+    
+    conn.commit()
+    conn.close()
+    
+    islemler = []
+    for musteri_id in rng.choices(musteri_idleri, cum_weights=agirliklar, k=islem_sayisi):
+        if rng.random() < 0.6:
+            islemler.append((musteri_id, rastgele_tarih(), "Veresiye", round(rng.lognormvariate(5, 1), 2), "BORÇ"))
+        else:
+            islemler.append((musteri_id, rastgele_tarih(), "Ödeme", round(rng.lognormvariate(4.8, 1), 2), "ÖDEME"))
+    
+    kasa = []
+    for _ in range(kasa_sayisi):
+        islem_turu = "CİRO" if rng.random() < 0.7 else "GİDER"
+        kasa.append((rastgele_tarih(), rng.choice(_KASA_ACIKLAMALARI[islem_turu]),
+                     round(rng.lognormvariate(6, 1.2), 2), islem_turu))
+    
+    # Tüm işlem ve kasa satırları tek işlemde, normal doğrulamadan geçerek yazılır
+    basarili, mesaj = arka_uc.toplu_kaydet(islemler, kasa)
+    if not basarili:
+        raise ValueError(mesaj)
+
+
+def _olc(fonksiyon, tekrar):
+    """Fonksiyonu bir kez ısıtıp tekrar kez çalıştırır, medyan süreyi (ms) döndürür"""
+    fonksiyon()
+    sureler = []
+    for _ in range(tekrar):
+        baslangic = time.perf_counter()
+        fonksiyon()
+        sureler.append((time.perf_counter() - baslangic) * 1000)
+    return statistics.median(sureler)
+
+
+def _ice_aktarma_suresi(tekrar=3):
+    """Modülün yeni bir yorumlayıcıda içe aktarılma süresini (ms) ölçer"""
+    klasor = os.path.dirname(os.path.abspath(__file__))
+    
+    def calistir(kod):
+        baslangic = time.perf_counter()
+        subprocess.run([sys.executable, "-c", kod], cwd=klasor, check=True)
+        return (time.perf_counter() - baslangic) * 1000
+    
+    bos = statistics.median(calistir("pass") for _ in range(tekrar))
+    dolu = statistics.median(calistir("import esnaf_defter") for _ in range(tekrar))
+    return max(dolu - bos, 0.0)
+
+
+def benchmark_calistir(olcek="kucuk", tekrar=5, tohum=42):
+    """Sentetik veri üzerinde veri yolu, rapor ve açılış sürelerini ölçer
+    
+    Sonuç {ölçüm_adı: milisaniye} sözlüğüdür. Veriler geçici bir dosyada
+    üretilir, gerçek veritabanına dokunulmaz.
+    """
+    musteri, islem, kasa, yil = BENCHMARK_OLCEKLERI[olcek]
+    klasor = tempfile.mkdtemp(prefix="esnaf_benchmark_")
+    veri = SqliteDefter(os.path.join(klasor, "benchmark.db"))
+    veri.hazirla()
+    sentetik_defter_olustur(veri, musteri, islem, kasa, yil, tohum=tohum)
+    
+    def musteri_listesi_veri_yolu():
+        # musteri_listesini_guncelle'nin veritabanı tarafı
+        MusteriOnbellegi(veri).kayitlar()
+        veri.genel_borc_ozeti()
+    
+    def ilk_boyama_veri_yolu():
+        # EsnafDefterUygulamasi.ilk_boyama'nın veritabanı tarafı
+        veri.kasa_gunluk_ozet(date.today().strftime("%Y-%m-%d"))
+        veri.musteri_ozetleri(ILK_SAYFA_MUSTERI)
+    
+    # Satış ekranı: 30 bin ürünlük katalogda 1000 kod/barkod araması
+    veri.urunleri_kaydet([(f"U{i:05d}", f"Ürün {i}", 1 + i % 500, f"869{i:010d}") for i in range(30_000)])
+    urun_indeksi = UrunIndeksi(veri)
+    aranacaklar = [f"U{random.Random(tohum + i).randrange(30_000):05d}" if i % 2 else f"869{i * 29:010d}"
+                   for i in range(1000)]
+    
+    def urun_arama_x1000():
+        for kod in aranacaklar:
+            urun_indeksi.bul(kod)
+    
+    en_aktif = veri.musteri_listele()[0]['id']
+    pdf_yolu = os.path.join(klasor, "rapor.pdf")
+    olcumler = {
+        "ilk_boyama_veri_yolu": ilk_boyama_veri_yolu,
+        "musteri_listesi_veri_yolu": musteri_listesi_veri_yolu,
+        "islem_listele": lambda: veri.islem_listele(en_aktif),
+        "musteri_ekstresi": lambda: veri.musteri_ekstresi(en_aktif, "2025-01-01"),
+        "genel_borc_ozeti": veri.genel_borc_ozeti,
+        "hatirlatma_adaylari": lambda: veri.hatirlatma_adaylari(0, 0, "2026-01-01"),
+        "kasa_aylik_ozet": lambda: veri.kasa_aylik_ozet(2025, 6),
+        "kasa_islem_listele": veri.kasa_islem_listele,
+        "borc_raporu_olustur": veri.borc_raporu_olustur,
+        "kasa_raporu_olustur": lambda: veri.kasa_raporu_olustur(2025, 6),
+        "borc_raporu_pdf_olustur": lambda: veri.borc_raporu_pdf_olustur(pdf_yolu),
+        "kasa_raporu_pdf_olustur": lambda: veri.kasa_raporu_pdf_olustur(2025, 6, pdf_yolu),
+        # Tek model, dört biçim (metin, HTML, CSV, PDF)
+        "kasa_raporu_dort_bicim": lambda: rapor_disa_aktar(veri.rapor_modeli("kasa", 2025, 6), RAPOR_BICIMLERI,
+                                                           os.path.join(klasor, "rapor")),
+        "urun_arama_x1000": urun_arama_x1000,
+    }
+    
+    sonuclar = {}
+    for ad, fonksiyon in olcumler.items():
+        # Tüm müşterileri dolaşan ağır ölçümler daha az tekrarlanır
+        sonuclar[ad] = _olc(fonksiyon, tekrar if "borc_raporu" not in ad else max(1, tekrar // 2))
+    
+    # Kolon görüntüsü özetleri; görüntü diğer ölçümleri etkilemesin diye en son kurulur
+    veri.kolon_goruntusu_olustur()
+    sonuclar["kolon_toplam_ozet"] = _olc(veri.kasa_toplam_ozet, tekrar)
+    sonuclar["kolon_aylik_gruplama"] = _olc(lambda: veri.kolon_ozeti("kasa", grup="ay"), tekrar)
+    veri.kolon_goruntusu_kaldir()
+    
+    sonuclar["ice_aktarma"] = _ice_aktarma_suresi()
+    
+    try:
+        root = tk.Tk()
+        root.withdraw()
+    except tk.TclError:
+        root = None  # Ekran yok (sunucu ortamı), açılış ölçülemez
+    if root is not None:
+        baslangic = time.perf_counter()
+        uygulama = EsnafDefterUygulamasi(root, veri)
+        while uygulama.ilk_boyama_ms is None:
+            root.update()
+        sonuclar["ilk_boyama"] = uygulama.ilk_boyama_ms
+        # Arka plan yüklemesi dahil tüm listelerin dolması
+        while not uygulama.acilis_tamamlandi:
+            root.update()
+            time.sleep(0.005)
+        sonuclar["acilis"] = (time.perf_counter() - baslangic) * 1000
+        root.destroy()
+    
+    shutil.rmtree(klasor, ignore_errors=True)
+    return sonuclar
+
+
+def benchmark_karsilastir(sonuclar, temel, tolerans=BENCHMARK_TOLERANS):
+    """Sonuçları temel ölçümle karşılaştırır; (rapor_metni, gerileme_var_mi) döndürür"""
+    satirlar = [f"{'Ölçüm':<28}{'Süre (ms)':>12}{'Temel (ms)':>12}{'Oran':>8}"]
+    gerileme = False
+    for ad, sure in sonuclar.items():
+        temel_sure = temel.get(ad)
+        if temel_sure:
+            oran = sure / temel_sure
+            isaret = "  GERİLEME" if oran > tolerans else ""
+            gerileme = gerileme or oran > tolerans
+            satirlar.append(f"{ad:<28}{sure:>12.2f}{temel_sure:>12.2f}{oran:>8.2f}{isaret}")
+        else:
+            satirlar.append(f"{ad:<28}{sure:>12.2f}{'-':>12}{'-':>8}")
+    return "\n".join(satirlar), gerileme
+
+
+def benchmark_komutu(olcek, tekrar, temel_dosyasi, temeli_kaydet):
+    """Komut satırından benchmark çalıştırır; gerileme varsa 1 döndürür"""
+    print(f"Ölçek: {olcek} {BENCHMARK_OLCEKLERI[olcek]} (müşteri, işlem, kasa, yıl)")
+    sonuclar = benchmark_calistir(olcek, tekrar)
+    
+    kayitli = {}
+    if os.path.exists(temel_dosyasi):
+        with open(temel_dosyasi, encoding="utf-8") as f:
+            kayitli = json.load(f)
+    temel = kayitli.get(olcek, {}).get("sonuclar", {})
+    
+    metin, gerileme = benchmark_karsilastir(sonuclar, temel)
+    print(metin)
+    
+    # İlk boyama, temel ölçümden bağımsız olarak sabit bir hedefe göre de denetlenir
+    ilk_boyama = sonuclar.get("ilk_boyama", sonuclar["ilk_boyama_veri_yolu"])
+    hedef_asildi = ilk_boyama > ILK_BOYAMA_HEDEF_MS
+    if hedef_asildi:
+        print(f"Uyarı: ilk boyama {ilk_boyama:.0f} ms, hedef {ILK_BOYAMA_HEDEF_MS} ms!")
+    
+    if temeli_kaydet:
+        kayitli[olcek] = {
+            "tarih": datetime.now().strftime("%Y-%m-%d %H:%M"),
+            "python": sys.version.split()[0],
+            "sqlite": sqlite3.sqlite_version,
+            "platform": sys.platform,
+            "sonuclar": sonuclar,
+        }
+        with open(temel_dosyasi, "w", encoding="utf-8") as f:
+            json.dump(kayitli, f, ensure_ascii=False, indent=2)
+        print(f"Temel ölçüm kaydedildi: {temel_dosyasi}")
+        return 0
+    
+    if gerileme:
+        print(f"Uyarı: temel ölçüme göre %{(BENCHMARK_TOLERANS - 1) * 100:.0f}'ten fazla yavaşlama var!")
+        return 1
+    return 1 if hedef_asildi else 0
+
+
+def _stres_isci(dosya, sure_sn, mesgul_ms, tohum):
+    """Stres testi süreci: süre dolana kadar yazar (%80) ve okur, sayaçları döndürür"""
+    global MESGUL_ZAMAN_ASIMI_MS
+    MESGUL_ZAMAN_ASIMI_MS = mesgul_ms
+    veri = SqliteDefter(dosya)
+    rastgele = random.Random(tohum)
+    bugun = date.today().strftime("%Y-%m-%d")
+    sonuc = {"yazma": 0, "okuma": 0, "kilit_hatasi": 0, "sureler": []}
+    bitis = time.monotonic() + sure_sn
+    while time.monotonic() < bitis:
+        baslangic = time.perf_counter()
+        try:
+            if rastgele.random() < 0.8:
+                veri.kasa_islem_ekle(bugun, "stres", rastgele.randint(1, 500), "CİRO")
+                sonuc["yazma"] += 1
+                sonuc["sureler"].append((time.perf_counter() - baslangic) * 1000)
+            else:
+                veri.kasa_gunluk_ozet(bugun)
+                sonuc["okuma"] += 1
+        except sqlite3.OperationalError as e:
+            if not kilit_hatasi_mi(e):
+                raise
+            sonuc["kilit_hatasi"] += 1
+    sonuc["yeniden_deneme"] = yazma_sayaclari["yeniden_deneme"]
+    return sonuc
+
+
+def stres_komutu(dosya=None, surec_sayisi=4, sure_sn=10, mesgul_ms=MESGUL_ZAMAN_ASIMI_MS):
+    """Aynı dosyaya çok süreçten eşzamanlı yazar; verim ve kilit hatası oranını yazdırır
+    
+    Vazgeçilen (denemeleri tükenen) kilit hatası varsa 1 döndürür.
+    """
+    klasor = None
+    if not dosya:
+        klasor = tempfile.mkdtemp(prefix="esnaf_stres_")
+        dosya = os.path.join(klasor, "stres.db")
+    SqliteDefter(dosya).hazirla()
+    
+    print(f"Stres testi: {surec_sayisi} süreç, {sure_sn:g} sn, meşgul zaman aşımı {mesgul_ms} ms, {dosya}")
+    with multiprocessing.Pool(surec_sayisi) as havuz:
+        sonuclar = havuz.starmap(_stres_isci, [(dosya, sure_sn, mesgul_ms, tohum) for tohum in range(surec_sayisi)])
+    if klasor:
+        shutil.rmtree(klasor, ignore_errors=True)
+    
+    yazma = sum(s["yazma"] for s in sonuclar)
+    okuma = sum(s["okuma"] for s in sonuclar)
+    hata = sum(s["kilit_hatasi"] for s in sonuclar)
+    yeniden = sum(s["yeniden_deneme"] for s in sonuclar)
+    sureler = sorted(sure for s in sonuclar for sure in s["sureler"])
+    print(f"Yazma: {yazma} ({yazma / sure_sn:.0f}/sn) | Okuma: {okuma} | "
+          f"Yeniden deneme: {yeniden} | Kilit hatası: {hata} (%{100 * hata / max(yazma + okuma + hata, 1):.2f})")
+    if sureler:
+        print(f"Yazma gecikmesi (ms): medyan {statistics.median(sureler):.1f} | "
+              f"p99 {sureler[int(len(sureler) * 0.99) - 1]:.1f} | en yüksek {sureler[-1]:.1f}")
+    return 1 if hata else 0
+
+
 # ============================================================================
 # ANA PROGRAM
 # ============================================================================
 
 def main():
     """Ana program fonksiyonu"""
-    # Veritabanı tablolarını oluştur
-    tablolari_olustur()
+    global MESGUL_ZAMAN_ASIMI_MS
+    # PyInstaller ile paketlenmiş exe'de --stres süreçleri main()'i yeniden çalıştırmasın
+    multiprocessing.freeze_support()
+    parser = argparse.ArgumentParser(description="Esnaf Defteri")
+    parser.add_argument("--sunucu", action="store_true",
+                        help="Arayüz yerine ağ sunucusunu başlatır (diğer kasalar bağlanabilir)")
+    parser.add_argument("--adres", default="127.0.0.1",
+                        help="Sunucunun dinleyeceği adres (yerel ağ için 0.0.0.0; --anahtar ile birlikte kullanın)")
+    parser.add_argument("--anahtar", default=os.environ.get("ESNAF_ANAHTAR"),
+                        help="Sunucu ile kasaların paylaştığı anahtar (varsayılan: ESNAF_ANAHTAR ortam değişkeni)")
+    parser.add_argument("--port", type=int, default=VARSAYILAN_PORT, help="Sunucu portu")
+    parser.add_argument("--uzak", metavar="URL",
+                        help="Yerel veritabanı yerine sunucuya bağlanır (örn: http://192.168.1.10:8765)")
+    parser.add_argument("--bellek", action="store_true",
+                        help="Geçici bellek veritabanıyla açar (deneme amaçlı, veriler kaydedilmez)")
+    parser.add_argument("--benchmark", action="store_true",
+                        help="Sentetik veri üzerinde performans ölçümü yapar ve temel ölçümle karşılaştırır")
+    parser.add_argument("--olcek", choices=sorted(BENCHMARK_OLCEKLERI), default="kucuk",
+                        help="Benchmark / sentetik veri ölçeği")
+    parser.add_argument("--tekrar", type=int, default=5, help="Her ölçümün tekrar sayısı")
+    parser.add_argument("--temel", default=BENCHMARK_TEMEL_DOSYASI, help="Temel ölçüm dosyası")
+    parser.add_argument("--temel-kaydet", action="store_true",
+                        help="Bu ölçümü yeni temel olarak kaydeder")
+    parser.add_argument("--sentetik-olustur", metavar="DOSYA",
+                        help="Verilen dosyaya sentetik deneme verisi yazar")
+    parser.add_argument("--olcum", action="store_true",
+                        help="Veri fonksiyonlarını ve SQL ifadelerini ölçer, çıkışta raporu yazdırır")
+    parser.add_argument("--tanilama", metavar="URL",
+                        help="Çalışan bir sunucunun ölçüm raporunu yazdırır")
+    parser.add_argument("--mesgul-ms", type=int, default=MESGUL_ZAMAN_ASIMI_MS,
+                        help="Veritabanı başka bir program tarafından kilitliyken beklenecek süre (ms)")
+    parser.add_argument("--stres", metavar="DOSYA", nargs="?", const="",
+                        help="Çok süreçli eşzamanlı yazma testi (dosya verilmezse geçici dosya)")
+    parser.add_argument("--surec", type=int, default=4, help="Stres testindeki süreç sayısı")
+    parser.add_argument("--sure", type=float, default=10, help="Stres testinin süresi (sn)")
+    parser.add_argument("--bakim", metavar="DOSYA", nargs="+",
+                        help="Dosyalarda tam bakım (VACUUM geçişi, boş sayfa atma, ANALYZE) yapar")
+    parser.add_argument("--kontrol", metavar="DOSYA", nargs="+",
+                        help="Veritabanı dosyalarının bütünlüğünü denetler (sorun kalırsa çıkış kodu 1)")
+    parser.add_argument("--onar", action="store_true",
+                        help="--kontrol ile birlikte: düzeltilebilen sorunları onarır")
+    parser.add_argument("--tam", action="store_true",
+                        help="--kontrol ile birlikte: quick_check yerine tam integrity_check çalıştırır")
+    parser.add_argument("--defter", metavar="DOSYA",
+                        help="Eşitleme, ürün yükleme, kolon görüntüsü, rapor ve hatırlatma komutlarında kullanılacak veritabanı (varsayılan esnaf_defter.db)")
+    parser.add_argument("--urun-yukle", metavar="CSV",
+                        help="Ürün kataloğunu CSV dosyasından yükler (kod;barkod;ad;fiyat;stok)")
+    parser.add_argument("--kolon", action="store_true",
+                        help="Hızlı dönem toplamları için kolon görüntüsünü kurar ve yıllık özeti yazdırır")
+    parser.add_argument("--kolon-kaldir", action="store_true",
+                        help="Kolon görüntüsünü siler (özetler yeniden doğrudan tablolardan hesaplanır)")
+    parser.add_argument("--rapor", choices=("borc", "kasa", "kategori"),
+                        help="Raporu bir kez hesaplayıp --bicim ile verilen biçimlerde dosyaya yazar")
+    parser.add_argument("--bicim", nargs="+", choices=sorted(RAPOR_BICIMLERI), default=["metin"],
+                        help="--rapor ile birlikte: çıktı biçimleri (metin, html, csv, pdf)")
+    parser.add_argument("--cikti", metavar="KOK",
+                        help="--rapor ile birlikte: uzantısız dosya yolu (varsayılan rapor adı ve saat)")
+    parser.add_argument("--yil", type=int, help="--rapor ile birlikte: rapor yılı")
+    parser.add_argument("--ay", type=int, help="--rapor ile birlikte: rapor ayı (kasa raporunda yıl ile birlikte)")
+    parser.add_argument("--etiket", help="--rapor kategori ile birlikte: etikete göre süzer")
+    parser.add_argument("--hatirlat", action="store_true",
+                        help="Eşiği aşan borçlulara ödeme hatırlatmalarını kuyruğa alır ve gönderim kutusunu boşaltır")
+    parser.add_argument("--alt-bakiye", type=float, default=HATIRLATMA_ALT_BAKIYE,
+                        help="--hatirlat ile birlikte: en az bakiye (TL)")
+    parser.add_argument("--alt-gun", type=int, default=HATIRLATMA_ALT_GUN,
+                        help="--hatirlat ile birlikte: ödenmemiş en eski borcun en az yaşı (gün)")
+    parser.add_argument("--hatirlatma-hedefi", metavar="HEDEF",
+                        help="--hatirlat ile birlikte: JSON satırlarının yazılacağı dosya ya da "
+                             "ağ geçidi adresi (http://...); varsayılan veritabanının yanındaki _hatirlatmalar.jsonl")
+    parser.add_argument("--saniyede", type=float, default=HATIRLATMA_SANIYEDE,
+                        help="--hatirlat ile birlikte: saniyede en fazla gönderim")
+    parser.add_argument("--senk-disa", metavar="HEDEF",
+                        help="Son eşitlemeden bu yana değişen kayıtları dosyaya (veya klasöre) yazar")
+    parser.add_argument("--senk-ice", metavar="DOSYA", nargs="+", default=[],
+                        help="Başka şubenin eşitleme dosyalarını sırayla uygular")
+    parser.add_argument("--bastan", action="store_true",
+                        help="--senk-disa ile birlikte: tüm kayıtları içeren tam dosya oluşturur")
+    parser.add_argument("--senk-yeni-kimlik", action="store_true",
+                        help="Kopyalanarak kurulan defterin şube kimliğini yeniler")
+    args = parser.parse_args()
+    
+    MESGUL_ZAMAN_ASIMI_MS = args.mesgul_ms
+    
+    if args.stres is not None:
+        sys.exit(stres_komutu(args.stres or None, args.surec, args.sure, args.mesgul_ms))
+    
+    if args.tanilama:
+        print(olcum_raporu(UzakDefter(args.tanilama, anahtar=args.anahtar).tanilama()))
+        return
+    
+    if args.olcum:
+        olcumu_ac()
+        atexit.register(lambda: print(olcum_raporu()))
+    
+    if args.bakim:
+        sys.exit(bakim_komutu(args.bakim))
+    
+    if args.urun_yukle:
+        sys.exit(urun_komutu(args.defter, args.urun_yukle))
+    
+    if args.kolon or args.kolon_kaldir:
+        sys.exit(kolon_komutu(args.defter, args.kolon_kaldir))
+    
+    if args.hatirlat:
+        sys.exit(hatirlatma_komutu(args.defter, args.alt_bakiye, args.alt_gun, args.hatirlatma_hedefi, args.saniyede))
+    
+    if args.rapor:
+        sys.exit(rapor_komutu(args.defter, args.rapor, args.bicim, args.cikti, args.yil, args.ay, args.etiket))
+    
+    if args.senk_disa or args.senk_ice or args.senk_yeni_kimlik:
+        sys.exit(senk_komutu(args.defter, args.senk_disa, args.senk_ice, args.bastan, args.senk_yeni_kimlik))
+    
+    if args.kontrol:
+        sys.exit(butunluk_komutu(args.kontrol, args.onar, args.tam))
+    
+    if args.benchmark:
+        sys.exit(benchmark_komutu(args.olcek, args.tekrar, args.temel, args.temel_kaydet))
+    
+    if args.sentetik_olustur:
+        veri = SqliteDefter(args.sentetik_olustur)
+        veri.hazirla()
+        musteri, islem, kasa, yil = BENCHMARK_OLCEKLERI[args.olcek]
+        sentetik_defter_olustur(veri, musteri, islem, kasa, yil)
+        print(f"Sentetik veri yazıldı: {args.sentetik_olustur}")
+        return
+    
+    if args.sunucu:
+        sunucu = DefterSunucusu(args.adres, args.port, anahtar=args.anahtar)
+        print(f"Esnaf Defteri sunucusu: http://{args.adres}:{args.port} (durdurmak için Ctrl+C)")
+        if not args.anahtar and args.adres not in ("127.0.0.1", "localhost", "::1"):
+            print("UYARI: Sunucu anahtarsız ve ağa açık; ağdaki herkes kayıt ekleyip silebilir, "
+                  "yıl kapatabilir. --anahtar kullanın.")
+        try:
+            asyncio.run(sunucu.calistir())
+        except KeyboardInterrupt:
+            pass
+        return
+    
+    if args.uzak:
+        veri = UzakDefter(args.uzak, anahtar=args.anahtar)
+    elif args.bellek:
+        veri = BellekDefter()
+    else:
+        veri = SqliteDefter()
+        # Veritabanı tablolarını oluştur
+        veri.hazirla()
+        
+        # Eski silinmiş kayıtlar pencere açılırken arka planda arşive taşınır
+        threading.Thread(target=veri.silinenleri_arsivle, daemon=True).start()
+        # ANALYZE, boş sayfa atma vb. program boştayken yapılır
+        BakimServisi(veri)
     
     # Ana pencereyi oluştur
     root = tk.Tk()
     
+    if args.uzak:
+        # Sunucu hatalarını program çökmeden kullanıcıya göster
+        root.report_callback_exception = lambda tur, hata, iz: messagebox.showerror("Sunucu Hatası", str(hata))
+    else:
+        varsayilan_hata_isleyici = root.report_callback_exception
+        
+        def arayuz_hatasi(tur, hata, iz):
+            # Denemeler tükendiyse program çökmeden kullanıcı uyarılır
+            if kilit_hatasi_mi(hata):
+                messagebox.showerror("Veritabanı Meşgul",
+                                     "Veritabanı başka bir program tarafından kullanılıyor "
+                                     "(ör. yedekleme). Biraz bekleyip tekrar deneyin.")
+            else:
+                varsayilan_hata_isleyici(tur, hata, iz)
+        root.report_callback_exception = arayuz_hatasi
+    
     # Uygulama ikonunu ayarla (opsiyonel)
     try:
         root.iconbitmap("icon.ico")
@@ -1284,7 +7818,7 @@ def main():
         pass
     
     # Uygulamayı başlat
-    app = EsnafDefterUygulamasi(root)
+    app = EsnafDefterUygulamasi(root, veri)
     
     # Ana döngüyü başlat
     root.mainloop()
@@ -1306,23 +7840,68 @@ ESNAF DEFTERİ - KULLANIM KILAVUZU
    - Müşteri listesinden bir müşteri seçin
    - "Borç Ekle" veya "Ödeme Ekle" butonları ile işlem kaydedin
    - Bakiye otomatik hesaplanır (kırmızı = borçlu, yeşil = alacaklı)
+   - "Ödeme Hatırlatmaları" en az bakiye ve en eski borç yaşı eşiğini aşan,
+     telefonu kayıtlı müşterileri listeler; "Kutuya Ekle" mesajları
+     gönderim kutusuna yazar, "Gönderimi Başlat" arka planda saniyede en
+     fazla 5 mesaj gönderir (hedef bir dosya ya da SMS ağ geçidi adresi).
+     Gönderilemeyenler beklemeyle yeniden denenir; aynı müşteriye 7 gün
+     içinde ikinci hatırlatma eklenmez
+   - "Benzer Müşteriler" aynı kişi olabilecek kayıtları ("AHMET YILMAZ",
+     "Ahmet Yilmaz (bakkal)", aynı telefon) listeler; kalacak kaydı seçip
+     birleştirin, diğerlerinin işlemleri ona taşınır
 
 2. GÜNLÜK KASA SEKMESİ:
    - Tarih, tutar ve açıklama girin
    - "Ciro Ekle" ile günlük satışları kaydedin
    - "Gider Ekle" ile harcamaları kaydedin
    - Günlük özet otomatik güncellenir
+   - Gün sonu fişleri için "Çoklu Giriş" ile satırları art arda girip
+     hepsini tek seferde kaydedin (Enter satır ekler)
+   - Yoğun saatlerde "Hızlı giriş" kutusunu işaretleyin: tutarı yazıp
+     Enter (ciro) ya da Shift+Enter (gider) ile kaydedin; sonuç pencere
+     açılmadan alttaki durum satırında görünür
+
+3. SATIŞ SEKMESİ:
+   - "Ürünler" butonu ile ürün kodu, barkod, ad ve fiyat girin (CSV
+     dosyasından toplu yükleme: kod;barkod;ad;fiyat;stok)
+   - Kod/Barkod alanında barkodu okutun ya da kodu yazıp Enter'a basın;
+     "3*KOD" 3 adet ekler, aynı ürün tekrar okutulursa miktarı artar
+   - "Peşin Satış" satırları kasaya ciro, "Veresiye" seçili müşteriye
+     borç olarak yazar; stoğu girilen ürünlerin stoğu düşer
 
-3. RAPORLAR SEKMESİ:
+4. RAPORLAR SEKMESİ:
    - Borç-Alacak veya Kasa raporu oluşturun
-   - Raporları metin dosyası olarak kaydedin
+   - Görüntülenen raporu "Raporu Dosyaya Kaydet" ile metin (.txt), web sayfası
+     (.html), Excel (.csv) veya PDF olarak kaydedin; biçim dosya uzantısından
+     seçilir (komut satırından: python esnaf_defter.py --rapor kasa --yil 2025
+     --ay 6 --bicim metin html csv pdf)
+   - "Yılı Kapat" ile geçmiş yılları "esnaf_defter_arsiv.db" dosyasına taşıyın
+   - "Bütünlük Kontrolü" veritabanını denetler, bulunan sorunları onarabilir
+     (komut satırından: python esnaf_defter.py --kontrol DOSYA... --onar)
 
 VERİTABANI:
    - Tüm veriler "esnaf_defter.db" dosyasında saklanır
+   - İki kasa tek veritabanını paylaşabilir: ana bilgisayarda
+     "python esnaf_defter.py --sunucu --adres 0.0.0.0 --anahtar GIZLI"
+     çalıştırın, diğer kasada "python esnaf_defter.py --uzak
+     http://ANA_BILGISAYAR:8765 --anahtar GIZLI". Anahtarsız sunucuya ağdaki
+     herkes bağlanıp kayıt silebilir, yıl kapatabilir; sunucuyu yalnızca
+     güvendiğiniz yerel ağda açın, internete açmayın
    - Bu dosyayı yedekleyerek verilerinizi koruyabilirsiniz
+   - Ayrı veritabanı tutan şubeler Raporlar sekmesindeki "Eşitleme Dosyası
+     Oluştur / Al" butonlarıyla (USB bellek ya da ortak klasör üzerinden)
+     yalnızca değişen kayıtları birbirine aktarır. Her dosya karşı şubenin
+     henüz almadığı tüm değişiklikleri içerir, en son dosyayı almak yeterlidir;
+     iki şubede birden değişen kayıtta son değişiklik geçerli olur
 
 İPUÇLARI:
    - Program internet gerektirmez
+   - Yavaşlık şüphesinde Ctrl+Shift+D ile tanılama penceresini açıp ölçümü başlatın
+   - Çok yıllık defterlerde kasa özetleri yavaşladıysa bir kez
+     "python esnaf_defter.py --kolon" çalıştırın; özetler bundan sonra
+     veritabanının yanındaki .kolon dosyalarından anında hesaplanır
    - Veriler otomatik kaydedilir
    - Silme işlemleri onay gerektirir
+   - Silinen kayıtlar "Silmeyi Geri Al" ile geri getirilebilir
+   - 90 günden eski silinmiş kayıtlar otomatik olarak arşive taşınır
 """
@@ -0,0 +1,67 @@
+"""Benchmark yardımcılarının testleri: sentetik veri üreticisi ve temel karşılaştırması"""
+import json
+import os
+
+import esnaf_defter as ed
+
+
+def sentetik_defter(klasor, ad, tohum=42):
+    veri = ed.SqliteDefter(os.path.join(klasor, ad))
+    veri.hazirla()
+    ed.sentetik_defter_olustur(veri, musteri_sayisi=20, islem_sayisi=300, kasa_sayisi=300, yil_sayisi=2,
+                               tohum=tohum)
+    return veri
+
+
+def icerik(veri):
+    """uuid gibi her çalıştırmada değişen sütunlar dışındaki tüm satırlar"""
+    conn = veri.baglanti()
+    try:
+        return {
+            "musteriler": conn.execute("SELECT id, ad, telefon FROM musteriler ORDER BY id").fetchall(),
+            "islemler": conn.execute(
+                "SELECT musteri_id, tarih, aciklama, tutar, islem_turu FROM islemler ORDER BY id").fetchall(),
+            "kasa": conn.execute("SELECT tarih, aciklama, tutar, islem_turu FROM kasa ORDER BY id").fetchall(),
+        }
+    finally:
+        conn.close()
+
+
+def test_sentetik_veri_ayni_tohumla_ayni(tmp_path):
+    birinci = icerik(sentetik_defter(tmp_path, "a.db"))
+    ikinci = icerik(sentetik_defter(tmp_path, "b.db"))
+    assert [len(satirlar) for satirlar in birinci.values()] == [20, 300, 300]
+    assert {ad: [tuple(s) for s in satirlar] for ad, satirlar in birinci.items()} == \
+           {ad: [tuple(s) for s in satirlar] for ad, satirlar in ikinci.items()}
+
+
+def test_sentetik_veri_farkli_tohumla_farkli(tmp_path):
+    birinci = icerik(sentetik_defter(tmp_path, "a.db", tohum=1))
+    ikinci = icerik(sentetik_defter(tmp_path, "b.db", tohum=2))
+    assert [tuple(s) for s in birinci["kasa"]] != [tuple(s) for s in ikinci["kasa"]]
+
+
+def test_karsilastir_tolerans_icinde_gerileme_yok():
+    metin, gerileme = ed.benchmark_karsilastir({"a": 11.0, "b": 5.0}, {"a": 10.0, "b": 5.0}, tolerans=1.25)
+    assert not gerileme
+    assert "GERİLEME" not in metin
+
+
+def test_karsilastir_tolerans_ustu_gerileme():
+    metin, gerileme = ed.benchmark_karsilastir({"a": 13.0, "b": 5.0}, {"a": 10.0, "b": 5.0}, tolerans=1.25)
+    assert gerileme
+    satir = next(s for s in metin.splitlines() if s.startswith("a "))
+    assert satir.endswith("GERİLEME")
+
+
+def test_karsilastir_temelde_olmayan_olcum():
+    metin, gerileme = ed.benchmark_karsilastir({"yeni": 100.0}, {})
+    assert not gerileme
+    assert metin.splitlines()[1].split()[-2:] == ["-", "-"]
+
+
+def test_kayitli_temel_kucuk_olcek_icin_var():
+    with open(ed.BENCHMARK_TEMEL_DOSYASI, encoding="utf-8") as f:
+        temel = json.load(f)["kucuk"]["sonuclar"]
+    assert "ilk_boyama_veri_yolu" in temel
+    assert all(isinstance(sure, (int, float)) and sure > 0 for sure in temel.values())
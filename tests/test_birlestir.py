@@ -0,0 +1,41 @@
+"""Müşteri birleştirme ve silme geri alma testleri"""
+import os
+
+import pytest
+
+import esnaf_defter as ed
+
+
+@pytest.fixture
+def veri(tmp_path):
+    veri = ed.SqliteDefter(os.path.join(tmp_path, "defter.db"))
+    veri.hazirla()
+    for ad in ("Ali", "Ali Yılmaz"):
+        veri.musteri_ekle(ad)
+    return veri
+
+
+def kimlikler(veri):
+    return {m['ad']: m['id'] for m in veri.musteri_listele()}
+
+
+def test_birlestirme_silmeyi_geri_al_ile_bozulmaz(veri):
+    ids = kimlikler(veri)
+    veri.islem_ekle(ids["Ali"], "2025-01-01", "x", 20, "BORÇ")
+    assert veri.musteri_birlestir(ids["Ali Yılmaz"], [ids["Ali"]])[0]
+    
+    basarili, mesaj = veri.son_silmeyi_geri_al(("musteriler", "islemler"))
+    assert not basarili and "birleştirme" in mesaj
+    assert veri.geri_al("musteriler", ids["Ali"])[0] is False
+    assert list(kimlikler(veri)) == ["Ali Yılmaz"]
+    assert veri.musteri_bakiye_hesapla(ids["Ali Yılmaz"]) == 20.0
+
+
+def test_birlestirmeden_onceki_silme_geri_alinir(veri):
+    veri.musteri_ekle("Veli")
+    ids = kimlikler(veri)
+    veri.musteri_sil(ids["Veli"])
+    veri.musteri_birlestir(ids["Ali Yılmaz"], [ids["Ali"]])
+    basarili, mesaj = veri.son_silmeyi_geri_al(("musteriler", "islemler"))
+    assert basarili and "birleştirmesi geri alınamaz" in mesaj
+    assert sorted(kimlikler(veri)) == ["Ali Yılmaz", "Veli"]
@@ -0,0 +1,37 @@
+"""Dövizli işlemlerde kur kuralının testleri"""
+import os
+import sqlite3
+
+import pytest
+
+import esnaf_defter as ed
+
+
+@pytest.fixture
+def veri(tmp_path):
+    veri = ed.SqliteDefter(os.path.join(tmp_path, "defter.db"))
+    veri.hazirla()
+    veri.musteri_ekle("Ali")
+    return veri
+
+
+def dovizli_ekle(veri, para_birimi="EUR", tarih="2025-01-01"):
+    conn = veri.baglanti()
+    try:
+        with conn:
+            conn.execute("INSERT INTO islemler (musteri_id, tarih, aciklama, tutar, islem_turu, para_birimi) "
+                         "VALUES (?, ?, 'x', 10, 'BORÇ', ?)", (veri.musteri_listele()[0]['id'], tarih, para_birimi))
+    finally:
+        conn.close()
+
+
+def test_kuru_olmayan_dovizli_islem_okunur_mesajla_reddedilir(veri):
+    with pytest.raises(sqlite3.IntegrityError, match="Döviz kuru yok"):
+        dovizli_ekle(veri)
+
+
+def test_kur_girilince_dovizli_islem_bakiyeye_cevrilir(veri):
+    assert veri.kur_ekle("EUR", "2024-12-01", 35)[0]
+    dovizli_ekle(veri)
+    assert veri.musteri_bakiye_hesapla(veri.musteri_listele()[0]['id']) == 350.0
+    assert veri.butunluk_kontrol()[0]
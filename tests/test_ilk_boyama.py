@@ -0,0 +1,54 @@
+"""Açılışta ilk dolu görüntünün ILK_BOYAMA_HEDEF_MS içinde çizildiğini denetler"""
+import os
+import time
+import tkinter as tk
+from datetime import date
+
+import pytest
+
+import esnaf_defter as ed
+
+
+@pytest.fixture(scope="module")
+def veri(tmp_path_factory):
+    veri = ed.SqliteDefter(os.path.join(tmp_path_factory.mktemp("ilk_boyama"), "defter.db"))
+    veri.hazirla()
+    musteri, islem, kasa, yil = ed.BENCHMARK_OLCEKLERI["kucuk"]
+    ed.sentetik_defter_olustur(veri, musteri, islem, kasa, yil)
+    return veri
+
+
+@pytest.fixture
+def root():
+    try:
+        root = tk.Tk()
+    except tk.TclError:
+        pytest.skip("Ekran yok, arayüz açılamıyor")
+    root.withdraw()
+    yield root
+    try:
+        root.destroy()
+    except tk.TclError:
+        pass  # uygulama.kapat() pencereyi zaten kapattı
+
+
+def test_ilk_boyama_veri_yolu_hedefin_altinda(veri):
+    # Arayüzsüz ortamlarda da çalışan kısım: ilk boyamanın veritabanı tarafı
+    veri.kasa_gunluk_ozet(date.today().strftime("%Y-%m-%d"))
+    baslangic = time.perf_counter()
+    veri.kasa_gunluk_ozet(date.today().strftime("%Y-%m-%d"))
+    veri.musteri_ozetleri(ed.ILK_SAYFA_MUSTERI)
+    assert (time.perf_counter() - baslangic) * 1000 < ed.ILK_BOYAMA_HEDEF_MS
+
+
+def test_ilk_boyama_hedefin_altinda(veri, root):
+    uygulama = ed.EsnafDefterUygulamasi(root, veri)
+    son = time.monotonic() + 10
+    while uygulama.ilk_boyama_ms is None and time.monotonic() < son:
+        root.update()
+    assert uygulama.ilk_boyama_ms is not None, "ilk boyama 10 sn içinde olmadı"
+    assert uygulama.ilk_boyama_ms <= ed.ILK_BOYAMA_HEDEF_MS
+    while not uygulama.acilis_tamamlandi and time.monotonic() < son:
+        root.update()
+        time.sleep(0.005)
+    uygulama.kapat()
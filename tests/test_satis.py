@@ -0,0 +1,39 @@
+"""Satış kaydının doğrulama testleri"""
+import os
+
+import pytest
+
+import esnaf_defter as ed
+
+
+@pytest.fixture
+def veri(tmp_path):
+    veri = ed.SqliteDefter(os.path.join(tmp_path, "defter.db"))
+    veri.hazirla()
+    veri.urun_kaydet("EKM", "Ekmek", 10, None, 2)
+    return veri
+
+
+def urun_id(veri):
+    return veri.urun_listele()[0]['id']
+
+
+def test_silinmis_musteriye_veresiye_satilmaz(veri):
+    veri.musteri_ekle("Ali")
+    musteri_id = veri.musteri_listele()[0]['id']
+    veri.musteri_sil(musteri_id)
+    assert veri.satis_kaydet([(urun_id(veri), 1)], musteri_id=musteri_id) == (False, "Müşteri bulunamadı!")
+
+
+@pytest.mark.parametrize("fiyat", [-50, 0, "abc"])
+def test_gecersiz_birim_fiyat_reddedilir(veri, fiyat):
+    assert veri.satis_kaydet([(urun_id(veri), 1, fiyat)])[0] is False
+    assert not veri.kasa_islem_listele()
+
+
+def test_stok_eksiye_dusmez(veri):
+    basarili, mesaj = veri.satis_kaydet([(urun_id(veri), 1), (urun_id(veri), 2)])
+    assert not basarili and "stok yetersiz" in mesaj
+    assert not veri.kasa_islem_listele()
+    assert veri.satis_kaydet([(urun_id(veri), 2)])[0]
+    assert veri.urun_listele()[0]['stok'] == 0
@@ -0,0 +1,35 @@
+"""Şubeler arası eşitleme testleri"""
+import os
+
+import esnaf_defter as ed
+
+
+def sube(klasor, ad):
+    veri = ed.SqliteDefter(os.path.join(klasor, ad))
+    veri.hazirla()
+    return veri
+
+
+def test_dovizli_islem_kuruyla_birlikte_esitlenir(tmp_path):
+    a = sube(tmp_path, "a.db")
+    assert a.kur_ekle("EUR", "2025-01-01", 35)[0]
+    a.musteri_ekle("Ali")
+    musteri_id = a.musteri_listele()[0]['id']
+    assert a.islem_ekle(musteri_id, "2025-02-01", "Avro borç", 10, "BORÇ", para_birimi="EUR")[0]
+    
+    b = sube(tmp_path, "b.db")
+    basarili, mesaj = b.senk_paketini_uygula(a.senk_paketi_olustur())
+    assert basarili, mesaj
+    
+    [musteri] = b.musteri_listele()
+    assert b.musteri_bakiye_hesapla(musteri['id']) == 350.0
+    assert [tuple(kur)[:3] for kur in b.kur_listele()] == [("EUR", "2025-01-01", 35.0)]
+    
+    # Sonraki dövizli işlem de alınabilir; B'nin kendi kuru korunur
+    assert b.kur_ekle("EUR", "2025-03-01", 40)[0]
+    assert a.kur_ekle("EUR", "2025-03-01", 38)[0]
+    assert a.islem_ekle(musteri_id, "2025-03-02", "Avro borç", 1, "BORÇ", para_birimi="EUR")[0]
+    basarili, mesaj = b.senk_paketini_uygula(a.senk_paketi_olustur())
+    assert basarili, mesaj
+    assert b.musteri_bakiye_hesapla(musteri['id']) == 390.0
+    assert b.butunluk_kontrol()[0]